@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+---------------------
+Times the offline entry points of the pipeline runner and the fetch scripts
+(--help, --list-extractors, --status --cached) and checks that none of them
+imports a heavy package (pandas, numpy, pyodbc, requests, openpyxl) before
+it is needed.
+
+Each command is run once under `python -X importtime` to list the modules it
+loads, then --runs times for wall-clock timing. A bare `python -c pass` is
+timed the same way so the report shows the cost above interpreter startup.
+
+No database or network access is needed: --status --cached reads a small
+snapshot written to a temp directory.
+
+Usage:
+    python scripts/benchmark_cli_startup.py
+    python scripts/benchmark_cli_startup.py --runs 10 --max-ms 250
+    python scripts/benchmark_cli_startup.py --json
+
+Exit codes: 0 all within budget, 1 a heavy import or slow/failed command, 2 error
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+HEAVY_MODULES = ('pandas', 'numpy', 'pyodbc', 'pymssql', 'requests', 'openpyxl', 'sqlalchemy')
+
+STATUS_SNAPSHOT = {
+    'Captured_At': '2026-03-28T06:00:00',
+    'Rows': [{
+        'Pipeline_Name': 'GP_Practices', 'Last_Run_Status': 'SUCCESS',
+        'Last_Run_Date': '2026-03-27T06:00:00', 'Is_Overdue': 0, 'Next_Refresh_Date': '2026-04-03',
+    }],
+}
+
+
+def commands(status_cache: Path) -> Dict[str, List[str]]:
+    """Label -> script argv (relative to scripts/)."""
+    runner = 'pipeline/run_pipeline.py'
+    return {
+        'run_pipeline --help': [runner, '--help'],
+        'run_pipeline --list-extractors': [runner, '--list-extractors'],
+        'run_pipeline --status --cached': [runner, '--status', '--cached', '--status-cache', str(status_cache)],
+        'fetch_gp_practices_csv --help': ['data_integration/nhs_ods/fetch_gp_practices_csv.py', '--help'],
+        'fetch_pcn --help': ['data_integration/nhs_ods/fetch_pcn.py', '--help'],
+        'fetch_hrg_code_to_group --help': ['data_integration/hrg/fetch_hrg_code_to_group.py', '--help'],
+        'fetch_imd2019_idaci_idaopi --help': ['data_integration/imd2019/fetch_imd2019_idaci_idaopi.py', '--help'],
+    }
+
+
+def run_once(argv: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable] + argv, cwd=SCRIPTS_DIR,
+                          capture_output=True, text=True, timeout=120)
+
+
+def imported_modules(argv: List[str]) -> Set[str]:
+    """Top-level package names from `python -X importtime` (stderr: 'import time: self | cumulative | name')."""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=SCRIPTS_DIR,
+                            capture_output=True, text=True, timeout=120)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            name = line.rsplit('|', 1)[1].strip()
+            if name and name != 'package':
+                modules.add(name.split('.')[0])
+    return modules
+
+
+def time_command(argv: List[str], runs: int) -> Dict:
+    """Median/min wall-clock milliseconds over `runs` runs, plus the first failure if any."""
+    timings = []
+    failure = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = run_once(argv)
+        timings.append((time.perf_counter() - t0) * 1000)
+        if result.returncode != 0 and failure is None:
+            failure = (result.stderr or result.stdout).strip().splitlines()[-1:] or [f'exit {result.returncode}']
+    return {
+        'median_ms': round(statistics.median(timings), 1),
+        'min_ms': round(min(timings), 1),
+        'error': failure[0] if failure else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup of the pipeline runner and fetch scripts')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per command (default: 5)')
+    parser.add_argument('--max-ms', type=float, default=300.0,
+                        help='Budget for median startup above bare interpreter startup (default: 300)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        print('❌ --runs must be at least 1')
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        status_cache = Path(tmp) / 'pipeline_status_cache.json'
+        status_cache.write_text(json.dumps(STATUS_SNAPSHOT), encoding='utf-8')
+
+        baseline = time_command(['-c', 'pass'], args.runs)['median_ms']
+        results = []
+        for label, argv in commands(status_cache).items():
+            timing = time_command(argv, args.runs)
+            heavy = sorted(imported_modules(argv) & set(HEAVY_MODULES))
+            overhead = round(timing['median_ms'] - baseline, 1)
+            results.append({
+                'command': label,
+                **timing,
+                'overhead_ms': overhead,
+                'heavy_imports': heavy,
+                'ok': timing['error'] is None and not heavy and overhead <= args.max_ms,
+            })
+
+    if args.json:
+        print(json.dumps({'baseline_ms': baseline, 'max_ms': args.max_ms, 'results': results}, indent=2))
+    else:
+        print(f"\n=== CLI Startup (python -c pass: {baseline} ms, budget +{args.max_ms:g} ms) ===\n")
+        print(f"{'Command':<36} {'Median':>9} {'Min':>9} {'+Base':>9}  Notes")
+        print("-" * 90)
+        for r in results:
+            notes = []
+            if r['heavy_imports']:
+                notes.append('imports ' + ', '.join(r['heavy_imports']))
+            if r['error']:
+                notes.append(f"failed: {r['error']}")
+            if r['overhead_ms'] > args.max_ms:
+                notes.append('over budget')
+            mark = '✅' if r['ok'] else '❌'
+            print(f"{r['command']:<36} {r['median_ms']:>7.1f}ms {r['min_ms']:>7.1f}ms "
+                  f"{r['overhead_ms']:>7.1f}ms  {mark} {'; '.join(notes)}")
+
+    failed = [r for r in results if not r['ok']]
+    if not args.json:
+        print()
+        print(f"❌ {len(failed)} command(s) failed the startup check" if failed
+              else f"✅ All {len(results)} commands within budget")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(2)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+ETL Run Comparison (waits and plans)
+------------------------------------
+Diffs two runs of the same ETL batch step by step: duration, session waits
+(tbl_ETL_Step_Wait_Stats) and Query Store plans (tbl_ETL_Step_Query_Plan),
+both captured by sp_Log_Table_Load.
+
+- Runs: --fast / --slow Batch_IDs, or --batch-name picks the fastest and
+  slowest successful run among its last --last runs.
+- Steps are matched on Table_Name + Load_Type + Partition_ID (+ occurrence).
+- Waits: per wait type, slow minus fast wait time; largest increases first.
+- Plans: per statement (Query_Hash), the plan hashes each run used. A
+  different Query_Plan_Hash is a plan change; statements only one run executed
+  are listed too. Plans are only captured for steps logged with
+  @ProcID = @@PROCID (fact loaders, sp_Compute_CAM_Raw).
+
+Usage:
+    python compare_etl_runs.py --batch-name Compute_CAM_Raw
+    python compare_etl_runs.py --batch-name Fact_OP_Activity --last 10 --top 5
+    python compare_etl_runs.py --fast 1412 --slow 1490 --markdown cam_raw_diff.md
+
+Exit code 0 = report written, 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BATCH_QUERY = """
+SELECT Batch_ID, Batch_Name, Start_DateTime, Duration_Seconds, Status,
+       ISNULL(Rows_Inserted, 0) + ISNULL(Rows_Updated, 0) + ISNULL(Rows_Deleted, 0) AS Rows_Processed
+FROM [Analytics].[tbl_ETL_Batch_Log]
+WHERE Batch_ID IN (?, ?)
+"""
+
+PICK_QUERY = """
+SELECT TOP (?) Batch_ID, Duration_Seconds
+FROM [Analytics].[tbl_ETL_Batch_Log]
+WHERE Batch_Name = ? AND Status = 'Success' AND Duration_Seconds IS NOT NULL
+ORDER BY Batch_ID DESC
+"""
+
+STEP_QUERY = """
+SELECT Load_ID, Table_Name, Load_Type, Partition_ID, Duration_Seconds, Rows_Affected, Status
+FROM [Analytics].[tbl_ETL_Table_Load_Log]
+WHERE Batch_ID = ?
+ORDER BY Load_ID
+"""
+
+WAIT_QUERY = """
+SELECT Load_ID, Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms
+FROM [Analytics].[tbl_ETL_Step_Wait_Stats]
+WHERE Batch_ID = ?
+"""
+
+PLAN_QUERY = """
+SELECT Load_ID, Query_ID, Plan_ID, CONVERT(VARCHAR(18), Query_Hash, 1) AS Query_Hash,
+       CONVERT(VARCHAR(18), Query_Plan_Hash, 1) AS Query_Plan_Hash, Is_Forced_Plan,
+       Executions, Avg_Duration_ms, Avg_CPU_ms, Avg_Logical_Reads, Max_DOP, Statement_Text
+FROM [Analytics].[tbl_ETL_Step_Query_Plan]
+WHERE Batch_ID = ?
+"""
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str)
+
+
+def fetch(cursor, query: str, *params) -> list:
+    cursor.execute(query, *params)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, r)) for r in cursor.fetchall()]
+
+
+def pick_runs(cursor, batch_name: str, last: int) -> tuple:
+    """(fastest, slowest) successful Batch_ID among the last runs."""
+    runs = fetch(cursor, PICK_QUERY, last, batch_name)
+    if len(runs) < 2:
+        raise RuntimeError(f'Need two successful runs of {batch_name!r}, found {len(runs)}.')
+    runs.sort(key=lambda r: r['Duration_Seconds'])
+    return runs[0]['Batch_ID'], runs[-1]['Batch_ID']
+
+
+def load_run(cursor, batch_id: int) -> dict:
+    """Steps keyed by (Table_Name, Load_Type, Partition_ID, occurrence), with their waits and plans."""
+    waits = defaultdict(list)
+    for w in fetch(cursor, WAIT_QUERY, batch_id):
+        waits[w['Load_ID']].append(w)
+    plans = defaultdict(list)
+    for p in fetch(cursor, PLAN_QUERY, batch_id):
+        plans[p['Load_ID']].append(p)
+
+    steps = {}
+    seen = defaultdict(int)
+    for s in fetch(cursor, STEP_QUERY, batch_id):
+        base = (s['Table_Name'], s['Load_Type'], s['Partition_ID'])
+        seen[base] += 1
+        s['waits'] = {w['Wait_Type']: w for w in waits[s['Load_ID']]}
+        s['plans'] = plans[s['Load_ID']]
+        steps[base + (seen[base],)] = s
+    return steps
+
+
+def diff_waits(fast: dict, slow: dict, top: int) -> list:
+    """[(wait_type, fast_ms, slow_ms, delta_ms, fast_tasks, slow_tasks)] by largest increase."""
+    rows = []
+    for wait_type in set(fast) | set(slow):
+        f, s = fast.get(wait_type, {}), slow.get(wait_type, {})
+        f_ms, s_ms = f.get('Wait_Time_ms', 0), s.get('Wait_Time_ms', 0)
+        rows.append((wait_type, f_ms, s_ms, s_ms - f_ms,
+                     f.get('Waiting_Tasks_Count', 0), s.get('Waiting_Tasks_Count', 0)))
+    rows.sort(key=lambda r: -r[3])
+    return rows[:top]
+
+
+def diff_plans(fast: list, slow: list) -> list:
+    """Per Query_Hash: plan hashes and runtime on each side; changed / only-one-side first."""
+    by_query = defaultdict(lambda: {'fast': [], 'slow': []})
+    for side, plans in (('fast', fast), ('slow', slow)):
+        for p in plans:
+            by_query[p['Query_Hash']][side].append(p)
+
+    rows = []
+    for query_hash, sides in by_query.items():
+        f_hashes = {p['Query_Plan_Hash'] for p in sides['fast']}
+        s_hashes = {p['Query_Plan_Hash'] for p in sides['slow']}
+        if not f_hashes or not s_hashes:
+            change = 'SLOW ONLY' if s_hashes else 'FAST ONLY'
+        elif f_hashes != s_hashes:
+            change = 'PLAN CHANGED'
+        else:
+            change = 'same plan'
+        sample = (sides['slow'] or sides['fast'])[0]
+        rows.append({
+            'query_hash': query_hash,
+            'change': change,
+            'fast_plans': sorted(f_hashes),
+            'slow_plans': sorted(s_hashes),
+            'fast_ms': _weighted(sides['fast'], 'Avg_Duration_ms'),
+            'slow_ms': _weighted(sides['slow'], 'Avg_Duration_ms'),
+            'fast_reads': _weighted(sides['fast'], 'Avg_Logical_Reads'),
+            'slow_reads': _weighted(sides['slow'], 'Avg_Logical_Reads'),
+            'forced': any(p['Is_Forced_Plan'] for p in sides['slow']),
+            'text': ' '.join((sample['Statement_Text'] or '').split())[:120],
+        })
+    order = {'PLAN CHANGED': 0, 'SLOW ONLY': 1, 'FAST ONLY': 2, 'same plan': 3}
+    rows.sort(key=lambda r: (order[r['change']], -((r['slow_ms'] or 0) - (r['fast_ms'] or 0))))
+    return rows
+
+
+def _weighted(plans: list, column: str):
+    executions = sum(p['Executions'] or 0 for p in plans)
+    if not executions:
+        return None
+    return float(sum(float(p[column] or 0) * (p['Executions'] or 0) for p in plans)) / executions
+
+
+def _num(value, digits=0) -> str:
+    return '-' if value is None else f'{value:,.{digits}f}'
+
+
+def build_report(fast_run: dict, slow_run: dict, fast_steps: dict, slow_steps: dict, top: int) -> list:
+    lines = [
+        f"# {slow_run['Batch_Name']}: fast vs slow run",
+        '',
+        '| Run | Batch_ID | Started | Duration (s) | Rows |',
+        '|-----|----------|---------|--------------|------|',
+    ]
+    for label, run in (('Fast', fast_run), ('Slow', slow_run)):
+        lines.append(f"| {label} | {run['Batch_ID']} | {run['Start_DateTime']:%Y-%m-%d %H:%M} "
+                     f"| {_num(run['Duration_Seconds'])} | {_num(run['Rows_Processed'])} |")
+
+    for key in sorted(set(fast_steps) | set(slow_steps), key=lambda k: (slow_steps.get(k) or fast_steps[k])['Load_ID']):
+        f, s = fast_steps.get(key), slow_steps.get(key)
+        table, load_type, partition, _ = key
+        name = f'{table} ({load_type}' + (f', partition {partition}' if partition else '') + ')'
+        lines += ['', f'## {name}', '']
+        if not f or not s:
+            lines.append(f"Only in the {'slow' if s else 'fast'} run.")
+            continue
+        lines.append(f"Duration: {_num(f['Duration_Seconds'])}s -> {_num(s['Duration_Seconds'])}s, "
+                     f"rows: {_num(f['Rows_Affected'])} -> {_num(s['Rows_Affected'])}")
+
+        waits = diff_waits(f['waits'], s['waits'], top)
+        if waits:
+            lines += ['', '| Wait type | Fast ms | Slow ms | Change ms | Fast tasks | Slow tasks |',
+                      '|-----------|---------|---------|-----------|------------|------------|']
+            lines += [f'| {w[0]} | {w[1]:,} | {w[2]:,} | {w[3]:+,} | {w[4]:,} | {w[5]:,} |' for w in waits]
+        else:
+            lines += ['', 'No waits captured.']
+
+        plans = diff_plans(f['plans'], s['plans'])
+        if plans:
+            lines += ['', '| Query hash | Plan | Fast ms | Slow ms | Fast reads | Slow reads | Statement |',
+                      '|------------|------|---------|---------|------------|------------|-----------|']
+            for p in plans:
+                change = p['change'] + (' (forced)' if p['forced'] else '')
+                if p['change'] == 'PLAN CHANGED':
+                    change += f": {', '.join(p['fast_plans'])} -> {', '.join(p['slow_plans'])}"
+                lines.append(f"| {p['query_hash']} | {change} | {_num(p['fast_ms'], 1)} | {_num(p['slow_ms'], 1)} "
+                             f"| {_num(p['fast_reads'])} | {_num(p['slow_reads'])} | `{p['text']}` |")
+        else:
+            lines += ['', 'No plans captured (step not logged with @ProcID, or Query Store off).']
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Diff waits and plans between a fast and a slow ETL run.')
+    parser.add_argument('--batch-name', help='Pick the fastest and slowest successful runs of this Batch_Name')
+    parser.add_argument('--last', type=int, default=20, help='Runs considered with --batch-name')
+    parser.add_argument('--fast', type=int, help='Batch_ID of the fast run')
+    parser.add_argument('--slow', type=int, help='Batch_ID of the slow run')
+    parser.add_argument('--top', type=int, default=10, help='Wait types listed per step')
+    parser.add_argument('--markdown', type=Path, help='Write the report to this file instead of stdout')
+    args = parser.parse_args()
+
+    if not args.batch_name and (args.fast is None or args.slow is None):
+        parser.error('give --batch-name, or both --fast and --slow')
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        fast_id, slow_id = (args.fast, args.slow) if args.fast is not None else pick_runs(cursor, args.batch_name, args.last)
+        runs = {r['Batch_ID']: r for r in fetch(cursor, BATCH_QUERY, fast_id, slow_id)}
+        missing = [b for b in (fast_id, slow_id) if b not in runs]
+        if missing:
+            raise RuntimeError(f'Batch_ID not found: {missing}')
+        fast_steps = load_run(cursor, fast_id)
+        slow_steps = load_run(cursor, slow_id)
+        conn.close()
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    lines = build_report(runs[fast_id], runs[slow_id], fast_steps, slow_steps, args.top)
+    if args.markdown:
+        args.markdown.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        print(f'ℹ️  Wrote {args.markdown}')
+    else:
+        print('\n'.join(lines))
+
+    changed = sum(
+        1 for key in set(fast_steps) & set(slow_steps)
+        for p in diff_plans(fast_steps[key]['plans'], slow_steps[key]['plans'])
+        if p['change'] == 'PLAN CHANGED'
+    )
+    if changed:
+        print(f'⚠️  {changed} statement(s) ran with a different plan in the slow run.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -62,6 +62,19 @@ SOURCES = [
 ]
 
 
+STAGING_COLUMNS = [
+    "HRGCode",
+    "HRGDescription",
+    "Core_Or_Unbundled",
+    "HRGSubchapterKey",
+    "HRGSubchapter",
+    "HRGChapterKey",
+    "HRGChapter",
+    "Release_Date",
+    "Source_URL",
+]
+
+
 def normalize_text(value: Optional[str]) -> str:
     if value is None:
         return ""
@@ -418,6 +431,36 @@ def generate_collapsed_sql(rows: List[Dict[str, str]], batch_size: int = 1000) -
     return "\n".join(lines)
 
 
+def fetch_all_rows() -> List[Dict[str, str]]:
+    all_rows: List[Dict[str, str]] = []
+    for source in SOURCES:
+        print(f"Fetching {source['label']} ...")
+        blob = fetch_bytes(source["url"])
+        parsed = parse_hrg_file(blob)
+        if not parsed:
+            raise RuntimeError(f"No HRG rows parsed for {source['label']}")
+        for row in parsed:
+            row["Release_Date"] = source["release_date"]
+            row["Source_URL"] = source["url"]
+        all_rows.extend(parsed)
+        print(f"  rows: {len(parsed)}")
+
+    all_rows = dedupe_rows(all_rows)
+    print(f"Total rows (deduped): {len(all_rows)}")
+    return all_rows
+
+
+def extract_staging_rows(source_url: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    """Pipeline extractor: all SOURCES releases, keyed by [Analytics].[tbl_Staging_HRG] columns.
+
+    source_url is ignored - the staging table holds every release in SOURCES.
+    """
+    return [
+        {col: (normalize_text(row.get(col)) or None) for col in STAGING_COLUMNS}
+        for row in fetch_all_rows()
+    ]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Fetch NHS HRG workbooks and generate staging SQL")
     parser.add_argument(
@@ -444,21 +487,7 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    all_rows: List[Dict[str, str]] = []
-    for source in SOURCES:
-        print(f"Fetching {source['label']} ...")
-        blob = fetch_bytes(source["url"])
-        parsed = parse_hrg_file(blob)
-        if not parsed:
-            raise RuntimeError(f"No HRG rows parsed for {source['label']}")
-        for row in parsed:
-            row["Release_Date"] = source["release_date"]
-            row["Source_URL"] = source["url"]
-        all_rows.extend(parsed)
-        print(f"  rows: {len(parsed)}")
-
-    all_rows = dedupe_rows(all_rows)
-    print(f"Total rows (deduped): {len(all_rows)}")
+    all_rows = fetch_all_rows()
 
     timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     out_dir = Path(args.out_dir)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import argparse, io, os, sys, time
-import requests
-import pandas as pd
+
+# requests/pandas are imported where the workbook is fetched, so --help stays fast
 
 def norm(s):
     return ''.join(ch for ch in str(s).lower() if ch.isalnum())
@@ -24,7 +24,7 @@ def pick_sheet(xls):
             cols = {norm(c): c for c in df.columns}
             if all(any(all(k in col for k in keys) for col in cols) for keys in required):
                 return name, header_row
-    raise SystemExit('No sheet found with required IMD 2019 columns')
+    raise ValueError('No sheet found with required IMD 2019 columns')
 
 def find_col(cols, *keys):
     for k, orig in cols.items():
@@ -32,23 +32,16 @@ def find_col(cols, *keys):
             return orig
     return None
 
-def main():
-    ap = argparse.ArgumentParser(description='Fetch IMD 2019 IDACI/IDAOPI and generate SQL for staging')
-    ap.add_argument('--url', required=True, help='IMD 2019 XLSX URL')
-    ap.add_argument('--output', choices=['sql', 'csv'], default='sql')
-    ap.add_argument('--batch-size', type=int, default=1000)
-    ap.add_argument('--out-dir', default='.')
-    ap.add_argument('--sheet', help='Optional sheet name override')
-    ap.add_argument('--header-row', type=int, help='Optional header row override (0-based)')
-    args = ap.parse_args()
+def load_imd_frame(url, sheet=None, header_row=None):
+    """Download the IMD 2019 workbook and return (staging-shaped DataFrame, sheet name)."""
+    import requests
+    import pandas as pd
 
-    t0 = time.time()
-    r = requests.get(args.url, timeout=60)
+    r = requests.get(url, timeout=60)
     r.raise_for_status()
     xls = pd.ExcelFile(io.BytesIO(r.content))
-    if args.sheet:
-        sheet = args.sheet
-        header_row = 0 if args.header_row is None else args.header_row
+    if sheet:
+        header_row = 0 if header_row is None else header_row
     else:
         sheet, header_row = pick_sheet(xls)
     df = xls.parse(sheet, header=header_row)
@@ -76,7 +69,7 @@ def main():
         'IMD_Decile': imd_decile
     }.items() if v is None]
     if missing:
-        raise SystemExit(f'Missing columns in sheet \"{sheet}\" (header row {header_row}): {", ".join(missing)}')
+        raise ValueError(f'Missing columns in sheet \"{sheet}\" (header row {header_row}): {", ".join(missing)}')
 
     cols_in = [lsoa, lsoa_name, lad_code, lad_name, imd_rank, imd_decile]
     out = df[cols_in].copy()
@@ -89,6 +82,30 @@ def main():
     out['IDAOPI_Decile'] = df[idaopi_decile] if idaopi_decile else None
     out = out[['LSOA_Code', 'LSOA_Name', 'LocalAuthority_District_Code', 'LocalAuthority_District_Name', 'IMD_Rank', 'IMD_Decile', 'IDACI_Score', 'IDACI_Rank', 'IDACI_Decile', 'IDAOPI_Score', 'IDAOPI_Rank', 'IDAOPI_Decile']]
     out = out[out['LSOA_Code'].notna()]
+    return out, sheet
+
+def extract_staging_rows(source_url):
+    """Pipeline extractor: rows keyed by [Analytics].[tbl_Staging_LSOA_IMD2019] columns."""
+    out, _ = load_imd_frame(source_url)
+    out = out.astype(object).where(out.notna(), None)
+    out['Source_File'] = source_url
+    return out.to_dict('records')
+
+def main():
+    ap = argparse.ArgumentParser(description='Fetch IMD 2019 IDACI/IDAOPI and generate SQL for staging')
+    ap.add_argument('--url', required=True, help='IMD 2019 XLSX URL')
+    ap.add_argument('--output', choices=['sql', 'csv'], default='sql')
+    ap.add_argument('--batch-size', type=int, default=1000)
+    ap.add_argument('--out-dir', default='.')
+    ap.add_argument('--sheet', help='Optional sheet name override')
+    ap.add_argument('--header-row', type=int, help='Optional header row override (0-based)')
+    args = ap.parse_args()
+
+    t0 = time.time()
+    try:
+        out, sheet = load_imd_frame(args.url, args.sheet, args.header_row)
+    except ValueError as e:
+        raise SystemExit(str(e))
 
     ts = time.strftime('%Y%m%d_%H%M%S')
     label = f'imd2019_idaci_idaopi_{ts}'
@@ -107,6 +124,8 @@ def main():
     archive_path = os.path.join(archive_dir, f'{label}.sql')
     latest_path = os.path.join(args.out_dir, 'staging_lsoa_imd.sql')
 
+    import pandas as pd
+
     def fmt(v):
         if pd.isna(v) or v == '':
             return 'NULL'
@@ -1,11 +1,14 @@
+from __future__ import annotations
 
-import pandas as pd
-import requests
+import argparse
 import zipfile
 import io
 import os
 from datetime import datetime
 
+# pandas/requests are imported inside the functions that use them, so --help
+# and the pipeline runner's extractor registry don't pay for them up front
+
 # ---------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------
@@ -23,6 +26,9 @@ URL_EPCN_MEMBERS = "https://www.odsdatasearchandexport.nhs.uk/api/getReport?repo
 # Helpers
 # ---------------------------------------------------------
 def download_and_extract_csv(url: str, name: str) -> pd.DataFrame:
+    import pandas as pd
+    import requests
+
     print(f"Downloading {name} from {url}...")
     try:
         r = requests.get(url)
@@ -88,9 +94,9 @@ def normalize_status(status_code: str) -> str:
 # ---------------------------------------------------------
 # Main Logic
 # ---------------------------------------------------------
-def main():
-    print("Starting ODS CSV Fetch Pipeline (Pandas)...")
-    print("Source pattern: epraccur (master GP) + epcncorepartnerdetails (GP->PCN/Sub-ICB)")
+def fetch_merged_practices(epraccur_url: str = URL_EPRACCUR) -> pd.DataFrame:
+    """epraccur (all practices) LEFT JOIN deduplicated epcncorepartnerdetails."""
+    import pandas as pd
     
     # -------------------------------------------------------------------------
     # 1. Fetch PCN Memberships (epcncorepartnerdetails) - For PCN/ICB Info
@@ -154,7 +160,7 @@ def main():
     ]
     
     print("Fetching GP Practice Details (epraccur)...")
-    df_gp = download_and_extract_csv(URL_EPRACCUR, "epraccur")
+    df_gp = download_and_extract_csv(epraccur_url, "epraccur")
     df_gp_raw = pd.read_csv(io.StringIO(df_gp.to_csv(index=False, header=False)), header=None, dtype=str)
     
     # Header alignment
@@ -176,7 +182,71 @@ def main():
     )
     # Remove filter for SWL - User requested ALL practices
     print(f"Total Practices (National): {len(df_merged)}")
-    
+    return df_merged
+
+def staging_row(row) -> dict:
+    """One merged practice row keyed by [Analytics].[tbl_Staging_GP_Practice] columns (NaN -> None)."""
+    import pandas as pd
+
+    def val(v):
+        if pd.isna(v) or v == 'nan': return None
+        return v
+
+    # Sub-ICB/Commissioner logic:
+    # 1) Prefer membership feed (has Sub-ICB code/name)
+    # 2) Fall back to epraccur commissioner code when membership is absent
+    comm_code = row.get('Practice Parent Sub ICB Location Code')
+    if pd.isna(comm_code):
+         comm_code = row.get('Commissioner') # Fallback to epraccur
+
+    comm_name = row.get('Practice Parent Sub ICB Location Name') # Only in Memberships
+    icb_code = row.get('High Level Health Geography')  # epraccur col 4
+
+    # Helper for extracting codes
+    # Col 25 = Prescribing Setting, Col 13 = Organisation Sub-Type
+    presc_setting = row.get('Prescribing Setting')
+    org_sub_type = row.get('Organisation Sub-Type Code')
+
+    status = normalize_status(row.get('Status Code'))
+
+    return {
+        'Practice_Code': val(row['Organisation Code']),
+        'Practice_Name': val(row['Name']),
+        'Status': status,
+        'Prescribing_Setting': val(presc_setting),
+        'Org_Sub_Type': val(org_sub_type),
+        'Address_Line1': val(row.get('Address Line 1')),
+        'Address_Line2': val(row.get('Address Line 2')),
+        'Address_Line3': val(row.get('Address Line 3')),
+        'Town': val(row.get('Address Line 4')),
+        'Postcode': val(row.get('Postcode')),
+        'Contact_Telephone': val(row.get('Contact Telephone Number')),
+        'PCN_Code': val(row.get('PCN Code')),
+        'PCN_Name': val(row.get('PCN Name')),
+        'Commissioner_Code': val(comm_code),
+        'Commissioner_Name': val(comm_name),
+        'ICB_Code': val(icb_code),
+        'ICB_Name': None,
+        'Open_Date': val(row.get('Open Date')),
+        'Close_Date': val(row.get('Close Date')),
+    }
+
+def extract_staging_rows(source_url: str = None) -> list:
+    """Pipeline extractor (scripts/pipeline/extractors.py): Source_URL is the epraccur report."""
+    df_merged = fetch_merged_practices(source_url or URL_EPRACCUR)
+    return [staging_row(row) for _, row in df_merged.iterrows()]
+
+def main():
+    argparse.ArgumentParser(
+        description="Fetch NHS ODS GP practices (epraccur + PCN memberships) and generate staging SQL"
+    ).parse_args()
+
+    print("Starting ODS CSV Fetch Pipeline (Pandas)...")
+    print("Source pattern: epraccur (master GP) + epcncorepartnerdetails (GP->PCN/Sub-ICB)")
+
+    df_merged = fetch_merged_practices()
+
+    # -----------------------------------------------------
     # 4. Generate SQL (Batched INSERT)
     # -----------------------------------------------------
     lines = [
@@ -192,39 +262,15 @@ def main():
     
     BATCH_SIZE = 1000
     rows = []
+
+    def fmt(val):
+        if val is None: return "NULL"
+        escaped = str(val).replace("'", "''")
+        return f"'{escaped}'"
     
     for _, row in df_merged.iterrows():
-        def fmt(val):
-            if pd.isna(val) or val == 'nan': return "NULL"
-            return f"'{str(val).replace("'", "''")}'"
-            
-        # Sub-ICB/Commissioner logic:
-        # 1) Prefer membership feed (has Sub-ICB code/name)
-        # 2) Fall back to epraccur commissioner code when membership is absent
-        comm_code = row.get('Practice Parent Sub ICB Location Code')
-        if pd.isna(comm_code):
-             comm_code = row.get('Commissioner') # Fallback to epraccur
-
-        comm_name = row.get('Practice Parent Sub ICB Location Name') # Only in Memberships
-        icb_code = row.get('High Level Health Geography')  # epraccur col 4
-        
-        # Helper for extracting codes
-        # Col 25 = Prescribing Setting, Col 13 = Organisation Sub-Type
-        presc_setting = row.get('Prescribing Setting')
-        org_sub_type = row.get('Organisation Sub-Type Code')
-
-        status = normalize_status(row.get('Status Code'))
-
-        row_vals = (
-            f"({fmt(row['Organisation Code'])}, {fmt(row['Name'])}, "
-            f"{fmt(status)}, "
-            f"{fmt(presc_setting)}, {fmt(org_sub_type)}, "
-            f"{fmt(row.get('Address Line 1'))}, {fmt(row.get('Address Line 2'))}, {fmt(row.get('Address Line 3'))}, "
-            f"{fmt(row.get('Address Line 4'))}, {fmt(row.get('Postcode'))}, {fmt(row.get('Contact Telephone Number'))}, "
-            f"{fmt(row.get('PCN Code'))}, {fmt(row.get('PCN Name'))}, {fmt(comm_code)}, {fmt(comm_name)}, "
-            f"{fmt(icb_code)}, NULL, "
-            f"{fmt(row.get('Open Date'))}, {fmt(row.get('Close Date'))})"
-        )
+        rec = staging_row(row)
+        row_vals = "(" + ", ".join(fmt(v) for v in rec.values()) + ")"
         rows.append(row_vals)
         
         # Batch Flush
@@ -11,10 +11,10 @@ import io
 import sys
 from datetime import datetime
 
-def fetch_pcn_data():
+PCN_REPORT_URL = "https://www.odsdatasearchandexport.nhs.uk/api/getReport?report=epcn"
+
+def fetch_pcn_data(url=PCN_REPORT_URL):
     """Fetch PCN data from NHS ODS CSV API"""
-    url = "https://www.odsdatasearchandexport.nhs.uk/api/getReport?report=epcn"
-    
     print(f"Fetching PCN data from NHS ODS...")
     
     try:
@@ -53,6 +53,30 @@ def fetch_pcn_data():
         print(f"  ✗ Error: {e}")
         return []
 
+def extract_staging_rows(source_url=None):
+    """
+    Pipeline extractor (scripts/pipeline/extractors.py): PCN rows keyed by
+    [Analytics].[tbl_Staging_PCN] columns. The ODS 'ICB' pair is the PCN's
+    parent Sub ICB Location, so it maps to Sub_ICB_Code/Sub_ICB_Name.
+    """
+    records = fetch_pcn_data(source_url or PCN_REPORT_URL)
+    if not records:
+        raise RuntimeError("No PCN records fetched")
+
+    return [
+        {
+            'PCN_Code': r['PCN_Code'] or None,
+            'PCN_Name': r['PCN_Name'] or None,
+            'Sub_ICB_Code': r['ICB_Code'] or None,
+            'Sub_ICB_Name': r['ICB_Name'] or None,
+            'Open_Date': r['Open_Date'] or None,
+            'Close_Date': r['Close_Date'] or None,
+            'Town': r['Town'] or None,
+            'Postcode': r['Postcode'] or None,
+        }
+        for r in records
+    ]
+
 def generate_sql(records, table='[Analytics].[tbl_Staging_PCN]', batch_size=1000):
     """Generate SQL INSERT statements using multi-row VALUES batches"""
     
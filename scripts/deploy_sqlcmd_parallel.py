@@ -0,0 +1,958 @@
+#!/usr/bin/env python3
+"""
+Parallel SQLCMD Deployer
+------------------------
+Deploys a SQLCMD manifest (00_Run_Everything_SQLCMD.sql, 00_Dev_Full_Rebuild.sql)
+over a pool of connections instead of one serial sqlcmd session.
+
+The manifest is expanded the way sqlcmd would: :setvar applies to everything
+after it, :r includes are read recursively (H:\\sql\\... maps to this repo's
+sql/ folder), $(Var) is substituted and scripts are split into GO batches.
+Every included script, and every inline T-SQL block between :r lines, is a
+step. PRINT-only blocks are section labels and are not executed.
+
+Dependencies come from the objects each step touches:
+- define: CREATE / ALTER / DROP of a table, view, procedure, function,
+  synonym, type, schema, partition function / scheme or index
+- ref:    names inside a view / procedure / function body (the object has to
+  exist; its data is not touched at deploy time)
+- read / write: names used by code that runs at deploy time. INSERT, UPDATE,
+  DELETE, MERGE and TRUNCATE targets are writes; EXEC of a procedure the
+  manifest defines counts as running that procedure's body.
+
+A step waits for every earlier step (manifest order) with a conflicting
+access to the same object: define conflicts with everything, write with read
+and write, ref only with define. Everything else runs concurrently, so the
+result matches a serial run. Objects the manifest does not define
+(Unified.*, SUS functions) are not tracked.
+
+Incremental (--incremental): every successful step's SHA-256 (comments stripped,
+whitespace collapsed, $(Var) substituted) is stored in tbl_Deploy_Manifest
+(sql/00_setup/17_Create_Deploy_Manifest.sql). Only steps that are new, changed,
+forced, missing an object they create or whose procedure / view / function was
+altered since are redeployed - plus the later steps that depend on them, so
+unchanged procedures keep their cached plans.
+
+Usage:
+    python deploy_sqlcmd_parallel.py --dry-run
+    python deploy_sqlcmd_parallel.py --dry-run --explain --manifest sql/00_Dev_Full_Rebuild.sql
+    python deploy_sqlcmd_parallel.py --workers 6
+    python deploy_sqlcmd_parallel.py --var RunPostDeployLoads=1 --var ResetETLLogs=0
+    python deploy_sqlcmd_parallel.py --incremental --dry-run
+    python deploy_sqlcmd_parallel.py --incremental --force "04_etl/*"
+
+--var overrides the manifest's :setvar (sqlcmd -v does not).
+
+Exit code 0 = deployed (or plan OK), 1 = a step failed, 2 = error (manifest, variables or connection).
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import heapq
+import json
+import os
+import queue
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MANIFEST = REPO_ROOT / 'sql' / '00_Run_Everything_SQLCMD.sql'
+DEFAULT_PATH_MAP = f'H:\\sql={REPO_ROOT / "sql"}'
+
+NAME = r'(?:\[[^\]\n]+\]|"[^"\n]+"|[A-Za-z_][\w$]*)'
+QNAME = rf'{NAME}(?:\s*\.\s*{NAME}){{0,3}}'
+NAME_PART_RE = re.compile(NAME)
+NAME_TOKEN_RE = re.compile(rf'(?<![\w@#$.\]])({QNAME})')
+
+DIRECTIVE_RE = re.compile(r'^\s*:(\w+)\s*(.*?)\s*$')
+GO_RE = re.compile(r'^\s*GO(?:\s+(\d+))?\s*;?\s*$', re.IGNORECASE)
+VAR_RE = re.compile(r'\$\((\w+)\)')
+USE_RE = re.compile(rf'\bUSE\s+({NAME})', re.IGNORECASE)
+PRINT_RE = re.compile(r"\s*PRINT\s+N?'((?:[^']|'')*)'\s*;?", re.IGNORECASE)
+
+MODULE_RE = re.compile(
+    rf'^\s*(?:CREATE\s+(?:OR\s+ALTER\s+)?|ALTER\s+)(PROC|PROCEDURE|FUNCTION|VIEW|TRIGGER)\s+({QNAME})',
+    re.IGNORECASE,
+)
+# (verb, name) pairs
+OBJECT_DDL_RE = re.compile(
+    rf'\b(CREATE(?:\s+OR\s+ALTER)?|ALTER|DROP)\s+'
+    rf'(?:TABLE|VIEW|PROC|PROCEDURE|FUNCTION|SYNONYM|TYPE|TRIGGER|SEQUENCE)\s+'
+    rf'(?:IF\s+EXISTS\s+)?({QNAME})',
+    re.IGNORECASE,
+)
+PARTITION_RE = re.compile(rf'\b(CREATE|ALTER|DROP)\s+PARTITION\s+(?:FUNCTION|SCHEME)\s+({NAME})', re.IGNORECASE)
+SCHEMA_RE = re.compile(rf'\b(CREATE|DROP)\s+SCHEMA\s+({NAME})', re.IGNORECASE)
+# Index DDL alters the table it is on
+INDEX_DDL_RES = [
+    re.compile(rf'\b(?:CREATE|ALTER|DROP)\s+(?:UNIQUE\s+)?(?:(?:NON)?CLUSTERED\s+)?(?:COLUMNSTORE\s+)?'
+               rf'INDEX\s+(?:IF\s+EXISTS\s+)?{NAME}\s+ON\s+({QNAME})', re.IGNORECASE),
+    re.compile(rf'\bALTER\s+INDEX\s+{NAME}\s+ON\s+({QNAME})', re.IGNORECASE),
+]
+WHITESPACE_RE = re.compile(r"('(?:[^']|'')*')|\s+")
+WRITE_RES = [
+    re.compile(rf'\bINSERT\s+(?:INTO\s+)?({QNAME})', re.IGNORECASE),
+    re.compile(rf'\bUPDATE\s+(?:TOP\s*\([^)]*\)\s*)?({QNAME})', re.IGNORECASE),
+    re.compile(rf'\bDELETE\s+(?:TOP\s*\([^)]*\)\s*)?(?:FROM\s+)?({QNAME})', re.IGNORECASE),
+    re.compile(rf'\bMERGE\s+(?:TOP\s*\([^)]*\)\s*)?(?:INTO\s+)?({QNAME})', re.IGNORECASE),
+    re.compile(rf'\bTRUNCATE\s+TABLE\s+({QNAME})', re.IGNORECASE),
+]
+
+# Access kinds, weakest first; a step keeps the strongest per object
+REF, READ, WRITE, DEFINE = 'ref', 'read', 'write', 'define'
+STRENGTH = {REF: 0, READ: 1, WRITE: 2, DEFINE: 3}
+CONFLICTS = {
+    REF: {DEFINE},
+    READ: {WRITE, DEFINE},
+    WRITE: {READ, WRITE, DEFINE},
+    DEFINE: {REF, READ, WRITE, DEFINE},
+}
+
+
+@dataclass
+class Batch:
+    line: int
+    text: str
+    stripped: str
+    count: int = 1
+
+
+@dataclass
+class Step:
+    index: int
+    name: str
+    path: Path
+    line: int
+    section: str
+    database: str
+    batches: list
+    defines: dict = field(default_factory=dict)      # key -> 'module' | 'object'
+    creates: set = field(default_factory=set)        # keys the step leaves in place (CREATE, not only DROP)
+    modules: dict = field(default_factory=dict)      # module key -> body text (stripped)
+    access: dict = field(default_factory=dict)       # key -> REF / READ / WRITE / DEFINE
+    soft: set = field(default_factory=set)           # keys only referenced from procedure bodies
+    deps: dict = field(default_factory=dict)         # step index -> object key that orders them
+    hash: str = ''                                   # SHA-256 of the normalised text
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str, autocommit=True)
+
+
+# ---------------------------------------------------------------------------
+# SQL text helpers
+# ---------------------------------------------------------------------------
+
+def read_sql(path: Path) -> str:
+    """Script text with LF line endings (sqlcmd accepts UTF-8 with/without BOM and UTF-16)."""
+    data = path.read_bytes()
+    if data[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        text = data.decode('utf-16')
+    else:
+        text = data.decode('utf-8-sig', errors='replace')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def strip_comments(sql: str) -> str:
+    """Blank out -- and /* */ comments, keeping string literals and every line break."""
+    out = []
+    i, n = 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if c == "'":
+            j = i + 1
+            while j < n:
+                if sql[j] == "'":
+                    if sql.startswith("''", j):
+                        j += 2
+                        continue
+                    break
+                j += 1
+            out.append(sql[i:j + 1])
+            i = j + 1
+        elif sql.startswith('--', i):
+            j = sql.find('\n', i)
+            j = n if j == -1 else j
+            out.append(' ' * (j - i))
+            i = j
+        elif sql.startswith('/*', i):
+            depth, j = 1, i + 2
+            while j < n and depth:
+                if sql.startswith('/*', j):
+                    depth, j = depth + 1, j + 2
+                elif sql.startswith('*/', j):
+                    depth, j = depth - 1, j + 2
+                else:
+                    j += 1
+            out.append(re.sub(r'[^\n]', ' ', sql[i:j]))
+            i = j
+        else:
+            j = i + 1
+            while j < n and sql[j] not in "'-/":
+                j += 1
+            out.append(sql[i:j])
+            i = j
+    return ''.join(out)
+
+
+def split_batches(text: str, first_line: int) -> list:
+    """Split on GO lines (GO n repeats the batch); batches with only comments are dropped."""
+    batches = []
+    lines = text.split('\n')
+    stripped = strip_comments(text).split('\n')
+    start = 0
+    for i, bare in enumerate(stripped + ['GO']):
+        m = GO_RE.match(bare)
+        if not m:
+            continue
+        body = '\n'.join(stripped[start:i])
+        if body.strip():
+            batches.append(Batch(first_line + start, '\n'.join(lines[start:i]), body, int(m.group(1) or 1)))
+        start = i + 1
+    return batches
+
+
+def definition_hash(step: Step) -> str:
+    """SHA-256 of the step without comments and with whitespace outside string literals collapsed."""
+    text = '\nGO\n'.join(
+        f'{b.count}:' + WHITESPACE_RE.sub(lambda m: m.group(1) or ' ', b.stripped).strip()
+        for b in step.batches
+    )
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def name_parts(qname: str) -> list:
+    return [p.strip('[]"').lower() for p in NAME_PART_RE.findall(qname)]
+
+
+def object_key(qname: str, bare: bool = False) -> str:
+    """[db].[Schema].[Name] -> 'schema.name'; a one-part name is dbo unless bare (partition objects)."""
+    parts = name_parts(qname)
+    if len(parts) == 1:
+        return parts[0] if bare else f'dbo.{parts[0]}'
+    return '.'.join(parts[-2:])
+
+
+def candidate_keys(qname: str) -> list:
+    """Keys a referenced name could stand for: schema.name, db.schema.name, schema.name.column, bare."""
+    parts = name_parts(qname)
+    if len(parts) == 1:
+        return [parts[0]]
+    return ['.'.join(parts[i:i + 2]) for i in range(len(parts) - 1)]
+
+
+# ---------------------------------------------------------------------------
+# Manifest expansion
+# ---------------------------------------------------------------------------
+
+class Manifest:
+    """Expands a SQLCMD manifest into steps, applying :setvar / :r / $(Var) like sqlcmd."""
+
+    def __init__(self, overrides: dict, path_map: list, skip_missing: bool):
+        self.variables = dict(overrides)
+        self.overrides = overrides
+        self.path_map = path_map
+        self.skip_missing = skip_missing
+        self.steps = []
+        self.errors = []
+        self.warnings = []
+        self.section = ''
+        self.database = ''
+        self._stack = []
+
+    def rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(REPO_ROOT / 'sql').as_posix()
+        except ValueError:
+            return str(path)
+
+    def substitute(self, text: str, where: str) -> str:
+        for name in sorted(set(VAR_RE.findall(strip_comments(text)))):
+            if name not in self.variables:
+                self.errors.append(f"{where}: scripting variable '{name}' is not defined")
+        return VAR_RE.sub(lambda m: self.variables.get(m.group(1), m.group(0)), text)
+
+    def resolve(self, target: str, including: Path) -> Path:
+        target = target.strip().strip('"')
+        for prefix, local in self.path_map:
+            if target.lower().startswith(prefix.lower()):
+                target = local + target[len(prefix):]
+                break
+        path = Path(target.replace('\\', '/'))
+        return path if path.is_absolute() else (including.parent / path)
+
+    def load(self, path: Path):
+        path = path.resolve()
+        if path in self._stack:
+            self.errors.append(f'{self.rel(path)}: included recursively')
+            return
+        self._stack.append(path)
+        raw = read_sql(path)
+        lines = raw.split('\n')
+        stripped = strip_comments(raw).split('\n')
+        directives = [DIRECTIVE_RE.match(s) for s in stripped]
+        whole_file = not any(m and m.group(1).lower() == 'r' for m in directives)
+
+        chunk_start = 0
+        for i, m in enumerate(directives + [None]):
+            if i < len(lines) and not m:
+                continue
+            self.add_step(path, chunk_start + 1, '\n'.join(lines[chunk_start:i]), whole_file)
+            chunk_start = i + 1
+            if m is None:
+                continue
+            command, arg, where = m.group(1).lower(), m.group(2), f'{self.rel(path)}:{i + 1}'
+            if command == 'setvar':
+                name, _, value = arg.partition(' ')
+                if name not in self.overrides:
+                    if value.strip():
+                        self.variables[name] = value.strip().strip('"')
+                    else:
+                        self.variables.pop(name, None)
+            elif command == 'r':
+                include = self.resolve(self.substitute(arg, where), path)
+                if include.is_file():
+                    self.load(include)
+                elif self.skip_missing:
+                    self.warnings.append(f'{where}: skipped missing include {arg}')
+                else:
+                    self.errors.append(f'{where}: include not found {arg} ({include})')
+            elif command == 'on':
+                pass  # :ON ERROR EXIT - the deployer always stops on the first failed step
+            else:
+                self.errors.append(f'{where}: unsupported SQLCMD command :{command}')
+        self._stack.pop()
+
+    def add_step(self, path: Path, line: int, text: str, whole_file: bool):
+        where = f'{self.rel(path)}:{line}'
+        text = self.substitute(text, where)
+        batches = split_batches(text, line)
+        if not batches:
+            return
+
+        body = ''.join(b.stripped for b in batches)
+        printed = PRINT_RE.findall(body)
+        if printed and not PRINT_RE.sub('', body).strip():
+            labels = [p.replace("''", "'").strip(' >') for p in printed]
+            self.section = next((p for p in reversed(labels) if p and not p.startswith('[')), self.section)
+            return
+
+        step = Step(
+            index=len(self.steps),
+            name=self.rel(path) if whole_file else where,
+            path=path,
+            line=line,
+            section=self.section,
+            database=self.database,
+            batches=batches,
+        )
+        uses = USE_RE.findall(body)
+        if uses:
+            self.database = uses[-1]
+        self.steps.append(step)
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph
+# ---------------------------------------------------------------------------
+
+def find_definitions(step: Step):
+    """Objects a step creates, alters or drops; module bodies are kept for EXEC expansion."""
+    for batch in step.batches:
+        m = MODULE_RE.match(batch.stripped)
+        if m:
+            key = object_key(m.group(2))
+            step.defines[key] = 'module'
+            step.creates.add(key)
+            step.modules[key] = batch.stripped[m.end():]
+            continue
+        found = [(verb, object_key(q)) for verb, q in OBJECT_DDL_RE.findall(batch.stripped)]
+        found += [(verb, object_key(q, bare=True)) for verb, q in PARTITION_RE.findall(batch.stripped)]
+        found += [(verb, f'schema:{object_key(q, bare=True)}') for verb, q in SCHEMA_RE.findall(batch.stripped)]
+        found += [('ALTER', object_key(q)) for regex in INDEX_DDL_RES for q in regex.findall(batch.stripped)]
+        for verb, key in found:
+            step.defines.setdefault(key, 'object')
+            if verb.upper().startswith('CREATE'):
+                step.creates.add(key)
+
+
+def known_names(text: str, known: set) -> set:
+    found = set()
+    for q in NAME_TOKEN_RE.findall(text):
+        found.update(k for k in candidate_keys(q) if k in known)
+    return found
+
+
+def write_targets(text: str, known: set) -> set:
+    return {k for regex in WRITE_RES for q in regex.findall(text) for k in candidate_keys(q) if k in known}
+
+
+def body_access(body: str, known: set, modules: set) -> tuple:
+    """(object -> READ/WRITE, modules used) when a module body runs."""
+    access = {k: READ for k in known_names(body, known)}
+    ddl = [object_key(q) for _, q in OBJECT_DDL_RE.findall(body)]
+    ddl += [object_key(q) for regex in INDEX_DDL_RES for q in regex.findall(body)]
+    access.update({k: WRITE for k in ddl if k in known})
+    access.update({k: WRITE for k in write_targets(body, known)})
+    used = {k for k in access if k in modules}
+    return access, used
+
+
+class Graph:
+    """Orders steps by conflicting object access, earlier manifest steps first."""
+
+    def __init__(self, steps: list):
+        self.steps = steps
+        for step in steps:
+            find_definitions(step)
+            step.hash = definition_hash(step)
+        self.known = {k for s in steps for k in s.defines}
+        self.modules = {k for s in steps for k, kind in s.defines.items() if kind == 'module'}
+        self.history = {}
+        for step in steps:
+            self.classify(step)
+            self.link(step)
+
+    def definer(self, key: str, before: int):
+        """Latest step before `before` that defines the module `key`."""
+        for step in reversed(self.steps[:before]):
+            if key in step.modules:
+                return step
+        return None
+
+    def run_module(self, key: str, before: int, access: dict, seen: set):
+        """Accesses of running module `key` as defined by the latest earlier step."""
+        if key in seen:
+            return
+        seen.add(key)
+        _merge(access, key, READ)
+        definer = self.definer(key, before)
+        if definer is None:
+            return
+        body, used = body_access(definer.modules[key], self.known, self.modules)
+        for k, kind in body.items():
+            _merge(access, k, kind)
+        for k in used:
+            self.run_module(k, before, access, seen)
+
+    def classify(self, step: Step):
+        access = step.access
+        proc_refs = set()
+        for key in step.defines:
+            _merge(access, key, DEFINE)
+        for batch in step.batches:
+            m = MODULE_RE.match(batch.stripped)
+            if m:
+                names = known_names(batch.stripped[m.end():], self.known) - {object_key(m.group(2))}
+                if m.group(1).upper().startswith('PROC'):
+                    proc_refs |= names
+                    continue
+                for k in names:
+                    _merge(access, k, REF)
+                continue
+            names = known_names(batch.stripped, self.known)
+            for k in write_targets(batch.stripped, self.known):
+                _merge(access, k, WRITE)
+            for k in names:
+                if k in self.modules and k not in step.defines:
+                    self.run_module(k, step.index, access, set())
+                else:
+                    _merge(access, k, READ)
+        step.soft = proc_refs - set(access)
+        for k in proc_refs:
+            _merge(access, k, REF)
+        for key in list(access):
+            schema = f'schema:{key.split(".")[0]}'
+            if '.' in key and schema in self.known:
+                _merge(access, schema, REF)
+
+    def link(self, step: Step):
+        for key, kind in step.access.items():
+            for earlier, earlier_kind in self.history.get(key, []):
+                if earlier_kind in CONFLICTS[kind]:
+                    step.deps.setdefault(earlier, key)
+            self.history.setdefault(key, []).append((step.index, kind))
+
+    def reduced_deps(self, step: Step) -> dict:
+        """Direct dependencies not already implied through another dependency."""
+        reach = self.reachability()
+        implied = 0
+        for d in step.deps:
+            implied |= reach[d]
+        return {d: key for d, key in step.deps.items() if not (implied >> d) & 1}
+
+    def reachability(self) -> list:
+        if not hasattr(self, '_reach'):
+            self._reach = []
+            for step in self.steps:
+                bits = 0
+                for d in step.deps:
+                    bits |= self._reach[d] | (1 << d)
+                self._reach.append(bits)
+        return self._reach
+
+    def upstream(self, selected: set = None) -> dict:
+        """Step index -> steps it waits for; with a selection, the selected steps it waits for via any path."""
+        if selected is None:
+            return {s.index: set(s.deps) for s in self.steps}
+        reach = self.reachability()
+        return {i: {j for j in selected if (reach[i] >> j) & 1} for i in sorted(selected)}
+
+    def waves(self, selected: set = None) -> list:
+        level = {}
+        for i, ups in self.upstream(selected).items():
+            level[i] = 1 + max((level[d] for d in ups), default=0)
+        waves = [[] for _ in range(max(level.values(), default=0))]
+        for i, lv in level.items():
+            waves[lv - 1].append(self.steps[i])
+        return waves
+
+    def heights(self, selected: set = None) -> dict:
+        """Longest chain from each step to the end; the scheduler starts the tallest first."""
+        upstream = self.upstream(selected)
+        height = dict.fromkeys(upstream, 1)
+        for i in sorted(upstream, reverse=True):
+            for d in upstream[i]:
+                height[d] = max(height[d], height[i] + 1)
+        return height
+
+
+def _merge(access: dict, key: str, kind: str):
+    if STRENGTH[kind] > STRENGTH.get(access.get(key), -1):
+        access[key] = kind
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def run_step(pool: queue.Queue, step: Step) -> dict:
+    """Run one step's batches on a pooled connection; never raises."""
+    result = {'step': step.index, 'messages': [], 'error': None, 'batch_line': None}
+    started = time.perf_counter()
+    conn = pool.get()
+    try:
+        cursor = conn.cursor()
+        if step.database:
+            cursor.execute(f'USE {step.database}')
+        for batch in step.batches:
+            result['batch_line'] = batch.line
+            for _ in range(batch.count):
+                cursor.execute(batch.text)
+                while True:
+                    result['messages'].extend(m[1] for m in getattr(cursor, 'messages', None) or [])
+                    if not cursor.nextset():
+                        break
+        cursor.close()
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        pool.put(conn)
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def deploy(graph: Graph, args, selected: set = None) -> dict:
+    """Run ready steps (all, or the selection) on up to --workers connections; returns step index -> result."""
+    steps = graph.steps
+    height = graph.heights(selected)
+    waiting = graph.upstream(selected)
+    dependents = {i: [] for i in waiting}
+    for i, ups in waiting.items():
+        for d in ups:
+            dependents[d].append(i)
+
+    ready = [(-height[i], i) for i, deps in waiting.items() if not deps]
+    heapq.heapify(ready)
+    results, blocked, stopping = {}, set(), False
+
+    pool = queue.Queue()
+    for _ in range(args.workers):
+        pool.put(get_connection())
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            running = {}
+            while ready or running:
+                while ready and len(running) < args.workers and not stopping:
+                    _, i = heapq.heappop(ready)
+                    running[executor.submit(run_step, pool, steps[i])] = i
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    result = results[i] = future.result()
+                    report_step(steps[i], result, args.verbose)
+                    if result['error']:
+                        stopping = stopping or not args.continue_on_error
+                        blocked.update(_descendants(dependents, i))
+                        continue
+                    for j in dependents[i]:
+                        waiting[j].discard(i)
+                        if not waiting[j] and j not in blocked:
+                            heapq.heappush(ready, (-height[j], j))
+    finally:
+        while not pool.empty():
+            pool.get().close()
+    return results
+
+
+def _descendants(dependents: dict, i: int) -> set:
+    found, todo = set(), list(dependents[i])
+    while todo:
+        j = todo.pop()
+        if j not in found:
+            found.add(j)
+            todo.extend(dependents[j])
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Incremental deployment (tbl_Deploy_Manifest)
+# ---------------------------------------------------------------------------
+
+MANIFEST_TABLE = '[Analytics].[tbl_Deploy_Manifest]'
+MODULE_TYPES = {'P', 'V', 'FN', 'IF', 'TF', 'TR'}
+
+READ_MANIFEST_SQL = f"""
+SELECT Script_Name, Definition_Hash, Deployed_DateTime
+FROM {MANIFEST_TABLE}
+"""
+
+# Same key format as object_key(): 'schema.name', bare partition names, 'schema:name'
+CATALOG_SQL = """
+SELECT LOWER(s.name) + '.' + LOWER(o.name), o.type, o.modify_date
+FROM sys.objects o
+JOIN sys.schemas s ON s.schema_id = o.schema_id
+UNION ALL
+SELECT LOWER(s.name) + '.' + LOWER(t.name), 'UT', NULL
+FROM sys.types t
+JOIN sys.schemas s ON s.schema_id = t.schema_id
+WHERE t.is_user_defined = 1
+UNION ALL SELECT LOWER(name), 'PF', NULL FROM sys.partition_functions
+UNION ALL SELECT LOWER(name), 'PS', NULL FROM sys.partition_schemes
+UNION ALL SELECT 'schema:' + LOWER(name), 'SC', NULL FROM sys.schemas
+"""
+
+CLEAR_MANIFEST_SQL = f"DELETE FROM {MANIFEST_TABLE} WHERE Script_Name = ?"
+
+RECORD_MANIFEST_SQL = f"""
+MERGE {MANIFEST_TABLE} AS t
+USING (SELECT ? AS Script_Name, ? AS Definition_Hash, ? AS Created_Objects,
+              ? AS Batch_Count, ? AS Duration_Seconds) AS s
+    ON t.Script_Name = s.Script_Name
+WHEN MATCHED THEN UPDATE SET
+    Definition_Hash = s.Definition_Hash,
+    Created_Objects = s.Created_Objects,
+    Batch_Count = s.Batch_Count,
+    Duration_Seconds = s.Duration_Seconds,
+    Deployed_DateTime = SYSDATETIME(),
+    Deployed_By = SUSER_SNAME(),
+    Host_Name = HOST_NAME()
+WHEN NOT MATCHED THEN
+    INSERT (Script_Name, Definition_Hash, Created_Objects, Batch_Count, Duration_Seconds)
+    VALUES (s.Script_Name, s.Definition_Hash, s.Created_Objects, s.Batch_Count, s.Duration_Seconds);
+"""
+
+
+def state_connection(database: str):
+    """Connection in the database the manifest deploys to (its last USE)."""
+    conn = get_connection()
+    if database:
+        conn.cursor().execute(f'USE {database}')
+    return conn
+
+
+def _manifest_table_exists(cursor) -> bool:
+    cursor.execute("SELECT OBJECT_ID(?, 'U')", MANIFEST_TABLE)
+    return cursor.fetchone()[0] is not None
+
+
+def read_state(database: str) -> tuple:
+    """(Script_Name -> (hash, deployed at), object key -> (type, modify_date)); the first is None
+    when tbl_Deploy_Manifest does not exist yet."""
+    conn = state_connection(database)
+    try:
+        cursor = conn.cursor()
+        deployed = None
+        if _manifest_table_exists(cursor):
+            cursor.execute(READ_MANIFEST_SQL)
+            deployed = {r[0]: (r[1], r[2]) for r in cursor.fetchall()}
+        cursor.execute(CATALOG_SQL)
+        catalog = {r[0]: (r[1].strip(), r[2]) for r in cursor.fetchall()}
+        return deployed, catalog
+    finally:
+        conn.close()
+
+
+def plan_incremental(graph: Graph, deployed: dict, catalog: dict, force: list) -> dict:
+    """Steps to redeploy -> reason.
+
+    A step is redeployed when it is forced, new, its hash changed, an object it creates
+    is missing, or a procedure / view / function it creates was altered after it was
+    deployed. Later steps follow when they touch an object a redeployed step defines,
+    or read an object it writes (steps that only write it too, like ETL logging, do
+    not); references from procedure bodies resolve at run time and do not count.
+    """
+    reasons, changed = {}, {}
+    for step in graph.steps:
+        row = deployed.get(step.name)
+        reason = None
+        if any(fnmatch.fnmatch(step.name, pattern) for pattern in force):
+            reason = 'forced'
+        elif row is None:
+            reason = 'not deployed'
+        elif row[0] != step.hash:
+            reason = 'definition changed'
+        else:
+            missing = sorted(k for k in step.creates if k not in catalog)
+            altered = sorted(
+                k for k, kind in step.defines.items()
+                if kind == 'module' and k in catalog and catalog[k][0] in MODULE_TYPES
+                and catalog[k][1] and catalog[k][1] > row[1]
+            )
+            if missing:
+                reason = f'missing {missing[0]}'
+            elif altered:
+                reason = f'altered outside a deployment {altered[0]}'
+            else:
+                hit = next((
+                    k for k, kind in step.access.items()
+                    if k in changed and k not in step.soft and (changed[k][1] == DEFINE or kind == READ)
+                ), None)
+                if hit:
+                    reason = f'after {changed[hit][0]} ({hit})'
+        if reason:
+            reasons[step.index] = reason
+            for k, kind in step.access.items():
+                if kind in (WRITE, DEFINE) and changed.get(k, ('', ''))[1] != DEFINE:
+                    changed[k] = (step.name, kind)
+    return reasons
+
+
+def clear_records(graph: Graph, selected: set, database: str) -> bool:
+    """Forget the steps about to run, so a failed or unfinished run redeploys them next time."""
+    conn = state_connection(database)
+    try:
+        cursor = conn.cursor()
+        if not _manifest_table_exists(cursor):
+            return False
+        cursor.executemany(CLEAR_MANIFEST_SQL, [(graph.steps[i].name,) for i in selected])
+        return True
+    finally:
+        conn.close()
+
+
+def record(graph: Graph, results: dict, database: str) -> int:
+    """Store the hash of every step that succeeded; returns rows written (-1 if the table is missing)."""
+    rows = [
+        (s.name, s.hash, ','.join(sorted(s.creates)) or None, len(s.batches), results[s.index]['seconds'])
+        for s in graph.steps
+        if s.index in results and not results[s.index]['error']
+    ]
+    conn = state_connection(database)
+    conn.autocommit = False
+    try:
+        cursor = conn.cursor()
+        if not _manifest_table_exists(cursor):
+            return -1
+        if rows:
+            cursor.executemany(RECORD_MANIFEST_SQL, rows)
+        conn.commit()
+        return len(rows)
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def report_step(step: Step, result: dict, verbose: bool):
+    if result['error']:
+        print(f"   ❌ {step.name:<70} {result['seconds']:>7.1f}s")
+        for message in result['messages'][-10:]:
+            print(f'      {message}')
+        print(f"      Batch at line {result['batch_line']}: {result['error']}")
+        return
+    print(f"   ✅ {step.name:<70} {result['seconds']:>7.1f}s")
+    if verbose:
+        for message in result['messages']:
+            print(f'      {message}')
+
+
+def report_plan(graph: Graph, explain: bool, selected: set = None, reasons: dict = None):
+    waves = graph.waves(selected)
+    count = len(graph.steps) if selected is None else len(selected)
+    edges = sum(len(s.deps) for s in graph.steps)
+    print(f'ℹ️  {count} steps, {edges} dependencies, {len(waves)} waves '
+          f'(widest {max((len(w) for w in waves), default=0)}); a serial run is {count} steps deep')
+    for n, wave in enumerate(waves, start=1):
+        print(f'Wave {n} ({len(wave)} step(s)):')
+        for step in wave:
+            print(f'   {step.name}' + (f'  [{reasons[step.index]}]' if reasons else ''))
+            if explain:
+                for d, key in sorted(graph.reduced_deps(step).items()):
+                    print(f'      after {graph.steps[d].name} ({key})')
+
+
+def plan_json(graph: Graph, results: dict, selected: set = None, reasons: dict = None) -> dict:
+    level = {s.index: n for n, wave in enumerate(graph.waves(selected), start=1) for s in wave}
+    return {'steps': [{
+        'index': s.index,
+        'name': s.name,
+        'section': s.section,
+        'hash': s.hash,
+        'wave': level.get(s.index),
+        'reason': (reasons or {}).get(s.index),
+        'batches': len(s.batches),
+        'defines': sorted(s.defines),
+        'depends_on': {graph.steps[d].name: key for d, key in sorted(graph.reduced_deps(s).items())},
+        'seconds': results.get(s.index, {}).get('seconds'),
+        'error': results.get(s.index, {}).get('error'),
+    } for s in graph.steps]}
+
+
+def parse_pairs(values: list, sep: str, what: str) -> list:
+    pairs = []
+    for value in values:
+        key, found, rest = value.partition(sep)
+        if not found or not key:
+            raise ValueError(f'{what} must look like NAME{sep}VALUE: {value!r}')
+        pairs.append((key, rest))
+    return pairs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Deploy a SQLCMD manifest in dependency order over parallel connections.')
+    parser.add_argument('--manifest', type=Path, default=DEFAULT_MANIFEST, help='SQLCMD manifest with :r includes')
+    parser.add_argument('--workers', type=int, default=4, help='Pooled connections / concurrent steps')
+    parser.add_argument('--var', action='append', default=[], metavar='NAME=VALUE', help='Override a :setvar (repeatable)')
+    parser.add_argument('--path-map', action='append', default=[], metavar='PREFIX=DIR',
+                        help=f'Map an :r path prefix to a local folder (default {DEFAULT_PATH_MAP})')
+    parser.add_argument('--skip-missing', action='store_true', help='Warn about (rather than fail on) missing :r files')
+    parser.add_argument('--dry-run', action='store_true', help='Print the dependency waves; no server needed (except with --incremental)')
+    parser.add_argument('--explain', action='store_true', help='With --dry-run, show why each step waits')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Only deploy steps that changed since {MANIFEST_TABLE} was written, and their dependents')
+    parser.add_argument('--force', action='append', default=[], metavar='PATTERN',
+                        help="With --incremental, always deploy steps matching this glob, e.g. '04_etl/*' (repeatable)")
+    parser.add_argument('--no-record', action='store_true', help=f'Do not update {MANIFEST_TABLE}')
+    parser.add_argument('--continue-on-error', action='store_true', help='Keep running steps that do not depend on a failure')
+    parser.add_argument('--verbose', action='store_true', help='Print PRINT output of every step')
+    parser.add_argument('--json', type=Path, help='Write the plan (and timings) to this file')
+    args = parser.parse_args()
+
+    try:
+        overrides = dict(parse_pairs(args.var, '=', '--var'))
+        path_map = parse_pairs(args.path_map or [DEFAULT_PATH_MAP], '=', '--path-map')
+    except ValueError as e:
+        print(f'❌ {e}')
+        return 2
+
+    manifest = Manifest(overrides, path_map, args.skip_missing)
+    if not args.manifest.is_file():
+        print(f'❌ Manifest not found: {args.manifest}')
+        return 2
+    manifest.load(args.manifest)
+    for warning in manifest.warnings:
+        print(f'⚠️  {warning}')
+    if manifest.errors:
+        for error in manifest.errors:
+            print(f'❌ {error}')
+        return 2
+
+    graph = Graph(manifest.steps)
+    print(f'ℹ️  Manifest: {args.manifest}')
+    print('ℹ️  Variables: ' + ', '.join(f'{k}={v}' for k, v in manifest.variables.items()))
+
+    selected, reasons = None, None
+    if args.incremental:
+        try:
+            deployed, catalog = read_state(manifest.database)
+        except Exception as e:
+            print(f'❌ {e}')
+            return 2
+        if deployed is None:
+            print(f'❌ {MANIFEST_TABLE} not found - run a full deploy first (it creates the table)')
+            return 2
+        reasons = plan_incremental(graph, deployed, catalog, args.force)
+        selected = set(reasons)
+        print(f'ℹ️  Incremental: {len(selected)} of {len(graph.steps)} steps to deploy')
+
+    results = {}
+    if args.dry_run:
+        report_plan(graph, args.explain, selected, reasons)
+    elif selected == set():
+        print('✅ Nothing changed since the last deployment.')
+    else:
+        args.workers = max(1, args.workers)
+        to_run = selected if selected is not None else {s.index for s in graph.steps}
+        started = time.perf_counter()
+        try:
+            recording = not args.no_record and clear_records(graph, to_run, manifest.database)
+            results = deploy(graph, args, selected)
+        except Exception as e:
+            print(f'❌ {e}')
+            return 2
+        seconds = time.perf_counter() - started
+        step_seconds = sum(r['seconds'] for r in results.values())
+        failed = [i for i, r in results.items() if r['error']]
+        skipped = len(to_run) - len(results)
+        print(f'ℹ️  Wall clock {seconds:.1f}s vs {step_seconds:.1f}s serial ({len(results)} steps, {args.workers} workers)')
+        if skipped:
+            print(f'⚠️  {skipped} step(s) not run')
+        if not args.no_record:
+            # A full deploy creates the table part-way through, so check again even if it was missing
+            try:
+                written = record(graph, results, manifest.database)
+                if written >= 0:
+                    print(f'ℹ️  Recorded {written} step hash(es) in {MANIFEST_TABLE}')
+                elif recording:
+                    print(f'⚠️  {MANIFEST_TABLE} disappeared during the run; hashes not recorded')
+            except Exception as e:
+                print(f'⚠️  Could not record step hashes: {e}')
+
+    if args.json:
+        args.json.write_text(json.dumps(plan_json(graph, results, selected, reasons), indent=2), encoding='utf-8')
+        print(f'ℹ️  Wrote {args.json}')
+
+    if args.dry_run or not results:
+        return 0
+    if failed:
+        print(f'❌ {len(failed)} step(s) failed')
+        return 1
+    if skipped:
+        return 1
+    print('✅ Deployment complete.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+ETL Performance Regression Monitor
+----------------------------------
+Copies the ETL logs (tbl_ETL_Batch_Log, tbl_ETL_Table_Load_Log,
+tbl_ETL_Performance_Metrics) into a local SQLite store, builds a time series
+per batch and per batch + table, and flags runs that got slower than their
+rolling baseline.
+
+- Sync is incremental: rows from the oldest batch still 'Running' in the store
+  (or the next new Batch_ID) are re-read, so finished batches pick up their
+  end time and status.
+- Only successful runs count. Each series is bucketed by --period (week or
+  day); a bucket's value is the median run throughput (rows/second), or the
+  median duration when the series never reports rows.
+- Baseline = median of the previous --baseline-periods buckets. A bucket is a
+  regression when throughput drops (or duration grows) by more than
+  --threshold-pct, e.g. Compute_CAM_Raw 30% slower week on week.
+- Whole-table sizes from tbl_ETL_Performance_Metrics are reported alongside,
+  flagged when they grew by more than the threshold (explains slower loads).
+- Baselines are written to the store (etl_baseline) for trending.
+
+--source-sqlite reads the same three tables (no schema prefix) from a SQLite
+file instead of SQL Server, for testing without a database.
+
+Usage:
+    python etl_performance_monitor.py
+    python etl_performance_monitor.py --batch Compute_CAM_Raw --threshold-pct 30
+    python etl_performance_monitor.py --no-sync --period day --report etl_perf.md
+    python etl_performance_monitor.py --source-sqlite etl_logs_sample.sqlite --store /tmp/perf.sqlite
+
+Exit code 0 = no regressions, 1 = regressions found, 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+# Source queries (SQL Server and SQLite stand-in); {schema} is '[Analytics].' or ''
+BATCH_QUERY = """
+SELECT Batch_ID, Batch_Name, Start_DateTime, End_DateTime, Status,
+       Rows_Inserted, Rows_Updated, Rows_Deleted, Duration_Seconds, Throughput_Rows_Per_Second
+FROM {schema}tbl_ETL_Batch_Log
+WHERE Batch_ID >= ?
+"""
+
+TABLE_LOAD_QUERY = """
+SELECT Load_ID, Batch_ID, Table_Name, Load_Type, Partition_ID, Start_DateTime, End_DateTime,
+       Duration_Seconds, Rows_Affected, Status
+FROM {schema}tbl_ETL_Table_Load_Log
+WHERE Batch_ID >= ?
+"""
+
+METRICS_QUERY = """
+SELECT Metric_ID, Batch_ID, Table_Name, Partition_Number, Table_Size_MB, Index_Size_MB,
+       Row_Count, Measurement_DateTime
+FROM {schema}tbl_ETL_Performance_Metrics
+WHERE Metric_ID > ?
+"""
+
+STORE_DDL = """
+CREATE TABLE IF NOT EXISTS etl_batch (
+    batch_id INTEGER PRIMARY KEY,
+    batch_name TEXT NOT NULL,
+    start_datetime TEXT NOT NULL,
+    end_datetime TEXT,
+    status TEXT NOT NULL,
+    rows_inserted INTEGER,
+    rows_updated INTEGER,
+    rows_deleted INTEGER,
+    duration_seconds INTEGER,
+    throughput_rows_per_second INTEGER
+);
+CREATE TABLE IF NOT EXISTS etl_table_load (
+    load_id INTEGER PRIMARY KEY,
+    batch_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    load_type TEXT,
+    partition_id INTEGER,
+    start_datetime TEXT NOT NULL,
+    end_datetime TEXT,
+    duration_seconds INTEGER,
+    rows_affected INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_etl_table_load_batch ON etl_table_load (batch_id);
+CREATE TABLE IF NOT EXISTS etl_performance_metric (
+    metric_id INTEGER PRIMARY KEY,
+    batch_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    partition_number INTEGER,
+    table_size_mb REAL,
+    index_size_mb REAL,
+    row_count INTEGER,
+    measurement_datetime TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS etl_baseline (
+    series_type TEXT NOT NULL,          -- 'batch', 'table'
+    series_name TEXT NOT NULL,          -- Batch_Name / Batch_Name + ' / ' + Table_Name
+    period_start TEXT NOT NULL,
+    period TEXT NOT NULL,               -- 'week', 'day'
+    runs INTEGER NOT NULL,
+    measure TEXT NOT NULL,              -- 'throughput', 'duration'
+    value REAL NOT NULL,
+    baseline REAL,
+    change_pct REAL,
+    is_regression INTEGER NOT NULL,
+    computed_datetime TEXT NOT NULL,
+    PRIMARY KEY (series_type, series_name, period, period_start)
+);
+"""
+
+STORE_COLUMNS = {
+    'etl_batch': ['batch_id', 'batch_name', 'start_datetime', 'end_datetime', 'status', 'rows_inserted',
+                  'rows_updated', 'rows_deleted', 'duration_seconds', 'throughput_rows_per_second'],
+    'etl_table_load': ['load_id', 'batch_id', 'table_name', 'load_type', 'partition_id', 'start_datetime',
+                       'end_datetime', 'duration_seconds', 'rows_affected', 'status'],
+    'etl_performance_metric': ['metric_id', 'batch_id', 'table_name', 'partition_number', 'table_size_mb',
+                               'index_size_mb', 'row_count', 'measurement_datetime'],
+}
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str)
+
+
+def parse_datetime(value) -> datetime:
+    """datetime or ISO text (DATETIME2 text has 7 fractional digits; keep 6)."""
+    if isinstance(value, datetime):
+        return value
+    text = str(value).replace('T', ' ')
+    if '.' in text:
+        head, frac = text.split('.', 1)
+        text = f'{head}.{frac[:6]}'
+    return datetime.fromisoformat(text)
+
+
+def _store_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if value is not None and not isinstance(value, (int, float, str)):
+        return float(value)    # Decimal
+    return value
+
+
+# ----------------------------------------------------------------------------
+# Sync
+# ----------------------------------------------------------------------------
+
+def sync(store: sqlite3.Connection, source, schema: str) -> dict:
+    """Upsert new and still-running batches (and their table loads) plus new metrics."""
+    running = store.execute("SELECT MIN(batch_id) FROM etl_batch WHERE status = 'Running'").fetchone()[0]
+    last = store.execute('SELECT MAX(batch_id) FROM etl_batch').fetchone()[0]
+    from_batch = running if running is not None else (last or 0) + 1
+    last_metric = store.execute('SELECT MAX(metric_id) FROM etl_performance_metric').fetchone()[0] or 0
+
+    counts = {}
+    cursor = source.cursor()
+    for table, query, watermark in (('etl_batch', BATCH_QUERY, from_batch),
+                                    ('etl_table_load', TABLE_LOAD_QUERY, from_batch),
+                                    ('etl_performance_metric', METRICS_QUERY, last_metric)):
+        cursor.execute(query.format(schema=schema), (watermark,))
+        rows = [tuple(_store_value(v) for v in r) for r in cursor.fetchall()]
+        columns = STORE_COLUMNS[table]
+        store.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows,
+        )
+        counts[table] = len(rows)
+    store.commit()
+    return counts
+
+
+# ----------------------------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------------------------
+
+def period_start(value: datetime, period: str) -> str:
+    day = value.date()
+    if period == 'week':
+        day -= timedelta(days=day.weekday())
+    return day.isoformat()
+
+
+def load_runs(store: sqlite3.Connection, batch_filter) -> dict:
+    """{(series_type, series_name): [(start, duration_seconds, rows)]} for successful runs."""
+    series = defaultdict(list)
+    batch_sql = """
+        SELECT batch_name, start_datetime, duration_seconds,
+               COALESCE(rows_inserted, 0) + COALESCE(rows_updated, 0) + COALESCE(rows_deleted, 0)
+        FROM etl_batch WHERE status = 'Success' AND duration_seconds IS NOT NULL
+    """
+    for name, start, seconds, rows in store.execute(batch_sql):
+        series[('batch', name)].append((parse_datetime(start), seconds, rows))
+
+    table_sql = """
+        SELECT b.batch_name, t.table_name, t.start_datetime, t.duration_seconds, COALESCE(t.rows_affected, 0)
+        FROM etl_table_load t
+        JOIN etl_batch b ON b.batch_id = t.batch_id
+        WHERE t.status = 'Success' AND t.duration_seconds IS NOT NULL
+    """
+    for batch, table, start, seconds, rows in store.execute(table_sql):
+        series[('table', f'{batch} / {table}')].append((parse_datetime(start), seconds, rows))
+
+    if batch_filter:
+        wanted = {b.lower() for b in batch_filter}
+        series = {k: v for k, v in series.items() if k[1].split(' / ')[0].lower() in wanted}
+    return series
+
+
+def analyse_series(runs: list, period: str, baseline_periods: int, threshold_pct: float, min_runs: int) -> list:
+    """One row per bucket: value, rolling baseline (previous buckets) and regression flag."""
+    # Throughput when the series reports rows; duration otherwise
+    measure = 'throughput' if any(rows for _, _, rows in runs) else 'duration'
+    buckets = defaultdict(list)
+    for start, seconds, rows in runs:
+        if measure == 'throughput':
+            if rows and seconds > 0:
+                buckets[period_start(start, period)].append(rows / seconds)
+        else:
+            buckets[period_start(start, period)].append(float(seconds))
+
+    out = []
+    history = []
+    for key in sorted(buckets):
+        values = buckets[key]
+        value = median(values)
+        baseline = median(history[-baseline_periods:]) if len(history) >= min(baseline_periods, 2) else None
+        change_pct = None
+        is_regression = False
+        if baseline:
+            change_pct = (value - baseline) * 100.0 / baseline
+            if len(values) >= min_runs:
+                is_regression = (change_pct <= -threshold_pct if measure == 'throughput'
+                                 else change_pct >= threshold_pct)
+        out.append({
+            'period_start': key,
+            'runs': len(values),
+            'measure': measure,
+            'value': value,
+            'baseline': baseline,
+            'change_pct': change_pct,
+            'is_regression': is_regression,
+        })
+        history.append(value)
+    return out
+
+
+def table_size_growth(store: sqlite3.Connection, period: str, baseline_periods: int, threshold_pct: float) -> list:
+    """Latest whole-table size per table vs the median of its previous buckets."""
+    sizes = defaultdict(lambda: defaultdict(list))
+    sql = """
+        SELECT table_name, measurement_datetime, table_size_mb
+        FROM etl_performance_metric
+        WHERE partition_number IS NULL AND table_size_mb IS NOT NULL
+    """
+    for table, measured, size in store.execute(sql):
+        sizes[table][period_start(parse_datetime(measured), period)].append(size)
+
+    out = []
+    for table, buckets in sorted(sizes.items()):
+        keys = sorted(buckets)
+        if len(keys) < 2:
+            continue
+        latest = max(buckets[keys[-1]])
+        baseline = median([max(buckets[k]) for k in keys[-1 - baseline_periods:-1]])
+        if baseline and (latest - baseline) * 100.0 / baseline >= threshold_pct:
+            out.append({'table': table, 'period_start': keys[-1], 'size_mb': latest,
+                        'baseline_mb': baseline, 'change_pct': (latest - baseline) * 100.0 / baseline})
+    return out
+
+
+def save_baselines(store: sqlite3.Connection, results: dict, period: str):
+    now = datetime.now().isoformat(sep=' ', timespec='seconds')
+    store.executemany(
+        """INSERT OR REPLACE INTO etl_baseline (series_type, series_name, period_start, period, runs, measure,
+               value, baseline, change_pct, is_regression, computed_datetime)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (series_type, name, b['period_start'], period, b['runs'], b['measure'], b['value'],
+             b['baseline'], b['change_pct'], int(b['is_regression']), now)
+            for (series_type, name), buckets in results.items()
+            for b in buckets
+        ],
+    )
+    store.commit()
+
+
+# ----------------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------------
+
+def _fmt(bucket: dict) -> str:
+    unit = 'rows/s' if bucket['measure'] == 'throughput' else 's'
+    return (f"{bucket['value']:,.0f} {unit} vs baseline {bucket['baseline']:,.0f} {unit} "
+            f"({bucket['change_pct']:+.1f}%, {bucket['runs']} run(s))")
+
+
+def build_report(results: dict, growth: list, period: str, threshold_pct: float, show_all: bool) -> list:
+    """Markdown lines: latest-bucket regressions first, then (optionally) every series."""
+    latest = {k: v[-1] for k, v in results.items() if v}
+    regressions = sorted(
+        ((k, b) for k, b in latest.items() if b['is_regression']),
+        key=lambda x: x[1]['change_pct'] if x[1]['measure'] == 'throughput' else -x[1]['change_pct'],
+    )
+
+    lines = [
+        '# ETL Performance Report',
+        '',
+        f"Generated {datetime.now():%Y-%m-%d %H:%M} | period: {period} | threshold: {threshold_pct:g}% "
+        f"| series: {len(results)}",
+        '',
+        f'## Regressions ({len(regressions)})',
+        '',
+    ]
+    if regressions:
+        lines += ['| Type | Series | Period | Change |', '|------|--------|--------|--------|']
+        lines += [f"| {t} | {name} | {b['period_start']} | {_fmt(b)} |" for (t, name), b in regressions]
+    else:
+        lines.append('None.')
+
+    if growth:
+        lines += ['', f'## Table Size Growth ({len(growth)})', '',
+                  '| Table | Period | Size MB | Baseline MB | Change |', '|-------|--------|---------|-------------|--------|']
+        lines += [f"| {g['table']} | {g['period_start']} | {g['size_mb']:,.0f} | {g['baseline_mb']:,.0f} "
+                  f"| {g['change_pct']:+.1f}% |" for g in growth]
+
+    if show_all:
+        lines += ['', '## All Series (latest period)', '',
+                  '| Type | Series | Period | Value | Baseline | Change |',
+                  '|------|--------|--------|-------|----------|--------|']
+        for (t, name), b in sorted(latest.items()):
+            baseline = f"{b['baseline']:,.0f}" if b['baseline'] else '-'
+            change = f"{b['change_pct']:+.1f}%" if b['change_pct'] is not None else '-'
+            unit = 'rows/s' if b['measure'] == 'throughput' else 's'
+            lines.append(f"| {t} | {name} | {b['period_start']} | {b['value']:,.0f} {unit} | {baseline} | {change} |")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Detect ETL throughput regressions from the ETL logs.')
+    parser.add_argument('--store', type=Path, default=Path('etl_performance.sqlite'), help='Local SQLite store')
+    parser.add_argument('--source-sqlite', type=Path, help='Read the ETL log tables from this SQLite file')
+    parser.add_argument('--no-sync', action='store_true', help='Analyse the store without pulling new logs')
+    parser.add_argument('--period', choices=['week', 'day'], default='week', help='Bucket size')
+    parser.add_argument('--baseline-periods', type=int, default=4, help='Previous buckets in the baseline')
+    parser.add_argument('--threshold-pct', type=float, default=30.0, help='Slowdown %% that counts as a regression')
+    parser.add_argument('--min-runs', type=int, default=1, help='Runs needed in a bucket before it can be flagged')
+    parser.add_argument('--batch', nargs='+', help='Only these Batch_Names')
+    parser.add_argument('--report', type=Path, help='Write the Markdown report to this file')
+    parser.add_argument('--show-all', action='store_true', help='List every series, not only regressions')
+    args = parser.parse_args()
+
+    try:
+        store = sqlite3.connect(args.store)
+        store.executescript(STORE_DDL)
+
+        if not args.no_sync:
+            if args.source_sqlite:
+                source, schema = sqlite3.connect(args.source_sqlite), ''
+            else:
+                source, schema = get_connection(), '[Analytics].'
+            counts = sync(store, source, schema)
+            source.close()
+            print('ℹ️  Synced ' + ', '.join(f'{n} {t}' for t, n in counts.items()))
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    series = load_runs(store, args.batch)
+    results = {
+        key: analyse_series(runs, args.period, args.baseline_periods, args.threshold_pct, args.min_runs)
+        for key, runs in series.items()
+    }
+    save_baselines(store, results, args.period)
+    growth = table_size_growth(store, args.period, args.baseline_periods, args.threshold_pct)
+    store.close()
+
+    lines = build_report(results, growth, args.period, args.threshold_pct, args.show_all)
+    if args.report:
+        args.report.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        print(f'ℹ️  Wrote {args.report}')
+
+    regressions = [(k, v[-1]) for k, v in results.items() if v and v[-1]['is_regression']]
+    for (series_type, name), bucket in regressions:
+        print(f'❌ {series_type:<5} {name}: {_fmt(bucket)}')
+    for g in growth:
+        print(f"⚠️  {g['table']} grew {g['change_pct']:+.1f}% ({g['baseline_mb']:,.0f} -> {g['size_mb']:,.0f} MB)")
+
+    if regressions:
+        return 1
+    print(f'✅ No throughput regressions ({len(results)} series, per-{args.period} baseline).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
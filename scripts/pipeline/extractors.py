@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pipeline Extractor Registry
+---------------------------
+Maps Pipeline_Metadata rows to the fetch scripts under scripts/data_integration.
+
+Each extractor is registered by entry point ('package.module:function') and is
+imported only when a pipeline that needs it runs, so the runner starts without
+pandas/requests unless the selected fetcher uses them.
+
+An extractor function takes the pipeline's Source_URL (fetchers with a fixed
+release list may ignore it) and returns a list of dicts keyed by the staging
+table's column names, ready for PipelineRunner.run_staging().
+
+Selection:
+    1. Extractors whose source_type matches Pipeline_Metadata.Source_Type
+    2. If more than one, the one whose staging_table matches Target_Staging_Table
+
+Adding a fetcher:
+    Give the script an extract_staging_rows(source_url) function and add an
+    ExtractorSpec below - nothing else in the runner changes.
+
+Usage:
+    python run_pipeline.py --list-extractors
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ExtractorSpec:
+    """One registered extractor."""
+    name: str
+    source_type: str            # Pipeline_Metadata.Source_Type
+    staging_table: str          # Pipeline_Metadata.Target_Staging_Table
+    entry_point: str            # 'package.module:function', relative to scripts/
+    requires: Tuple[str, ...] = ()  # third-party packages the fetcher imports
+
+
+EXTRACTORS: Dict[str, ExtractorSpec] = {spec.name: spec for spec in [
+    ExtractorSpec(
+        name='gp_practices',
+        source_type='CSV',
+        staging_table='[Analytics].[tbl_Staging_GP_Practice]',
+        entry_point='data_integration.nhs_ods.fetch_gp_practices_csv:extract_staging_rows',
+        requires=('pandas', 'requests'),
+    ),
+    ExtractorSpec(
+        name='pcn',
+        source_type='CSV',
+        staging_table='[Analytics].[tbl_Staging_PCN]',
+        entry_point='data_integration.nhs_ods.fetch_pcn:extract_staging_rows',
+    ),
+    ExtractorSpec(
+        name='hrg_code_to_group',
+        source_type='BULK_DOWNLOAD',
+        staging_table='[Analytics].[tbl_Staging_HRG]',
+        entry_point='data_integration.hrg.fetch_hrg_code_to_group:extract_staging_rows',
+    ),
+    ExtractorSpec(
+        name='imd2019_idaci_idaopi',
+        source_type='BULK_DOWNLOAD',
+        staging_table='[Analytics].[tbl_Staging_LSOA_IMD2019]',
+        entry_point='data_integration.imd2019.fetch_imd2019_idaci_idaopi:extract_staging_rows',
+        requires=('pandas', 'requests', 'openpyxl'),
+    ),
+]}
+
+_loaded: Dict[str, Callable[[Optional[str]], List[Dict]]] = {}
+
+
+def _table_key(name: Optional[str]) -> str:
+    """'[Analytics].[tbl_Staging_PCN]' and 'Analytics.tbl_Staging_PCN' compare equal."""
+    return (name or '').replace('[', '').replace(']', '').strip().lower()
+
+
+def select_extractor(pipeline: Dict) -> ExtractorSpec:
+    """Pick the registered extractor for a Pipeline_Metadata row."""
+    source_type = (pipeline.get('Source_Type') or '').upper()
+    candidates = [s for s in EXTRACTORS.values() if s.source_type == source_type]
+    if len(candidates) > 1:
+        target = _table_key(pipeline.get('Target_Staging_Table'))
+        candidates = [s for s in candidates if _table_key(s.staging_table) == target]
+
+    if len(candidates) != 1:
+        registered = ', '.join(f"{s.name} ({s.source_type} -> {s.staging_table})"
+                               for s in EXTRACTORS.values())
+        raise ValueError(
+            f"No extractor registered for Source_Type '{source_type}' and staging table "
+            f"'{pipeline.get('Target_Staging_Table')}'. Registered: {registered}"
+        )
+    return candidates[0]
+
+
+def load_extractor(spec: ExtractorSpec) -> Callable[[Optional[str]], List[Dict]]:
+    """Import the extractor's module on first use and return its function."""
+    if spec.name not in _loaded:
+        module_name, _, func_name = spec.entry_point.partition(':')
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            needs = f" (needs {', '.join(spec.requires)})" if spec.requires else ''
+            raise RuntimeError(
+                f"Extractor '{spec.name}' could not import {module_name}{needs}: {e}. "
+                f"Install with: pip install -r scripts/requirements.txt"
+            ) from e
+        _loaded[spec.name] = getattr(module, func_name)
+    return _loaded[spec.name]
+
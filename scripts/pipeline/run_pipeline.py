@@ -10,33 +10,40 @@ Features:
 - Audit trail for every run (extraction → staging → ETL)
 - Interactive registration for new pipelines
 - CLI interface for manual and scheduled runs
+- Extractors selected by Source_Type from a lazily imported registry (extractors.py)
 
 Usage:
     python run_pipeline.py --all                    # Run all due pipelines
     python run_pipeline.py --pipeline GP_Practices  # Run specific pipeline
     python run_pipeline.py --force --pipeline LSOA  # Force run even if not due
     python run_pipeline.py --register               # Register a new pipeline
-    python run_pipeline.py --status                 # Show pipeline status
+    python run_pipeline.py --status                 # Show pipeline status (cached if DB unreachable)
+    python run_pipeline.py --status --cached        # Show last cached status, no database
+    python run_pipeline.py --list-extractors        # Show extractor registry
 
 Author: Sridhar Peddi
 Created: 2026-01-08
 """
 
 import argparse
+import json
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-import pyodbc
 from typing import Optional, Dict, List
 import logging
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils.db_connection import get_db_connection
-from utils.logger import setup_logger
+from extractors import EXTRACTORS, select_extractor, load_extractor
 
-logger = setup_logger(__name__)
+# pyodbc, utils.db_connection and utils.logger are imported by the code paths
+# that use them, so --help, --list-extractors and a cached --status start fast.
+# setup_logger() configures this same named logger before a pipeline run.
+logger = logging.getLogger(__name__)
+
+STATUS_CACHE = Path(__file__).parent / 'pipeline_status_cache.json'
 
 
 class PipelineRunner:
@@ -47,6 +54,7 @@ class PipelineRunner:
         self.conn = None
         
     def __enter__(self):
+        import pyodbc
         self.conn = pyodbc.connect(self.conn_string)
         return self
         
@@ -201,28 +209,21 @@ class PipelineRunner:
         self.conn.commit()
         cursor.close()
     
-    def run_extraction(self, pipeline: Dict, run_id: int) -> int:
+    def run_extraction(self, pipeline: Dict, run_id: int) -> List[Dict]:
         """
-        Extract data from source.
-        This method should be overridden by specific extractors.
-        Returns number of rows extracted.
+        Extract data from source with the extractor registered for the
+        pipeline's Source_Type (see extractors.py). The fetcher module is
+        imported here, on first use.
+        Returns the extracted rows, keyed by staging column.
         """
         logger.info(f"Extracting from {pipeline['Source_URL']}...")
         
-        # Import specific extractor based on source type
-        source_type = pipeline.get('Source_Type', 'API')
-        
-        if source_type == 'API':
-            from extractors.api_extractor import APIExtractor
-            extractor = APIExtractor(pipeline['Source_URL'])
-        elif source_type == 'CSV':
-            from extractors.csv_extractor import CSVExtractor
-            extractor = CSVExtractor(pipeline['Source_URL'])
-        else:
-            raise ValueError(f"Unsupported source type: {source_type}")
-        
         try:
-            data = extractor.extract()
+            spec = select_extractor(pipeline)
+            logger.info(f"Extractor: {spec.name} ({spec.entry_point})")
+            data = load_extractor(spec)(pipeline['Source_URL'])
+            if not data:
+                raise RuntimeError(f"Extractor {spec.name} returned no rows")
             self.update_extraction_status(run_id, len(data), 'SUCCESS')
             return data
         except Exception as e:
@@ -345,6 +346,13 @@ def register_pipeline():
     dimension_table = input("Dimension Table (e.g., 'Analytics.tbl_Dim_Provider'): ").strip()
     etl_procedure = input("ETL Procedure (e.g., 'Analytics.sp_Load_Dim_Provider'): ").strip()
     
+    try:
+        spec = select_extractor({'Source_Type': source_type, 'Target_Staging_Table': staging_table})
+        print(f"   Extractor: {spec.name}")
+    except ValueError:
+        print(f"⚠️  No extractor registered for {source_type} -> {staging_table}; "
+              f"add one to extractors.py before the first run")
+    
     print("\nRefresh Frequency Options:")
     print("  1. DAILY")
     print("  2. WEEKLY")
@@ -369,6 +377,7 @@ def register_pipeline():
         next_refresh = datetime.now() + timedelta(days=365*10)
     
     # Insert into database
+    from utils.db_connection import get_db_connection
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -391,28 +400,94 @@ def register_pipeline():
         conn.close()
 
 
-def show_status():
-    """Display current pipeline status."""
+def fetch_status_snapshot() -> List[Dict]:
+    """Query vw_Pipeline_Status (rows keyed by column name)."""
+    from utils.db_connection import get_db_connection
     conn = get_db_connection()
     cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM [Analytics].[vw_Pipeline_Status] ORDER BY Is_Overdue DESC, Pipeline_Name")
-    
+    try:
+        cursor.execute("SELECT * FROM [Analytics].[vw_Pipeline_Status] ORDER BY Is_Overdue DESC, Pipeline_Name")
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def save_status_cache(rows: List[Dict], cache_path: Path):
+    """Write the status snapshot as JSON (dates as ISO strings)."""
+    def encode(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
+
+    snapshot = {'Captured_At': datetime.now().isoformat(timespec='seconds'), 'Rows': rows}
+    cache_path.write_text(json.dumps(snapshot, indent=2, default=encode), encoding='utf-8')
+
+
+def load_status_cache(cache_path: Path) -> Optional[Dict]:
+    """Read the last status snapshot, or None when there isn't one."""
+    try:
+        return json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def show_status(cache_path: Path = STATUS_CACHE, cached: bool = False) -> int:
+    """
+    Display current pipeline status.
+    Live from vw_Pipeline_Status (refreshing the cache); from the cached
+    snapshot when cached=True or the database is unreachable.
+    """
+    rows = None
+    if not cached:
+        try:
+            rows = fetch_status_snapshot()
+        except Exception as e:
+            print(f"⚠️  Database unreachable: {e}")
+        else:
+            try:
+                save_status_cache(rows, cache_path)
+            except OSError as e:
+                print(f"⚠️  Could not write status cache {cache_path}: {e}")
+
+    if rows is None:
+        snapshot = load_status_cache(cache_path)
+        if snapshot is None:
+            print(f"❌ No cached status snapshot at {cache_path}")
+            return 1
+        rows = snapshot['Rows']
+        print(f"ℹ️  Cached snapshot from {snapshot['Captured_At']} ({cache_path})")
+
+    def day(value) -> str:
+        if not value:
+            return ''
+        return value.strftime('%Y-%m-%d') if isinstance(value, (datetime, date)) else str(value)[:10]
+
     print("\n=== Pipeline Status ===\n")
     print(f"{'Pipeline':<20} {'Status':<10} {'Last Run':<12} {'Overdue':<8} {'Next Refresh':<15}")
     print("-" * 75)
     
-    for row in cursor.fetchall():
-        pipeline_name = row[1][:18]
-        status = row[9] or 'NEVER RUN'
-        last_run = row[7].strftime('%Y-%m-%d') if row[7] else 'Never'
-        overdue = '⚠️ YES' if row[12] else 'No'
-        next_refresh = row[6] strftime('%Y-%m-%d')
+    for row in rows:
+        pipeline_name = row['Pipeline_Name'][:18]
+        status = row['Last_Run_Status'] or 'NEVER RUN'
+        last_run = day(row['Last_Run_Date']) or 'Never'
+        overdue = '⚠️ YES' if row['Is_Overdue'] else 'No'
+        next_refresh = day(row['Next_Refresh_Date'])
         
         print(f"{pipeline_name:<20} {status:<10} {last_run:<12} {overdue:<8} {next_refresh:<15}")
     
-    cursor.close()
-    conn.close()
+    return 0
+
+
+def list_extractors():
+    """Display the extractor registry (no fetcher modules are imported)."""
+    print("\n=== Registered Extractors ===\n")
+    print(f"{'Name':<22} {'Source Type':<14} {'Staging Table':<42} {'Requires'}")
+    print("-" * 95)
+    for spec in EXTRACTORS.values():
+        requires = ', '.join(spec.requires) or '-'
+        print(f"{spec.name:<22} {spec.source_type:<14} {spec.staging_table:<42} {requires}")
 
 
 def main():
@@ -422,16 +497,27 @@ def main():
     parser.add_argument('--force', action='store_true', help='Force run even if not due')
     parser.add_argument('--register', action='store_true', help='Register a new pipeline')
     parser.add_argument('--status', action='store_true', help='Show pipeline status')
+    parser.add_argument('--cached', action='store_true', help='With --status: read the cached snapshot, no database')
+    parser.add_argument('--status-cache', type=Path, default=STATUS_CACHE,
+                        help=f'Status snapshot file (default: {STATUS_CACHE.name} next to this script)')
+    parser.add_argument('--list-extractors', action='store_true', help='Show registered extractors')
     
     args = parser.parse_args()
     
+    if args.list_extractors:
+        list_extractors()
+        return
+    
     if args.register:
         register_pipeline()
         return
     
     if args.status:
-        show_status()
-        return
+        return show_status(args.status_cache, args.cached)
+    
+    from utils.db_connection import get_db_connection
+    from utils.logger import setup_logger
+    setup_logger(__name__)
     
     conn_string = get_db_connection()
     
@@ -451,4 +537,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+Power BI Aggregation Generator
+------------------------------
+Analyses the KeyMeasures measure definitions and the model relationships, then
+generates one aggregation table per fact that the aggregatable measures use:
+
+- Warehouse DDL: [Analytics].[tbl_Agg_<IP|OP|AE>_Activity] plus
+  [Analytics].[sp_Load_Agg_<IP|OP|AE>_Activity] (@FromDate/@ToDate window reload,
+  one INSERT ... GROUP BY over the fact table).
+- TMDL: a hidden Agg_<IP|OP|AE>_Activity table whose columns carry alternateOf
+  mappings (groupBy for the grain keys, sum / count / min / max for the metrics),
+  its relationships to the grain dimensions and the model.tmdl ref.
+
+Measure analysis (recursive through [measure] references):
+- Aggregatable: SUM / MIN / MAX(Fact[col]), COUNTROWS(Fact), AVERAGE(Fact[col])
+  (sum + count), arithmetic and DIVIDE of aggregatable measures, CALCULATE /
+  TOTALYTD whose filters are on related dimensions (those dimensions join the
+  grain) or Dim_Date time intelligence.
+- Not aggregatable (reported with the reason): DISTINCTCOUNT (use the
+  Agg_Patient_Sketch approximate measures), CALCULATE filtered on a fact column
+  (--group-fact-flags adds boolean flag columns to the grain instead), VAR /
+  iterator / other expressions.
+
+Grain: the fact's active relationships to the default dimensions (--grain-dims)
+plus any dimension used in an aggregatable measure's filter, plus the fact's
+partition date column so the load procedure can reload a date window.
+Column types and nullability come from the fact's CREATE TABLE in sql/02_facts:
+nullable keys group under the unknown member (-1), sums of DECIMAL(p, s) columns
+are DECIMAL(18, s) and a sum over only NULLs is stored as 0.
+
+Power BI only answers a query from an alternateOf aggregation when the detail
+table is DirectQuery or dual; the facts are import today, so the report flags
+this and the generated tables take effect once the facts move to DirectQuery/dual.
+
+Default is a report only. --write writes the SQL script, the Agg_*.tmdl tables,
+relationships and model.tmdl refs (re-running replaces them).
+
+Usage:
+    python generate_aggregations.py
+    python generate_aggregations.py --write
+    python generate_aggregations.py --grain-dims Dim_Date Dim_Commissioner Dim_Provider --write
+    python generate_aggregations.py --group-fact-flags --write
+
+Exit code 0 = OK, 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import re
+import sys
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from tmdl_model import Model, call, column_refs, load_model, strip_dax_strings
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MODEL_DIR = REPO_ROOT / 'powerbi' / 'pbip' / 'High_Spring.SemanticModel' / 'definition'
+DEFAULT_SQL_OUT = REPO_ROOT / 'sql' / '02_facts' / '08_Create_tbl_Agg_Fact_Activity.sql'
+FACT_DDL_DIR = REPO_ROOT / 'sql' / '02_facts'
+
+# Fact TMDL table -> aggregation name and partition date column (model name, SQL name)
+FACT_TABLES = {
+    'Fact_IP_Activity': {'agg': 'Agg_IP_Activity', 'date': ('Discharge Date', 'Discharge_Date')},
+    'Fact_OP_Activity': {'agg': 'Agg_OP_Activity', 'date': ('Appointment Date', 'Appointment_Date')},
+    'Fact_AE_Activity': {'agg': 'Agg_AE_Activity', 'date': ('Arrival Date', 'Arrival_Date')},
+}
+
+DEFAULT_GRAIN_DIMS = [
+    'Dim_Date', 'Dim_Commissioner', 'Dim_Provider', 'Dim_POD',
+    'Dim_Specialty', 'Dim_Age_Band', 'Dim_Gender',
+]
+
+TIME_INTELLIGENCE = {
+    'SAMEPERIODLASTYEAR', 'DATESYTD', 'DATESMTD', 'DATESQTD', 'PREVIOUSMONTH',
+    'PREVIOUSYEAR', 'PARALLELPERIOD', 'DATEADD', 'DATESINPERIOD', 'DATESBETWEEN',
+}
+TIME_TOTALS = {'TOTALYTD', 'TOTALMTD', 'TOTALQTD'}
+
+# Model dataType -> SQL type for aggregated values
+SQL_TYPES = {'int64': 'BIGINT', 'double': 'FLOAT', 'decimal': 'DECIMAL(19, 4)',
+             'boolean': 'BIT', 'dateTime': 'DATE', 'string': 'NVARCHAR(255)'}
+
+NAMESPACE = uuid.UUID('6f1b7c52-3a0e-4d7e-9a51-0c2d8e4b7a10')
+
+
+@dataclass
+class Analysis:
+    needs: Set[Tuple[str, str, Optional[str]]] = field(default_factory=set)   # (fact, summarization, column)
+    dims: Set[str] = field(default_factory=set)
+    flags: Set[Tuple[str, str]] = field(default_factory=set)                  # (fact, boolean column)
+    reason: Optional[str] = None
+
+    def merge(self, other: 'Analysis') -> 'Analysis':
+        self.needs |= other.needs
+        self.dims |= other.dims
+        self.flags |= other.flags
+        self.reason = self.reason or other.reason
+        return self
+
+
+def failed(reason: str) -> Analysis:
+    return Analysis(reason=reason)
+
+
+# ----------------------------------------------------------------------------
+# Measure analysis
+# ----------------------------------------------------------------------------
+
+class Analyser:
+    def __init__(self, model: Model, group_fact_flags: bool):
+        self.model = model
+        self.group_fact_flags = group_fact_flags
+        self.cache: Dict[str, Analysis] = {}
+
+    def measure(self, name: str) -> Analysis:
+        if name not in self.cache:
+            m = self.model.find_measure(name)
+            self.cache[name] = failed('recursive reference')
+            self.cache[name] = self.expression(m.expression) if m else failed(f'unknown measure [{name}]')
+        return self.cache[name]
+
+    def expression(self, expression: str) -> Analysis:
+        text = strip_dax_strings(expression).strip()
+        if re.match(r'^VAR\b', text, re.IGNORECASE) or re.search(r'\bRETURN\b', text):
+            return failed('VAR/RETURN expression')
+        terms = split_terms(text)
+        if len(terms) > 1:
+            result = Analysis()
+            for term in terms:
+                result.merge(self.expression(term))
+            return result
+        return self.term(text)
+
+    def term(self, text: str) -> Analysis:
+        if re.fullmatch(r'-?\d+(\.\d+)?|TRUE(\(\))?|FALSE(\(\))?|BLANK\(\)', text, re.IGNORECASE):
+            return Analysis()
+        if re.fullmatch(r'\[[^\]]+\]', text):
+            return self.measure(text[1:-1])
+        if text.startswith('(') and call('GROUP' + text):
+            return self.expression(text[1:-1])
+
+        parsed = call(text)
+        if parsed is None:
+            return failed(f'unsupported expression: {text[:60]}')
+        func, args = parsed
+
+        if func in ('SUM', 'MIN', 'MAX', 'AVERAGE', 'DISTINCTCOUNT', 'COUNT'):
+            refs = column_refs(args[0]) if len(args) == 1 else []
+            if len(refs) != 1:
+                return failed(f'{func} over an expression')
+            table, column = refs[0]
+            if func == 'DISTINCTCOUNT':
+                return failed(f'DISTINCTCOUNT({table}[{column}]) is not additive '
+                              '(use the Agg_Patient_Sketch approximate measures)')
+            if table not in FACT_TABLES:
+                return failed(f'{func} over non-fact table {table}')
+            if func == 'AVERAGE':
+                return Analysis(needs={(table, 'sum', column), (table, 'count', column)})
+            return Analysis(needs={(table, func.lower(), column)})
+
+        if func == 'COUNTROWS':
+            table = args[0].strip().strip("'") if len(args) == 1 else ''
+            if table not in FACT_TABLES:
+                return failed(f'COUNTROWS({args[0] if args else ""}) is not a fact table')
+            return Analysis(needs={(table, 'count', None)})
+
+        if func == 'DIVIDE':
+            result = Analysis()
+            for arg in args:
+                result.merge(self.expression(arg))
+            return result
+
+        if func in ('CALCULATE',) + tuple(TIME_TOTALS):
+            if not args:
+                return failed(f'empty {func}')
+            result = Analysis().merge(self.expression(args[0]))
+            filters = args[1:2] if func in TIME_TOTALS else args[1:]
+            for f in filters:
+                result.merge(self.filter(f))
+            return result
+
+        return failed(f'{func} is not aggregatable')
+
+    def filter(self, text: str) -> Analysis:
+        parsed = call(text)
+        if parsed and parsed[0] in TIME_INTELLIGENCE | {'KEEPFILTERS'}:
+            if parsed[0] == 'KEEPFILTERS':
+                return self.filter(parsed[1][0])
+            refs = column_refs(text)
+            if all(t == 'Dim_Date' for t, _ in refs):
+                return Analysis(dims={'Dim_Date'})
+            return failed(f'{parsed[0]} over a non-date column')
+
+        result = Analysis()
+        for table, column in column_refs(text) or [(None, None)]:
+            if table is None:
+                return failed(f'filter without a column reference: {text[:60]}')
+            if table in FACT_TABLES:
+                col = self.model.tables[table].columns.get(column)
+                if self.group_fact_flags and col is not None and col.data_type == 'boolean':
+                    result.flags.add((table, column))
+                    continue
+                return failed(f'CALCULATE filter on fact column {table}[{column}]')
+            result.dims.add(table)
+        return result
+
+
+def split_terms(text: str) -> List[str]:
+    """Split on top-level + - * / (outside brackets, parentheses and strings)."""
+    terms, depth, current, in_bracket = [], 0, [], False
+    for i, ch in enumerate(text):
+        if ch == '[':
+            in_bracket = True
+        elif ch == ']':
+            in_bracket = False
+        elif not in_bracket:
+            if ch in '({':
+                depth += 1
+            elif ch in ')}':
+                depth -= 1
+            elif ch in '+-*/' and depth == 0 and ''.join(current).strip():
+                terms.append(''.join(current).strip())
+                current = []
+                continue
+        current.append(ch)
+    if ''.join(current).strip():
+        terms.append(''.join(current).strip())
+    return terms
+
+
+# ----------------------------------------------------------------------------
+# Aggregation design
+# ----------------------------------------------------------------------------
+
+@dataclass
+class AggColumn:
+    name: str                 # model and SQL column name
+    sql_type: str
+    summarization: str        # groupBy, sum, count, min, max
+    base_column: Optional[str]
+    source_sql: Optional[str]
+    data_type: str
+    null_default: Optional[str] = None   # groupBy: ISNULL replacement for a nullable fact column
+
+
+def fact_source_columns(model: Model, fact: str) -> Dict[str, str]:
+    """Model column alias -> SQL column, from the partition's native query."""
+    source = next((p.source for p in model.tables[fact].partitions if p.source), '') or ''
+    mapping = {}
+    for sql, alias in re.findall(r'\[([^\]]+)\](?:\s+AS\s+\[([^\]]+)\])?', source):
+        mapping[alias or sql] = sql
+    return mapping
+
+
+def sql_table_name(model: Model, fact: str) -> str:
+    source = next((p.source for p in model.tables[fact].partitions if p.source), '') or ''
+    match = re.search(r'FROM\s+\[(\w+)\]\.\[(\w+)\]', source)
+    if not match:
+        raise RuntimeError(f'{fact}: cannot find the warehouse table in the partition query.')
+    return f'[{match.group(1)}].[{match.group(2)}]'
+
+
+def fact_sql_columns(sql_table: str) -> Dict[str, Tuple[str, bool]]:
+    """SQL column -> (type, nullable), from the fact's CREATE TABLE in sql/02_facts."""
+    pattern = re.compile(r'CREATE\s+TABLE\s+' + re.escape(sql_table) + r'\s*\((.*?)\n\)', re.S | re.I)
+    for path in sorted(FACT_DDL_DIR.glob('*.sql')):
+        match = pattern.search(path.read_text(encoding='utf-8', errors='replace'))
+        if match:
+            return {name: (sql_type.upper(), not not_null)
+                    for name, sql_type, not_null in re.findall(
+                        r'^\s*\[(\w+)\]\s+(\w+(?:\(\s*\d+\s*(?:,\s*\d+\s*)?\))?)\s+(NOT\s+)?NULL',
+                        match.group(1), re.M | re.I)}
+    return {}
+
+
+def sum_sql_type(source_type: Optional[str], data_type: str) -> str:
+    """Exact type for a SUM: DECIMAL(p, s) sums as DECIMAL(18, s), integers as BIGINT."""
+    decimal = re.match(r'(?:DECIMAL|NUMERIC)\(\s*\d+\s*,\s*(\d+)\s*\)', source_type or '')
+    if decimal:
+        return f'DECIMAL(18, {decimal.group(1)})'
+    if source_type in ('INT', 'BIGINT', 'SMALLINT', 'TINYINT', 'BIT'):
+        return 'BIGINT'
+    return SQL_TYPES.get(data_type, 'FLOAT')
+
+
+def sql_identifier(name: str) -> str:
+    return re.sub(r'\W+', '_', name).strip('_')
+
+
+def design(model: Model, fact: str, needs, dims, flags, grain_dims):
+    spec = FACT_TABLES[fact]
+    table = model.tables[fact]
+    sources = fact_source_columns(model, fact)
+    sql_columns = fact_sql_columns(sql_table_name(model, fact))
+
+    def nullable(source: Optional[str]) -> bool:
+        return sql_columns.get(source, ('', True))[1]
+
+    columns: List[AggColumn] = []
+    relationships = []
+    wanted = set(grain_dims) | dims
+    for rel in model.related(fact):
+        if rel.to_table in wanted:
+            col = table.columns[rel.from_column]
+            source = sources.get(rel.from_column)
+            # NULL keys group under the unknown member (-1) so they fit the clustered PK
+            columns.append(AggColumn(rel.from_column, 'INT', 'groupBy', rel.from_column, source,
+                                     col.data_type, '-1' if nullable(source) else None))
+            relationships.append(rel)
+    missing = wanted - {r.to_table for r in relationships}
+
+    date_model, date_sql = spec['date']
+    for name in [date_model] + sorted(c for _, c in flags):
+        col = table.columns[name]
+        source = sources.get(name, sql_identifier(name))
+        null_default = '0' if col.data_type == 'boolean' and nullable(source) else None
+        columns.append(AggColumn(name, SQL_TYPES.get(col.data_type, 'INT'), 'groupBy',
+                                 name, source, col.data_type, null_default))
+
+    for _, summarization, column in sorted(needs, key=lambda n: (n[1], n[2] or '')):
+        if column is None:
+            columns.append(AggColumn('Row Count', 'BIGINT', 'count', None, None, 'int64'))
+            continue
+        base = table.columns[column]
+        label = {'sum': 'Sum', 'count': 'Count', 'min': 'Min', 'max': 'Max'}[summarization]
+        source = sources.get(column, sql_identifier(column))
+        source_type = sql_columns.get(source, (None, True))[0]
+        data_type = 'int64' if summarization == 'count' else base.data_type
+        if summarization == 'count':
+            sql_type = 'BIGINT'
+        elif summarization == 'sum':
+            sql_type = sum_sql_type(source_type, base.data_type)
+        else:
+            sql_type = source_type or SQL_TYPES.get(base.data_type, 'FLOAT')
+        columns.append(AggColumn(f'{label} {column}', sql_type, summarization, column, source, data_type))
+    return columns, relationships, missing
+
+
+# ----------------------------------------------------------------------------
+# Rendering
+# ----------------------------------------------------------------------------
+
+def sql_select_expression(c: AggColumn) -> str:
+    if c.summarization == 'groupBy':
+        if c.null_default is not None:
+            return f'ISNULL(f.[{c.source_sql}], {c.null_default})'
+        return f'f.[{c.source_sql}]'
+    if c.summarization == 'count':
+        return 'COUNT_BIG(*)' if c.base_column is None else f'COUNT_BIG(f.[{c.source_sql}])'
+    if c.summarization == 'sum':
+        # SUM over only NULLs (e.g. ERF cost on non-ERF rows) is NULL; the column is NOT NULL
+        return f'ISNULL(SUM(CAST(f.[{c.source_sql}] AS {c.sql_type})), 0)'
+    return f'{c.summarization.upper()}(f.[{c.source_sql}])'
+
+
+def render_sql(aggs: List[dict]) -> str:
+    out = [
+        '/**',
+        'Script Name:   08_Create_tbl_Agg_Fact_Activity.sql',
+        'Description:   Aggregation tables behind the KeyMeasures alternateOf mappings, and their',
+        '               window loaders. Generated by scripts/powerbi/generate_aggregations.py.',
+        'Author:        Sridhar Peddi',
+        'Created:       2026-03-28',
+        '',
+        'Notes:',
+        '- Do not edit by hand: re-run the generator after changing KeyMeasures or the grain.',
+        '- sp_Load_Agg_*_Activity @FromDate/@ToDate reloads the date window (NULLs = full rebuild);',
+        '  run after the fact load for the same window.',
+        '',
+        'Change Log:',
+        '  2026-03-28  Sridhar Peddi    Initial creation',
+        '**/',
+        '',
+        'USE [Data_Lab_SWL_Live];',
+        'GO',
+        '',
+        'SET ANSI_NULLS ON;',
+        'GO',
+        'SET QUOTED_IDENTIFIER ON;',
+        'GO',
+        '',
+    ]
+    for agg in aggs:
+        table = f"[Analytics].[tbl_{agg['name']}]"
+        proc = f"[Analytics].[sp_Load_{agg['name']}]"
+        keys = [c for c in agg['columns'] if c.summarization == 'groupBy']
+        date_sql = agg['date_sql']
+        out += [
+            f"IF OBJECT_ID('{table}', 'U') IS NOT NULL",
+            f'    DROP TABLE {table};',
+            'GO',
+            '',
+            f'CREATE TABLE {table} (',
+        ]
+        for c in agg['columns']:
+            out.append(f'    [{sql_identifier(c.name) if c.summarization != "groupBy" else c.source_sql}] '
+                       f'{c.sql_type} {"NULL" if c.summarization in ("min", "max") else "NOT NULL"},')
+        out += [
+            '    [ETL_LoadDateTime] DATETIME2 DEFAULT CURRENT_TIMESTAMP,',
+            '',
+            f"    CONSTRAINT [PK_{agg['name']}]",
+            '        PRIMARY KEY CLUSTERED (' + ', '.join(f'[{c.source_sql}]' for c in keys) + ')',
+            ') ON [PRIMARY];',
+            'GO',
+            '',
+            f"PRINT '[OK] Created table: {table}';",
+            'GO',
+            '',
+            f"IF OBJECT_ID('{proc}', 'P') IS NOT NULL",
+            f'    DROP PROCEDURE {proc};',
+            'GO',
+            '',
+            f'CREATE PROCEDURE {proc}',
+            '    @FromDate DATE = NULL,',
+            '    @ToDate DATE = NULL',
+            'AS',
+            'BEGIN',
+            '    SET NOCOUNT ON;',
+            '',
+            '    BEGIN TRY',
+            '        BEGIN TRANSACTION;',
+            '',
+            f'        DELETE FROM {table}',
+            f'        WHERE (@FromDate IS NULL OR [{date_sql}] >= @FromDate)',
+            f'          AND (@ToDate IS NULL OR [{date_sql}] <= @ToDate);',
+            '',
+            f'        INSERT INTO {table} WITH (TABLOCK) (',
+        ]
+        names = [sql_identifier(c.name) if c.summarization != 'groupBy' else c.source_sql for c in agg['columns']]
+        out.append(',\n'.join(f'            [{n}]' for n in names))
+        out += ['        )', '        SELECT']
+        out.append(',\n'.join(f'            {sql_select_expression(c)}' for c in agg['columns']))
+        out += [
+            f"        FROM {agg['sql_table']} f",
+            f'        WHERE (@FromDate IS NULL OR f.[{date_sql}] >= @FromDate)',
+            f'          AND (@ToDate IS NULL OR f.[{date_sql}] <= @ToDate)',
+            '        GROUP BY',
+        ]
+        out.append(',\n'.join(f'            {sql_select_expression(c)}' for c in keys) + ';')
+        out += [
+            '',
+            "        PRINT '[OK] " + agg['name'] + " rows loaded: ' + CAST(@@ROWCOUNT AS VARCHAR(20));",
+            '',
+            '        COMMIT TRANSACTION;',
+            '    END TRY',
+            '    BEGIN CATCH',
+            '        IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;',
+            '        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE();',
+            "        RAISERROR(@ErrorMessage, 16, 1);",
+            '    END CATCH',
+            'END;',
+            'GO',
+            '',
+            f"PRINT '[OK] Created procedure: {proc}';",
+            'GO',
+            '',
+        ]
+    return '\n'.join(out)
+
+
+def tmdl_name(name: str) -> str:
+    return name if re.fullmatch(r'[A-Za-z_]\w*', name) else "'" + name.replace("'", "''") + "'"
+
+
+def render_tmdl(agg: dict) -> str:
+    name = agg['name']
+    out = [f'/// {agg["fact"]} aggregation for KeyMeasures (generated by generate_aggregations.py)',
+           f'table {name}', '\tisHidden', f'\tlineageTag: {uuid.uuid5(NAMESPACE, name)}', '']
+    sql_names = []
+    for c in agg['columns']:
+        sql_name = c.source_sql if c.summarization == 'groupBy' else sql_identifier(c.name)
+        sql_names.append(f'[{sql_name}] AS [{c.name}]' if sql_name != c.name else f'[{sql_name}]')
+        out += [
+            f'\tcolumn {tmdl_name(c.name)}',
+            f'\t\tdataType: {c.data_type}',
+            '\t\tisHidden',
+            f'\t\tlineageTag: {uuid.uuid5(NAMESPACE, name + "." + c.name)}',
+            '\t\tsummarizeBy: none',
+            f'\t\tsourceColumn: {c.name}',
+            '',
+            '\t\talternateOf',
+        ]
+        if c.base_column is not None:
+            out.append(f'\t\t\tbaseColumn: {agg["fact"]}.{tmdl_name(c.base_column)}')
+        else:
+            out.append(f'\t\t\tbaseTable: {agg["fact"]}')
+        out += [f'\t\t\tsummarization: {c.summarization}', '']
+    query = f"SELECT {', '.join(sql_names)} FROM [Analytics].[tbl_{name}]"
+    out += [
+        f'\tpartition {name} = m',
+        '\t\tmode: import',
+        '\t\tsource =',
+        '\t\t\t\tlet',
+        f'\t\t\t\t    Source = Sql.Database("{agg["server"]}", "{agg["database"]}", [Query="{query}"])',
+        '\t\t\t\tin',
+        '\t\t\t\t    Source',
+        '',
+        '\tannotation PBI_ResultType = Table',
+        '',
+    ]
+    return '\n'.join(out)
+
+
+def render_relationships(agg: dict) -> str:
+    out = []
+    for rel in agg['relationships']:
+        rid = uuid.uuid5(NAMESPACE, f'relationship {agg["name"]}.{rel.from_column}')
+        out += [f'relationship {rid}']
+        if not rel.is_active:
+            out.append('\tisActive: false')
+        out += [f'\tfromColumn: {agg["name"]}.{tmdl_name(rel.from_column)}',
+                f'\ttoColumn: {rel.to_table}.{tmdl_name(rel.to_column)}', '']
+    return '\n'.join(out)
+
+
+def read_raw(path: Path):
+    """Return (text as stored, newline of the first line); mixed line endings are kept."""
+    raw = path.read_bytes().decode('utf-8-sig')
+    return raw, '\r\n' if raw.split('\n', 1)[0].endswith('\r') else '\n'
+
+
+def append_block(raw: str, block: str, newline: str) -> str:
+    raw = re.sub(r'(\r?\n)+$', '', raw)
+    return raw + newline + newline + block.strip('\n').replace('\n', newline) + newline
+
+
+def write_model(model_dir: Path, aggs: List[dict]):
+    for agg in aggs:
+        path = model_dir / 'tables' / f"{agg['name']}.tmdl"
+        path.write_bytes(render_tmdl(agg).replace('\n', '\r\n').encode('utf-8'))
+
+    # Relationships: drop blocks previously generated for these tables, append fresh ones
+    names = {a['name'] for a in aggs}
+    rel_path = model_dir / 'relationships.tmdl'
+    raw, newline = read_raw(rel_path)
+    raw = re.sub(
+        r'(?m)^relationship [^\n]*\n(?:\t[^\n]*\n)*?\tfromColumn: (?:'
+        + '|'.join(map(re.escape, sorted(names)))
+        + r')\.[^\n]*\n(?:\t[^\n]*\n)*(?:\r?\n)?',
+        '', raw)
+    rel_path.write_bytes(append_block(raw, '\n'.join(render_relationships(a) for a in aggs), newline).encode('utf-8'))
+
+    model_path = model_dir / 'model.tmdl'
+    raw, newline = read_raw(model_path)
+    missing = [n for n in sorted(names) if not re.search(rf'(?m)^ref table {n}\r?$', raw)]
+    if missing:
+        raw = re.sub(r'(\r?\n)+$', '', raw) + newline + newline.join(f'ref table {n}' for n in missing) + newline
+        model_path.write_bytes(raw.encode('utf-8'))
+
+
+# ----------------------------------------------------------------------------
+# Main
+# ----------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Generate aggregation tables for the KeyMeasures measures.')
+    parser.add_argument('--model-dir', type=Path, default=DEFAULT_MODEL_DIR, help='SemanticModel definition folder')
+    parser.add_argument('--measure-table', default='KeyMeasures', help='Table whose measures are analysed')
+    parser.add_argument('--grain-dims', nargs='+', default=DEFAULT_GRAIN_DIMS, help='Dimensions in every aggregation grain')
+    parser.add_argument('--group-fact-flags', action='store_true',
+                        help='Add boolean fact columns used in CALCULATE filters to the grain')
+    parser.add_argument('--sql-out', type=Path, default=DEFAULT_SQL_OUT, help='Warehouse DDL output (with --write)')
+    parser.add_argument('--write', action='store_true', help='Write the SQL script and TMDL tables')
+    args = parser.parse_args()
+
+    try:
+        model = load_model(args.model_dir)
+        if args.measure_table not in model.tables:
+            raise RuntimeError(f'{args.measure_table} not found in {args.model_dir}')
+
+        analyser = Analyser(model, args.group_fact_flags)
+        results = {m.name: analyser.measure(m.name) for m in model.tables[args.measure_table].measures.values()}
+
+        aggregatable = {n: r for n, r in results.items() if r.reason is None and r.needs}
+        blocked = {n: r for n, r in results.items() if r.reason is not None}
+
+        aggs = []
+        for fact, spec in FACT_TABLES.items():
+            needs = {n for r in aggregatable.values() for n in r.needs if n[0] == fact}
+            if not needs:
+                continue
+            dims = {d for r in aggregatable.values() if any(n[0] == fact for n in r.needs) for d in r.dims}
+            flags = {f for r in aggregatable.values() for f in r.flags if f[0] == fact}
+            columns, relationships, missing = design(model, fact, needs, dims, flags, args.grain_dims)
+            if not relationships:
+                print(f'⚠️  {fact} has no active relationships to {", ".join(sorted(missing))}; '
+                      f'{spec["agg"]} skipped')
+                continue
+            for dim in sorted(missing):
+                print(f'⚠️  {fact} has no active relationship to {dim}; not in the {spec["agg"]} grain')
+            source = next(p.source for p in model.tables[fact].partitions if p.source)
+            server, database = re.search(r'Sql\.Database\("([^"]+)",\s*"([^"]+)"', source).groups()
+            aggs.append({
+                'name': spec['agg'], 'fact': fact, 'columns': columns, 'relationships': relationships,
+                'sql_table': sql_table_name(model, fact), 'date_sql': spec['date'][1],
+                'server': server, 'database': database,
+                'storage_mode': model.tables[fact].storage_mode,
+            })
+
+        built = {a['fact'] for a in aggs}
+        for name, r in list(aggregatable.items()):
+            skipped = sorted({n[0] for n in r.needs} - built)
+            if skipped:
+                blocked[name] = failed(f'no aggregation for {", ".join(skipped)}')
+                del aggregatable[name]
+
+        print(f'{args.measure_table}: {len(results)} measures, {len(aggregatable)} aggregatable, '
+              f'{len(blocked)} not aggregatable')
+        for agg in aggs:
+            keys = [c.name for c in agg['columns'] if c.summarization == 'groupBy']
+            metrics = [f'{c.summarization}({c.base_column or "*"})' for c in agg['columns'] if c.summarization != 'groupBy']
+            print(f"\n{agg['name']} <- {agg['fact']}")
+            print(f"   Grain:   {', '.join(keys)}")
+            print(f"   Metrics: {', '.join(metrics)}")
+            served = sorted(n for n, r in aggregatable.items() if {x[0] for x in r.needs} == {agg['fact']})
+            print(f'   Serves {len(served)} measure(s): {", ".join(served)}')
+            if agg['storage_mode'] not in ('directQuery', 'dual'):
+                print(f"   ⚠️  {agg['fact']} is {agg['storage_mode'] or 'import'}: alternateOf is only used when "
+                      'the detail table is DirectQuery or dual')
+
+        if blocked:
+            print('\nNot aggregatable:')
+            for name, r in sorted(blocked.items()):
+                print(f'   ❌ {name}: {r.reason}')
+
+        if args.write:
+            args.sql_out.write_text(render_sql(aggs), encoding='utf-8')
+            print(f'\n✅ Wrote {args.sql_out}')
+            write_model(args.model_dir, aggs)
+            print(f"✅ Wrote {', '.join(a['name'] + '.tmdl' for a in aggs)}, relationships.tmdl, model.tmdl")
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
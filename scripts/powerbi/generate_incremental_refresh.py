@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Power BI Incremental Refresh Generator
+--------------------------------------
+Writes RangeStart/RangeEnd incremental refresh policies and monthly policyRange
+partitions into the fact table TMDL files, sized from the warehouse:
+
+- Archive (rollingWindowPeriods): first populated month of the fact's monthly
+  partition function (sys.partition_range_values + sys.partitions) through the
+  reference month.
+- Incremental (incrementalPeriods): first month of the ETL load window recorded on
+  [Analytics].[tbl_ETL_Batch_Log] (Window_From_Date / Window_To_Date, last successful
+  fact batch, or every successful batch since --since) through the reference month.
+
+So a scheduled refresh re-imports only the months the ETL touched; older months
+stay as archived partitions.
+
+The existing partition query is kept. Its native SQL is wrapped in
+Value.NativeQuery(..., [EnableFolding = true]) so the RangeStart/RangeEnd filter
+folds into the SQL WHERE clause (one partition query per month, no full scans).
+Re-running replaces the previous policy and partitions (idempotent).
+
+Also ensures the RangeStart / RangeEnd parameters exist in definition/expressions.tmdl.
+--tmsl writes a TMSL refresh command for only the touched month partitions
+(for XMLA / SSMS runs outside the scheduled refresh).
+
+Usage:
+    python generate_incremental_refresh.py
+    python generate_incremental_refresh.py --since 2026-03-01 --tmsl refresh_touched.json
+    python generate_incremental_refresh.py --tables Fact_IP_Activity --dry-run
+    # Offline (no database): explicit archive start and load window
+    python generate_incremental_refresh.py --archive-start 2019-04-01 --window 2025-10-01:2026-02-28
+
+Exit code 0 = TMDL written (or unchanged), 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MODEL_DIR = REPO_ROOT / 'powerbi' / 'pbip' / 'High_Spring.SemanticModel' / 'definition'
+
+# TMDL table -> warehouse table, partition function, partition column and ETL batch name
+FACT_TABLES = {
+    'Fact_IP_Activity': {
+        'sql_table': 'tbl_Fact_IP_Activity',
+        'partition_function': 'PF_IP_Activity_Monthly',
+        'sql_date_column': 'Discharge_Date',
+        'model_date_column': 'Discharge Date',
+        'batch_name': 'Fact_IP_Activity',
+    },
+    'Fact_OP_Activity': {
+        'sql_table': 'tbl_Fact_OP_Activity',
+        'partition_function': 'PF_OP_Activity_Monthly',
+        'sql_date_column': 'Appointment_Date',
+        'model_date_column': 'Appointment Date',
+        'batch_name': 'Fact_OP_Activity',
+    },
+    'Fact_AE_Activity': {
+        'sql_table': 'tbl_Fact_AE_Activity',
+        'partition_function': 'PF_AE_Activity_Monthly',
+        'sql_date_column': 'Arrival_Date',
+        'model_date_column': 'Arrival Date',
+        'batch_name': 'Fact_AE_Activity',
+    },
+}
+
+FILTER_STEP = '#"Incremental Refresh Filter"'
+
+BOUNDARIES_QUERY = """
+SELECT prv.boundary_id, CONVERT(DATE, prv.value) AS Boundary_Date
+FROM sys.partition_range_values prv
+INNER JOIN sys.partition_functions pf
+    ON pf.function_id = prv.function_id
+WHERE pf.name = ?
+ORDER BY prv.boundary_id
+"""
+
+PARTITION_ROWS_QUERY = """
+SELECT p.partition_number, SUM(p.rows) AS Partition_Rows
+FROM sys.partitions p
+WHERE p.object_id = OBJECT_ID(?)
+  AND p.index_id IN (0, 1)
+GROUP BY p.partition_number
+"""
+
+WINDOW_QUERY = """
+SELECT Batch_ID, Window_From_Date, Window_To_Date, End_DateTime
+FROM [Analytics].[tbl_ETL_Batch_Log]
+WHERE Batch_Name = ?
+  AND Status = 'Success'
+  AND Window_From_Date IS NOT NULL
+ORDER BY Batch_ID DESC
+"""
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(start: date, end: date) -> int:
+    """Whole months from start's month to end's month (same month = 0)."""
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def parse_date(value: str) -> date:
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str)
+
+
+def first_populated_month(cursor, spec: dict):
+    """First month whose partition holds rows (RANGE RIGHT: partition n = [boundary n-1, boundary n))."""
+    cursor.execute(BOUNDARIES_QUERY, spec['partition_function'])
+    boundaries = [r[1] for r in cursor.fetchall()]
+    if not boundaries:
+        raise RuntimeError(f"Partition function {spec['partition_function']} has no boundaries.")
+
+    cursor.execute(PARTITION_ROWS_QUERY, f"[Analytics].[{spec['sql_table']}]")
+    rows = {r[0]: r[1] for r in cursor.fetchall()}
+
+    for number in range(2, len(boundaries) + 2):
+        if rows.get(number, 0) > 0:
+            return month_start(boundaries[number - 2])
+    return month_start(boundaries[0])
+
+
+def etl_window(cursor, spec: dict, since):
+    """(from, to) covering the last successful load, or every successful load since `since`."""
+    cursor.execute(WINDOW_QUERY, spec['batch_name'])
+    batches = cursor.fetchall()
+    if not batches:
+        return None
+    if since is None:
+        selected = batches[:1]
+    else:
+        selected = [b for b in batches if b[3] is not None and b[3].date() >= since] or batches[:1]
+    return min(b[1] for b in selected), max(b[2] for b in selected)
+
+
+# ----------------------------------------------------------------------------
+# TMDL helpers
+# ----------------------------------------------------------------------------
+
+def read_tmdl(path: Path):
+    """Return (text with LF line endings, original lines with their own line endings)."""
+    raw = path.read_bytes().decode('utf-8-sig')
+    return raw.replace('\r\n', '\n'), re.findall(r'[^\n]*\n|[^\n]+$', raw)
+
+
+def write_tmdl(path: Path, text: str, original: list):
+    """Write LF text back, keeping the ending of every line the generator did not change.
+
+    TMDL files saved by Power BI Desktop can mix CRLF and LF; re-ending every line would bury
+    the policy change in churn. New or edited lines take the file's most common ending.
+    """
+    old_lines = [line.rstrip('\r\n') for line in original]
+    old_endings = [line[len(body):] for line, body in zip(original, old_lines)]
+    crlf = sum(1 for e in old_endings if e == '\r\n')
+    default = '\r\n' if crlf >= len(old_endings) - crlf else '\n'
+
+    new_lines = text.split('\n')
+    trailing_newline = new_lines[-1] == ''
+    if trailing_newline:
+        new_lines.pop()
+    endings = [default] * len(new_lines)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            endings[j1:j2] = [old_endings[i] or default for i in range(i1, i2)]
+    if new_lines and not trailing_newline:
+        endings[-1] = ''
+    path.write_bytes(''.join(line + end for line, end in zip(new_lines, endings)).encode('utf-8'))
+
+
+def split_child_blocks(text: str):
+    """Split a table TMDL into (header, [(kind, block_text)]), one block per one-tab child.
+
+    Blank lines belong to the preceding block; kind is the first word of the child.
+    """
+    lines = text.split('\n')
+    header = []
+    blocks = []
+    for line in lines:
+        if line.startswith('\t') and not line.startswith('\t\t'):
+            kind = line.strip().split(' ', 1)[0]
+            blocks.append([kind, [line]])
+        elif blocks:
+            blocks[-1][1].append(line)
+        else:
+            header.append(line)
+    return '\n'.join(header), [(k, '\n'.join(b)) for k, b in blocks]
+
+
+def extract_expression(block: str, keyword: str) -> str:
+    """Multi-line M expression after `<keyword> =` (4-tab indented), dedented."""
+    lines = block.split('\n')
+    for i, line in enumerate(lines):
+        if line.strip() == f'{keyword} =':
+            body = []
+            for expr_line in lines[i + 1:]:
+                if expr_line.startswith('\t\t\t\t'):
+                    body.append(expr_line[4:])
+                elif expr_line.strip() == '':
+                    body.append('')
+                else:
+                    break
+            return '\n'.join(body).strip('\n')
+    raise ValueError(f'No "{keyword} =" expression found.')
+
+
+def base_source_expression(blocks) -> str:
+    """M query of the table: the import partition, or the existing policy's source without our filter."""
+    for kind, block in blocks:
+        if kind == 'refreshPolicy':
+            return strip_filter_step(extract_expression(block, 'sourceExpression'))
+    for kind, block in blocks:
+        if kind == 'partition' and block.split('\n', 1)[0].rstrip().endswith('= m'):
+            return extract_expression(block, 'source')
+    raise ValueError('No import (m) partition or refreshPolicy found.')
+
+
+def strip_filter_step(expression: str) -> str:
+    match = re.search(
+        r',\s*\n\s*' + re.escape(FILTER_STEP) + r' = Table\.SelectRows\(([^,]+),.*\nin\n\s*' + re.escape(FILTER_STEP),
+        expression,
+        re.DOTALL,
+    )
+    if not match:
+        return expression
+    return expression[:match.start()] + '\nin\n    ' + match.group(1).strip()
+
+
+def foldable_source(expression: str) -> str:
+    """Sql.Database(server, db, [Query="..."]) -> Value.NativeQuery(..., [EnableFolding = true])."""
+    return re.sub(
+        r'Sql\.Database\(("[^"]*"),\s*("[^"]*"),\s*\[Query=("(?:[^"]|"")*")\]\)',
+        r'Value.NativeQuery(Sql.Database(\1, \2), \3, null, [EnableFolding = true])',
+        expression,
+    )
+
+
+def filtered_expression(expression: str, model_column: str) -> str:
+    """Append the RangeStart/RangeEnd filter step to a `let ... in <result>` expression."""
+    match = re.search(r'\nin\n\s*(.+?)\s*$', expression, re.DOTALL)
+    if not match:
+        raise ValueError('Partition query is not a let ... in expression.')
+    result = match.group(1)
+    column = f'[{model_column}]'
+    return (
+        expression[:match.start()] + ',\n'
+        + f'    {FILTER_STEP} = Table.SelectRows({result}, each {column} >= Date.From(RangeStart) and {column} < Date.From(RangeEnd))\n'
+        + 'in\n'
+        + f'    {FILTER_STEP}'
+    )
+
+
+def indent_expression(expression: str) -> str:
+    return '\n'.join(('\t\t\t\t' + line) if line else '' for line in expression.split('\n'))
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table} {month:%Y-%m}"
+
+
+def render_policy(expression: str, rolling_periods: int, incremental_periods: int) -> str:
+    return '\n'.join([
+        '\trefreshPolicy',
+        '\t\tpolicyType: basic',
+        '\t\trollingWindowGranularity: month',
+        f'\t\trollingWindowPeriods: {rolling_periods}',
+        '\t\tincrementalGranularity: month',
+        f'\t\tincrementalPeriods: {incremental_periods}',
+        '\t\tincrementalPeriodsOffset: 0',
+        '\t\tmode: import',
+        '\t\tsourceExpression =',
+        indent_expression(expression),
+        '',
+    ])
+
+
+def render_partitions(table: str, first_month: date, last_month: date) -> str:
+    out = []
+    month = first_month
+    while month <= last_month:
+        following = add_months(month, 1)
+        out.extend([
+            f"\tpartition '{partition_name(table, month)}' = policyRange",
+            '\t\tmode: import',
+            f'\t\tstart: {month:%Y-%m-%d}T00:00:00',
+            f'\t\tend: {following:%Y-%m-%d}T00:00:00',
+            '\t\tgranularity: month',
+            '',
+        ])
+        month = following
+    return '\n'.join(out)
+
+
+def apply_policy(text: str, table: str, spec: dict, archive_start: date,
+                 window_from: date, reference: date):
+    header, blocks = split_child_blocks(text)
+    expression = filtered_expression(
+        foldable_source(base_source_expression(blocks)),
+        spec['model_date_column'],
+    )
+
+    first_month = month_start(archive_start)
+    last_month = month_start(reference)
+    window_month = max(month_start(window_from), first_month)
+    rolling_periods = months_between(first_month, last_month) + 1
+    incremental_periods = months_between(window_month, last_month) + 1
+
+    generated = render_policy(expression, rolling_periods, incremental_periods) + '\n' \
+        + render_partitions(table, first_month, last_month)
+
+    out = []
+    inserted = False
+    for kind, block in blocks:
+        if kind in ('partition', 'refreshPolicy'):
+            if not inserted:
+                out.append(generated)
+                inserted = True
+            continue
+        out.append(block)
+    if not inserted:
+        out.append(generated)
+
+    touched = []
+    month = window_month
+    while month <= last_month:
+        touched.append(partition_name(table, month))
+        month = add_months(month, 1)
+
+    summary = {
+        'archive_from': first_month,
+        'incremental_from': window_month,
+        'through': last_month,
+        'rolling_periods': rolling_periods,
+        'incremental_periods': incremental_periods,
+        'touched_partitions': touched,
+    }
+    return header + '\n' + '\n'.join(out), summary
+
+
+def ensure_range_parameters(expressions_path: Path, archive_start: date, reference: date, dry_run: bool):
+    """Add RangeStart / RangeEnd DateTime parameters to expressions.tmdl if missing."""
+    if expressions_path.exists():
+        text, original = read_tmdl(expressions_path)
+    else:
+        text, original = '', []
+
+    added = []
+    for name, value in (('RangeStart', month_start(archive_start)), ('RangeEnd', add_months(reference, 1))):
+        if re.search(rf'^expression {name} =', text, re.MULTILINE):
+            continue
+        block = '\n'.join([
+            f'expression {name} = #datetime({value.year}, {value.month}, {value.day}, 0, 0, 0) '
+            'meta [IsParameterQuery=true, Type="DateTime", IsParameterQueryRequired=true]',
+            f'\tlineageTag: {uuid.uuid4()}',
+            '',
+            '\tannotation PBI_ResultType = DateTime',
+            '',
+        ])
+        text = (text.rstrip('\n') + '\n\n' if text.strip() else '') + block
+        added.append(name)
+
+    if added and not dry_run:
+        write_tmdl(expressions_path, text, original)
+    return added
+
+
+def tmsl_refresh(database: str, partitions: dict) -> dict:
+    return {
+        'refresh': {
+            'type': 'full',
+            'applyRefreshPolicy': False,
+            'objects': [
+                {'database': database, 'table': table, 'partition': name}
+                for table, names in partitions.items()
+                for name in names
+            ],
+        }
+    }
+
+
+def parse_window(value: str):
+    try:
+        start, end = value.split(':')
+        return parse_date(start), parse_date(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected FROM:TO as YYYY-MM-DD:YYYY-MM-DD')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Generate incremental refresh policies for the fact TMDL tables.')
+    parser.add_argument('--model-dir', type=Path, default=DEFAULT_MODEL_DIR, help='SemanticModel definition folder')
+    parser.add_argument('--tables', nargs='+', choices=sorted(FACT_TABLES), default=sorted(FACT_TABLES))
+    parser.add_argument('--since', type=parse_date, help='Union of successful load windows finished on/after this date')
+    parser.add_argument('--reference-date', type=parse_date, default=date.today(),
+                        help='Refresh date the policy is sized against (default: today)')
+    parser.add_argument('--archive-start', type=parse_date, help='Offline: first archived month (skips partition metadata)')
+    parser.add_argument('--window', type=parse_window, help='Offline: load window FROM:TO (skips tbl_ETL_Batch_Log)')
+    parser.add_argument('--tmsl', type=Path, help='Write a TMSL refresh command for the touched partitions')
+    parser.add_argument('--database', default='High_Spring', help='Dataset name used in the TMSL command')
+    parser.add_argument('--dry-run', action='store_true', help='Report only; do not write files')
+    args = parser.parse_args()
+
+    tables_dir = args.model_dir / 'tables'
+    cursor = None
+    try:
+        if args.archive_start is None or args.window is None:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+        touched = {}
+        earliest_archive = None
+        for table in args.tables:
+            spec = FACT_TABLES[table]
+            path = tables_dir / f'{table}.tmdl'
+
+            archive_start = args.archive_start or first_populated_month(cursor, spec)
+            window = args.window or etl_window(cursor, spec, args.since)
+            if window is None:
+                print(f'⚠️  {table}: no successful {spec["batch_name"]} batch with a load window; '
+                      'refreshing the current month only.')
+                window = (args.reference_date, args.reference_date)
+
+            text, original = read_tmdl(path)
+            new_text, summary = apply_policy(text, table, spec, archive_start, window[0], args.reference_date)
+
+            print(f'{table}: archive {summary["archive_from"]:%Y-%m} ({summary["rolling_periods"]} months), '
+                  f'incremental {summary["incremental_from"]:%Y-%m} ({summary["incremental_periods"]} months), '
+                  f'through {summary["through"]:%Y-%m}; ETL window {window[0]} to {window[1]}')
+
+            if new_text != text and not args.dry_run:
+                write_tmdl(path, new_text, original)
+                print(f'   ✅ Wrote {path.relative_to(args.model_dir.parent)}')
+            elif new_text != text:
+                print(f'   Would write {path.relative_to(args.model_dir.parent)}')
+            else:
+                print('   Unchanged')
+
+            touched[table] = summary['touched_partitions']
+            earliest_archive = min(filter(None, [earliest_archive, archive_start]))
+
+        added = ensure_range_parameters(args.model_dir / 'expressions.tmdl', earliest_archive,
+                                        args.reference_date, args.dry_run)
+        if added:
+            verb = 'Would add' if args.dry_run else 'Added'
+            print(f'{verb} parameters to expressions.tmdl: {", ".join(added)}')
+
+        if args.tmsl and not args.dry_run:
+            args.tmsl.write_text(json.dumps(tmsl_refresh(args.database, touched), indent=2) + '\n', encoding='utf-8')
+            print(f'TMSL refresh for {sum(len(v) for v in touched.values())} partition(s): {args.tmsl}')
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+    finally:
+        if cursor is not None:
+            cursor.connection.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
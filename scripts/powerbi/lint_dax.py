@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+DAX Cost Linter
+---------------
+Flags measure patterns that get expensive as the fact tables grow, offline against
+the PBIP folder (definition/ and TMDLScripts/), and suggests precomputed columns.
+
+Rules:
+- DAX001  COUNTROWS over a fact table (full row count per query cell)
+          -> Agg_*_Activity Row Count (generate_aggregations.py) or a summed count column.
+- DAX002  DISTINCTCOUNT over a high-cardinality fact column (PatientKey, EncounterKey, ...)
+          -> Agg_Patient_Sketch approximate measures or precomputed distinct counts per grain.
+- DAX003  CALCULATE filter comparing a non-boolean fact column (Fact_IP_Activity[Length of Stay] = 0)
+          -> precomputed BIT flag in the fact build, filtered as Fact[Is ...] = TRUE.
+- DAX004  FILTER / row iterator (SUMX, AVERAGEX, ...) over a whole fact table
+          -> precomputed column, or a column filter instead of a table filter.
+
+Cardinality is estimated from warehouse row counts: model tables are mapped to
+their warehouse table through the partition query (FROM [Analytics].[tbl_...]).
+- --from-db reads sys.partitions (and --save-row-counts caches them to CSV)
+- --row-counts reads a cached CSV (table,rows) so the linter runs fully offline
+- with neither, Fact_* tables are treated as large
+
+Findings on tables with at least --large-rows rows are warnings; the rest are info.
+
+Usage:
+    python lint_dax.py
+    python lint_dax.py --from-db --save-row-counts row_counts.csv
+    python lint_dax.py --row-counts row_counts.csv
+    python lint_dax.py ../../powerbi/pbip/High_Spring.SemanticModel/TMDLScripts/Measures.tmdl
+
+Exit code 0 = no warnings, 1 = warnings found, 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tmdl_model import Model, Table, column_refs, find_calls, load_model
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SEMANTIC_MODEL = REPO_ROOT / 'powerbi' / 'pbip' / 'High_Spring.SemanticModel'
+DEFAULT_PATHS = [SEMANTIC_MODEL / 'definition', SEMANTIC_MODEL / 'TMDLScripts']
+
+ITERATORS = ['FILTER', 'SUMX', 'AVERAGEX', 'COUNTX', 'MINX', 'MAXX', 'CONCATENATEX', 'RANKX']
+COMPARISON = re.compile(
+    r"^\s*('(?:[^']|'')+'|[A-Za-z_]\w*)\s*\[([^\]]+)\]\s*(=|<>|>=|<=|>|<|IN\b)\s*(.+?)\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+OPERATOR_SQL = {'=': '=', '<>': '<>', '>=': '>=', '<=': '<=', '>': '>', '<': '<', 'IN': 'IN'}
+
+ROW_COUNT_QUERY = """
+SELECT s.name AS Schema_Name, t.name AS Table_Name, SUM(p.rows) AS Row_Count
+FROM sys.tables t
+INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+INNER JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+GROUP BY s.name, t.name
+"""
+
+
+@dataclass
+class Finding:
+    rule: str
+    severity: str          # warning, info
+    measure: str
+    path: Optional[Path]
+    line: int
+    message: str
+    suggestion: str
+
+
+# ----------------------------------------------------------------------------
+# Row counts
+# ----------------------------------------------------------------------------
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str)
+
+
+def db_row_counts() -> Dict[str, int]:
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(ROW_COUNT_QUERY)
+        return {f'[{r[0]}].[{r[1]}]'.lower(): int(r[2]) for r in cursor.fetchall()}
+    finally:
+        conn.close()
+
+
+def load_row_counts(path: Path) -> Dict[str, int]:
+    counts = {}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[1].strip().isdigit():
+                continue        # header / blank
+            counts[row[0].strip().lower()] = int(row[1])
+    return counts
+
+
+def save_row_counts(path: Path, counts: Dict[str, int]):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['table', 'rows'])
+        for name, rows in sorted(counts.items()):
+            writer.writerow([name, rows])
+
+
+def warehouse_table(table: Table) -> Optional[str]:
+    """[schema].[table] from the partition query's FROM clause."""
+    for p in table.partitions:
+        match = re.search(r'FROM\s+\[(\w+)\]\.\[(\w+)\]', p.source or '')
+        if match:
+            return f'[{match.group(1)}].[{match.group(2)}]'
+    return None
+
+
+def source_column(table: Table, column: str) -> str:
+    """Warehouse column behind a model column (from '[SQL] AS [Alias]' in the partition query)."""
+    for p in table.partitions:
+        match = re.search(r'\[([^\]]+)\]\s+AS\s+\[' + re.escape(column) + r'\]', p.source or '')
+        if match:
+            return match.group(1)
+    return re.sub(r'\W+', '_', column)
+
+
+class Cardinality:
+    def __init__(self, catalog: Model, counts: Dict[str, int], large_rows: int):
+        self.catalog = catalog
+        self.counts = counts
+        self.large_rows = large_rows
+
+    def rows(self, table: str) -> Optional[int]:
+        for key in (table.lower(), (warehouse_table(self.catalog.tables[table]) or '').lower()
+                    if table in self.catalog.tables else ''):
+            if key and key in self.counts:
+                return self.counts[key]
+            bare = key.split('.')[-1].strip('[]')
+            for name, rows in self.counts.items():
+                if bare and name.split('.')[-1].strip('[]') == bare:
+                    return rows
+        return None
+
+    def is_large(self, table: str) -> bool:
+        rows = self.rows(table)
+        return table.startswith('Fact_') if rows is None else rows >= self.large_rows
+
+    def describe(self, table: str) -> str:
+        rows = self.rows(table)
+        return f'{table} ~{rows:,} rows' if rows is not None else f'{table} (rows unknown)'
+
+
+# ----------------------------------------------------------------------------
+# Rules
+# ----------------------------------------------------------------------------
+
+def is_fact(table: str) -> bool:
+    return table.startswith('Fact_')
+
+
+def singular(text: str) -> str:
+    if re.search(r'(ch|sh|ss|x)es$', text):
+        return text[:-2]
+    return text[:-1] if text.endswith('s') and not text.endswith('ss') else text
+
+
+def flag_name(measure: str) -> str:
+    """'IP Day Cases' -> 'Is Day Case'."""
+    stem = re.sub(r'^(IP|OP|AE|A&E)\s+', '', measure)
+    return 'Is ' + singular(stem.strip())
+
+
+def lint_measure(measure, catalog: Model, card: Cardinality) -> List[Finding]:
+    findings = []
+
+    def add(rule, table, message, suggestion):
+        severity = 'warning' if card.is_large(table) else 'info'
+        findings.append(Finding(rule, severity, measure.name, measure.source, measure.line,
+                                f'{message} [{card.describe(table)}]', suggestion))
+
+    for func, args in find_calls(measure.expression, ['COUNTROWS']):
+        table = args[0].strip().strip("'") if len(args) == 1 else ''
+        if is_fact(table):
+            add('DAX001', table, f'COUNTROWS({table}) counts fact rows on every query cell',
+                f'Answer from the Agg table Row Count (generate_aggregations.py) or SUM a '
+                f'precomputed 1-per-row count column on {table}.')
+
+    for func, args in find_calls(measure.expression, ['DISTINCTCOUNT']):
+        refs = column_refs(args[0]) if args else []
+        if refs and is_fact(refs[0][0]):
+            table, column = refs[0]
+            prefix = measure.name.split(' ')[0]
+            approx = [m.name for m in catalog.measures()
+                      if 'Agg_Patient_Sketch' in m.expression and m.name.split(' ')[0] == prefix]
+            suggestion = ('Precompute distinct counts per reporting grain in the warehouse '
+                          '(as tbl_Agg_Patient_Sketch_Monthly does for patients).')
+            if approx and column == 'PatientKey':
+                suggestion = (f"Use {', '.join(repr(a) for a in approx)} where an approximate count is "
+                              f'acceptable. {suggestion}')
+            add('DAX002', table, f'DISTINCTCOUNT({table}[{column}]) builds a distinct set of up to every fact row',
+                suggestion)
+
+    for func, args in find_calls(measure.expression, ['CALCULATE', 'CALCULATETABLE']):
+        for f in args[1:]:
+            match = COMPARISON.match(f)
+            if not match:
+                continue
+            table = match.group(1).strip("'").replace("''", "'")
+            column, operator, value = match.group(2), match.group(3).upper(), match.group(4)
+            if not is_fact(table):
+                continue
+            col = catalog.tables[table].columns.get(column) if table in catalog.tables else None
+            if col is not None and col.data_type == 'boolean':
+                continue        # already a precomputed flag
+            sql_column = source_column(catalog.tables[table], column) if table in catalog.tables else column
+            sql_value = value.replace('{', '(').replace('}', ')').replace('"', "'")
+            name = flag_name(measure.name)
+            add('DAX003', table, f'CALCULATE filter on fact column {table}[{column}] {operator} {value}',
+                f"Add [{name.replace(' ', '_')}] = CAST(CASE WHEN [{sql_column}] {OPERATOR_SQL[operator]} "
+                f"{sql_value} THEN 1 ELSE 0 END AS BIT) to the fact build and filter "
+                f"{table}[{name}] = TRUE.")
+
+    for func, args in find_calls(measure.expression, ITERATORS):
+        table = args[0].strip().strip("'") if args else ''
+        if is_fact(table):
+            add('DAX004', table, f'{func}({table}, ...) iterates every fact row',
+                'Precompute the row expression as a fact column, or filter a column '
+                '(KEEPFILTERS(Fact[col] ...)) instead of the whole table.')
+
+    return findings
+
+
+# ----------------------------------------------------------------------------
+# Main
+# ----------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Lint DAX measures in the PBIP semantic model for fact-scale cost.')
+    parser.add_argument('paths', nargs='*', type=Path, default=DEFAULT_PATHS,
+                        help='definition folder, TMDLScripts folder or .tmdl files (default: both folders)')
+    parser.add_argument('--from-db', action='store_true', help='Read warehouse row counts from sys.partitions')
+    parser.add_argument('--row-counts', type=Path, help='Cached row counts CSV (table,rows)')
+    parser.add_argument('--save-row-counts', type=Path, help='Write the row counts used to CSV')
+    parser.add_argument('--large-rows', type=int, default=1_000_000, help='Row count at which findings are warnings')
+    parser.add_argument('--warnings-only', action='store_true', help='Hide info findings')
+    args = parser.parse_args()
+
+    try:
+        counts = {}
+        if args.row_counts:
+            counts.update(load_row_counts(args.row_counts))
+        if args.from_db:
+            counts.update(db_row_counts())
+        if args.save_row_counts:
+            save_row_counts(args.save_row_counts, counts)
+
+        # Table metadata (columns, partition queries) from the full model plus the linted paths
+        catalog = load_model(SEMANTIC_MODEL / 'definition') if (SEMANTIC_MODEL / 'definition').exists() else Model()
+        targets = []
+        for path in args.paths:
+            model = load_model(path)
+            for name, table in model.tables.items():
+                catalog.tables.setdefault(name, table)
+            targets.append((path, model))
+        card = Cardinality(catalog, counts, args.large_rows)
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    warnings = 0
+    total = 0
+    for path, model in targets:
+        findings = [f for m in model.measures() for f in lint_measure(m, catalog, card)]
+        findings = [f for f in findings if f.severity == 'warning' or not args.warnings_only]
+        print(f'\n{path}: {len(model.measures())} measures, {len(findings)} finding(s)')
+        for f in sorted(findings, key=lambda x: (str(x.path), x.line, x.rule)):
+            where = f'{f.path.relative_to(path) if path.is_dir() else f.path.name}:{f.line}' if f.path else ''
+            icon = '⚠️ ' if f.severity == 'warning' else 'ℹ️ '
+            print(f"{icon} {f.rule} {where}  '{f.measure}': {f.message}")
+            print(f'      -> {f.suggestion}')
+        warnings += sum(f.severity == 'warning' for f in findings)
+        total += len(findings)
+
+    if not counts:
+        print('\nℹ️  No row counts (--from-db / --row-counts): Fact_* tables treated as large.')
+    if warnings == 0:
+        print(f'\n✅ No warnings ({total} info finding(s)).')
+        return 0
+    print(f'\n❌ {warnings} warning(s), {total - warnings} info.')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""
+TMDL Model Reader
+-----------------
+Small offline reader for the PBIP semantic model (definition/*.tmdl) and the
+TMDLScripts createOrReplace scripts. No Power BI / .NET dependency.
+
+- parse_tmdl(text): indentation tree of TMDL objects, properties and
+  multi-line expressions ('=' followed by deeper-indented lines).
+- load_model(path): tables (columns, measures, partitions) and relationships
+  from a definition folder, a TMDLScripts folder or a single .tmdl file.
+- DAX helpers: column / measure references, top-level argument splitting and
+  call lookup.
+
+Used by generate_aggregations.py and lint_dax.py.
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Objects whose bare keyword line (no name) opens a child block
+BLOCK_KEYWORDS = {'refreshPolicy', 'alternateOf', 'dataAccessOptions', 'createOrReplace', 'database', 'model'}
+
+
+@dataclass
+class Node:
+    keyword: str
+    name: Optional[str] = None
+    expression: Optional[str] = None
+    properties: Dict[str, object] = field(default_factory=dict)
+    children: List['Node'] = field(default_factory=list)
+    description: Optional[str] = None
+    line: int = 0
+
+    def find(self, keyword: str) -> List['Node']:
+        """All descendants (depth-first) with this keyword."""
+        found = []
+        for child in self.children:
+            if child.keyword == keyword:
+                found.append(child)
+            found.extend(child.find(keyword))
+        return found
+
+
+@dataclass
+class Column:
+    table: str
+    name: str
+    data_type: Optional[str] = None
+    source_column: Optional[str] = None
+    expression: Optional[str] = None     # calculated column
+    is_hidden: bool = False
+
+
+@dataclass
+class Measure:
+    table: str
+    name: str
+    expression: str
+    description: Optional[str] = None
+    source: Optional[Path] = None
+    line: int = 0
+
+
+@dataclass
+class Partition:
+    table: str
+    name: str
+    kind: str                              # m, policyRange, calculated, entity
+    mode: Optional[str] = None
+    source: Optional[str] = None
+
+
+@dataclass
+class Table:
+    name: str
+    columns: Dict[str, Column] = field(default_factory=dict)
+    measures: Dict[str, Measure] = field(default_factory=dict)
+    partitions: List[Partition] = field(default_factory=list)
+    is_hidden: bool = False
+    source: Optional[Path] = None
+
+    @property
+    def storage_mode(self) -> Optional[str]:
+        modes = {p.mode for p in self.partitions if p.mode}
+        return modes.pop() if len(modes) == 1 else ('mixed' if modes else None)
+
+
+@dataclass
+class Relationship:
+    name: str
+    from_table: str
+    from_column: str
+    to_table: str
+    to_column: str
+    is_active: bool = True
+
+
+@dataclass
+class Model:
+    tables: Dict[str, Table] = field(default_factory=dict)
+    relationships: List[Relationship] = field(default_factory=list)
+
+    def measures(self) -> List[Measure]:
+        return [m for t in self.tables.values() for m in t.measures.values()]
+
+    def find_measure(self, name: str) -> Optional[Measure]:
+        for table in self.tables.values():
+            if name in table.measures:
+                return table.measures[name]
+        return None
+
+    def related(self, table: str, active_only: bool = True) -> List[Relationship]:
+        """Relationships from `table` (many side) to its lookup tables."""
+        return [
+            r for r in self.relationships
+            if r.from_table == table and (r.is_active or not active_only)
+        ]
+
+
+# ----------------------------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------------------------
+
+def read_text(path: Path) -> str:
+    return path.read_bytes().decode('utf-8-sig').replace('\r\n', '\n')
+
+
+def _depth(line: str) -> int:
+    return len(line) - len(line.lstrip('\t'))
+
+
+def parse_name(text: str):
+    """Split a TMDL object name ('quoted ''name''' or bare) from the rest of the line."""
+    text = text.strip()
+    if text.startswith("'"):
+        i = 1
+        out = []
+        while i < len(text):
+            if text[i] == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    out.append("'")
+                    i += 2
+                    continue
+                return ''.join(out), text[i + 1:].strip()
+            out.append(text[i])
+            i += 1
+        return ''.join(out), ''
+    match = re.match(r'([^\s=.]+)\s*(.*)$', text)
+    return (match.group(1), match.group(2).strip()) if match else (text, '')
+
+
+def parse_reference(text: str):
+    """'Table Name'.'Column' / Table.Column -> (table, column)."""
+    table, rest = parse_name(text)
+    if rest.startswith('.'):
+        column, _ = parse_name(rest[1:])
+        return table, column
+    return table, None
+
+
+def _read_expression(lines, start, decl_depth):
+    """Consume lines deeper than decl_depth + 1 (blank lines allowed); return (text, next index)."""
+    body = []
+    i = start
+    while i < len(lines):
+        line = lines[i]
+        if line.strip() == '':
+            body.append('')
+            i += 1
+            continue
+        if _depth(line) >= decl_depth + 2:
+            body.append(line)
+            i += 1
+            continue
+        break
+    while body and body[-1] == '':
+        body.pop()
+        i -= 1
+    if not body:
+        return '', i
+    indent = min(_depth(l) for l in body if l)
+    return '\n'.join(l[indent:] if l else '' for l in body), i
+
+
+def parse_tmdl(text: str) -> Node:
+    """Parse TMDL text into a tree rooted at a synthetic 'document' node."""
+    lines = text.replace('\r\n', '\n').split('\n')
+    root = Node('document')
+    stack = [(-1, root)]
+    description = []
+    i = 0
+
+    while i < len(lines):
+        raw = lines[i]
+        stripped = raw.strip()
+        if not stripped:
+            i += 1
+            continue
+
+        depth = _depth(raw)
+        if stripped.startswith('///'):
+            description.append(stripped[3:].strip())
+            i += 1
+            continue
+
+        while stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1]
+        line_no = i + 1
+        i += 1
+
+        prop = re.match(r'^(\w+):\s*(.*)$', stripped)
+        expr_prop = re.match(r'^(\w+)\s*=\s*(.*)$', stripped)
+        if prop:
+            parent.properties[prop.group(1)] = prop.group(2)
+            continue
+        if expr_prop and expr_prop.group(1) not in ('table', 'column', 'measure', 'partition', 'expression'):
+            value = expr_prop.group(2)
+            more, i = _read_expression(lines, i, depth)
+            parent.properties[expr_prop.group(1)] = '\n'.join(x for x in (value, more) if x)
+            continue
+
+        keyword, _, rest = stripped.partition(' ')
+        if not rest:
+            is_block = keyword in BLOCK_KEYWORDS or (
+                i < len(lines) and lines[i].strip() and _depth(lines[i]) > depth
+            )
+            if not is_block:
+                parent.properties[keyword] = True
+                continue
+            node = Node(keyword, line=line_no, description=' '.join(description) or None)
+        else:
+            name, remainder = parse_name(rest)
+            node = Node(keyword, name=name, line=line_no, description=' '.join(description) or None)
+            if remainder.startswith('='):
+                value = remainder[1:].strip()
+                more, i = _read_expression(lines, i, depth)
+                node.expression = '\n'.join(x for x in (value, more) if x)
+        description = []
+        parent.children.append(node)
+        stack.append((depth, node))
+
+    return root
+
+
+# ----------------------------------------------------------------------------
+# Model
+# ----------------------------------------------------------------------------
+
+def _add_document(model: Model, doc: Node, path: Path):
+    for t in doc.find('table'):
+        table = model.tables.setdefault(t.name, Table(t.name, source=path))
+        table.is_hidden = table.is_hidden or bool(t.properties.get('isHidden'))
+        for c in t.children:
+            if c.keyword == 'column':
+                table.columns[c.name] = Column(
+                    table=t.name,
+                    name=c.name,
+                    data_type=c.properties.get('dataType'),
+                    source_column=c.properties.get('sourceColumn'),
+                    expression=c.expression,
+                    is_hidden=bool(c.properties.get('isHidden')),
+                )
+            elif c.keyword == 'measure':
+                table.measures[c.name] = Measure(
+                    table=t.name,
+                    name=c.name,
+                    expression=c.expression or '',
+                    description=c.description,
+                    source=path,
+                    line=c.line,
+                )
+            elif c.keyword == 'partition':
+                table.partitions.append(Partition(
+                    table=t.name,
+                    name=c.name,
+                    kind=(c.expression or '').strip(),
+                    mode=c.properties.get('mode'),
+                    source=c.properties.get('source'),
+                ))
+
+    for r in doc.find('relationship'):
+        from_ref = r.properties.get('fromColumn')
+        to_ref = r.properties.get('toColumn')
+        if not from_ref or not to_ref:
+            continue
+        from_table, from_column = parse_reference(from_ref)
+        to_table, to_column = parse_reference(to_ref)
+        model.relationships = [x for x in model.relationships if x.name != r.name]
+        model.relationships.append(Relationship(
+            name=r.name,
+            from_table=from_table,
+            from_column=from_column,
+            to_table=to_table,
+            to_column=to_column,
+            is_active=str(r.properties.get('isActive', 'true')).lower() != 'false',
+        ))
+
+
+def load_model(path: Path) -> Model:
+    """Load a definition folder (tables/ + relationships.tmdl), a TMDLScripts folder or one file."""
+    path = Path(path)
+    files = [path] if path.is_file() else sorted(path.rglob('*.tmdl'))
+    model = Model()
+    for f in files:
+        _add_document(model, parse_tmdl(read_text(f)), f)
+    return model
+
+
+# ----------------------------------------------------------------------------
+# DAX helpers
+# ----------------------------------------------------------------------------
+
+COLUMN_REF = re.compile(r"('(?:[^']|'')+'|[A-Za-z_][\w]*)\s*\[([^\]]+)\]")
+MEASURE_REF = re.compile(r"(?<![\w'\]])\[([^\]]+)\]")
+
+
+def unquote(name: str) -> str:
+    return name[1:-1].replace("''", "'") if name.startswith("'") else name
+
+
+def strip_dax_strings(expression: str) -> str:
+    """Blank out string literals and comments so reference regexes don't match inside them."""
+    expression = re.sub(r'//[^\n]*|--[^\n]*', '', expression)
+    expression = re.sub(r'/\*.*?\*/', '', expression, flags=re.DOTALL)
+    return re.sub(r'"(?:[^"]|"")*"', '""', expression)
+
+
+def column_refs(expression: str):
+    """[(table, column)] referenced as Table[Column]."""
+    return [(unquote(t), c) for t, c in COLUMN_REF.findall(strip_dax_strings(expression))]
+
+
+def measure_refs(expression: str):
+    """[measure] references (bracketed names not preceded by a table)."""
+    return MEASURE_REF.findall(strip_dax_strings(expression))
+
+
+def split_args(text: str) -> List[str]:
+    """Split a DAX argument list on top-level commas."""
+    args, depth, current, in_string = [], 0, [], False
+    for ch in text:
+        if ch == '"':
+            in_string = not in_string
+        elif not in_string:
+            if ch in '([{':
+                depth += 1
+            elif ch in ')]}':
+                depth -= 1
+            elif ch == ',' and depth == 0:
+                args.append(''.join(current).strip())
+                current = []
+                continue
+        current.append(ch)
+    if ''.join(current).strip():
+        args.append(''.join(current).strip())
+    return args
+
+
+def call(expression: str):
+    """'FUNC( args )' spanning the whole expression -> (FUNC upper, [args]); else None."""
+    match = re.match(r'^\s*([A-Za-z][A-Za-z0-9\.]*)\s*\((.*)\)\s*$', expression, re.DOTALL)
+    if not match:
+        return None
+    inner = match.group(2)
+    depth = 0
+    for ch in inner:
+        depth += ch == '('
+        depth -= ch == ')'
+        if depth < 0:
+            return None     # the outer ')' closes earlier: not a single call
+    return match.group(1).upper(), split_args(inner)
+
+
+def find_calls(expression: str, names):
+    """Every call to one of `names` anywhere in the expression -> [(FUNC upper, [args])], outermost first."""
+    text = strip_dax_strings(expression)
+    pattern = re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\s*\(', re.IGNORECASE)
+    found = []
+    for match in pattern.finditer(text):
+        depth, start = 0, match.end() - 1
+        for i in range(start, len(text)):
+            depth += text[i] == '('
+            depth -= text[i] == ')'
+            if depth == 0:
+                found.append((match.group(1).upper(), split_args(text[start + 1:i])))
+                break
+    return found
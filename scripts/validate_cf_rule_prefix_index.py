@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+CF Rule Prefix Index Validator
+------------------------------
+Checks that [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] (compiled by
+sp_Compile_CF_Segment_Rule_ICD10) matches exactly the same ICD-10 codes as the
+LIKE patterns in [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10].
+
+For every code in the list, the set of Rule_IDs matched by T-SQL LIKE semantics
+must equal the set matched by the compiled Exact / Prefix / Like rows.
+
+Code list:
+- --codes-file: text/CSV file, ICD-10 code in the first column (header optional)
+- otherwise --codes-query is run against the database (default: distinct codes
+  in tbl_Ref_CF_Code_Lookup plus every diagnosis code, primary and secondary, in
+  tbl_Bridge_Encounter_Diagnosis - the codes the CF loaders actually match)
+
+Codes are normalised the same way as the CF loaders (UPPER, '.' and ' ' removed).
+
+Usage:
+    python validate_cf_rule_prefix_index.py
+    python validate_cf_rule_prefix_index.py --codes-file icd10_codes.csv
+    python validate_cf_rule_prefix_index.py --codes-file icd10_codes.csv --show 50
+
+Exit code 0 = compiled index matches, 1 = mismatches found, 2 = error.
+
+Author: Sridhar Peddi
+Created: 2026-03-25
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_CODES_QUERY = """
+SELECT DISTINCT [Code]
+FROM [Analytics].[tbl_Ref_CF_Code_Lookup]
+WHERE [Code_Type] = 'ICD10'
+UNION
+SELECT DISTINCT [Diagnosis_Code]
+FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis]
+"""
+
+RULES_QUERY = """
+SELECT Rule_ID, ICD10_Like
+FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10]
+WHERE Is_Active = 1
+"""
+
+COMPILED_QUERY = """
+SELECT Rule_ID, Match_Type, Prefix_Length, Code_Prefix
+FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]
+"""
+
+
+def normalise_code(code: str) -> str:
+    """Same normalisation as the CF loaders."""
+    return code.upper().replace('.', '').replace(' ', '')
+
+
+def like_to_regex(pattern: str) -> re.Pattern:
+    """Translate a T-SQL LIKE pattern (%, _, [...], [^...]) to an anchored regex.
+
+    Case-insensitive, as under the database's default CI collation.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '%':
+            out.append('.*')
+        elif ch == '_':
+            out.append('.')
+        elif ch == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                # Unclosed '[' never matches in T-SQL
+                return re.compile(r'(?!)')
+            body = pattern[i + 1:end]
+            negate = body.startswith('^')
+            if negate:
+                body = body[1:]
+            body = body.replace('\\', '\\\\').replace(']', '\\]')
+            out.append('[' + ('^' if negate else '') + body + ']')
+            i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile('^' + ''.join(out) + '$', re.IGNORECASE | re.DOTALL)
+
+
+def load_codes_file(path: Path) -> list:
+    codes = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip():
+                continue
+            codes.append(row[0].strip())
+    # Drop a header row if present
+    if codes and codes[0].lower() in ('code', 'icd10', 'icd10_code', 'diagnosis_code'):
+        codes = codes[1:]
+    return codes
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str)
+
+
+def compiled_matches(row: dict, code: str) -> bool:
+    """Mirror of the compiled matching in sp_Load_Bridge_CF_Segment_Patient_Snapshot."""
+    match_type = row['Match_Type']
+    if match_type == 'Exact':
+        return code.upper() == row['Code_Prefix'].upper()
+    if match_type == 'Prefix':
+        length = row['Prefix_Length']
+        return len(code) >= length and code[:length].upper() == row['Code_Prefix'].upper()
+    return bool(row['regex'].match(code))
+
+
+def validate(rules: list, compiled: list, codes: list, show: int) -> int:
+    errors = 0
+
+    # 1. One compiled row per active rule
+    rule_ids = {r['Rule_ID'] for r in rules}
+    compiled_ids = defaultdict(int)
+    for c in compiled:
+        compiled_ids[c['Rule_ID']] += 1
+
+    missing = sorted(rule_ids - set(compiled_ids))
+    extra = sorted(set(compiled_ids) - rule_ids)
+    dupes = sorted(k for k, v in compiled_ids.items() if v > 1)
+    for label, ids in (('missing from compiled index', missing),
+                       ('compiled but not active', extra),
+                       ('compiled more than once', dupes)):
+        if ids:
+            errors += len(ids)
+            print(f'❌ {len(ids)} rule(s) {label}: {ids[:show]}')
+
+    # 2. Same matches for every code
+    for r in rules:
+        r['regex'] = like_to_regex(r['ICD10_Like'])
+    for c in compiled:
+        c['regex'] = like_to_regex(c['Code_Prefix'])
+
+    mismatches = []
+    for code in codes:
+        expected = {r['Rule_ID'] for r in rules if r['regex'].match(code)}
+        actual = {c['Rule_ID'] for c in compiled if compiled_matches(c, code)}
+        if expected != actual:
+            mismatches.append((code, sorted(expected - actual), sorted(actual - expected)))
+
+    if mismatches:
+        errors += len(mismatches)
+        print(f'❌ {len(mismatches)} code(s) match differently:')
+        for code, only_like, only_compiled in mismatches[:show]:
+            print(f'   {code:<10} LIKE only: {only_like}  compiled only: {only_compiled}')
+
+    by_type = defaultdict(int)
+    for c in compiled:
+        by_type[c['Match_Type']] += 1
+    print(f'Rules: {len(rules)} active, compiled: '
+          + ', '.join(f'{k}={v}' for k, v in sorted(by_type.items())))
+    print(f'Codes checked: {len(codes)}')
+
+    if errors == 0:
+        print('✅ Compiled prefix index matches LIKE semantics.')
+        return 0
+    return 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Validate the compiled CF rule prefix index against LIKE semantics.')
+    parser.add_argument('--codes-file', type=Path, help='ICD-10 code list (first column)')
+    parser.add_argument('--codes-query', default=DEFAULT_CODES_QUERY, help='SQL returning one code column')
+    parser.add_argument('--show', type=int, default=20, help='Max mismatches to print')
+    args = parser.parse_args()
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(RULES_QUERY)
+        rules = [{'Rule_ID': r[0], 'ICD10_Like': r[1]} for r in cursor.fetchall()]
+
+        cursor.execute(COMPILED_QUERY)
+        compiled = [
+            {'Rule_ID': r[0], 'Match_Type': r[1], 'Prefix_Length': r[2], 'Code_Prefix': r[3]}
+            for r in cursor.fetchall()
+        ]
+
+        if args.codes_file:
+            raw_codes = load_codes_file(args.codes_file)
+        else:
+            cursor.execute(args.codes_query)
+            raw_codes = [r[0] for r in cursor.fetchall() if r[0]]
+
+        conn.close()
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    codes = sorted({normalise_code(c) for c in raw_codes if normalise_code(c)})
+    return validate(rules, compiled, codes, args.show)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Parallel Fact Validation Runner
+-------------------------------
+Runs [Analytics].[sp_Validate_Fact_Data] split by domain and section group on a
+pool of connections, merges the result sets into the shape a single call
+returns, and stores the run, per-unit timings and merged results in
+tbl_Validation_Run / tbl_Validation_Run_Unit / tbl_Validation_Result
+(sql/06_validation/04_Create_Validation_Run.sql).
+
+Units (DOMAIN:SECTIONS, passed as @Domain / @Sections):
+- IP:1,2,3,5,6,7 and OP:1,2,3,5,6,7 - the single-scan sections (one grouped
+  pass per side; splitting these further would repeat the scan)
+- IP:4 and OP:4 - orphan checks, independent of the scan
+
+Merged output: test results renumbered (failures first), summary recomputed
+from them, distribution health / issues, missing members and dictionary
+checks concatenated in the procedure's order.
+
+Usage:
+    python validate_fact_data_parallel.py --from-date 2025-04-01 --to-date 2025-12-31
+    python validate_fact_data_parallel.py --from-date 2025-04-01 --to-date 2025-12-31 --workers 2
+    python validate_fact_data_parallel.py --from-date 2025-04-01 --to-date 2025-12-31 \\
+        --units IP:1,2,3 OP:1,2,3 --no-persist --json validation.json
+
+Exit code 0 = all tests passed, 1 = test failures, 2 = error (connection or unit).
+
+Author: Sridhar Peddi
+Created: 2026-03-28
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+DEFAULT_UNITS = ['IP:1,2,3,5,6,7', 'OP:1,2,3,5,6,7', 'IP:4', 'OP:4']
+
+VALIDATE_SQL = """
+EXEC [Analytics].[sp_Validate_Fact_Data]
+    @FromDate = ?,
+    @ToDate = ?,
+    @VarianceThresholdPct = ?,
+    @UnknownThresholdPct = ?,
+    @MaterialityThreshold = ?,
+    @FailOnError = 0,
+    @ValidationMode = 'SINGLE_SCAN',
+    @Domain = ?,
+    @Sections = ?
+"""
+
+# Result sets are identified by a column only they return
+RESULT_SET_KEYS = [
+    ('results', 'Test_ID'),
+    ('summary', 'Total_Tests'),
+    ('health', 'Total_Codes'),
+    ('issues', 'Difference'),
+    ('missing', 'Missing_Code'),
+    ('dictionary', 'In_NHS_Dictionary'),
+]
+
+HEALTH_ORDER = {'NEEDS ATTENTION': 1, 'ACCEPTABLE': 2, 'GOOD': 3}
+
+INSERT_RUN_SQL = """
+INSERT INTO [Analytics].[tbl_Validation_Run] (
+    From_Date, To_Date, Variance_Threshold_Pct, Unknown_Threshold_Pct, Materiality_Threshold, Workers,
+    Start_DateTime, End_DateTime, Duration_Seconds, Unit_Seconds,
+    Total_Tests, Passed, Failed, Units_Failed, Overall_Status)
+OUTPUT INSERTED.Run_ID
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_UNIT_SQL = """
+INSERT INTO [Analytics].[tbl_Validation_Run_Unit] (
+    Run_ID, Unit_Name, Domain, Sections, Start_DateTime, End_DateTime, Duration_Seconds,
+    Test_Count, Failed_Count, Status, Error_Message)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_RESULT_SQL = """
+INSERT INTO [Analytics].[tbl_Validation_Result] (
+    Run_ID, Test_ID, Unit_Name, Domain, Test_Category, Test_Name,
+    Source_Value, Target_Value, Variance_Pct, Threshold_Pct, Status, Details)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def get_connection():
+    """Connect using the .env settings (see .env.example)."""
+    import pyodbc
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    server = os.getenv('SQL_SERVER')
+    database = os.getenv('SQL_DATABASE')
+    user = os.getenv('SQL_USER')
+    password = os.getenv('SQL_PASSWORD') or os.getenv('SQL_PWD')
+
+    if not server or not database:
+        raise RuntimeError('SQL_SERVER and SQL_DATABASE must be set (see .env.example).')
+
+    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};'
+    if user:
+        conn_str += f'UID={user};PWD={password}'
+    else:
+        conn_str += 'Trusted_Connection=yes'
+    return pyodbc.connect(conn_str, autocommit=True)
+
+
+def parse_unit(text: str) -> tuple:
+    """'IP:1,2,3' -> ('IP', '1,2,3')."""
+    domain, _, sections = text.partition(':')
+    domain = domain.strip().upper()
+    sections = ','.join(s.strip() for s in sections.split(',') if s.strip())
+    if domain not in ('IP', 'OP'):
+        raise ValueError(f'Unit {text!r}: domain must be IP or OP')
+    if not sections or any(s not in '1234567' or len(s) != 1 for s in sections.split(',')):
+        raise ValueError(f'Unit {text!r}: sections must be a comma list of 1-7')
+    return domain, sections
+
+
+def read_result_sets(cursor) -> dict:
+    """Every result set of the call, keyed by RESULT_SET_KEYS name -> list of dicts."""
+    sets = {}
+    while True:
+        if cursor.description:
+            columns = [c[0] for c in cursor.description]
+            rows = [dict(zip(columns, r)) for r in cursor.fetchall()]
+            name = next((n for n, key in RESULT_SET_KEYS if key in columns), None)
+            if name is None:
+                raise RuntimeError(f'Unexpected result set: {columns}')
+            sets[name] = rows
+        if not cursor.nextset():
+            break
+    return sets
+
+
+def run_unit(pool: queue.Queue, args, domain: str, sections: str) -> dict:
+    """Run one unit on a pooled connection; never raises (errors go in the unit dict)."""
+    unit = {
+        'name': f'{domain}:{sections}',
+        'domain': domain,
+        'sections': sections,
+        'start': datetime.now(),
+        'sets': {},
+        'error': None,
+    }
+    started = time.perf_counter()
+    conn = pool.get()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            VALIDATE_SQL,
+            args.from_date, args.to_date, args.variance_threshold, args.unknown_threshold,
+            args.materiality, domain, sections,
+        )
+        unit['sets'] = read_result_sets(cursor)
+        cursor.close()
+    except Exception as e:
+        unit['error'] = str(e)
+    finally:
+        pool.put(conn)
+    unit['end'] = datetime.now()
+    unit['seconds'] = round(time.perf_counter() - started, 2)
+
+    results = unit['sets'].get('results', [])
+    unit['tests'] = len(results)
+    unit['failed'] = sum(1 for r in results if r['Status'] == 'FAIL')
+    unit['status'] = 'ERROR' if unit['error'] else ('FAIL' if unit['failed'] else 'PASS')
+    return unit
+
+
+def _count(value) -> int:
+    """Distribution issue counts come back FORMAT(..., 'N0')-ed."""
+    return int(str(value).replace(',', '')) if value is not None else 0
+
+
+def merge(units: list) -> dict:
+    """Combine the unit result sets into the shape of a single sp_Validate_Fact_Data call."""
+    merged = {name: [] for name, _ in RESULT_SET_KEYS if name != 'summary'}
+    for unit in units:
+        for name in merged:
+            for row in unit['sets'].get(name, []):
+                merged[name].append(dict(row, Unit_Name=unit['name']) if name == 'results' else row)
+
+    merged['results'].sort(key=lambda r: (r['Status'] != 'FAIL', r['Domain'], r['Test_Category'], r['Test_Name']))
+    for i, row in enumerate(merged['results'], start=1):
+        row['Test_ID'] = i
+    merged['health'].sort(key=lambda r: (HEALTH_ORDER.get(r['Health_Status'], 4), r['Domain'], r['Dimension_Name']))
+    merged['issues'].sort(key=lambda r: (-abs(_count(r['Difference'])), r['Domain'], r['Dimension_Name']))
+    merged['missing'].sort(key=lambda r: (r['Domain'], r['Dimension_Name'], -(r['Source_Record_Count'] or 0)))
+    merged['dictionary'].sort(key=lambda r: (r['Domain'], r['Dimension_Name'], -(r['Source_Record_Count'] or 0)))
+
+    passed = sum(1 for r in merged['results'] if r['Status'] == 'PASS')
+    failed = sum(1 for r in merged['results'] if r['Status'] == 'FAIL')
+    units_failed = sum(1 for u in units if u['error'])
+    merged['summary'] = [{
+        'Total_Tests': len(merged['results']),
+        'Passed': passed,
+        'Failed': failed,
+        'Overall_Status': 'ERROR' if units_failed else ('FAIL' if failed else 'PASS'),
+    }]
+    return merged
+
+
+def persist(args, units: list, merged: dict, start: datetime, end: datetime, seconds: float) -> int:
+    """Write the run, its units and the merged results; returns Run_ID."""
+    summary = merged['summary'][0]
+    conn = get_connection()
+    conn.autocommit = False
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            INSERT_RUN_SQL,
+            args.from_date, args.to_date, args.variance_threshold, args.unknown_threshold,
+            args.materiality, args.workers, start, end, seconds,
+            round(sum(u['seconds'] for u in units), 2),
+            summary['Total_Tests'], summary['Passed'], summary['Failed'],
+            sum(1 for u in units if u['error']), summary['Overall_Status'],
+        )
+        run_id = cursor.fetchone()[0]
+        cursor.executemany(INSERT_UNIT_SQL, [
+            (run_id, u['name'], u['domain'], u['sections'], u['start'], u['end'], u['seconds'],
+             u['tests'], u['failed'], u['status'], (u['error'] or '')[:2000] or None)
+            for u in units
+        ])
+        if merged['results']:
+            cursor.fast_executemany = True
+            cursor.executemany(INSERT_RESULT_SQL, [
+                (run_id, r['Test_ID'], r['Unit_Name'], r['Domain'], r['Test_Category'], r['Test_Name'],
+                 r['Source_Value'], r['Target_Value'], r['Variance_Pct'], r['Threshold_Pct'],
+                 r['Status'], r['Details'])
+                for r in merged['results']
+            ])
+        conn.commit()
+        return run_id
+    finally:
+        conn.close()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def report(units: list, merged: dict, seconds: float, show: int):
+    print('Units:')
+    for u in sorted(units, key=lambda x: -x['seconds']):
+        marker = {'PASS': '✅', 'FAIL': '❌', 'ERROR': '❌'}[u['status']]
+        detail = u['error'] if u['error'] else f"{u['tests']} tests, {u['failed']} failed"
+        print(f"   {marker} {u['name']:<16} {u['seconds']:>8.1f}s  {detail}")
+
+    unit_seconds = sum(u['seconds'] for u in units)
+    print(f'ℹ️  Wall clock {seconds:.1f}s vs {unit_seconds:.1f}s serial ({len(units)} units)')
+
+    failures = [r for r in merged['results'] if r['Status'] == 'FAIL']
+    if failures:
+        print(f'❌ {len(failures)} failed test(s):')
+        for r in failures[:show]:
+            print(f"   {r['Domain']:<3} {r['Test_Category']:<22} {r['Test_Name']:<40} {r['Details']}")
+
+    for name, label in (('issues', 'material distribution issue(s)'),
+                        ('missing', 'missing dimension member(s)'),
+                        ('dictionary', 'code(s) to review against the NHS Dictionary')):
+        if merged[name]:
+            print(f'⚠️  {len(merged[name])} {label}')
+
+    summary = merged['summary'][0]
+    print(f"Total Tests: {summary['Total_Tests']}  Passed: {summary['Passed']}  Failed: {summary['Failed']}")
+    if summary['Overall_Status'] == 'PASS':
+        print('✅ All tests passed.')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run sp_Validate_Fact_Data in parallel by domain and section.')
+    parser.add_argument('--from-date', required=True, help='Validation window start (YYYY-MM-DD)')
+    parser.add_argument('--to-date', required=True, help='Validation window end (YYYY-MM-DD)')
+    parser.add_argument('--variance-threshold', type=float, default=1.0, help='@VarianceThresholdPct')
+    parser.add_argument('--unknown-threshold', type=float, default=5.0, help='@UnknownThresholdPct')
+    parser.add_argument('--materiality', type=int, default=100, help='@MaterialityThreshold')
+    parser.add_argument('--units', nargs='+', default=DEFAULT_UNITS, help='DOMAIN:SECTIONS units, e.g. IP:1,2,3 OP:4')
+    parser.add_argument('--workers', type=int, default=4, help='Pooled connections / concurrent units')
+    parser.add_argument('--no-persist', action='store_true', help='Do not write to tbl_Validation_Run*')
+    parser.add_argument('--json', type=Path, help='Also write the merged result sets to this file')
+    parser.add_argument('--show', type=int, default=20, help='Max failed tests to print')
+    args = parser.parse_args()
+
+    try:
+        args.from_date = date.fromisoformat(args.from_date)
+        args.to_date = date.fromisoformat(args.to_date)
+        units = [parse_unit(u) for u in args.units]
+        args.workers = max(1, min(args.workers, len(units)))
+
+        pool = queue.Queue()
+        for _ in range(args.workers):
+            pool.put(get_connection())
+    except Exception as e:
+        print(f'❌ {e}')
+        return 2
+
+    start = datetime.now()
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            done = list(executor.map(lambda u: run_unit(pool, args, *u), units))
+    finally:
+        while not pool.empty():
+            pool.get().close()
+    end = datetime.now()
+    seconds = round(time.perf_counter() - started, 2)
+
+    merged = merge(done)
+    report(done, merged, seconds, args.show)
+
+    if args.json:
+        args.json.write_text(json.dumps(
+            {'units': [{k: v for k, v in u.items() if k != 'sets'} for u in done], **merged},
+            default=_json_default, indent=2,
+        ), encoding='utf-8')
+        print(f'ℹ️  Wrote {args.json}')
+
+    if not args.no_persist:
+        try:
+            run_id = persist(args, done, merged, start, end, seconds)
+            print(f'ℹ️  Saved as Run_ID {run_id} (tbl_Validation_Run)')
+        except Exception as e:
+            print(f'❌ Could not save the run: {e}')
+            return 2
+
+    status = merged['summary'][0]['Overall_Status']
+    return {'PASS': 0, 'FAIL': 1}.get(status, 2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -113,6 +113,12 @@ EXEC [Analytics].[sp_Load_Fact_AE_Activity]
     @ToDate = '$(ToDate)';
 PRINT '    [OK] Fact_AE_Activity complete';
 
+PRINT '    [3.4] Fact statistics (loaded partitions)...';
+EXEC [Analytics].[sp_Update_Fact_Statistics]
+    @FromDate = '$(FromDate)',
+    @ToDate = '$(ToDate)';
+PRINT '    [OK] Fact statistics complete';
+
 PRINT '';
 PRINT '>>> PHASE 3 COMPLETE: Facts loaded';
 PRINT '';
@@ -141,6 +147,18 @@ EXEC [Analytics].[sp_Enrich_Facts_CAM]
     @ToDate = '$(ToDate)';
 PRINT '    [OK] CAM enrichment complete';
 
+PRINT '    [4.4] Fact columnstore maintenance...';
+EXEC [Analytics].[sp_Maintain_Fact_Columnstore]
+    @FromDate = '$(FromDate)',
+    @ToDate = '$(ToDate)';
+PRINT '    [OK] Fact columnstore maintenance complete';
+
+PRINT '    [4.5] Patient sketches...';
+EXEC [Analytics].[sp_Load_Agg_Patient_Sketch]
+    @FromDate = '$(FromDate)',
+    @ToDate = '$(ToDate)';
+PRINT '    [OK] Patient sketches complete';
+
 PRINT '';
 PRINT '>>> PHASE 4 COMPLETE: Enrichment finished';
 PRINT '';
@@ -164,7 +182,9 @@ SELECT 'tbl_CAM_Assignment_Active', COUNT(*) FROM [Analytics].[tbl_CAM_Assignmen
 UNION ALL
 SELECT 'tbl_ERF_Repriced_Active', COUNT(*) FROM [Analytics].[tbl_ERF_Repriced_Active]
 UNION ALL
-SELECT 'tbl_OpPlan_Active', COUNT(*) FROM [Analytics].[tbl_OpPlan_Active];
+SELECT 'tbl_OpPlan_Active', COUNT(*) FROM [Analytics].[tbl_OpPlan_Active]
+UNION ALL
+SELECT 'tbl_Agg_Patient_Sketch_Monthly', COUNT(*) FROM [Analytics].[tbl_Agg_Patient_Sketch_Monthly];
 
 PRINT '';
 PRINT 'Next steps (optional):';
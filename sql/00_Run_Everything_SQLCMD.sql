@@ -41,15 +41,19 @@ PRINT '>>> 1. Core Setup';
 :r H:\sql\00_setup\01_Create_Analytics_Schema.sql
 :r H:\sql\00_setup\02_Create_Partition_Function_Scheme.sql
 :r H:\sql\00_setup\03_Create_ETL_Logging.sql
+:r H:\sql\00_setup\17_Create_Deploy_Manifest.sql
 :r H:\sql\00_setup\04_Create_Staging_NHS_ODS.sql
 :r H:\sql\00_setup\07_Create_Staging_LSOA_IMD2019.sql
 :r H:\sql\00_setup\10_Create_Staging_PCN_Relationships.sql
 :r H:\sql\00_setup\05_Create_SUS_Published_Functions.sql
 :r H:\sql\00_setup\06_Create_SUS_Published_Functions_SWL.sql
 :r H:\sql\00_setup\08_Create_OP_POD_Function.sql
+:r H:\sql\00_setup\16_Create_Month_Calendar_Functions.sql
 :r H:\sql\00_setup\06_Create_Partition_Maintenance.sql
 :r H:\sql\00_setup\07_Create_CAM_View.sql
 :r H:\sql\00_setup\09_Create_ERF_Views.sql
+:r H:\sql\00_setup\14_Create_Patient_Sketch_Functions.sql
+:r H:\sql\00_setup\15_Create_Fact_Source_Synonyms.sql
 :r H:\sql\cam\[CAM].[tbl_CAM_Raw].sql
 :r H:\sql\04_etl\24_sp_Compute_CAM_Raw.sql
 PRINT '    [OK] Setup Complete';
@@ -68,6 +72,15 @@ BEGIN
             DBCC CHECKIDENT ('[Analytics].[tbl_ETL_Performance_Metrics]', RESEED, 0);
         END
 
+        IF OBJECT_ID('[Analytics].[tbl_ETL_Step_Query_Plan]', 'U') IS NOT NULL
+            DELETE FROM [Analytics].[tbl_ETL_Step_Query_Plan];
+
+        IF OBJECT_ID('[Analytics].[tbl_ETL_Step_Wait_Stats]', 'U') IS NOT NULL
+            DELETE FROM [Analytics].[tbl_ETL_Step_Wait_Stats];
+
+        IF OBJECT_ID('[Analytics].[tbl_ETL_Session_Wait_Snapshot]', 'U') IS NOT NULL
+            DELETE FROM [Analytics].[tbl_ETL_Session_Wait_Snapshot];
+
         IF OBJECT_ID('[Analytics].[tbl_ETL_Error_Details]', 'U') IS NOT NULL
         BEGIN
             DELETE FROM [Analytics].[tbl_ETL_Error_Details];
@@ -139,7 +152,9 @@ PRINT '    2e. Dictionary NHS DD Dimensions (Views - Core)';
 :r H:\sql\01_dimensions\32_Create_Dim_OpPlan_Measure.sql
 :r H:\sql\01_dimensions\33_Create_Dim_OpPlan_MeasureSet_Detail.sql
 :r H:\sql\01_dimensions\34_Create_Dim_OpPlan_MeasureSet_Display.sql
-PRINT '    [OK] All Dimensions Created (31 total: 9 tables + 22 views)';
+:r H:\sql\01_dimensions\35_Create_Dim_Key_Lookup.sql
+:r H:\sql\01_dimensions\36_Create_Dim_OpPlan_MeasureSet_Hash.sql
+PRINT '    [OK] All Dimensions Created (34 total: 12 tables + 22 views)';
 
 -------------------------------------------------------------------------------
 -- 2.5. FACTS + BRIDGES (DDL)
@@ -148,17 +163,21 @@ PRINT '>>> 2.5 Creating Facts + Bridges (DDL)';
 :r H:\sql\02_facts\01_Create_tbl_Fact_IP_Activity.sql
 :r H:\sql\02_facts\02_Create_tbl_Fact_OP_Activity.sql
 :r H:\sql\02_facts\03_Create_tbl_Fact_AE_Activity.sql
+:r H:\sql\02_facts\07_Create_tbl_Agg_Patient_Sketch_Monthly.sql
 
 :r H:\sql\03_bridges\01f_Create_tbl_Bridge_CF_Segment_Patient_Snapshot.sql
 :r H:\sql\03_bridges\01c_Create_tbl_Ref_CF_Segment_Rules.sql
 :r H:\sql\03_bridges\01e_Create_tbl_Ref_CF_Code_Lookup.sql
 :r H:\sql\03_bridges\01d_Load_tbl_Ref_CF_Segment_Rule_ICD10.sql
+:r H:\sql\03_bridges\01g_Create_tbl_Ref_CF_Segment_Rule_ICD10_Prefix.sql
 :r H:\sql\03_bridges\02b_Create_tbl_Bridge_Operating_Plan_Deferred.sql
 :r H:\sql\03_bridges\02f_Create_tbl_Bridge_OpPlan_MeasureSet.sql
 :r H:\sql\03_bridges\03_Create_tbl_Bridge_ERF.sql
 :r H:\sql\03_bridges\04_Create_tbl_CAM_Assignment_Active.sql
 :r H:\sql\03_bridges\05_Create_tbl_ERF_Repriced_Active.sql
 :r H:\sql\03_bridges\06_Create_tbl_OpPlan_Active.sql
+:r H:\sql\03_bridges\07_Create_tbl_Bridge_Encounter_Diagnosis.sql
+:r H:\sql\03_bridges\08_Create_tbl_Bridge_Encounter_Procedure.sql
 PRINT '    [OK] Facts + Bridges Created';
 
 -------------------------------------------------------------------------------
@@ -182,6 +201,7 @@ PRINT '>>> 3. Creating ETL Procedures';
 :r H:\sql\04_etl\06_Load_Dim_CAM_Service_Category.sql
 :r H:\sql\04_etl\07_Load_Dim_CAM_Assignment_Reason.sql
 :r H:\sql\04_etl\08_Load_Dim_Patient.sql
+:r H:\sql\04_etl\28_sp_Refresh_Dim_Key_Lookup.sql
 
 PRINT '    3b. Fact Load Procedures (Create only - do NOT execute yet)';
 :r H:\sql\04_etl\10_sp_Load_Fact_IP_Activity.sql
@@ -195,15 +215,21 @@ PRINT '    3c.1 Precompute Operating Plan Active (Create only - execute when rea
 :r H:\sql\04_etl\23_sp_Load_OpPlan_Active.sql
 PRINT '    3c.2 CF Code Lookup Loader (Create only - execute when ready)';
 :r H:\sql\04_etl\25_sp_Load_Ref_CF_Code_Lookup.sql
+:r H:\sql\04_etl\30_sp_Compile_CF_Segment_Rule_ICD10.sql
 
 PRINT '    3d. Bridge Load Procedures (Create only - execute when ready)';
 :r H:\sql\04_etl\13_sp_Load_Bridge_ERF_Activity.sql
 :r H:\sql\04_etl\14_sp_Load_Bridge_Operating_Plan_Deferred.sql
+:r H:\sql\04_etl\31_sp_Load_Bridge_Encounter_Codes.sql
 
 PRINT '    3e. Fact Enrichment Procedures (Create only - execute when ready)';
 :r H:\sql\04_etl\16_sp_Enrich_Facts_CAM.sql
 :r H:\sql\04_etl\19_sp_Enrich_Facts_Operating_Plan.sql
 :r H:\sql\04_etl\20_sp_Enrich_Facts_ERF.sql
+:r H:\sql\04_etl\27_sp_Load_Agg_Patient_Sketch.sql
+:r H:\sql\04_etl\29_sp_Extract_Fact_Source_Window.sql
+:r H:\sql\06_validation\03_Create_Fact_Fingerprint.sql
+:r H:\sql\06_validation\04_Create_Validation_Run.sql
 :r H:\sql\04_etl\09_sp_Run_Fact_Loads_With_Enrichment.sql
 
 PRINT '    3f. Patient Segmentation Procedures (Create only - execute when ready)';
@@ -292,25 +318,46 @@ BEGIN
         @FromDate = '$(FromDate)',
         @ToDate = '$(ToDate)';
 
-    PRINT '    [7.8] Enrich Operating Plan...';
+    PRINT '    [7.8] Diagnosis/Procedure Bridges (CF lookback: 24 months before FromDate)...';
+    DECLARE @BridgeFromDate DATE = DATEADD(MONTH, -23, DATEFROMPARTS(YEAR('$(FromDate)'), MONTH('$(FromDate)'), 1));
+    EXEC [Analytics].[sp_Load_Bridge_Encounter_Codes]
+        @FromDate = @BridgeFromDate,
+        @ToDate = '$(ToDate)';
+
+    PRINT '    [7.9] Update Fact Statistics...';
+    EXEC [Analytics].[sp_Update_Fact_Statistics]
+        @FromDate = '$(FromDate)',
+        @ToDate = '$(ToDate)';
+
+    PRINT '    [7.10] Enrich Operating Plan...';
     EXEC [Analytics].[sp_Enrich_Facts_Operating_Plan]
         @FinYearStart = '$(FinYearStart)',
         @FromDate = '$(FromDate)',
         @ToDate = '$(ToDate)';
 
-    PRINT '    [7.9] Enrich ERF...';
+    PRINT '    [7.11] Enrich ERF...';
     EXEC [Analytics].[sp_Enrich_Facts_ERF]
         @FinYearStart = '$(FinYearStart)',
         @FromDate = '$(FromDate)',
         @ToDate = '$(ToDate)';
 
-    PRINT '    [7.10] Enrich CAM...';
+    PRINT '    [7.12] Enrich CAM...';
     EXEC [Analytics].[sp_Enrich_Facts_CAM]
         @FinancialYear = '$(FinancialYear)',
         @ProviderCode = NULL,
         @FromDate = '$(FromDate)',
         @ToDate = '$(ToDate)';
 
+    PRINT '    [7.13] Fact Columnstore Maintenance...';
+    EXEC [Analytics].[sp_Maintain_Fact_Columnstore]
+        @FromDate = '$(FromDate)',
+        @ToDate = '$(ToDate)';
+
+    PRINT '    [7.14] Patient Sketches...';
+    EXEC [Analytics].[sp_Load_Agg_Patient_Sketch]
+        @FromDate = '$(FromDate)',
+        @ToDate = '$(ToDate)';
+
     PRINT '    [OK] Optional Precompute + Fact + Enrichment Run Complete';
 END
 ELSE
@@ -20,6 +20,8 @@ GO
 -------------------------------------------------------------------------------
 
 -- 1. Drop Stored Procedures
+IF OBJECT_ID('[Analytics].[sp_Capture_ETL_Step_Stats]', 'P') IS NOT NULL DROP PROCEDURE [Analytics].[sp_Capture_ETL_Step_Stats];
+IF OBJECT_ID('[Analytics].[sp_Capture_ETL_Table_Metrics]', 'P') IS NOT NULL DROP PROCEDURE [Analytics].[sp_Capture_ETL_Table_Metrics];
 IF OBJECT_ID('[Analytics].[sp_Cleanup_Stale_Batches]', 'P') IS NOT NULL DROP PROCEDURE [Analytics].[sp_Cleanup_Stale_Batches];
 IF OBJECT_ID('[Analytics].[sp_Log_Table_Load]', 'P') IS NOT NULL DROP PROCEDURE [Analytics].[sp_Log_Table_Load];
 IF OBJECT_ID('[Analytics].[sp_End_ETL_Batch]', 'P') IS NOT NULL DROP PROCEDURE [Analytics].[sp_End_ETL_Batch];
@@ -31,6 +33,9 @@ IF OBJECT_ID('[Analytics].[ETL_Error_Details]', 'U') IS NOT NULL DROP TABLE [Ana
 IF OBJECT_ID('[Analytics].[ETL_Table_Load_Log]', 'U') IS NOT NULL DROP TABLE [Analytics].[ETL_Table_Load_Log];
 
 -- 2b. Drop Child Tables
+IF OBJECT_ID('[Analytics].[tbl_ETL_Step_Query_Plan]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Step_Query_Plan];
+IF OBJECT_ID('[Analytics].[tbl_ETL_Step_Wait_Stats]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Step_Wait_Stats];
+IF OBJECT_ID('[Analytics].[tbl_ETL_Session_Wait_Snapshot]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Session_Wait_Snapshot];
 IF OBJECT_ID('[Analytics].[tbl_ETL_Performance_Metrics]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Performance_Metrics];
 IF OBJECT_ID('[Analytics].[tbl_ETL_Error_Details]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Error_Details];
 IF OBJECT_ID('[Analytics].[tbl_ETL_Table_Load_Log]', 'U') IS NOT NULL DROP TABLE [Analytics].[tbl_ETL_Table_Load_Log];
@@ -63,6 +68,9 @@ Created:       2026-01-02
 
 Change Log:
   2026-01-02  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Window_From_Date / Window_To_Date on tbl_ETL_Batch_Log (fact load window)
+  2026-03-28  Sridhar Peddi    sp_Capture_ETL_Table_Metrics: size/rowgroup/compression per logged table at batch end
+  2026-03-28  Sridhar Peddi    Per-step session wait deltas and Query Store plans (tbl_ETL_Step_Wait_Stats / _Query_Plan)
 **/
 CREATE TABLE [Analytics].[tbl_ETL_Batch_Log]
 (
@@ -73,6 +81,10 @@ CREATE TABLE [Analytics].[tbl_ETL_Batch_Log]
     Status VARCHAR(20) NOT NULL DEFAULT 'Running', 
         -- Values: 'Running', 'Success', 'Failed', 'Timeout', 'Cancelled'
     
+    -- Activity-date window loaded (windowed fact loads; NULL for other batches)
+    Window_From_Date DATE NULL,
+    Window_To_Date DATE NULL,
+    
     -- Row counts (how many rows were inserted/updated/deleted)
     Rows_Inserted INT NULL,
     Rows_Updated INT NULL,
@@ -232,6 +244,15 @@ CREATE TABLE [Analytics].[tbl_ETL_Performance_Metrics]
     Compression_Type VARCHAR(50) NULL, -- 'Columnstore', 'Page', 'Row', 'None'
     Compression_Ratio DECIMAL(5,2) NULL,  -- e.g., 10.5 = 10.5:1 compression
     
+    -- Columnstore rowgroup health (per partition; NULL = whole table)
+    Partition_Number INT NULL,
+    Measurement_Phase VARCHAR(20) NULL,   -- 'Before', 'After' (maintenance runs), 'Batch End' (whole table)
+    Row_Count BIGINT NULL,
+    Deleted_Row_Count BIGINT NULL,
+    Delta_Rowgroup_Count INT NULL,        -- OPEN/CLOSED rowgroups (not yet compressed)
+    Rowgroup_Density_Pct DECIMAL(5,2) NULL,  -- ideal rowgroups / compressed rowgroups
+    Maintenance_Action VARCHAR(20) NULL,  -- 'REORGANIZE', 'REBUILD'
+    
     -- Timing
     Measurement_DateTime DATETIME2 NOT NULL DEFAULT GETDATE(),
     
@@ -249,6 +270,86 @@ GO
 PRINT '[OK] Created table: [Analytics].[tbl_ETL_Performance_Metrics]';
 GO
 
+-------------------------------------------------------------------------------
+-- TABLE 5: ETL_Session_Wait_Snapshot
+-- Purpose: Cumulative sys.dm_exec_session_wait_stats of the batch's session at
+-- its last log point (batch start or previous step). Working state only:
+-- replaced at every step, cleared by sp_End_ETL_Batch.
+-------------------------------------------------------------------------------
+
+CREATE TABLE [Analytics].[tbl_ETL_Session_Wait_Snapshot]
+(
+    Batch_ID INT NOT NULL,
+    Wait_Type NVARCHAR(60) NOT NULL,
+    Waiting_Tasks_Count BIGINT NOT NULL,
+    Wait_Time_ms BIGINT NOT NULL,
+    Signal_Wait_Time_ms BIGINT NOT NULL,
+    
+    CONSTRAINT PK_ETL_Session_Wait_Snapshot PRIMARY KEY CLUSTERED (Batch_ID, Wait_Type)
+);
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_ETL_Session_Wait_Snapshot]';
+GO
+
+-------------------------------------------------------------------------------
+-- TABLE 6: ETL_Step_Wait_Stats
+-- Purpose: What each logged step waited on (session wait deltas since the
+-- previous log point of the batch)
+-------------------------------------------------------------------------------
+
+CREATE TABLE [Analytics].[tbl_ETL_Step_Wait_Stats]
+(
+    Load_ID INT NOT NULL,   -- Links to ETL_Table_Load_Log (the step)
+    Batch_ID INT NOT NULL,
+    Wait_Type NVARCHAR(60) NOT NULL,
+    Waiting_Tasks_Count BIGINT NOT NULL,
+    Wait_Time_ms BIGINT NOT NULL,
+    Signal_Wait_Time_ms BIGINT NOT NULL,
+    
+    CONSTRAINT PK_ETL_Step_Wait_Stats PRIMARY KEY CLUSTERED (Load_ID, Wait_Type),
+    CONSTRAINT FK_ETL_Step_Wait_Batch FOREIGN KEY (Batch_ID) 
+        REFERENCES [Analytics].[tbl_ETL_Batch_Log](Batch_ID)
+);
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_ETL_Step_Wait_Stats]';
+GO
+
+-------------------------------------------------------------------------------
+-- TABLE 7: ETL_Step_Query_Plan
+-- Purpose: Which Query Store plans the calling procedure ran during each step
+-- (steps logged with @ProcID = @@PROCID). Runtime figures are Query Store
+-- interval totals, so they can include other executions in the same interval.
+-------------------------------------------------------------------------------
+
+CREATE TABLE [Analytics].[tbl_ETL_Step_Query_Plan]
+(
+    Load_ID INT NOT NULL,
+    Batch_ID INT NOT NULL,
+    Object_Name NVARCHAR(256) NOT NULL,   -- Calling procedure
+    Query_ID BIGINT NOT NULL,
+    Plan_ID BIGINT NOT NULL,
+    Query_Hash BINARY(8) NOT NULL,        -- Same statement across runs
+    Query_Plan_Hash BINARY(8) NOT NULL,   -- Changes when the plan shape changes
+    Is_Forced_Plan BIT NOT NULL,
+    Executions BIGINT NOT NULL,
+    Avg_Duration_ms DECIMAL(18,2) NULL,
+    Avg_CPU_ms DECIMAL(18,2) NULL,
+    Avg_Logical_Reads DECIMAL(18,0) NULL,
+    Max_DOP BIGINT NULL,
+    Last_Execution_Time DATETIMEOFFSET NULL,
+    Statement_Text NVARCHAR(400) NULL,
+    
+    CONSTRAINT PK_ETL_Step_Query_Plan PRIMARY KEY CLUSTERED (Load_ID, Plan_ID),
+    CONSTRAINT FK_ETL_Step_Plan_Batch FOREIGN KEY (Batch_ID) 
+        REFERENCES [Analytics].[tbl_ETL_Batch_Log](Batch_ID)
+);
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_ETL_Step_Query_Plan]';
+GO
+
 PRINT '';
 PRINT '========================================';
 PRINT 'Creating Stored Procedures';
@@ -270,7 +371,9 @@ GO
 CREATE PROCEDURE [Analytics].[sp_Start_ETL_Batch]
     @BatchName VARCHAR(100),
     @BatchID INT OUTPUT,
-    @TimeoutMinutes INT = 720  -- Default 12 hours
+    @TimeoutMinutes INT = 720,  -- Default 12 hours
+    @WindowFromDate DATE = NULL,  -- Activity-date window (fact loads)
+    @WindowToDate DATE = NULL
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -305,12 +408,24 @@ BEGIN
     
     -- Insert batch log record
     INSERT INTO [Analytics].[tbl_ETL_Batch_Log] 
-        (Batch_Name, Start_DateTime, Status, Executed_By, Server_Name)
+        (Batch_Name, Start_DateTime, Status, Executed_By, Server_Name, Window_From_Date, Window_To_Date)
     VALUES 
-        (@BatchName, GETDATE(), 'Running', SUSER_SNAME(), @@SERVERNAME);
+        (@BatchName, GETDATE(), 'Running', SUSER_SNAME(), @@SERVERNAME, @WindowFromDate, @WindowToDate);
     
     SET @BatchID = SCOPE_IDENTITY();
     
+    -- Session wait baseline for the first step (see sp_Capture_ETL_Step_Stats)
+    BEGIN TRY
+        INSERT INTO [Analytics].[tbl_ETL_Session_Wait_Snapshot]
+            (Batch_ID, Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms)
+        SELECT @BatchID, wait_type, waiting_tasks_count, wait_time_ms, signal_wait_time_ms
+        FROM sys.dm_exec_session_wait_stats
+        WHERE session_id = @@SPID;
+    END TRY
+    BEGIN CATCH
+        PRINT ' [WARNING] Session wait snapshot not taken: ' + ERROR_MESSAGE();
+    END CATCH
+    
     -- Print confirmation
     PRINT '>>> Started Batch ID: ' + CAST(@BatchID AS VARCHAR) + ' (' + @BatchName + ')';
     PRINT ' Start Time: ' + CONVERT(VARCHAR, GETDATE(), 121);
@@ -342,7 +457,8 @@ CREATE PROCEDURE [Analytics].[sp_End_ETL_Batch]
     @RowsUpdated INT = NULL,
     @RowsDeleted INT = NULL,
     @RowsFailed INT = NULL,
-    @ErrorMessage NVARCHAR(MAX) = NULL
+    @ErrorMessage NVARCHAR(MAX) = NULL,
+    @CaptureMetrics BIT = 1  -- Size/rowgroup metrics for the batch's tables (Success only)
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -375,6 +491,20 @@ BEGIN
         WHERE Batch_ID = @BatchID;
     END
     
+    -- Table metrics are informational: a capture failure must not fail the batch
+    IF @Status = 'Success' AND @CaptureMetrics = 1
+    BEGIN
+        BEGIN TRY
+            EXEC [Analytics].[sp_Capture_ETL_Table_Metrics] @BatchID = @BatchID;
+        END TRY
+        BEGIN CATCH
+            PRINT ' [WARNING] Table metrics not captured: ' + ERROR_MESSAGE();
+        END CATCH
+    END
+    
+    -- Step wait snapshots are only needed while the batch runs
+    DELETE FROM [Analytics].[tbl_ETL_Session_Wait_Snapshot] WHERE Batch_ID = @BatchID;
+    
     -- Release application lock (Safely)
     IF @BatchName IS NOT NULL
     BEGIN
@@ -445,7 +575,8 @@ CREATE PROCEDURE [Analytics].[sp_Log_Table_Load]
     @ErrorMessage NVARCHAR(MAX) = NULL,
     @StartDateTime DATETIME2 = NULL,
     @EndDateTime DATETIME2 = NULL,
-    @PartitionID INT = NULL
+    @PartitionID INT = NULL,
+    @ProcID INT = NULL  -- Pass @@PROCID to record the caller's Query Store plans for this step
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -457,6 +588,23 @@ BEGIN
         (@BatchID, @TableName, @LoadType, @PartitionID,
          COALESCE(@StartDateTime, GETDATE()), COALESCE(@EndDateTime, GETDATE()),
          @RowsAffected, @RowsFailed, @Status, LEFT(@ErrorMessage, 4000));
+    
+    DECLARE @LoadID INT = SCOPE_IDENTITY();
+    
+    -- Step waits / plans are diagnostics: never fail the load over them
+    -- (skipped when the caller's transaction is doomed)
+    IF XACT_STATE() <> -1
+    BEGIN
+        BEGIN TRY
+            EXEC [Analytics].[sp_Capture_ETL_Step_Stats]
+                @BatchID = @BatchID,
+                @LoadID = @LoadID,
+                @ProcID = @ProcID;
+        END TRY
+        BEGIN CATCH
+            PRINT '  |- [WARNING] Step waits/plans not captured: ' + ERROR_MESSAGE();
+        END CATCH
+    END
     
     -- Print tree-style output for visual clarity
     DECLARE @StatusIcon VARCHAR(5) = CASE @Status 
@@ -517,6 +665,282 @@ GO
 PRINT '[OK] Created procedure: [Analytics].[sp_Cleanup_Stale_Batches]';
 GO
 
+-------------------------------------------------------------------------------
+-- PROCEDURE 5: sp_Capture_ETL_Table_Metrics
+-- Purpose: Size, rowgroup and compression metrics for every table logged in a
+-- batch (called by sp_End_ETL_Batch on success). One whole-table row per table
+-- (Partition_Number NULL, Measurement_Phase 'Batch End'), so growth and
+-- compression degradation can be trended per load.
+--
+-- - Tables come from tbl_ETL_Table_Load_Log (Status 'Success') for the batch.
+--   Names must resolve in this database ('Analytics.tbl_Fact_IP_Activity');
+--   other databases and wildcard names ('Analytics.tbl_Fact_*_Activity') are skipped.
+-- - Table_Size_MB / Row_Count: heap or clustered index (sys.dm_db_partition_stats,
+--   in-row + LOB pages). Index_Size_MB: nonclustered indexes.
+-- - Rowgroup_Count / Delta_Rowgroup_Count / Deleted_Row_Count / Rowgroup_Density_Pct:
+--   sys.dm_db_column_store_row_group_physical_stats, same definitions as
+--   vw_Columnstore_Rowgroup_Health (NULL for rowstore tables).
+-- - Compression_Ratio is an estimate: rows x declared row width (variable-length
+--   columns at half their declared length, (MAX) at 4000 bytes) / Table_Size_MB.
+--   Only its trend per table is meaningful.
+-------------------------------------------------------------------------------
+
+IF OBJECT_ID('[Analytics].[sp_Capture_ETL_Table_Metrics]', 'P') IS NOT NULL
+BEGIN
+    DROP PROCEDURE [Analytics].[sp_Capture_ETL_Table_Metrics];
+END
+GO
+
+CREATE PROCEDURE [Analytics].[sp_Capture_ETL_Table_Metrics]
+    @BatchID INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @Tables TABLE (Object_ID INT PRIMARY KEY, Table_Name VARCHAR(100) NOT NULL);
+    
+    INSERT INTO @Tables (Object_ID, Table_Name)
+    SELECT OBJECT_ID(l.Table_Name, 'U'), MIN(l.Table_Name)
+    FROM [Analytics].[tbl_ETL_Table_Load_Log] l
+    WHERE l.Batch_ID = @BatchID
+      AND l.Status = 'Success'
+      AND OBJECT_ID(l.Table_Name, 'U') IS NOT NULL
+      AND ISNULL(PARSENAME(l.Table_Name, 3), DB_NAME()) = DB_NAME()
+    GROUP BY OBJECT_ID(l.Table_Name, 'U');
+    
+    IF @@ROWCOUNT = 0
+        RETURN 0;
+    
+    ;WITH Size AS (
+        SELECT
+            ps.object_id,
+            SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.row_count ELSE 0 END) AS Row_Count,
+            SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.used_page_count ELSE 0 END) * 8 / 1024.0 AS Table_Size_MB,
+            SUM(CASE WHEN ps.index_id > 1 THEN ps.used_page_count ELSE 0 END) * 8 / 1024.0 AS Index_Size_MB
+        FROM sys.dm_db_partition_stats ps
+        INNER JOIN @Tables t ON t.Object_ID = ps.object_id
+        GROUP BY ps.object_id
+    ),
+    Compression AS (
+        SELECT
+            p.object_id,
+            MAX(p.data_compression_desc) AS Data_Compression
+        FROM sys.partitions p
+        INNER JOIN @Tables t ON t.Object_ID = p.object_id
+        WHERE p.index_id IN (0, 1)
+        GROUP BY p.object_id
+    ),
+    RowgroupPartition AS (
+        SELECT
+            rg.object_id,
+            rg.partition_number,
+            SUM(CASE WHEN rg.state_desc = 'COMPRESSED' THEN 1 ELSE 0 END) AS Compressed_Rowgroups,
+            SUM(CASE WHEN rg.state_desc IN ('OPEN', 'CLOSED') THEN 1 ELSE 0 END) AS Delta_Rowgroups,
+            SUM(CASE WHEN rg.state_desc = 'COMPRESSED' THEN CAST(rg.total_rows AS BIGINT) - ISNULL(rg.deleted_rows, 0) ELSE 0 END) AS Live_Compressed_Rows,
+            SUM(CAST(ISNULL(rg.deleted_rows, 0) AS BIGINT)) AS Deleted_Rows
+        FROM sys.dm_db_column_store_row_group_physical_stats rg
+        INNER JOIN @Tables t ON t.Object_ID = rg.object_id
+        WHERE rg.state_desc <> 'TOMBSTONE'
+        GROUP BY rg.object_id, rg.partition_number
+    ),
+    Rowgroup AS (
+        SELECT
+            object_id,
+            SUM(Compressed_Rowgroups + Delta_Rowgroups) AS Rowgroup_Count,
+            SUM(Delta_Rowgroups) AS Delta_Rowgroup_Count,
+            SUM(Deleted_Rows) AS Deleted_Row_Count,
+            SUM(Compressed_Rowgroups) AS Compressed_Rowgroups,
+            -- Ideal rowgroups per partition (CEILING(live rows / 1,048,576), at least 1 when compressed)
+            SUM(CASE
+                    WHEN Compressed_Rowgroups = 0 THEN 0
+                    WHEN Live_Compressed_Rows <= 0 THEN 1
+                    ELSE CEILING(Live_Compressed_Rows / 1048576.0)
+                END) AS Ideal_Rowgroups
+        FROM RowgroupPartition
+        GROUP BY object_id
+    ),
+    RowWidth AS (
+        SELECT
+            c.object_id,
+            SUM(CASE
+                    WHEN c.max_length = -1 THEN 4000
+                    WHEN ty.name IN ('varchar', 'nvarchar', 'varbinary') THEN c.max_length / 2
+                    ELSE c.max_length
+                END) AS Row_Bytes
+        FROM sys.columns c
+        INNER JOIN @Tables t ON t.Object_ID = c.object_id
+        INNER JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+        WHERE c.is_computed = 0
+        GROUP BY c.object_id
+    )
+    INSERT INTO [Analytics].[tbl_ETL_Performance_Metrics] (
+        Batch_ID, Table_Name, Table_Size_MB, Index_Size_MB, Rowgroup_Count,
+        Compression_Type, Compression_Ratio, Partition_Number, Measurement_Phase,
+        Row_Count, Deleted_Row_Count, Delta_Rowgroup_Count, Rowgroup_Density_Pct
+    )
+    SELECT
+        @BatchID,
+        t.Table_Name,
+        CAST(s.Table_Size_MB AS DECIMAL(18,2)),
+        CAST(s.Index_Size_MB AS DECIMAL(18,2)),
+        rg.Rowgroup_Count,
+        CASE
+            WHEN c.Data_Compression LIKE 'COLUMNSTORE%' THEN 'Columnstore'
+            WHEN c.Data_Compression = 'PAGE' THEN 'Page'
+            WHEN c.Data_Compression = 'ROW' THEN 'Row'
+            ELSE 'None'
+        END,
+        CASE
+            WHEN s.Table_Size_MB = 0 THEN NULL
+            ELSE CAST(
+                CASE
+                    WHEN s.Row_Count * w.Row_Bytes / 1048576.0 / s.Table_Size_MB > 999.99 THEN 999.99
+                    ELSE s.Row_Count * w.Row_Bytes / 1048576.0 / s.Table_Size_MB
+                END AS DECIMAL(5,2))
+        END,
+        NULL,
+        'Batch End',
+        s.Row_Count,
+        rg.Deleted_Row_Count,
+        rg.Delta_Rowgroup_Count,
+        CASE
+            WHEN rg.object_id IS NULL THEN NULL
+            WHEN rg.Compressed_Rowgroups = 0 THEN 100.0
+            ELSE CAST(100.0 * rg.Ideal_Rowgroups / rg.Compressed_Rowgroups AS DECIMAL(5,2))
+        END
+    FROM @Tables t
+    INNER JOIN Size s ON s.object_id = t.Object_ID
+    LEFT JOIN Compression c ON c.object_id = t.Object_ID
+    LEFT JOIN Rowgroup rg ON rg.object_id = t.Object_ID
+    LEFT JOIN RowWidth w ON w.object_id = t.Object_ID;
+    
+    PRINT '  |- [OK] Table metrics captured: ' + CAST(@@ROWCOUNT AS VARCHAR) + ' table(s)';
+    
+    RETURN 0;
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Capture_ETL_Table_Metrics]';
+GO
+
+-------------------------------------------------------------------------------
+-- PROCEDURE 6: sp_Capture_ETL_Step_Stats
+-- Purpose: Waits and plans for one logged step (called by sp_Log_Table_Load).
+-- The step runs from the batch's previous log point (previous table load, else
+-- batch start) to now, on the same session.
+--
+-- - Waits: sys.dm_exec_session_wait_stats for @@SPID minus the batch snapshot
+--   (tbl_ETL_Session_Wait_Snapshot), then the snapshot moves to now. Includes
+--   parallel worker waits (CXPACKET etc.) of the session's queries.
+-- - Plans: only when @ProcID is given and Query Store is on. Queries of that
+--   procedure whose plan last executed since the step started; counts and
+--   averages are summed over the overlapping Query Store intervals.
+-------------------------------------------------------------------------------
+
+IF OBJECT_ID('[Analytics].[sp_Capture_ETL_Step_Stats]', 'P') IS NOT NULL
+BEGIN
+    DROP PROCEDURE [Analytics].[sp_Capture_ETL_Step_Stats];
+END
+GO
+
+CREATE PROCEDURE [Analytics].[sp_Capture_ETL_Step_Stats]
+    @BatchID INT,
+    @LoadID INT,
+    @ProcID INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @Waits TABLE (
+        Wait_Type NVARCHAR(60) PRIMARY KEY,
+        Waiting_Tasks_Count BIGINT NOT NULL,
+        Wait_Time_ms BIGINT NOT NULL,
+        Signal_Wait_Time_ms BIGINT NOT NULL
+    );
+    
+    INSERT INTO @Waits (Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms)
+    SELECT wait_type, waiting_tasks_count, wait_time_ms, signal_wait_time_ms
+    FROM sys.dm_exec_session_wait_stats
+    WHERE session_id = @@SPID;
+    
+    -- 1. Wait deltas since the previous log point (no snapshot = from session start)
+    INSERT INTO [Analytics].[tbl_ETL_Step_Wait_Stats]
+        (Load_ID, Batch_ID, Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms)
+    SELECT
+        @LoadID,
+        @BatchID,
+        w.Wait_Type,
+        w.Waiting_Tasks_Count - ISNULL(s.Waiting_Tasks_Count, 0),
+        w.Wait_Time_ms - ISNULL(s.Wait_Time_ms, 0),
+        w.Signal_Wait_Time_ms - ISNULL(s.Signal_Wait_Time_ms, 0)
+    FROM @Waits w
+    LEFT JOIN [Analytics].[tbl_ETL_Session_Wait_Snapshot] s
+        ON s.Batch_ID = @BatchID
+       AND s.Wait_Type = w.Wait_Type
+    WHERE w.Wait_Time_ms > ISNULL(s.Wait_Time_ms, 0);
+    
+    DELETE FROM [Analytics].[tbl_ETL_Session_Wait_Snapshot] WHERE Batch_ID = @BatchID;
+    
+    INSERT INTO [Analytics].[tbl_ETL_Session_Wait_Snapshot]
+        (Batch_ID, Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms)
+    SELECT @BatchID, Wait_Type, Waiting_Tasks_Count, Wait_Time_ms, Signal_Wait_Time_ms
+    FROM @Waits;
+    
+    -- 2. Query Store plans of the calling procedure
+    IF @ProcID IS NULL
+        OR NOT EXISTS (
+            SELECT 1 FROM sys.database_query_store_options
+            WHERE actual_state_desc IN ('READ_WRITE', 'READ_ONLY')
+        )
+        RETURN 0;
+    
+    DECLARE @StepStart DATETIME2;
+    SELECT @StepStart = COALESCE(
+        (SELECT MAX(l.End_DateTime)
+         FROM [Analytics].[tbl_ETL_Table_Load_Log] l
+         WHERE l.Batch_ID = @BatchID AND l.Load_ID < @LoadID),
+        (SELECT b.Start_DateTime
+         FROM [Analytics].[tbl_ETL_Batch_Log] b
+         WHERE b.Batch_ID = @BatchID));
+    
+    -- Query Store times are DATETIMEOFFSET; batch log times are server local
+    DECLARE @StepStartOffset DATETIMEOFFSET =
+        TODATETIMEOFFSET(@StepStart, DATEPART(TZOFFSET, SYSDATETIMEOFFSET()));
+    
+    INSERT INTO [Analytics].[tbl_ETL_Step_Query_Plan]
+        (Load_ID, Batch_ID, Object_Name, Query_ID, Plan_ID, Query_Hash, Query_Plan_Hash, Is_Forced_Plan,
+         Executions, Avg_Duration_ms, Avg_CPU_ms, Avg_Logical_Reads, Max_DOP, Last_Execution_Time, Statement_Text)
+    SELECT
+        @LoadID,
+        @BatchID,
+        OBJECT_SCHEMA_NAME(@ProcID) + '.' + OBJECT_NAME(@ProcID),
+        q.query_id,
+        p.plan_id,
+        q.query_hash,
+        p.query_plan_hash,
+        p.is_forced_plan,
+        SUM(rs.count_executions),
+        CAST(SUM(rs.avg_duration * rs.count_executions) / NULLIF(SUM(rs.count_executions), 0) / 1000.0 AS DECIMAL(18,2)),
+        CAST(SUM(rs.avg_cpu_time * rs.count_executions) / NULLIF(SUM(rs.count_executions), 0) / 1000.0 AS DECIMAL(18,2)),
+        CAST(SUM(rs.avg_logical_io_reads * rs.count_executions) / NULLIF(SUM(rs.count_executions), 0) AS DECIMAL(18,0)),
+        MAX(rs.max_dop),
+        MAX(rs.last_execution_time),
+        LEFT(MAX(qt.query_sql_text), 400)
+    FROM sys.query_store_query q
+    INNER JOIN sys.query_store_query_text qt ON qt.query_text_id = q.query_text_id
+    INNER JOIN sys.query_store_plan p ON p.query_id = q.query_id
+    INNER JOIN sys.query_store_runtime_stats rs ON rs.plan_id = p.plan_id
+    WHERE q.object_id = @ProcID
+      AND rs.last_execution_time >= @StepStartOffset
+    GROUP BY q.query_id, p.plan_id, q.query_hash, p.query_plan_hash, p.is_forced_plan;
+    
+    RETURN 0;
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Capture_ETL_Step_Stats]';
+GO
+
 PRINT '';
 PRINT '========================================';
 PRINT 'ETL Logging Infrastructure Complete';
@@ -524,8 +948,8 @@ PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
 PRINT '========================================';
 PRINT '';
 PRINT 'Summary:';
-PRINT '  [OK] 4 Tables created';
-PRINT '  [OK] 4 Stored Procedures created';
+PRINT '  [OK] 7 Tables created';
+PRINT '  [OK] 6 Stored Procedures created';
 PRINT '';
 PRINT 'Next Steps:';
 PRINT '  1. Test with: EXEC [Analytics].[sp_Start_ETL_Batch] ''Test_Batch'', @BatchID OUTPUT';
@@ -18,12 +18,18 @@ GO
 
 /**
 Script Name:   06_Create_Partition_Maintenance.sql
-Description:   Extends monthly partition functions for IP/OP/AE facts.
+Description:   Extends monthly partition functions for IP/OP/AE facts and the *_Active tables.
 Author:        Sridhar Peddi
 Created:       2026-01-12
 
+Notes:
+- Missing boundaries come from fn_Partition_Month_Calendar in one query; the SPLITs
+  (DDL, one per boundary) are generated and run as a single batch.
+
 Change Log:
   2026-01-12  Sridhar Peddi    Initial creation
+  2026-03-27  Sridhar Peddi    Set-based boundary list via fn_Partition_Month_Calendar (no month WHILE loop)
+  2026-03-28  Sridhar Peddi    Include PF_Active_Monthly
 **/
 CREATE PROCEDURE [Analytics].[sp_Extend_Fact_Partitions]
     @MonthsAhead INT = 12,
@@ -42,84 +48,830 @@ BEGIN
     INSERT INTO @Functions (FunctionName)
     VALUES ('PF_OP_Activity_Monthly'),
            ('PF_IP_Activity_Monthly'),
-           ('PF_AE_Activity_Monthly');
+           ('PF_AE_Activity_Monthly'),
+           ('PF_Active_Monthly');
+
+    DECLARE @Sql NVARCHAR(MAX);
+    DECLARE @Missing NVARCHAR(4000);
+    DECLARE @Added INT;
+
+    IF OBJECT_ID('tempdb..#NewBoundaries') IS NOT NULL
+        DROP TABLE #NewBoundaries;
+
+    -- Next @MonthsAhead months after each function's last boundary (or @StartFrom),
+    -- minus boundaries that already exist: one set-based pass over all functions.
+    SELECT
+        f.FunctionName,
+        c.Month_Start AS Boundary
+    INTO #NewBoundaries
+    FROM @Functions f
+    INNER JOIN sys.partition_functions pf
+        ON pf.name = f.FunctionName
+    OUTER APPLY (
+        SELECT MAX(TRY_CONVERT(DATE, prv.value)) AS Last_Boundary
+        FROM sys.partition_range_values prv
+        WHERE prv.function_id = pf.function_id
+    ) lb
+    CROSS APPLY (
+        SELECT DATEFROMPARTS(
+            YEAR(ISNULL(lb.Last_Boundary, GETDATE())),
+            MONTH(ISNULL(lb.Last_Boundary, GETDATE())),
+            1
+        ) AS Base_Boundary
+    ) bb
+    CROSS APPLY (
+        SELECT CASE
+            WHEN @StartFrom IS NOT NULL AND @StartFrom > bb.Base_Boundary
+                THEN DATEFROMPARTS(YEAR(@StartFrom), MONTH(@StartFrom), 1)
+            ELSE bb.Base_Boundary
+        END AS Current_Boundary
+    ) cb
+    CROSS APPLY [Analytics].[fn_Partition_Month_Calendar](
+        f.FunctionName,
+        DATEADD(MONTH, 1, cb.Current_Boundary),
+        DATEADD(MONTH, @MonthsAhead, cb.Current_Boundary)
+    ) c
+    WHERE c.Boundary_Exists = 0;
+
+    SET @Added = @@ROWCOUNT;
+
+    SELECT @Missing = STRING_AGG(f.FunctionName, ', ')
+    FROM @Functions f
+    WHERE NOT EXISTS (SELECT 1 FROM sys.partition_functions pf WHERE pf.name = f.FunctionName);
+
+    IF @Missing IS NOT NULL
+        PRINT 'Partition function not found: ' + @Missing;
+
+    IF @Added = 0
+    BEGIN
+        PRINT 'No new partition boundaries required.';
+        RETURN;
+    END
+
+    -- SPLIT is DDL (one statement per boundary); generate them all and run as one batch
+    SELECT @Sql = STRING_AGG(
+        CAST(N'ALTER PARTITION FUNCTION ' + QUOTENAME(n.FunctionName)
+            + N'() SPLIT RANGE (''' + CONVERT(NVARCHAR(10), n.Boundary, 120) + N''');'
+            + NCHAR(10) + N'PRINT ''Added boundary ' + CONVERT(NVARCHAR(10), n.Boundary, 120)
+            + N' to ' + n.FunctionName + N''';' AS NVARCHAR(MAX)),
+        NCHAR(10)) WITHIN GROUP (ORDER BY n.FunctionName, n.Boundary)
+    FROM #NewBoundaries n;
+
+    EXEC sp_executesql @Sql;
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Extend_Fact_Partitions]';
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Get_Partition_Range]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Get_Partition_Range];
+GO
+
+/**
+Script Name:   06_Create_Partition_Maintenance.sql
+Description:   Resolves the partition numbers of an Analytics table covering a date window.
+Author:        Sridhar Peddi
+Created:       2026-03-19
+
+Notes:
+- NULL dates mean the first/last partition.
+- Non-partitioned tables return 1 to 1 with @IsPartitioned = 0.
+
+Change Log:
+  2026-03-19  Sridhar Peddi    Initial creation (shared by columnstore + statistics maintenance)
+**/
+CREATE PROCEDURE [Analytics].[sp_Get_Partition_Range]
+    @TableName SYSNAME,
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL,
+    @FromPartition INT OUTPUT,
+    @ToPartition INT OUTPUT,
+    @IsPartitioned BIT OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
 
-    DECLARE @FuncName SYSNAME;
-    DECLARE @LastBoundary DATE;
-    DECLARE @CurrentBoundary DATE;
+    DECLARE @ObjectID INT = OBJECT_ID('[Analytics].' + QUOTENAME(@TableName));
+    DECLARE @FuncName SYSNAME = NULL;
     DECLARE @Sql NVARCHAR(4000);
-    DECLARE @i INT;
 
-    DECLARE func_cursor CURSOR FOR
-        SELECT FunctionName FROM @Functions;
+    SELECT @FuncName = pf.name
+    FROM sys.indexes i
+    INNER JOIN sys.partition_schemes ps
+        ON ps.data_space_id = i.data_space_id
+    INNER JOIN sys.partition_functions pf
+        ON pf.function_id = ps.function_id
+    WHERE i.object_id = @ObjectID
+      AND i.index_id IN (0, 1);
+
+    SET @IsPartitioned = CASE WHEN @FuncName IS NULL THEN 0 ELSE 1 END;
+    SET @FromPartition = 1;
+
+    SELECT @ToPartition = ISNULL(MAX(p.partition_number), 1)
+    FROM sys.partitions p
+    WHERE p.object_id = @ObjectID
+      AND p.index_id IN (0, 1);
+
+    IF @FuncName IS NOT NULL AND @FromDate IS NOT NULL
+    BEGIN
+        SET @Sql = N'SELECT @p = $PARTITION.' + QUOTENAME(@FuncName) + N'(@d);';
+        EXEC sp_executesql @Sql, N'@d DATE, @p INT OUTPUT', @d = @FromDate, @p = @FromPartition OUTPUT;
+    END
+
+    IF @FuncName IS NOT NULL AND @ToDate IS NOT NULL
+    BEGIN
+        SET @Sql = N'SELECT @p = $PARTITION.' + QUOTENAME(@FuncName) + N'(@d);';
+        EXEC sp_executesql @Sql, N'@d DATE, @p INT OUTPUT', @d = @ToDate, @p = @ToPartition OUTPUT;
+    END
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Get_Partition_Range]';
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Clear_Active_Window]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Clear_Active_Window];
+GO
+
+/**
+Script Name:   06_Create_Partition_Maintenance.sql
+Description:   Empties an Activity_Date window of a precomputed *_Active table before reload.
+Author:        Sridhar Peddi
+Created:       2026-03-28
+
+Notes:
+- Month partitions lying wholly inside the window are emptied with one
+  TRUNCATE TABLE ... WITH (PARTITIONS (...)) (metadata only, no row logging).
+- Part months at the window edges, and tables not (yet) partitioned, fall back to a
+  ranged DELETE on Activity_Date.
+- Works inside the caller's transaction (TRUNCATE is transactional), so loaders can
+  clear + insert atomically.
+- @RowsDeleted counts truncated rows from sys.partitions plus deleted rows.
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Initial creation
+**/
+CREATE PROCEDURE [Analytics].[sp_Clear_Active_Window]
+    @TableName SYSNAME,
+    @FromDate DATE,
+    @ToDate DATE,
+    @RowsDeleted INT = 0 OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ObjectID INT = OBJECT_ID('[Analytics].' + QUOTENAME(@TableName), 'U');
+    DECLARE @FuncName SYSNAME = NULL;
+    DECLARE @Partitions NVARCHAR(MAX) = NULL;
+    DECLARE @RowsTruncated BIGINT = 0;
+    DECLARE @RowsRanged INT = 0;
+    DECLARE @Sql NVARCHAR(MAX);
+
+    SET @RowsDeleted = 0;
+
+    IF @ObjectID IS NULL
+    BEGIN
+        RAISERROR('Table [Analytics].[%s] was not found.', 16, 1, @TableName);
+        RETURN;
+    END
+
+    IF @FromDate IS NULL OR @ToDate IS NULL OR @ToDate < @FromDate
+    BEGIN
+        RAISERROR('@FromDate and @ToDate are required and ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
 
-    OPEN func_cursor;
-    FETCH NEXT FROM func_cursor INTO @FuncName;
+    SELECT @FuncName = pf.name
+    FROM sys.indexes i
+    INNER JOIN sys.partition_schemes ps
+        ON ps.data_space_id = i.data_space_id
+    INNER JOIN sys.partition_functions pf
+        ON pf.function_id = ps.function_id
+    WHERE i.object_id = @ObjectID
+      AND i.index_id IN (0, 1);
 
-    WHILE @@FETCH_STATUS = 0
+    IF @FuncName IS NOT NULL
     BEGIN
-        IF EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = @FuncName)
+        -- A month's partition holds exactly that month when both its start and the
+        -- next month's start are boundaries (RANGE RIGHT).
+        SELECT
+            @Partitions = STRING_AGG(CAST(c.Partition_Number AS NVARCHAR(MAX)), N', ')
+                WITHIN GROUP (ORDER BY c.Partition_Number),
+            @RowsTruncated = SUM(r.Partition_Rows)
+        FROM [Analytics].[fn_Partition_Month_Calendar](@FuncName, @FromDate, @ToDate) c
+        INNER JOIN [Analytics].[fn_Partition_Month_Calendar](@FuncName, DATEADD(MONTH, 1, @FromDate), DATEADD(MONTH, 1, @ToDate)) n
+            ON n.Month_Start = c.Next_Month_Start
+           AND n.Boundary_Exists = 1
+        CROSS APPLY (
+            SELECT ISNULL(SUM(p.rows), 0) AS Partition_Rows
+            FROM sys.partitions p
+            WHERE p.object_id = @ObjectID
+              AND p.index_id IN (0, 1)
+              AND p.partition_number = c.Partition_Number
+        ) r
+        WHERE c.Boundary_Exists = 1
+          AND c.Month_Start >= @FromDate
+          AND c.Month_End <= @ToDate;
+
+        IF @Partitions IS NOT NULL
         BEGIN
-            SELECT @LastBoundary = MAX(TRY_CONVERT(DATE, prv.value))
-            FROM sys.partition_range_values prv
-            INNER JOIN sys.partition_functions pf
-                ON pf.function_id = prv.function_id
-            WHERE pf.name = @FuncName;
+            SET @Sql = N'TRUNCATE TABLE [Analytics].' + QUOTENAME(@TableName)
+                + N' WITH (PARTITIONS (' + @Partitions + N'));';
+            EXEC sp_executesql @Sql;
 
-            IF @LastBoundary IS NULL
-            BEGIN
-                SET @LastBoundary = DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1);
-            END
+            PRINT '  Truncated ' + @TableName + ' partitions (' + @Partitions + '): '
+                + CAST(@RowsTruncated AS VARCHAR(20)) + ' rows';
+        END
+    END
 
-            SET @CurrentBoundary = DATEFROMPARTS(YEAR(@LastBoundary), MONTH(@LastBoundary), 1);
+    -- Part months at the edges (or everything when not partitioned)
+    SET @Sql = N'DELETE FROM [Analytics].' + QUOTENAME(@TableName)
+        + N' WHERE [Activity_Date] >= @FromDate AND [Activity_Date] <= @ToDate;'
+        + N' SET @Rows = @@ROWCOUNT;';
+    EXEC sp_executesql @Sql,
+        N'@FromDate DATE, @ToDate DATE, @Rows INT OUTPUT',
+        @FromDate = @FromDate,
+        @ToDate = @ToDate,
+        @Rows = @RowsRanged OUTPUT;
 
-            IF @StartFrom IS NOT NULL AND @StartFrom > @CurrentBoundary
-            BEGIN
-                SET @CurrentBoundary = DATEFROMPARTS(YEAR(@StartFrom), MONTH(@StartFrom), 1);
-            END
+    SET @RowsDeleted = CAST(ISNULL(@RowsTruncated, 0) AS INT) + @RowsRanged;
+END
+GO
 
-            SET @i = 0;
-            WHILE @i < @MonthsAhead
-            BEGIN
-                SET @CurrentBoundary = DATEADD(MONTH, 1, @CurrentBoundary);
-
-                IF NOT EXISTS (
-                    SELECT 1
-                    FROM sys.partition_range_values prv
-                    INNER JOIN sys.partition_functions pf
-                        ON pf.function_id = prv.function_id
-                    WHERE pf.name = @FuncName
-                      AND TRY_CONVERT(DATE, prv.value) = @CurrentBoundary
-                )
-                BEGIN
-                    SET @Sql = N'ALTER PARTITION FUNCTION ' + QUOTENAME(@FuncName)
-                        + N'() SPLIT RANGE ('''
-                        + CONVERT(VARCHAR(10), @CurrentBoundary, 120) + N''');';
-                    EXEC sp_executesql @Sql;
-                    PRINT 'Added boundary ' + CONVERT(VARCHAR(10), @CurrentBoundary, 120)
-                        + ' to ' + @FuncName;
-                END
-                ELSE
-                BEGIN
-                    PRINT 'Boundary already exists for ' + @FuncName + ': '
-                        + CONVERT(VARCHAR(10), @CurrentBoundary, 120);
+PRINT '[OK] Created procedure: [Analytics].[sp_Clear_Active_Window]';
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Maintain_Fact_Columnstore]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Maintain_Fact_Columnstore];
+GO
+
+IF OBJECT_ID('[Analytics].[vw_Columnstore_Rowgroup_Health]', 'V') IS NOT NULL
+    DROP VIEW [Analytics].[vw_Columnstore_Rowgroup_Health];
+GO
+
+/**
+Script Name:   06_Create_Partition_Maintenance.sql
+Description:   Rowgroup health per partition for Analytics clustered columnstore tables.
+Author:        Sridhar Peddi
+Created:       2026-03-18
+
+Notes:
+- Rowgroup_Density_Pct = ideal rowgroups (CEILING(live compressed rows / 1,048,576))
+  / compressed rowgroups. 100 = fully packed; deleted rows lower the density.
+- Delta_Rowgroups = OPEN/CLOSED rowgroups still in the delta store.
+
+Change Log:
+  2026-03-18  Sridhar Peddi    Initial creation
+**/
+CREATE VIEW [Analytics].[vw_Columnstore_Rowgroup_Health]
+AS
+SELECT
+    g.Table_Name,
+    g.Object_ID,
+    g.Index_Name,
+    g.Partition_Number,
+    g.Compressed_Rowgroups,
+    g.Delta_Rowgroups,
+    g.Total_Rows,
+    g.Deleted_Rows,
+    g.Size_MB,
+    CAST(
+        CASE
+            WHEN g.Compressed_Rowgroups = 0 THEN 100.0
+            WHEN g.Compressed_Rows - g.Deleted_Rows <= 0 THEN 100.0 / g.Compressed_Rowgroups
+            ELSE 100.0 * CEILING((g.Compressed_Rows - g.Deleted_Rows) / 1048576.0) / g.Compressed_Rowgroups
+        END
+    AS DECIMAL(5,2)) AS Rowgroup_Density_Pct,
+    CAST(
+        CASE WHEN g.Total_Rows = 0 THEN 0 ELSE 100.0 * g.Deleted_Rows / g.Total_Rows END
+    AS DECIMAL(5,2)) AS Deleted_Pct
+FROM (
+    SELECT
+        o.name AS Table_Name,
+        rg.object_id AS Object_ID,
+        i.name AS Index_Name,
+        rg.partition_number AS Partition_Number,
+        SUM(CASE WHEN rg.state_desc = 'COMPRESSED' THEN 1 ELSE 0 END) AS Compressed_Rowgroups,
+        SUM(CASE WHEN rg.state_desc IN ('OPEN', 'CLOSED') THEN 1 ELSE 0 END) AS Delta_Rowgroups,
+        SUM(CASE WHEN rg.state_desc = 'COMPRESSED' THEN CAST(rg.total_rows AS BIGINT) ELSE 0 END) AS Compressed_Rows,
+        SUM(CAST(rg.total_rows AS BIGINT)) AS Total_Rows,
+        SUM(CAST(ISNULL(rg.deleted_rows, 0) AS BIGINT)) AS Deleted_Rows,
+        CAST(SUM(CAST(ISNULL(rg.size_in_bytes, 0) AS BIGINT)) / 1048576.0 AS DECIMAL(18,2)) AS Size_MB
+    FROM sys.dm_db_column_store_row_group_physical_stats rg
+    INNER JOIN sys.indexes i
+        ON i.object_id = rg.object_id
+       AND i.index_id = rg.index_id
+       AND i.type = 5  -- clustered columnstore
+    INNER JOIN sys.objects o
+        ON o.object_id = rg.object_id
+    WHERE o.schema_id = SCHEMA_ID('Analytics')
+      AND rg.state_desc <> 'TOMBSTONE'
+    GROUP BY
+        o.name,
+        rg.object_id,
+        i.name,
+        rg.partition_number
+) g;
+GO
+
+PRINT '[OK] Created view: [Analytics].[vw_Columnstore_Rowgroup_Health]';
+GO
+
+/**
+Script Name:   06_Create_Partition_Maintenance.sql
+Description:   Reorganizes or rebuilds IP/OP/AE fact columnstore partitions whose
+               rowgroup quality has degraded (window reloads leave trimmed/open
+               rowgroups and deleted bitmaps).
+Author:        Sridhar Peddi
+Created:       2026-03-18
+
+Notes:
+- REBUILD when density < @RebuildDensityPct or deleted rows >= @RebuildDeletedPct.
+- REORGANIZE (COMPRESS_ALL_ROW_GROUPS) when delta rowgroups exist,
+  density < @ReorganizeDensityPct or deleted rows >= @ReorganizeDeletedPct.
+- Healthy partitions are left alone.
+- @FromDate/@ToDate restrict the check to partitions covering that window (NULL = all).
+- Logs 'Before' health for every partition checked and 'After' for every partition
+  maintained to tbl_ETL_Performance_Metrics.
+- Run after fact loads (called by sp_Run_Fact_Loads_With_Enrichment).
+
+Change Log:
+  2026-03-18  Sridhar Peddi    Initial creation
+  2026-03-26  Sridhar Peddi    Include tbl_Bridge_Encounter_Diagnosis / _Procedure
+**/
+CREATE PROCEDURE [Analytics].[sp_Maintain_Fact_Columnstore]
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL,
+    @ReorganizeDensityPct DECIMAL(5,2) = 90,
+    @RebuildDensityPct DECIMAL(5,2) = 50,
+    @ReorganizeDeletedPct DECIMAL(5,2) = 10,
+    @RebuildDeletedPct DECIMAL(5,2) = 30
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @BatchName VARCHAR(100) = 'Maintain_Fact_Columnstore';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @TableName SYSNAME;
+    DECLARE @LogTableName VARCHAR(100);
+    DECLARE @IndexName SYSNAME;
+    DECLARE @PartitionNumber INT;
+    DECLARE @Action VARCHAR(20);
+    DECLARE @TotalRows BIGINT;
+    DECLARE @ActionStart DATETIME2;
+    DECLARE @FromPartition INT;
+    DECLARE @ToPartition INT;
+    DECLARE @Sql NVARCHAR(4000);
+    DECLARE @IsPartitioned BIT;
+    DECLARE @Maintained INT = 0;
+
+    IF @FromDate IS NOT NULL AND @ToDate IS NOT NULL AND @ToDate < @FromDate
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
+
+    IF @RebuildDensityPct > @ReorganizeDensityPct OR @RebuildDeletedPct < @ReorganizeDeletedPct
+    BEGIN
+        RAISERROR('Rebuild thresholds must be stricter than reorganize thresholds.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @Tables TABLE (TableName SYSNAME NOT NULL);
+    INSERT INTO @Tables (TableName)
+    VALUES ('tbl_Fact_IP_Activity'),
+           ('tbl_Fact_OP_Activity'),
+           ('tbl_Fact_AE_Activity'),
+           ('tbl_Bridge_Encounter_Diagnosis'),
+           ('tbl_Bridge_Encounter_Procedure');
+
+    IF OBJECT_ID('tempdb..#PartitionHealth') IS NOT NULL
+        DROP TABLE #PartitionHealth;
+
+    CREATE TABLE #PartitionHealth (
+        Table_Name SYSNAME NOT NULL,
+        Index_Name SYSNAME NOT NULL,
+        Partition_Number INT NOT NULL,
+        Is_Partitioned BIT NOT NULL,
+        Maintenance_Action VARCHAR(20) NULL,
+        PRIMARY KEY (Table_Name, Partition_Number)
+    );
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        -- 1. Resolve the partition range covering the window for each table
+        DECLARE table_cursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT TableName FROM @Tables;
+
+        OPEN table_cursor;
+        FETCH NEXT FROM table_cursor INTO @TableName;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            EXEC [Analytics].[sp_Get_Partition_Range]
+                @TableName = @TableName,
+                @FromDate = @FromDate,
+                @ToDate = @ToDate,
+                @FromPartition = @FromPartition OUTPUT,
+                @ToPartition = @ToPartition OUTPUT,
+                @IsPartitioned = @IsPartitioned OUTPUT;
+
+            INSERT INTO #PartitionHealth (Table_Name, Index_Name, Partition_Number, Is_Partitioned, Maintenance_Action)
+            SELECT
+                h.Table_Name,
+                h.Index_Name,
+                h.Partition_Number,
+                @IsPartitioned,
+                CASE
+                    WHEN h.Rowgroup_Density_Pct < @RebuildDensityPct
+                      OR h.Deleted_Pct >= @RebuildDeletedPct THEN 'REBUILD'
+                    WHEN h.Delta_Rowgroups > 0
+                      OR h.Rowgroup_Density_Pct < @ReorganizeDensityPct
+                      OR h.Deleted_Pct >= @ReorganizeDeletedPct THEN 'REORGANIZE'
                 END
+            FROM [Analytics].[vw_Columnstore_Rowgroup_Health] h
+            WHERE h.Table_Name = @TableName
+              AND h.Partition_Number >= @FromPartition
+              AND h.Partition_Number <= @ToPartition;
 
-                SET @i = @i + 1;
-            END
+            FETCH NEXT FROM table_cursor INTO @TableName;
+        END
+
+        CLOSE table_cursor;
+        DEALLOCATE table_cursor;
+
+        -- 2. Before snapshot (every partition checked)
+        INSERT INTO [Analytics].[tbl_ETL_Performance_Metrics] (
+            Batch_ID, Table_Name, Table_Size_MB, Rowgroup_Count, Compression_Type,
+            Partition_Number, Measurement_Phase, Row_Count, Deleted_Row_Count,
+            Delta_Rowgroup_Count, Rowgroup_Density_Pct, Maintenance_Action
+        )
+        SELECT
+            @BatchID,
+            'Analytics.' + h.Table_Name,
+            h.Size_MB,
+            h.Compressed_Rowgroups + h.Delta_Rowgroups,
+            'Columnstore',
+            h.Partition_Number,
+            'Before',
+            h.Total_Rows,
+            h.Deleted_Rows,
+            h.Delta_Rowgroups,
+            h.Rowgroup_Density_Pct,
+            p.Maintenance_Action
+        FROM #PartitionHealth p
+        INNER JOIN [Analytics].[vw_Columnstore_Rowgroup_Health] h
+            ON h.Table_Name = p.Table_Name
+           AND h.Partition_Number = p.Partition_Number;
+
+        PRINT 'Columnstore partitions checked: ' + CAST(@@ROWCOUNT AS VARCHAR(20));
+
+        -- 3. Maintain only the partitions below threshold
+        DECLARE partition_cursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT p.Table_Name, p.Index_Name, p.Partition_Number, p.Maintenance_Action, p.Is_Partitioned
+            FROM #PartitionHealth p
+            WHERE p.Maintenance_Action IS NOT NULL
+            ORDER BY p.Table_Name, p.Partition_Number;
+
+        OPEN partition_cursor;
+        FETCH NEXT FROM partition_cursor INTO @TableName, @IndexName, @PartitionNumber, @Action, @IsPartitioned;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            SET @ActionStart = CURRENT_TIMESTAMP;
+            SET @LogTableName = 'Analytics.' + @TableName;
+            SET @Sql = N'ALTER INDEX ' + QUOTENAME(@IndexName)
+                + N' ON [Analytics].' + QUOTENAME(@TableName) + N' ' + @Action
+                + CASE WHEN @IsPartitioned = 1
+                       THEN N' PARTITION = ' + CAST(@PartitionNumber AS NVARCHAR(10))
+                       ELSE N'' END
+                + CASE WHEN @Action = 'REORGANIZE'
+                       THEN N' WITH (COMPRESS_ALL_ROW_GROUPS = ON)'
+                       ELSE N'' END
+                + N';';
+
+            PRINT @Sql;
+            EXEC sp_executesql @Sql;
+
+            SELECT @TotalRows = h.Total_Rows
+            FROM [Analytics].[vw_Columnstore_Rowgroup_Health] h
+            WHERE h.Table_Name = @TableName
+              AND h.Partition_Number = @PartitionNumber;
+
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = @LogTableName,
+                @LoadType = @Action,
+                @RowsAffected = @TotalRows,
+                @Status = 'Success',
+                @StartDateTime = @ActionStart,
+                @PartitionID = @PartitionNumber;
+
+            SET @Maintained = @Maintained + 1;
+
+            FETCH NEXT FROM partition_cursor INTO @TableName, @IndexName, @PartitionNumber, @Action, @IsPartitioned;
+        END
+
+        CLOSE partition_cursor;
+        DEALLOCATE partition_cursor;
+
+        -- 4. After snapshot (maintained partitions only)
+        INSERT INTO [Analytics].[tbl_ETL_Performance_Metrics] (
+            Batch_ID, Table_Name, Table_Size_MB, Rowgroup_Count, Compression_Type,
+            Partition_Number, Measurement_Phase, Row_Count, Deleted_Row_Count,
+            Delta_Rowgroup_Count, Rowgroup_Density_Pct, Maintenance_Action
+        )
+        SELECT
+            @BatchID,
+            'Analytics.' + h.Table_Name,
+            h.Size_MB,
+            h.Compressed_Rowgroups + h.Delta_Rowgroups,
+            'Columnstore',
+            h.Partition_Number,
+            'After',
+            h.Total_Rows,
+            h.Deleted_Rows,
+            h.Delta_Rowgroups,
+            h.Rowgroup_Density_Pct,
+            p.Maintenance_Action
+        FROM #PartitionHealth p
+        INNER JOIN [Analytics].[vw_Columnstore_Rowgroup_Health] h
+            ON h.Table_Name = p.Table_Name
+           AND h.Partition_Number = p.Partition_Number
+        WHERE p.Maintenance_Action IS NOT NULL;
+
+        PRINT 'Columnstore partitions maintained: ' + CAST(@Maintained AS VARCHAR(20));
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = 0,
+            @RowsUpdated = @Maintained,
+            @RowsDeleted = 0,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Maintaining Fact Columnstore: ' + ISNULL(@ErrorMessage, '');
+
+        IF CURSOR_STATUS('local', 'table_cursor') >= -1
+        BEGIN
+            IF CURSOR_STATUS('local', 'table_cursor') >= 0
+                CLOSE table_cursor;
+            DEALLOCATE table_cursor;
         END
-        ELSE
+
+        IF CURSOR_STATUS('local', 'partition_cursor') >= -1
         BEGIN
-            PRINT 'Partition function not found: ' + @FuncName;
+            IF CURSOR_STATUS('local', 'partition_cursor') >= 0
+                CLOSE partition_cursor;
+            DEALLOCATE partition_cursor;
         END
 
-        FETCH NEXT FROM func_cursor INTO @FuncName;
+        IF @BatchID IS NOT NULL
+        BEGIN
+            SET @LogTableName = ISNULL('Analytics.' + @TableName, 'Analytics.tbl_Fact_*');
+
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = @LogTableName,
+                @LoadType = 'Maintenance',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage,
+                @PartitionID = @PartitionNumber;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = @Maintained,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Maintain_Fact_Columnstore]';
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Update_Fact_Statistics]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Update_Fact_Statistics];
+GO
+
+/**
+Script Name:   06_Create_Partition_Maintenance.sql
+Description:   Refreshes statistics on the facts and bridges after a load,
+               touching only the partitions covered by the load window.
+Author:        Sridhar Peddi
+Created:       2026-03-19
+
+Notes:
+- Incremental stats (STATISTICS_INCREMENTAL / INCREMENTAL = ON) on partitioned
+  tables: UPDATE STATISTICS ... WITH RESAMPLE ON PARTITIONS (window range).
+- Other stats: plain UPDATE STATISTICS (default sample), only when modified.
+- Columnstore index stats are skipped (no histogram).
+- @FromDate/@ToDate NULL = all partitions.
+- One sp_Log_Table_Load row per table with start/end timings.
+- Replaces the legacy "sp_Update_Statistics_All_Tables WITH FULLSCAN" approach.
+
+Change Log:
+  2026-03-19  Sridhar Peddi    Initial creation
+  2026-03-26  Sridhar Peddi    Include tbl_Bridge_Encounter_Diagnosis / _Procedure
+**/
+CREATE PROCEDURE [Analytics].[sp_Update_Fact_Statistics]
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @BatchName VARCHAR(100) = 'Update_Fact_Statistics';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @TableName SYSNAME;
+    DECLARE @LogTableName VARCHAR(100);
+    DECLARE @StatsName SYSNAME;
+    DECLARE @IsIncremental BIT;
+    DECLARE @IsPartitioned BIT;
+    DECLARE @FromPartition INT;
+    DECLARE @ToPartition INT;
+    DECLARE @TableStart DATETIME2;
+    DECLARE @TableStats INT;
+    DECLARE @TotalStats INT = 0;
+    DECLARE @Sql NVARCHAR(4000);
+
+    IF @FromDate IS NOT NULL AND @ToDate IS NOT NULL AND @ToDate < @FromDate
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
     END
 
-    CLOSE func_cursor;
-    DEALLOCATE func_cursor;
+    DECLARE @Tables TABLE (TableName SYSNAME NOT NULL);
+    INSERT INTO @Tables (TableName)
+    VALUES ('tbl_Fact_IP_Activity'),
+           ('tbl_Fact_OP_Activity'),
+           ('tbl_Fact_AE_Activity'),
+           ('tbl_Bridge_ERF_Activity'),
+           ('tbl_Bridge_OpPlan_MeasureSet'),
+           ('tbl_Bridge_CF_Segment_Patient_Snapshot'),
+           ('tbl_Bridge_Encounter_Diagnosis'),
+           ('tbl_Bridge_Encounter_Procedure');
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        DECLARE table_cursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT t.TableName
+            FROM @Tables t
+            WHERE OBJECT_ID('[Analytics].' + QUOTENAME(t.TableName), 'U') IS NOT NULL;
+
+        OPEN table_cursor;
+        FETCH NEXT FROM table_cursor INTO @TableName;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            SET @TableStart = SYSDATETIME();
+            SET @TableStats = 0;
+            SET @LogTableName = 'Analytics.' + @TableName;
+
+            EXEC [Analytics].[sp_Get_Partition_Range]
+                @TableName = @TableName,
+                @FromDate = @FromDate,
+                @ToDate = @ToDate,
+                @FromPartition = @FromPartition OUTPUT,
+                @ToPartition = @ToPartition OUTPUT,
+                @IsPartitioned = @IsPartitioned OUTPUT;
+
+            DECLARE stats_cursor CURSOR LOCAL FAST_FORWARD FOR
+                SELECT s.name, s.is_incremental
+                FROM sys.stats s
+                LEFT JOIN sys.indexes i
+                    ON i.object_id = s.object_id
+                   AND i.index_id = s.stats_id
+                OUTER APPLY sys.dm_db_stats_properties(s.object_id, s.stats_id) sp
+                WHERE s.object_id = OBJECT_ID('[Analytics].' + QUOTENAME(@TableName))
+                  AND ISNULL(i.type, 0) NOT IN (5, 6)  -- columnstore
+                  AND (
+                        s.is_incremental = 1
+                     OR sp.modification_counter IS NULL
+                     OR sp.modification_counter > 0
+                  );
+
+            OPEN stats_cursor;
+            FETCH NEXT FROM stats_cursor INTO @StatsName, @IsIncremental;
+
+            WHILE @@FETCH_STATUS = 0
+            BEGIN
+                SET @Sql = N'UPDATE STATISTICS [Analytics].' + QUOTENAME(@TableName)
+                    + N' (' + QUOTENAME(@StatsName) + N')'
+                    + CASE WHEN @IsIncremental = 1 AND @IsPartitioned = 1
+                           THEN N' WITH RESAMPLE ON PARTITIONS ('
+                                + CAST(@FromPartition AS NVARCHAR(10)) + N' TO '
+                                + CAST(@ToPartition AS NVARCHAR(10)) + N')'
+                           ELSE N'' END
+                    + N';';
+
+                EXEC sp_executesql @Sql;
+                SET @TableStats = @TableStats + 1;
+
+                FETCH NEXT FROM stats_cursor INTO @StatsName, @IsIncremental;
+            END
+
+            CLOSE stats_cursor;
+            DEALLOCATE stats_cursor;
+
+            PRINT @LogTableName + ': ' + CAST(@TableStats AS VARCHAR(10)) + ' statistics updated'
+                + CASE WHEN @IsPartitioned = 1
+                       THEN ' (partitions ' + CAST(@FromPartition AS VARCHAR(10))
+                            + '-' + CAST(@ToPartition AS VARCHAR(10)) + ')'
+                       ELSE '' END;
+
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = @LogTableName,
+                @LoadType = 'Statistics',
+                @RowsAffected = @TableStats,
+                @Status = 'Success',
+                @StartDateTime = @TableStart,
+                @EndDateTime = NULL;
+
+            SET @TotalStats = @TotalStats + @TableStats;
+
+            FETCH NEXT FROM table_cursor INTO @TableName;
+        END
+
+        CLOSE table_cursor;
+        DEALLOCATE table_cursor;
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = 0,
+            @RowsUpdated = @TotalStats,
+            @RowsDeleted = 0,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Updating Fact Statistics: ' + ISNULL(@ErrorMessage, '');
+
+        IF CURSOR_STATUS('local', 'stats_cursor') >= -1
+        BEGIN
+            IF CURSOR_STATUS('local', 'stats_cursor') >= 0
+                CLOSE stats_cursor;
+            DEALLOCATE stats_cursor;
+        END
+
+        IF CURSOR_STATUS('local', 'table_cursor') >= -1
+        BEGIN
+            IF CURSOR_STATUS('local', 'table_cursor') >= 0
+                CLOSE table_cursor;
+            DEALLOCATE table_cursor;
+        END
+
+        IF @BatchID IS NOT NULL
+        BEGIN
+            SET @LogTableName = ISNULL(@LogTableName, 'Analytics.tbl_Fact_*');
+
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = @LogTableName,
+                @LoadType = 'Statistics',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage,
+                @StartDateTime = @TableStart;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = @TotalStats,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
 END
 GO
 
-PRINT '[OK] Created procedure: [Analytics].[sp_Extend_Fact_Partitions]';
+PRINT '[OK] Created procedure: [Analytics].[sp_Update_Fact_Statistics]';
 GO
@@ -8,6 +8,7 @@ GO
 PRINT '>>> Incremental: OpPlan Active deployment';
 
 -- DDL (create-if-missing / alter)
+:r H:\sql\analytics_platform\01_dimensions\36_Create_Dim_OpPlan_MeasureSet_Hash.sql
 :r H:\sql\analytics_platform\03_bridges\06_Create_tbl_OpPlan_Active.sql
 
 -- Stored procedures (drop + create)
@@ -13,8 +13,14 @@ PRINT '========================================';
 GO
 
 -- Recreate stored procedures (safe to re-run)
+:r H:\sql\analytics_platform\00_setup\16_Create_Month_Calendar_Functions.sql
 :r H:\sql\analytics_platform\04_etl\25_sp_Load_Ref_CF_Code_Lookup.sql
 :r H:\sql\analytics_platform\03_bridges\01f_Create_tbl_Bridge_CF_Segment_Patient_Snapshot.sql
+:r H:\sql\analytics_platform\03_bridges\01g_Create_tbl_Ref_CF_Segment_Rule_ICD10_Prefix.sql
+:r H:\sql\analytics_platform\04_etl\30_sp_Compile_CF_Segment_Rule_ICD10.sql
+-- Diagnosis bridge loader (CF snapshot reads tbl_Bridge_Encounter_Diagnosis).
+-- First deploy only: 03_bridges\07/08_Create_tbl_Bridge_Encounter_* (they drop + recreate).
+:r H:\sql\analytics_platform\04_etl\31_sp_Load_Bridge_Encounter_Codes.sql
 :r H:\sql\analytics_platform\04_etl\26_sp_Load_Bridge_CF_Segment_Patient_Snapshot.sql
 
 PRINT '[OK] Incremental deploy complete';
@@ -0,0 +1,180 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating patient sketch functions';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Patient_Sketch_Estimate]', 'FN') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Patient_Sketch_Estimate];
+IF OBJECT_ID('[Analytics].[fn_Patient_Sketch_Merge]', 'FN') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Patient_Sketch_Merge];
+IF OBJECT_ID('[Analytics].[fn_Patient_Sketch_Registers]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Patient_Sketch_Registers];
+IF OBJECT_ID('[Analytics].[fn_Patient_Sketch_Register]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Patient_Sketch_Register];
+GO
+
+/**
+Script Name:   14_Create_Patient_Sketch_Functions.sql
+Description:   HyperLogLog helpers for approximate distinct patient counts.
+               Maps a patient to its sketch register (index + rank).
+Author:        Sridhar Peddi
+Created:       2026-03-16
+
+Notes:
+- Sketch layout: 1024 registers (precision 10), one byte per register,
+  stored as VARBINARY(1024). Register N lives at byte N + 1.
+- Hash: SHA2_256 of the 8-byte SK_PatientID. Bytes 1-2 pick the register
+  (low 10 bits), bytes 3-6 give the 32-bit word used for the rank.
+- Standard error at this precision is ~3.25%.
+- Inline TVF so the loader can CROSS APPLY it without per-row UDF calls.
+
+Change Log:
+  2026-03-16  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Patient_Sketch_Register]
+(
+    @SK_PatientID BIGINT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT
+        CAST(CAST(SUBSTRING(h.Hash_Value, 1, 2) AS INT) % 1024 AS SMALLINT) AS Register_Index,
+        CAST(
+            CASE
+                WHEN w.Hash_Word = 0 THEN 33
+                -- Rank = position of the first 1-bit in the 32-bit word.
+                -- The epsilon guards LOG() rounding just below exact powers of 2.
+                ELSE 32 - FLOOR(LOG(w.Hash_Word, 2) + 1e-12)
+            END AS TINYINT
+        ) AS Register_Value
+    FROM (
+        SELECT HASHBYTES('SHA2_256', CAST(@SK_PatientID AS BINARY(8))) AS Hash_Value
+    ) h
+    CROSS APPLY (
+        SELECT CAST(0x00000000 + SUBSTRING(h.Hash_Value, 3, 4) AS BIGINT) AS Hash_Word
+    ) w;
+GO
+
+/**
+Script Name:   14_Create_Patient_Sketch_Functions.sql
+Description:   Expands a patient sketch into its 1024 registers.
+Author:        Sridhar Peddi
+Created:       2026-03-16
+
+Change Log:
+  2026-03-16  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Patient_Sketch_Registers]
+(
+    @Sketch VARBINARY(1024)
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT
+        CAST(n.Register_Index AS SMALLINT) AS Register_Index,
+        CAST(ISNULL(CAST(SUBSTRING(@Sketch, n.Register_Index + 1, 1) AS TINYINT), 0) AS TINYINT) AS Register_Value
+    FROM (
+        SELECT a.n * 256 + b.n * 16 + c.n AS Register_Index
+        FROM (VALUES (0),(1),(2),(3)) a(n)
+        CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9),(10),(11),(12),(13),(14),(15)) b(n)
+        CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9),(10),(11),(12),(13),(14),(15)) c(n)
+    ) n
+    WHERE @Sketch IS NOT NULL;
+GO
+
+/**
+Script Name:   14_Create_Patient_Sketch_Functions.sql
+Description:   Merges two patient sketches (register-wise MAX).
+               Merge is associative, so sketches can be rolled up in any order.
+Author:        Sridhar Peddi
+Created:       2026-03-16
+
+Change Log:
+  2026-03-16  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Patient_Sketch_Merge]
+(
+    @SketchA VARBINARY(1024),
+    @SketchB VARBINARY(1024)
+)
+RETURNS VARBINARY(1024)
+AS
+BEGIN
+    IF @SketchA IS NULL RETURN @SketchB;
+    IF @SketchB IS NULL RETURN @SketchA;
+
+    DECLARE @Hex VARCHAR(2048);
+
+    SELECT @Hex = STRING_AGG(
+        CONVERT(VARCHAR(2), CAST(
+            CASE WHEN a.Register_Value >= b.Register_Value THEN a.Register_Value ELSE b.Register_Value END
+        AS BINARY(1)), 2),
+        ''
+    ) WITHIN GROUP (ORDER BY a.Register_Index)
+    FROM [Analytics].[fn_Patient_Sketch_Registers](@SketchA) a
+    INNER JOIN [Analytics].[fn_Patient_Sketch_Registers](@SketchB) b
+        ON b.Register_Index = a.Register_Index;
+
+    RETURN CONVERT(VARBINARY(1024), @Hex, 2);
+END
+GO
+
+/**
+Script Name:   14_Create_Patient_Sketch_Functions.sql
+Description:   Approximate distinct patient count for a (merged) sketch.
+Author:        Sridhar Peddi
+Created:       2026-03-16
+
+Notes:
+- HyperLogLog raw estimate with linear counting for small cardinalities.
+- Returns 0 for NULL/empty sketches.
+
+Change Log:
+  2026-03-16  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Patient_Sketch_Estimate]
+(
+    @Sketch VARBINARY(1024)
+)
+RETURNS BIGINT
+AS
+BEGIN
+    DECLARE @m FLOAT = 1024;
+    DECLARE @Harmonic FLOAT;
+    DECLARE @ZeroRegisters INT;
+    DECLARE @Estimate FLOAT;
+
+    IF @Sketch IS NULL RETURN 0;
+
+    SELECT
+        @Harmonic = SUM(POWER(CAST(2 AS FLOAT), -CAST(r.Register_Value AS INT))),
+        @ZeroRegisters = SUM(CASE WHEN r.Register_Value = 0 THEN 1 ELSE 0 END)
+    FROM [Analytics].[fn_Patient_Sketch_Registers](@Sketch) r;
+
+    IF @ZeroRegisters = @m RETURN 0;
+
+    SET @Estimate = (0.7213 / (1 + 1.079 / @m)) * @m * @m / @Harmonic;
+
+    IF @Estimate <= 2.5 * @m AND @ZeroRegisters > 0
+        SET @Estimate = @m * LOG(@m / @ZeroRegisters);
+
+    RETURN CAST(ROUND(@Estimate, 0) AS BIGINT);
+END
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Patient_Sketch_Register]';
+PRINT '[OK] Created function: [Analytics].[fn_Patient_Sketch_Registers]';
+PRINT '[OK] Created function: [Analytics].[fn_Patient_Sketch_Merge]';
+PRINT '[OK] Created function: [Analytics].[fn_Patient_Sketch_Estimate]';
+GO
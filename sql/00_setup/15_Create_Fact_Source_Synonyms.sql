@@ -0,0 +1,191 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating fact source synonyms';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+/**
+Script Name:   15_Create_Fact_Source_Synonyms.sql
+Description:   Synonyms, run work tables and source functions through which the precompute
+               and fact loaders read the Unified encounter tables.
+Author:        Sridhar Peddi
+Created:       2026-03-23
+
+Notes:
+- The synonyms always point at [Data_Lab_SWL].[Unified]; nothing re-points them at run time,
+  so ad-hoc queries, validation and standalone loads always see all of Unified.
+- [Analytics].[tbl_Work_*_Source] hold the window extracted once by an orchestrated run
+  (sp_Extract_Fact_Source_Window). They are permanent (truncated after each run) so the
+  functions below stay bound to them.
+- [Analytics].[fn_Src_*_Encounter](@UseWorkSource) is what the loaders read: Unified when 0,
+  the work table when 1. Each branch carries its own @UseWorkSource predicate, so only one
+  is executed (startup filter).
+- Only a session holding the 'Analytics.Fact_Source_Window' applock (sp_Run_Fact_Loads_With_Enrichment)
+  may pass @UseWorkSource = 1; the loaders check this.
+- Work tables are created without the IDENTITY property (the join in the SELECT INTO) so the
+  extract can INSERT ... SELECT * into them.
+- Re-running this script keeps existing work tables; sp_Extract_Fact_Source_Window rebuilds them
+  (and refreshes the functions) when the Unified columns change.
+
+Change Log:
+  2026-03-23  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Synonyms are no longer re-pointed; permanent work tables + fn_Src_*_Encounter
+**/
+
+IF OBJECT_ID('[Analytics].[syn_Src_IP_Encounter]', 'SN') IS NOT NULL
+    DROP SYNONYM [Analytics].[syn_Src_IP_Encounter];
+CREATE SYNONYM [Analytics].[syn_Src_IP_Encounter]
+    FOR [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active];
+GO
+
+IF OBJECT_ID('[Analytics].[syn_Src_OP_Encounter]', 'SN') IS NOT NULL
+    DROP SYNONYM [Analytics].[syn_Src_OP_Encounter];
+CREATE SYNONYM [Analytics].[syn_Src_OP_Encounter]
+    FOR [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active];
+GO
+
+IF OBJECT_ID('[Analytics].[syn_Src_ED_Encounter]', 'SN') IS NOT NULL
+    DROP SYNONYM [Analytics].[syn_Src_ED_Encounter];
+CREATE SYNONYM [Analytics].[syn_Src_ED_Encounter]
+    FOR [Data_Lab_SWL].[Unified].[tbl_ED_EncounterDenormalised_Active];
+GO
+
+PRINT '[OK] Created synonym: [Analytics].[syn_Src_IP_Encounter]';
+PRINT '[OK] Created synonym: [Analytics].[syn_Src_OP_Encounter]';
+PRINT '[OK] Created synonym: [Analytics].[syn_Src_ED_Encounter]';
+GO
+
+-------------------------------------------------------------------------------
+-- Work tables (empty; filled per run by sp_Extract_Fact_Source_Window)
+-------------------------------------------------------------------------------
+
+IF OBJECT_ID('[Analytics].[tbl_Work_IP_Source]', 'U') IS NULL
+BEGIN
+    SELECT TOP (0) src.*
+    INTO [Analytics].[tbl_Work_IP_Source]
+    FROM [Analytics].[syn_Src_IP_Encounter] src
+    LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+    CREATE CLUSTERED INDEX IX_Work_IP_Source_Encounter
+        ON [Analytics].[tbl_Work_IP_Source] (SK_EncounterID);
+    CREATE NONCLUSTERED INDEX IX_Work_IP_Source_Date
+        ON [Analytics].[tbl_Work_IP_Source] (End_Date_Hospital_Provider_Spell);
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Work_IP_Source]';
+END
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Work_OP_Source]', 'U') IS NULL
+BEGIN
+    SELECT TOP (0) src.*
+    INTO [Analytics].[tbl_Work_OP_Source]
+    FROM [Analytics].[syn_Src_OP_Encounter] src
+    LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+    CREATE CLUSTERED INDEX IX_Work_OP_Source_Encounter
+        ON [Analytics].[tbl_Work_OP_Source] (SK_EncounterID);
+    CREATE NONCLUSTERED INDEX IX_Work_OP_Source_Date
+        ON [Analytics].[tbl_Work_OP_Source] (Appointment_Date);
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Work_OP_Source]';
+END
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Work_ED_Source]', 'U') IS NULL
+BEGIN
+    SELECT TOP (0) src.*
+    INTO [Analytics].[tbl_Work_ED_Source]
+    FROM [Analytics].[syn_Src_ED_Encounter] src
+    LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+    CREATE CLUSTERED INDEX IX_Work_ED_Source_Encounter
+        ON [Analytics].[tbl_Work_ED_Source] (SK_EncounterID);
+    CREATE NONCLUSTERED INDEX IX_Work_ED_Source_Date
+        ON [Analytics].[tbl_Work_ED_Source] (Arrival_Date);
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Work_ED_Source]';
+END
+GO
+
+-------------------------------------------------------------------------------
+-- Source functions (Unified or the run's work table, chosen by the caller)
+-------------------------------------------------------------------------------
+
+IF OBJECT_ID('[Analytics].[fn_Src_IP_Encounter]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Src_IP_Encounter];
+GO
+
+CREATE FUNCTION [Analytics].[fn_Src_IP_Encounter]
+(
+    @UseWorkSource BIT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT src.*
+    FROM [Analytics].[syn_Src_IP_Encounter] src
+    WHERE @UseWorkSource = 0
+
+    UNION ALL
+
+    SELECT w.*
+    FROM [Analytics].[tbl_Work_IP_Source] w
+    WHERE @UseWorkSource = 1;
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Src_OP_Encounter]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Src_OP_Encounter];
+GO
+
+CREATE FUNCTION [Analytics].[fn_Src_OP_Encounter]
+(
+    @UseWorkSource BIT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT src.*
+    FROM [Analytics].[syn_Src_OP_Encounter] src
+    WHERE @UseWorkSource = 0
+
+    UNION ALL
+
+    SELECT w.*
+    FROM [Analytics].[tbl_Work_OP_Source] w
+    WHERE @UseWorkSource = 1;
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Src_ED_Encounter]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Src_ED_Encounter];
+GO
+
+CREATE FUNCTION [Analytics].[fn_Src_ED_Encounter]
+(
+    @UseWorkSource BIT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT src.*
+    FROM [Analytics].[syn_Src_ED_Encounter] src
+    WHERE @UseWorkSource = 0
+
+    UNION ALL
+
+    SELECT w.*
+    FROM [Analytics].[tbl_Work_ED_Source] w
+    WHERE @UseWorkSource = 1;
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Src_IP_Encounter]';
+PRINT '[OK] Created function: [Analytics].[fn_Src_OP_Encounter]';
+PRINT '[OK] Created function: [Analytics].[fn_Src_ED_Encounter]';
+GO
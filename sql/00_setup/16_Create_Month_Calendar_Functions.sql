@@ -0,0 +1,126 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating month calendar functions';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Partition_Month_Calendar]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Partition_Month_Calendar];
+IF OBJECT_ID('[Analytics].[fn_Month_Calendar]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Month_Calendar];
+GO
+
+/**
+Script Name:   16_Create_Month_Calendar_Functions.sql
+Description:   One row per calendar month from @FromDate's month through @ToDate's month,
+               with YYYYMM key, month bounds and NHS financial year.
+Author:        Sridhar Peddi
+Created:       2026-03-27
+
+Notes:
+- Inline TVF: loaders join/CROSS APPLY it so per-month work is one set-based statement
+  (no WHILE month loops or month cursors).
+- Months are generated from a digit tally (up to 10,000), so ranges beyond the date
+  dimension still return rows; Dim_Date attributes ([Dictionary].[dbo].[Dates], the
+  source of vw_Dim_Date) are LEFT JOINed on the month start.
+- NULL or reversed dates return no rows.
+
+Change Log:
+  2026-03-27  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Month_Calendar]
+(
+    @FromDate DATE,
+    @ToDate DATE
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT
+        YEAR(m.Month_Start) * 100 + MONTH(m.Month_Start) AS Month_Key,
+        m.Month_Start,
+        EOMONTH(m.Month_Start) AS Month_End,
+        DATEADD(MONTH, 1, m.Month_Start) AS Next_Month_Start,
+        YEAR(m.Month_Start) AS Calendar_Year,
+        MONTH(m.Month_Start) AS Calendar_Month,
+        CASE WHEN MONTH(m.Month_Start) >= 4 THEN YEAR(m.Month_Start) ELSE YEAR(m.Month_Start) - 1 END AS Fin_Year_Start,
+        d.[SK_Date] AS Month_Start_SK_Date,
+        d.[FiscalCalendarYearName]
+    FROM (
+        SELECT DATEADD(MONTH, t.n, DATEFROMPARTS(YEAR(@FromDate), MONTH(@FromDate), 1)) AS Month_Start
+        FROM (
+            SELECT a.n * 1000 + b.n * 100 + c.n * 10 + e.n AS n
+            FROM (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9)) a(n)
+            CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9)) b(n)
+            CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9)) c(n)
+            CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7),(8),(9)) e(n)
+        ) t
+        WHERE t.n <= DATEDIFF(MONTH, @FromDate, @ToDate)
+    ) m
+    LEFT JOIN [Dictionary].[dbo].[Dates] d
+        ON d.[FullDate] = m.Month_Start;
+GO
+
+/**
+Script Name:   16_Create_Month_Calendar_Functions.sql
+Description:   fn_Month_Calendar for a partition function: each month flags whether its
+               start is already a boundary and the partition number it maps to.
+Author:        Sridhar Peddi
+Created:       2026-03-27
+
+Notes:
+- Monthly partition functions are RANGE RIGHT on DATE, so a month's partition number is
+  1 + the number of boundaries on or before its first day.
+- Unknown function name returns every month with Boundary_Exists = 0 and Partition_Number = 1.
+
+Change Log:
+  2026-03-27  Sridhar Peddi    Initial creation
+**/
+CREATE FUNCTION [Analytics].[fn_Partition_Month_Calendar]
+(
+    @FunctionName SYSNAME,
+    @FromDate DATE,
+    @ToDate DATE
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT
+        c.Month_Key,
+        c.Month_Start,
+        c.Month_End,
+        c.Next_Month_Start,
+        CAST(CASE WHEN b.Boundary_Hit > 0 THEN 1 ELSE 0 END AS BIT) AS Boundary_Exists,
+        b.Boundaries_Before + 1 AS Partition_Number
+    FROM [Analytics].[fn_Month_Calendar](@FromDate, @ToDate) c
+    OUTER APPLY (
+        SELECT
+            COUNT(*) AS Boundaries_Before,
+            SUM(CASE WHEN CONVERT(DATE, prv.value) = c.Month_Start THEN 1 ELSE 0 END) AS Boundary_Hit
+        FROM sys.partition_range_values prv
+        INNER JOIN sys.partition_functions pf
+            ON pf.function_id = prv.function_id
+        WHERE pf.name = @FunctionName
+          AND CONVERT(DATE, prv.value) <= c.Month_Start
+    ) b;
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Month_Calendar]';
+PRINT '[OK] Created function: [Analytics].[fn_Partition_Month_Calendar]';
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'Month calendar functions created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
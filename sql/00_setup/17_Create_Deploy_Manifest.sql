@@ -0,0 +1,62 @@
+/**
+-- Script Name: 17_Create_Deploy_Manifest.sql
+-- Description: Deployed-script manifest for scripts/deploy_sqlcmd_parallel.py.
+--              One row per manifest step (an :r script or an inline block) holding the
+--              SHA-256 of its normalised text (comments stripped, whitespace collapsed,
+--              $(Var) substituted) and the objects it creates. With --incremental the
+--              deployer only reruns steps whose hash changed, whose objects are missing
+--              or were altered outside a deployment, and the steps that depend on them.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-28
+
+-- Notes:
+--   Created only if missing - a full deploy must not wipe the deployment history.
+--   Delete a row (or run the deployer with --force) to redeploy a script regardless of its hash.
+
+-- Change Log:
+-- 2026-03-28   | Sridhar Peddi    | Initial creation
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating Deploy Manifest';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Deploy_Manifest]', 'U') IS NULL
+BEGIN
+    CREATE TABLE [Analytics].[tbl_Deploy_Manifest] (
+        [Script_Name] NVARCHAR(400) NOT NULL,            -- '04_etl/10_sp_Load_Fact_IP_Activity.sql', '00_Run_Everything_SQLCMD.sql:58'
+        [Definition_Hash] CHAR(64) NOT NULL,             -- SHA-256 (hex) of the normalised step text
+        [Created_Objects] NVARCHAR(MAX) NULL,            -- comma list: 'analytics.sp_load_fact_ip_activity'
+        [Batch_Count] INT NOT NULL,
+        [Duration_Seconds] DECIMAL(10,2) NULL,
+
+        [Deployed_DateTime] DATETIME2 NOT NULL DEFAULT SYSDATETIME(),
+        [Deployed_By] NVARCHAR(128) NOT NULL DEFAULT SUSER_SNAME(),
+        [Host_Name] NVARCHAR(128) NOT NULL DEFAULT HOST_NAME(),
+
+        CONSTRAINT [PK_Deploy_Manifest] PRIMARY KEY CLUSTERED ([Script_Name])
+    ) ON [PRIMARY];
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Deploy_Manifest]';
+END
+ELSE
+BEGIN
+    PRINT '[OK] Table [Analytics].[tbl_Deploy_Manifest] already exists (history kept)';
+END
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'Deploy Manifest Complete';
+PRINT '========================================';
+GO
@@ -55,6 +55,11 @@ CREATE UNIQUE INDEX [UQ_Dim_OpPlan_MeasureSet_Hash]
     ON [Analytics].[tbl_Dim_OpPlan_MeasureSet] ([SetHash], [MeasureIds]);
 GO
 
+-- SKs restart with the table: clear the hash dictionary (36_Create_Dim_OpPlan_MeasureSet_Hash.sql)
+IF OBJECT_ID('[Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]', 'U') IS NOT NULL
+    TRUNCATE TABLE [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash];
+GO
+
 PRINT '[OK] Created table: [Analytics].[tbl_Dim_OpPlan_MeasureSet]';
 PRINT '[OK] Inserted default "Unknown" member (SK_OpPlan_MeasureSet = -1)';
 GO
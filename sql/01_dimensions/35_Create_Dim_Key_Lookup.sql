@@ -0,0 +1,108 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating Dim Key Lookup cache';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+/**
+Script Name:   35_Create_Dim_Key_Lookup.sql
+Description:   Persistent surrogate-key lookup cache for the fact loaders.
+               One row per (lookup, normalised code) -> SK, plus a date -> SK_Date table.
+               Rebuilt by [Analytics].[sp_Refresh_Dim_Key_Lookup] after dimension loads and
+               checked (changed lookups only) by the IP/OP/AE fact loaders before each load.
+Author:        Sridhar Peddi
+Created:       2026-03-20
+
+Notes:
+- Codes are stored already normalised (trimmed, '00' provider suffix rule applied
+  by the loaders on the source side, INT-matched codes stored as canonical INT text),
+  so the fact INSERT joins are plain clustered-key seeks with no view expansion.
+- Duplicate codes in a dimension resolve to MIN(SK), matching the previous temp maps.
+- Age band needs no lookup: SK_Age_BandID is the capped age itself.
+- Lookup_Code is VARCHAR(100), the width the refresh stages every dimension code at
+  (widest dimension code column is 50), so no code is truncated or dropped.
+
+Change Log:
+  2026-03-20  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Widen Lookup_Code VARCHAR(20) -> VARCHAR(100) (migrates existing table)
+**/
+
+-------------------------------------------------------------------------------
+-- Create tables IF NOT EXISTS (contents are derived; refresh repopulates)
+-------------------------------------------------------------------------------
+
+IF OBJECT_ID('[Analytics].[tbl_Dim_Key_Lookup]', 'U') IS NULL
+BEGIN
+    PRINT 'Creating table [Analytics].[tbl_Dim_Key_Lookup]...';
+
+    CREATE TABLE [Analytics].[tbl_Dim_Key_Lookup]
+    (
+        Lookup_Name VARCHAR(40) NOT NULL,           -- 'Provider', 'GPPractice_PCN', 'POD_IP', ...
+        Lookup_Code VARCHAR(100) NOT NULL,          -- normalised business code
+        SK_ID INT NOT NULL,
+        Refreshed_DateTime DATETIME2 NOT NULL DEFAULT GETDATE(),
+
+        CONSTRAINT PK_Dim_Key_Lookup PRIMARY KEY CLUSTERED (Lookup_Name, Lookup_Code)
+    );
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Dim_Key_Lookup]';
+END
+ELSE
+BEGIN
+    PRINT '[INFO] Table [Analytics].[tbl_Dim_Key_Lookup] already exists.';
+END
+GO
+
+-- Migrate: Lookup_Code was VARCHAR(20), which silently dropped longer codes
+IF EXISTS (
+    SELECT 1
+    FROM sys.columns
+    WHERE object_id = OBJECT_ID('[Analytics].[tbl_Dim_Key_Lookup]')
+      AND name = 'Lookup_Code'
+      AND max_length < 100
+)
+BEGIN
+    ALTER TABLE [Analytics].[tbl_Dim_Key_Lookup] DROP CONSTRAINT PK_Dim_Key_Lookup;
+    ALTER TABLE [Analytics].[tbl_Dim_Key_Lookup] ALTER COLUMN Lookup_Code VARCHAR(100) NOT NULL;
+    ALTER TABLE [Analytics].[tbl_Dim_Key_Lookup]
+        ADD CONSTRAINT PK_Dim_Key_Lookup PRIMARY KEY CLUSTERED (Lookup_Name, Lookup_Code);
+
+    PRINT '[OK] Widened [Analytics].[tbl_Dim_Key_Lookup].Lookup_Code to VARCHAR(100) (run sp_Refresh_Dim_Key_Lookup to add the previously dropped codes)';
+END
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Dim_Date_Key_Lookup]', 'U') IS NULL
+BEGIN
+    PRINT 'Creating table [Analytics].[tbl_Dim_Date_Key_Lookup]...';
+
+    CREATE TABLE [Analytics].[tbl_Dim_Date_Key_Lookup]
+    (
+        FullDate DATE NOT NULL,
+        SK_Date INT NOT NULL,
+
+        CONSTRAINT PK_Dim_Date_Key_Lookup PRIMARY KEY CLUSTERED (FullDate)
+    );
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Dim_Date_Key_Lookup]';
+END
+ELSE
+BEGIN
+    PRINT '[INFO] Table [Analytics].[tbl_Dim_Date_Key_Lookup] already exists.';
+END
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'Dim Key Lookup cache Created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
@@ -0,0 +1,77 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating OpPlan measure-set hash dictionary';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+/**
+Script Name:   36_Create_Dim_OpPlan_MeasureSet_Hash.sql
+Description:   Persistent SetHash -> SK_OpPlan_MeasureSet dictionary for tbl_Dim_OpPlan_MeasureSet.
+               One narrow BINARY(32) clustered key per known measure set, so sp_Load_OpPlan_Active
+               resolves known sets with a seek and only inserts novel sets into the dimension.
+Author:        Sridhar Peddi
+Created:       2026-03-28
+
+Notes:
+- SetHash = HASHBYTES('SHA2_256', MeasureIds) (sorted, comma-separated), as stored on the dimension.
+- Maintained by [Analytics].[sp_Load_OpPlan_Active]; it rebuilds the dictionary from the
+  dimension when the two disagree (row count / max SK), e.g. after 31_Create_Dim_OpPlan_MeasureSet.sql.
+- The Unknown member (SK -1) is not stored.
+- Contents are derived; safe to create-if-not-exists.
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Initial creation
+**/
+IF OBJECT_ID('[Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]', 'U') IS NULL
+BEGIN
+    PRINT 'Creating table [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]...';
+
+    CREATE TABLE [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]
+    (
+        SetHash BINARY(32) NOT NULL,
+        SK_OpPlan_MeasureSet BIGINT NOT NULL,
+        MeasureCount INT NOT NULL,
+
+        CONSTRAINT PK_Dim_OpPlan_MeasureSet_Hash PRIMARY KEY CLUSTERED (SetHash)
+    );
+
+    PRINT '[OK] Created table: [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]';
+END
+ELSE
+BEGIN
+    PRINT '[INFO] Table [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] already exists.';
+END
+GO
+
+-- Seed from the dimension on first deploy (the loader keeps it in sync afterwards)
+IF NOT EXISTS (SELECT 1 FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash])
+   AND OBJECT_ID('[Analytics].[tbl_Dim_OpPlan_MeasureSet]', 'U') IS NOT NULL
+BEGIN
+    INSERT INTO [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] (SetHash, SK_OpPlan_MeasureSet, MeasureCount)
+    SELECT
+        CAST(d.SetHash AS BINARY(32)),
+        MIN(d.SK_OpPlan_MeasureSet),
+        MIN(d.MeasureCount)
+    FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
+    WHERE d.SK_OpPlan_MeasureSet <> -1
+    GROUP BY CAST(d.SetHash AS BINARY(32));
+
+    PRINT '[OK] Seeded [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]: ' + CAST(@@ROWCOUNT AS VARCHAR(20)) + ' sets';
+END
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'OpPlan measure-set hash dictionary created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
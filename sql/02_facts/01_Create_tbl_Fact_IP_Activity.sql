@@ -9,6 +9,7 @@
 -- Change Log:
 Change Log:
 -- 2026-01-09   | Sridhar Peddi    | Initial creation - IP fact table with 21 FK dimensions
+-- 2026-03-19   | Sridhar Peddi    | Incremental statistics on PK/indexes + key columns
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -120,7 +121,8 @@ CREATE TABLE [Analytics].[tbl_Fact_IP_Activity] (
     [ETL_UpdateDateTime] DATETIME2 NULL,
   
     -- CONSTRAINTS
-    CONSTRAINT [PK_Fact_IP_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Discharge_Date] ASC),
+    CONSTRAINT [PK_Fact_IP_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Discharge_Date] ASC)
+        WITH (STATISTICS_INCREMENTAL = ON),
     CONSTRAINT [CK_Fact_IP_LOS] CHECK ([Length_Of_Stay] >= 0),
     CONSTRAINT [CK_Fact_IP_Cost] CHECK ([Total_Cost] >= 0)
 ) ON [PS_IP_Activity_Monthly]([Discharge_Date]);
@@ -146,9 +148,17 @@ CREATE NONCLUSTERED INDEX [IX_Fact_IP_Activity_CAM]
         [Service_Category_Variance],
         [ETL_UpdateDateTime]
     )
+    WITH (STATISTICS_INCREMENTAL = ON)
     ON [PS_IP_Activity_Monthly]([Discharge_Date]);
 GO
 
+-- Incremental statistics: refreshed per loaded partition by sp_Update_Fact_Statistics
+CREATE STATISTICS [ST_Fact_IP_Activity_Discharge_Date] ON [Analytics].[tbl_Fact_IP_Activity] ([Discharge_Date]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_IP_Activity_SK_PatientID] ON [Analytics].[tbl_Fact_IP_Activity] ([SK_PatientID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_IP_Activity_SK_CommissionerID] ON [Analytics].[tbl_Fact_IP_Activity] ([SK_CommissionerID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_IP_Activity_SK_ProviderID] ON [Analytics].[tbl_Fact_IP_Activity] ([SK_ProviderID]) WITH INCREMENTAL = ON;
+GO
+
 PRINT '[OK] Created table: [Analytics].[tbl_Fact_IP_Activity]';
 PRINT '     Grain: Inpatient Spell';
 GO
@@ -10,6 +10,7 @@
 Change Log:
 -- 2026-01-09   | Sridhar Peddi    | Initial creation - OP fact table
 -- 2026-01-26   | Sridhar Peddi    | Add Is_FirstAttendance flag
+-- 2026-03-19   | Sridhar Peddi    | Incremental statistics on PK/indexes + key columns
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -119,7 +120,8 @@ CREATE TABLE [Analytics].[tbl_Fact_OP_Activity] (
     [ETL_UpdateDateTime] DATETIME2 NULL,
   
     -- CONSTRAINTS
-    CONSTRAINT [PK_Fact_OP_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Appointment_Date] ASC),
+    CONSTRAINT [PK_Fact_OP_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Appointment_Date] ASC)
+        WITH (STATISTICS_INCREMENTAL = ON),
     CONSTRAINT [CK_Fact_OP_Cost] CHECK ([Total_Cost] >= 0)
 ) ON [PS_OP_Activity_Monthly]([Appointment_Date]);
 GO
@@ -142,9 +144,17 @@ CREATE NONCLUSTERED INDEX [IX_Fact_OP_Activity_CAM]
         [Service_Category_Variance],
         [ETL_UpdateDateTime]
     )
+    WITH (STATISTICS_INCREMENTAL = ON)
     ON [PS_OP_Activity_Monthly]([Appointment_Date]);
 GO
 
+-- Incremental statistics: refreshed per loaded partition by sp_Update_Fact_Statistics
+CREATE STATISTICS [ST_Fact_OP_Activity_Appointment_Date] ON [Analytics].[tbl_Fact_OP_Activity] ([Appointment_Date]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_OP_Activity_SK_PatientID] ON [Analytics].[tbl_Fact_OP_Activity] ([SK_PatientID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_OP_Activity_SK_CommissionerID] ON [Analytics].[tbl_Fact_OP_Activity] ([SK_CommissionerID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_OP_Activity_SK_ProviderID] ON [Analytics].[tbl_Fact_OP_Activity] ([SK_ProviderID]) WITH INCREMENTAL = ON;
+GO
+
 PRINT '[OK] Created table: [Analytics].[tbl_Fact_OP_Activity]';
 GO
 
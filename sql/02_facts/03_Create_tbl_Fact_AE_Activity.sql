@@ -9,6 +9,7 @@
 -- Change Log:
 Change Log:
 -- 2026-01-09   | Sridhar Peddi    | Initial creation - AE fact table
+-- 2026-03-19   | Sridhar Peddi    | Incremental statistics on PK/indexes + key columns
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -90,7 +91,8 @@ CREATE TABLE [Analytics].[tbl_Fact_AE_Activity] (
     [ETL_LoadDateTime] DATETIME2 DEFAULT CURRENT_TIMESTAMP,
     
     -- CONSTRAINTS
-    CONSTRAINT [PK_Fact_AE_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Arrival_Date] ASC),
+    CONSTRAINT [PK_Fact_AE_Activity] PRIMARY KEY NONCLUSTERED ([SK_EncounterID] ASC, [Arrival_Date] ASC)
+        WITH (STATISTICS_INCREMENTAL = ON),
     CONSTRAINT [CK_Fact_AE_Cost] CHECK ([Total_Cost] >= 0)
 ) ON [PS_AE_Activity_Monthly]([Arrival_Date]);
 GO
@@ -99,6 +101,13 @@ GO
 CREATE CLUSTERED COLUMNSTORE INDEX [CCI_Fact_AE_Activity] ON [Analytics].[tbl_Fact_AE_Activity];
 GO
 
+-- Incremental statistics: refreshed per loaded partition by sp_Update_Fact_Statistics
+CREATE STATISTICS [ST_Fact_AE_Activity_Arrival_Date] ON [Analytics].[tbl_Fact_AE_Activity] ([Arrival_Date]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_AE_Activity_SK_PatientID] ON [Analytics].[tbl_Fact_AE_Activity] ([SK_PatientID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_AE_Activity_SK_CommissionerID] ON [Analytics].[tbl_Fact_AE_Activity] ([SK_CommissionerID]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Fact_AE_Activity_SK_ProviderID] ON [Analytics].[tbl_Fact_AE_Activity] ([SK_ProviderID]) WITH INCREMENTAL = ON;
+GO
+
 PRINT '[OK] Created table: [Analytics].[tbl_Fact_AE_Activity]';
 GO
 
@@ -0,0 +1,160 @@
+/**
+-- Script Name: 07_Create_tbl_Agg_Patient_Sketch_Monthly.sql
+-- Description: Monthly patient sketch aggregate for IP/OP facts.
+--              Grain: Dataset + Activity Month + Commissioner + Provider.
+--              Holds a HyperLogLog sketch of SK_PatientID so approximate
+--              distinct patient counts can be rolled up across any slice.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-16
+
+-- Change Log:
+-- 2026-03-16   | Sridhar Peddi    | Initial creation - sketch table, register view, rollup TVF
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating tbl_Agg_Patient_Sketch_Monthly TABLE';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Patient_Sketch_Rollup]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Patient_Sketch_Rollup];
+GO
+
+IF OBJECT_ID('[Analytics].[vw_Agg_Patient_Sketch_Register]', 'V') IS NOT NULL
+    DROP VIEW [Analytics].[vw_Agg_Patient_Sketch_Register];
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Agg_Patient_Sketch_Monthly]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Agg_Patient_Sketch_Monthly] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Agg_Patient_Sketch_Monthly];
+END
+GO
+
+/**
+-- Table Name:  tbl_Agg_Patient_Sketch_Monthly
+-- Description: Patient sketches per summary grain.
+--              Patient_Count is the exact distinct count at this grain
+--              (cannot be summed across rows; use the sketch for rollups).
+--              Size: ~1 KB per grain row.
+**/
+CREATE TABLE [Analytics].[tbl_Agg_Patient_Sketch_Monthly] (
+    [Dataset] VARCHAR(2) NOT NULL,                     -- 'IP', 'OP'
+    [Activity_Month] INT NOT NULL,                     -- 202504, 202505
+    [SK_Month_DateID] INT NOT NULL,                    -- vw_Dim_Date.SK_Date of month start
+    [SK_CommissionerID] INT NOT NULL,
+    [SK_ProviderID] INT NOT NULL,
+
+    -- METRICS
+    [Activity_Count] INT NOT NULL,
+    [Patient_Count] INT NOT NULL,
+    [Patient_Sketch] VARBINARY(1024) NOT NULL,         -- 1024 x 1-byte HLL registers
+
+    -- AUDIT
+    [ETL_LoadDateTime] DATETIME2 DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT [PK_Agg_Patient_Sketch_Monthly]
+        PRIMARY KEY CLUSTERED ([Dataset], [Activity_Month], [SK_CommissionerID], [SK_ProviderID])
+) ON [PRIMARY];
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Agg_Patient_Sketch_Monthly]';
+GO
+
+/**
+-- View Name:   vw_Agg_Patient_Sketch_Register
+-- Description: Non-zero sketch registers per grain row.
+--              Feeds the Power BI approximate patient measures, which merge
+--              registers with MAX() under any month/commissioner/provider filter.
+**/
+CREATE VIEW [Analytics].[vw_Agg_Patient_Sketch_Register] AS
+SELECT
+    s.[Dataset],
+    s.[Activity_Month],
+    s.[SK_Month_DateID],
+    s.[SK_CommissionerID],
+    s.[SK_ProviderID],
+    r.[Register_Index],
+    r.[Register_Value]
+FROM [Analytics].[tbl_Agg_Patient_Sketch_Monthly] s
+CROSS APPLY [Analytics].[fn_Patient_Sketch_Registers](s.[Patient_Sketch]) r
+WHERE r.[Register_Value] > 0;
+GO
+
+PRINT '[OK] Created view: [Analytics].[vw_Agg_Patient_Sketch_Register]';
+GO
+
+/**
+-- Function Name: fn_Patient_Sketch_Rollup
+-- Description:   Merges every sketch in a slice and returns the approximate
+--                distinct patient count. NULL filters mean "all".
+-- Example:
+--   SELECT * FROM [Analytics].[fn_Patient_Sketch_Rollup]('IP', 202504, 202603, NULL, NULL);
+**/
+CREATE FUNCTION [Analytics].[fn_Patient_Sketch_Rollup]
+(
+    @Dataset VARCHAR(2),
+    @FromMonth INT,
+    @ToMonth INT,
+    @SK_CommissionerID INT = NULL,
+    @SK_ProviderID INT = NULL
+)
+RETURNS TABLE
+AS
+RETURN
+    WITH Slice AS (
+        SELECT
+            s.Patient_Sketch,
+            s.Activity_Count
+        FROM [Analytics].[tbl_Agg_Patient_Sketch_Monthly] s
+        WHERE s.Dataset = @Dataset
+          AND s.Activity_Month >= @FromMonth
+          AND s.Activity_Month <= @ToMonth
+          AND (@SK_CommissionerID IS NULL OR s.SK_CommissionerID = @SK_CommissionerID)
+          AND (@SK_ProviderID IS NULL OR s.SK_ProviderID = @SK_ProviderID)
+    ),
+    MergedRegisters AS (
+        SELECT
+            r.Register_Index,
+            MAX(r.Register_Value) AS Register_Value
+        FROM Slice s
+        CROSS APPLY [Analytics].[fn_Patient_Sketch_Registers](s.Patient_Sketch) r
+        GROUP BY r.Register_Index
+    ),
+    Merged AS (
+        SELECT
+            CONVERT(
+                VARBINARY(1024),
+                STRING_AGG(CONVERT(VARCHAR(2), CAST(m.Register_Value AS BINARY(1)), 2), '')
+                    WITHIN GROUP (ORDER BY m.Register_Index),
+                2
+            ) AS Merged_Sketch
+        FROM MergedRegisters m
+    )
+    SELECT
+        (SELECT COUNT_BIG(1) FROM Slice) AS Sketch_Rows,
+        (SELECT SUM(CAST(Activity_Count AS BIGINT)) FROM Slice) AS Activity_Count,
+        m.Merged_Sketch,
+        [Analytics].[fn_Patient_Sketch_Estimate](m.Merged_Sketch) AS Approx_Patient_Count
+    FROM Merged m;
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Patient_Sketch_Rollup]';
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'tbl_Agg_Patient_Sketch_Monthly TABLE Created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
@@ -35,6 +35,7 @@ Created:      2026-01-26
 
 Change Log:
   2026-01-26  Sridhar Peddi    Initial creation
+  2026-03-25  Sridhar Peddi    Recompile the CF rule prefix index after loading
 **/
 BEGIN TRY
     DELETE FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10];
@@ -93,6 +94,10 @@ BEGIN CATCH
 END CATCH
 GO
 
+IF OBJECT_ID('[Analytics].[sp_Compile_CF_Segment_Rule_ICD10]', 'P') IS NOT NULL
+    EXEC [Analytics].[sp_Compile_CF_Segment_Rule_ICD10] @Force = 1;
+GO
+
 PRINT '';
 PRINT '========================================';
 PRINT 'CF ICD10 rules load completed';
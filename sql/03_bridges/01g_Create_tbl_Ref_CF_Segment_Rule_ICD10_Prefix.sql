@@ -0,0 +1,76 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating CF rule ICD10 prefix index table';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+/**
+Script Name:  01g_Create_tbl_Ref_CF_Segment_Rule_ICD10_Prefix.sql
+Description:  Compiled form of tbl_Ref_CF_Segment_Rule_ICD10 (one row per active rule) so CF
+              loaders match diagnosis codes by equi-join on (Prefix_Length, Code_Prefix)
+              instead of evaluating every LIKE pattern against every diagnosis slot.
+Author:       Sridhar Peddi
+Created:      2026-03-25
+
+Notes:
+- Match_Type:
+    'Exact'  = pattern has no wildcard; code must equal Code_Prefix.
+    'Prefix' = literal followed only by '%'; LEFT(code, Prefix_Length) = Code_Prefix.
+    'Like'   = anything else ('_', '[...]', inner '%'); Code_Prefix holds the raw pattern
+               and loaders fall back to LIKE for these rows only.
+- Rebuilt by [Analytics].[sp_Compile_CF_Segment_Rule_ICD10] when the rules hash changes
+  (Rules_Hash = SHA2_256 over the active rules in Rule_ID order).
+- Contents are derived; safe to create-if-not-exists. A table from before Rules_Hash is dropped
+  and recreated (the next compile refills it).
+
+Change Log:
+  2026-03-25  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Rules_Checksum (CHECKSUM_AGG) replaced by Rules_Hash BINARY(32)
+**/
+IF COL_LENGTH('[Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]', 'Rules_Checksum') IS NOT NULL
+BEGIN
+    DROP TABLE [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix];
+    PRINT '[INFO] Dropped [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] (Rules_Checksum -> Rules_Hash).';
+END
+
+IF OBJECT_ID('[Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]', 'U') IS NULL
+BEGIN
+    CREATE TABLE [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] (
+        [Prefix_Length] TINYINT NOT NULL,
+        [Code_Prefix] VARCHAR(20) NOT NULL,
+        [Rule_ID] INT NOT NULL,
+        [Match_Type] VARCHAR(10) NOT NULL,
+        [Segment_Score] INT NOT NULL,
+        [Is_Primary_Only] BIT NOT NULL,
+        [Lookback_Months] INT NULL,
+        [Rules_Hash] BINARY(32) NOT NULL,
+        [Compiled_DateTime] DATETIME2 NOT NULL CONSTRAINT [DF_CF_Rule_Prefix_CompiledDtm] DEFAULT (SYSUTCDATETIME()),
+
+        CONSTRAINT [PK_Ref_CF_Segment_Rule_ICD10_Prefix] PRIMARY KEY CLUSTERED ([Prefix_Length], [Code_Prefix], [Rule_ID]),
+        CONSTRAINT [UQ_Ref_CF_Segment_Rule_ICD10_Prefix_Rule] UNIQUE ([Rule_ID]),
+        CONSTRAINT [CHK_Ref_CF_Segment_Rule_ICD10_Prefix_Type] CHECK ([Match_Type] IN ('Exact', 'Prefix', 'Like'))
+    ) ON [PRIMARY];
+
+    PRINT '[OK] Created: [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]';
+END
+ELSE
+BEGIN
+    PRINT '[INFO] Table [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] already exists.';
+END
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'CF rule ICD10 prefix index table created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
@@ -21,6 +21,18 @@ Created:       2026-01-15
 Notes:
 - Create-if-missing only. Do NOT drop.
 - Activity_Date stores Discharge_Date for IP and Appointment_Date for OP.
+- Partitioned monthly on Activity_Date (PS_Active_Monthly) so the loader empties whole
+  months with TRUNCATE ... WITH (PARTITIONS) (sp_Clear_Active_Window).
+- Activity_Date is part of the clustered PK (partition alignment); the loader removes an
+  encounter's row from other months before insert and fails the load if any loaded
+  (SK_EncounterID, Dataset) still has more than one row. A unique (SK_EncounterID, Dataset) index
+  is not used: without Activity_Date it would not be partition-aligned, which TRUNCATE
+  ... WITH (PARTITIONS) requires. Both the delete and the check only read months outside the
+  loaded window, which the loader has just emptied.
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Partition on PS_Active_Monthly; Activity_Date added to the PK
+  2026-03-28  Sridhar Peddi    Note the loader's duplicate-key check (no unique index: not partition-aligned)
 **/
 IF OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]', 'U') IS NULL
 BEGIN
@@ -43,8 +55,44 @@ BEGIN
         [ETL_LoadDateTime] DATETIME2 NOT NULL DEFAULT CURRENT_TIMESTAMP,
         [ETL_UpdateDateTime] DATETIME2 NULL,
 
-        CONSTRAINT [PK_CAM_Assignment_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [Dataset] ASC)
-    );
+        CONSTRAINT [PK_CAM_Assignment_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [Dataset] ASC, [Activity_Date] ASC)
+    ) ON [PS_Active_Monthly]([Activity_Date]);
+END
+GO
+
+-- Migrate an unpartitioned table: rebuild the clustered PK on PS_Active_Monthly.
+-- Nonclustered indexes are dropped here and recreated (partition-aligned) below.
+IF OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]', 'U') IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1
+        FROM sys.indexes i
+        INNER JOIN sys.partition_schemes ps
+            ON ps.data_space_id = i.data_space_id
+        WHERE i.object_id = OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]')
+          AND i.index_id = 1
+    )
+BEGIN
+    BEGIN TRANSACTION;
+
+        IF EXISTS (
+            SELECT 1
+            FROM sys.indexes
+            WHERE name = 'IX_CAM_Assignment_Active_ActivityDate'
+              AND object_id = OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]')
+        )
+            DROP INDEX [IX_CAM_Assignment_Active_ActivityDate]
+            ON [Analytics].[tbl_CAM_Assignment_Active];
+
+        ALTER TABLE [Analytics].[tbl_CAM_Assignment_Active]
+            DROP CONSTRAINT [PK_CAM_Assignment_Active];
+
+        ALTER TABLE [Analytics].[tbl_CAM_Assignment_Active]
+            ADD CONSTRAINT [PK_CAM_Assignment_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [Dataset] ASC, [Activity_Date] ASC)
+            ON [PS_Active_Monthly]([Activity_Date]);
+
+    COMMIT TRANSACTION;
+
+    PRINT '[OK] Partitioned [Analytics].[tbl_CAM_Assignment_Active] on PS_Active_Monthly';
 END
 GO
 
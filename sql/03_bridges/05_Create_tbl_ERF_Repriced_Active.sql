@@ -21,6 +21,19 @@ Created:       2026-01-15
 Notes:
 - Create-if-missing only. Do NOT drop.
 - Current FY only (windowed load).
+- Activity_Date stores Discharge_Date for IP and Appointment_Date for OP.
+- Partitioned monthly on Activity_Date (PS_Active_Monthly) so the loader empties whole
+  months with TRUNCATE ... WITH (PARTITIONS) (sp_Clear_Active_Window).
+- Activity_Date is part of the clustered PK (partition alignment); the loader removes an
+  encounter's row from other months before insert and fails the load if any loaded
+  (SK_EncounterID, POD) still has more than one row. A unique (SK_EncounterID, POD) index
+  is not used: without Activity_Date it would not be partition-aligned, which TRUNCATE
+  ... WITH (PARTITIONS) requires. Both the delete and the check only read months outside the
+  loaded window, which the loader has just emptied.
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Add Activity_Date; partition on PS_Active_Monthly; Activity_Date added to the PK
+  2026-03-28  Sridhar Peddi    Backfill Activity_Date from the IP/OP facts when adding the column
 **/
 IF OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NULL
 BEGIN
@@ -28,6 +41,7 @@ BEGIN
         [SK_EncounterID] BIGINT NOT NULL,
         [POD] VARCHAR(2) NOT NULL, -- IP / OP
         [dv_FinYear] VARCHAR(9) NOT NULL,
+        [Activity_Date] DATE NOT NULL,
         [ERF_National_Price] DECIMAL(12,2) NULL,
         [ERF_MFF_Applied] DECIMAL(12,6) NULL,
         [ERF_Total_Cost_Incl_MFF] DECIMAL(12,2) NULL,
@@ -35,8 +49,8 @@ BEGIN
         [ETL_LoadDateTime] DATETIME2 NOT NULL DEFAULT CURRENT_TIMESTAMP,
         [ETL_UpdateDateTime] DATETIME2 NULL,
 
-        CONSTRAINT [PK_ERF_Repriced_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [POD] ASC)
-    );
+        CONSTRAINT [PK_ERF_Repriced_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [POD] ASC, [Activity_Date] ASC)
+    ) ON [PS_Active_Monthly]([Activity_Date]);
 END
 GO
 
@@ -57,6 +71,108 @@ BEGIN
 END
 GO
 
+-- Existing rows get 1900-01-01 here and their real date from the facts in the next batch.
+IF OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NOT NULL
+    AND COL_LENGTH('[Analytics].[tbl_ERF_Repriced_Active]', 'Activity_Date') IS NULL
+BEGIN
+    ALTER TABLE [Analytics].[tbl_ERF_Repriced_Active]
+        ADD [Activity_Date] DATE NOT NULL
+            CONSTRAINT [DF_ERF_Repriced_Active_ActivityDate] DEFAULT ('19000101');
+
+    PRINT '[INFO] Added Activity_Date to [Analytics].[tbl_ERF_Repriced_Active]';
+END
+GO
+
+-- Backfill Activity_Date for rows that still carry the 1900-01-01 default, so rows from
+-- earlier FYs (which no reload touches) land in their real month. Runs before the
+-- partition migration below, so rows are placed once.
+IF OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NOT NULL
+    AND EXISTS (
+        SELECT 1
+        FROM [Analytics].[tbl_ERF_Repriced_Active]
+        WHERE [Activity_Date] = '19000101'
+    )
+BEGIN
+    DECLARE @RowsBackfilled INT = 0;
+    DECLARE @RowsUnmatched INT = 0;
+
+    UPDATE e
+    SET e.[Activity_Date] = f.[Activity_Date]
+    FROM [Analytics].[tbl_ERF_Repriced_Active] e
+    INNER JOIN (
+        SELECT [SK_EncounterID], MAX([Discharge_Date]) AS [Activity_Date]
+        FROM [Analytics].[tbl_Fact_IP_Activity]
+        GROUP BY [SK_EncounterID]
+    ) f
+        ON f.[SK_EncounterID] = e.[SK_EncounterID]
+    WHERE e.[POD] = 'IP'
+      AND e.[Activity_Date] = '19000101';
+
+    SET @RowsBackfilled = @@ROWCOUNT;
+
+    UPDATE e
+    SET e.[Activity_Date] = f.[Activity_Date]
+    FROM [Analytics].[tbl_ERF_Repriced_Active] e
+    INNER JOIN (
+        SELECT [SK_EncounterID], MAX([Appointment_Date]) AS [Activity_Date]
+        FROM [Analytics].[tbl_Fact_OP_Activity]
+        GROUP BY [SK_EncounterID]
+    ) f
+        ON f.[SK_EncounterID] = e.[SK_EncounterID]
+    WHERE e.[POD] = 'OP'
+      AND e.[Activity_Date] = '19000101';
+
+    SET @RowsBackfilled = @RowsBackfilled + @@ROWCOUNT;
+
+    SELECT @RowsUnmatched = COUNT(*)
+    FROM [Analytics].[tbl_ERF_Repriced_Active]
+    WHERE [Activity_Date] = '19000101';
+
+    PRINT '[OK] Backfilled Activity_Date on ' + CAST(@RowsBackfilled AS VARCHAR(20))
+        + ' [Analytics].[tbl_ERF_Repriced_Active] rows from the IP/OP facts';
+
+    IF @RowsUnmatched > 0
+        PRINT '[WARN] ' + CAST(@RowsUnmatched AS VARCHAR(20))
+            + ' rows have no fact match and keep 1900-01-01; reload their FY (sp_Load_ERF_Repriced_Active).';
+END
+GO
+
+-- Migrate an unpartitioned table: rebuild the clustered PK on PS_Active_Monthly.
+-- Nonclustered indexes are dropped here and recreated (partition-aligned) below.
+IF OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1
+        FROM sys.indexes i
+        INNER JOIN sys.partition_schemes ps
+            ON ps.data_space_id = i.data_space_id
+        WHERE i.object_id = OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]')
+          AND i.index_id = 1
+    )
+BEGIN
+    BEGIN TRANSACTION;
+
+        IF EXISTS (
+            SELECT 1
+            FROM sys.indexes
+            WHERE name = 'IX_ERF_Repriced_Active_FinYear'
+              AND object_id = OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]')
+        )
+            DROP INDEX [IX_ERF_Repriced_Active_FinYear]
+            ON [Analytics].[tbl_ERF_Repriced_Active];
+
+        ALTER TABLE [Analytics].[tbl_ERF_Repriced_Active]
+            DROP CONSTRAINT [PK_ERF_Repriced_Active];
+
+        ALTER TABLE [Analytics].[tbl_ERF_Repriced_Active]
+            ADD CONSTRAINT [PK_ERF_Repriced_Active] PRIMARY KEY CLUSTERED ([SK_EncounterID] ASC, [POD] ASC, [Activity_Date] ASC)
+            ON [PS_Active_Monthly]([Activity_Date]);
+
+    COMMIT TRANSACTION;
+
+    PRINT '[OK] Partitioned [Analytics].[tbl_ERF_Repriced_Active] on PS_Active_Monthly';
+END
+GO
+
 IF OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NOT NULL
     AND NOT EXISTS (
         SELECT 1
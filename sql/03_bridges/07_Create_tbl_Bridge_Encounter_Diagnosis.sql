@@ -0,0 +1,85 @@
+/**
+-- Script Name: 07_Create_tbl_Bridge_Encounter_Diagnosis.sql
+-- Description: Normalised encounter diagnosis bridge (IP/OP).
+--              Grain: SK_EncounterID + Dataset + Diagnosis_Position.
+--              Unpivots Primary/Secondary_Diagnosis_Code_N once per load window so CF
+--              segmentation and clinical queries do not re-unpivot the wide Unified columns.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-26
+
+-- Change Log:
+-- 2026-03-26   | Sridhar Peddi    | Initial creation (tech spec 3.2.1, code-based; no ICD10 dimension yet)
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating tbl_Bridge_Encounter_Diagnosis TABLE';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Bridge_Encounter_Diagnosis]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Bridge_Encounter_Diagnosis] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Bridge_Encounter_Diagnosis];
+END
+GO
+
+/**
+-- Table Name:  tbl_Bridge_Encounter_Diagnosis
+-- Description: One row per non-blank diagnosis slot.
+--              Diagnosis_Code is cleaned as the CF loaders expect (UPPER, '.' and ' ' removed).
+--              Activity_Date = fact date (IP discharge, OP appointment) and partition key;
+--              Start_Date = IP spell start / OP appointment (CF lookback date).
+--              Partitioned on the IP monthly scheme (same monthly boundaries for IP and OP).
+**/
+CREATE TABLE [Analytics].[tbl_Bridge_Encounter_Diagnosis] (
+    [SK_EncounterID] BIGINT NOT NULL,
+    [Dataset] VARCHAR(2) NOT NULL,                     -- 'IP', 'OP'
+    [Diagnosis_Position] TINYINT NOT NULL,             -- 1 = Primary, 2-13 = Secondary 1-12
+    [Diagnosis_Code] VARCHAR(20) NOT NULL,
+    [Is_Primary_Diagnosis] BIT NOT NULL,
+    [SK_PatientID] BIGINT NULL,
+    [Activity_Date] DATE NOT NULL,
+    [Start_Date] DATE NULL,
+
+    -- AUDIT
+    [ETL_BatchID] INT NULL,
+    [ETL_LoadDateTime] DATETIME2 NOT NULL CONSTRAINT [DF_Bridge_Encounter_Diagnosis_LoadDtm] DEFAULT (SYSUTCDATETIME()),
+
+    CONSTRAINT [PK_Bridge_Encounter_Diagnosis] PRIMARY KEY NONCLUSTERED (
+        [SK_EncounterID],
+        [Dataset],
+        [Diagnosis_Position],
+        [Activity_Date]
+    ) WITH (STATISTICS_INCREMENTAL = ON),
+    CONSTRAINT [CHK_Bridge_Encounter_Diagnosis_Dataset] CHECK ([Dataset] IN ('IP', 'OP')),
+    CONSTRAINT [CHK_Bridge_Encounter_Diagnosis_Position] CHECK ([Diagnosis_Position] BETWEEN 1 AND 13)
+) ON [PS_IP_Activity_Monthly]([Activity_Date]);
+GO
+
+CREATE CLUSTERED COLUMNSTORE INDEX [CCI_Bridge_Encounter_Diagnosis]
+    ON [Analytics].[tbl_Bridge_Encounter_Diagnosis];
+GO
+
+CREATE STATISTICS [ST_Bridge_Encounter_Diagnosis_Code] ON [Analytics].[tbl_Bridge_Encounter_Diagnosis] ([Diagnosis_Code]) WITH INCREMENTAL = ON;
+CREATE STATISTICS [ST_Bridge_Encounter_Diagnosis_Start_Date] ON [Analytics].[tbl_Bridge_Encounter_Diagnosis] ([Start_Date]) WITH INCREMENTAL = ON;
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Bridge_Encounter_Diagnosis]';
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'tbl_Bridge_Encounter_Diagnosis TABLE Created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
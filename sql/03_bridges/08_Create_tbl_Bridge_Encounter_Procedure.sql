@@ -0,0 +1,81 @@
+/**
+-- Script Name: 08_Create_tbl_Bridge_Encounter_Procedure.sql
+-- Description: Normalised encounter procedure bridge (IP/OP).
+--              Grain: SK_EncounterID + Dataset + Procedure_Position.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-26
+
+-- Change Log:
+-- 2026-03-26   | Sridhar Peddi    | Initial creation (tech spec 3.2.2, code-based; primary procedure only)
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating tbl_Bridge_Encounter_Procedure TABLE';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Bridge_Encounter_Procedure]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Bridge_Encounter_Procedure] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Bridge_Encounter_Procedure];
+END
+GO
+
+/**
+-- Table Name:  tbl_Bridge_Encounter_Procedure
+-- Description: One row per non-blank procedure slot (OPCS-4, cleaned like diagnoses).
+--              Only Primary_Procedure_Code is sourced today; Procedure_Position leaves room
+--              for secondary procedure slots (2-24) without a schema change.
+--              Activity_Date = fact date (IP discharge, OP appointment) and partition key.
+**/
+CREATE TABLE [Analytics].[tbl_Bridge_Encounter_Procedure] (
+    [SK_EncounterID] BIGINT NOT NULL,
+    [Dataset] VARCHAR(2) NOT NULL,                     -- 'IP', 'OP'
+    [Procedure_Position] TINYINT NOT NULL,             -- 1 = Primary
+    [Procedure_Code] VARCHAR(20) NOT NULL,
+    [Is_Primary_Procedure] BIT NOT NULL,
+    [Procedure_Date] DATE NULL,                        -- OP only (Primary_Procedure_Date)
+    [SK_PatientID] BIGINT NULL,
+    [Activity_Date] DATE NOT NULL,
+
+    -- AUDIT
+    [ETL_BatchID] INT NULL,
+    [ETL_LoadDateTime] DATETIME2 NOT NULL CONSTRAINT [DF_Bridge_Encounter_Procedure_LoadDtm] DEFAULT (SYSUTCDATETIME()),
+
+    CONSTRAINT [PK_Bridge_Encounter_Procedure] PRIMARY KEY NONCLUSTERED (
+        [SK_EncounterID],
+        [Dataset],
+        [Procedure_Position],
+        [Activity_Date]
+    ) WITH (STATISTICS_INCREMENTAL = ON),
+    CONSTRAINT [CHK_Bridge_Encounter_Procedure_Dataset] CHECK ([Dataset] IN ('IP', 'OP')),
+    CONSTRAINT [CHK_Bridge_Encounter_Procedure_Position] CHECK ([Procedure_Position] BETWEEN 1 AND 24)
+) ON [PS_IP_Activity_Monthly]([Activity_Date]);
+GO
+
+CREATE CLUSTERED COLUMNSTORE INDEX [CCI_Bridge_Encounter_Procedure]
+    ON [Analytics].[tbl_Bridge_Encounter_Procedure];
+GO
+
+CREATE STATISTICS [ST_Bridge_Encounter_Procedure_Code] ON [Analytics].[tbl_Bridge_Encounter_Procedure] ([Procedure_Code]) WITH INCREMENTAL = ON;
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Bridge_Encounter_Procedure]';
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'tbl_Bridge_Encounter_Procedure TABLE Created';
+PRINT 'Completed: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+PRINT '';
+GO
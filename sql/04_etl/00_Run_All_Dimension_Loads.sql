@@ -7,6 +7,7 @@ Created:       2026-01-02
 Change Log:
   2026-01-02  Sridhar Peddi    Initial creation
   2026-01-15  Sridhar Peddi    Verify OpPlan measure view availability
+  2026-03-20  Sridhar Peddi    Refresh dimension key lookup cache after loads
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -287,6 +288,29 @@ BEGIN CATCH
     PRINT '';
 END CATCH
 
+-------------------------------------------------------------------------------
+-- Step 9: Refresh dimension key lookup cache (used by the fact loaders)
+-------------------------------------------------------------------------------
+
+PRINT '------------------------------------------------------------------------------';
+PRINT 'Step 9: Refreshing Dim Key Lookup cache';
+PRINT '------------------------------------------------------------------------------';
+
+SET @StepStartTime = GETDATE();
+
+BEGIN TRY
+    EXEC [Analytics].[sp_Refresh_Dim_Key_Lookup];
+END TRY
+BEGIN CATCH
+    SET @TotalErrors = @TotalErrors + 1;
+    PRINT '[FAIL] Error refreshing Dim Key Lookup: ' + ERROR_MESSAGE();
+    PRINT '';
+END CATCH
+
+SET @StepDuration = DATEDIFF(SECOND, @StepStartTime, GETDATE());
+PRINT '  Duration: ' + CAST(@StepDuration AS VARCHAR) + ' seconds';
+PRINT '';
+
 -------------------------------------------------------------------------------
 -- Summary
 -------------------------------------------------------------------------------
@@ -322,6 +346,8 @@ BEGIN
     SELECT 'Dim_Measures_Catalogue', COUNT(*) FROM [Analytics].[vw_Dim_Measures_Catalogue]
     UNION ALL
     SELECT 'Dim_OpPlan_Measure', COUNT(*) FROM [Analytics].[vw_Dim_OpPlan_Measure]
+    UNION ALL
+    SELECT 'Dim_Key_Lookup', COUNT(*) FROM [Analytics].[tbl_Dim_Key_Lookup]
     ORDER BY Dimension;
 END
 ELSE
@@ -19,21 +19,45 @@ Created:       2026-01-13
 
 Notes:
 - Runs precompute first (CAM Raw -> CAM Active -> ERF Repriced Active -> OpPlan Active),
-  then facts, then enrichments.
+  then facts. IP/OP fact loads write the CAM / Operating Plan / ERF columns in their insert
+  from the Active tables (@Enrich = 1), so no IP/OP post-load UPDATE passes are needed; the
+  fact loads fail if an Active table has no rows for the window.
+- AE is not enriched inline: sp_Enrich_Facts_Operating_Plan @AEOnly = 1 refreshes the AE
+  Operating Plan flags on every default run.
+- @PostLoadEnrichment = 1 restores the old path: facts load unenriched, then
+  sp_Enrich_Facts_Operating_Plan (IP/OP/AE) / _ERF / _CAM update them.
+- Diagnosis/procedure bridges (tbl_Bridge_Encounter_*) are reloaded for the window after the facts.
+- Statistics for the loaded partitions are refreshed between facts and enrichments.
 - AE fact load is currently disabled (do not run).
+- Fact columnstore partitions in the window are reorganized/rebuilt if rowgroup quality dropped.
+- Patient sketches (approximate distinct patients) are rebuilt last for the window months.
+- Source/fact fingerprints (month x provider: count, key hash, cost) are then captured for the
+  window (sp_Capture_Fact_Fingerprint); sp_Reconcile_Fact_Fingerprint drills into mismatches.
+- @SinglePassSource = 1 extracts the Unified IP/OP/ED rows once (fact window + financial year)
+  into tbl_Work_*_Source and passes @UseWorkSource = 1 to every step that reads them. The run
+  holds the session applock 'Analytics.Fact_Source_Window' throughout, so a second single-pass
+  run fails fast instead of truncating the work tables under this one. The synonyms are never
+  re-pointed: other sessions keep reading all of Unified. Work tables are emptied and the lock
+  released at the end (also on failure).
+- sp_Load_OpPlan_Active's PLNG.Get_OpPlan_ActivityBridge_* functions (Data_Lab_SWL) still scan
+  Unified; only its own encounter joins read the work tables.
 
 Parameters:
 - @FromDate/@ToDate: optional window (passed to fact loads and enrichments)
 - @FinYearStart: required for Operating Plan + ERF enrichment
 - @FinancialYear: required for CAM enrichment
 - @ProviderCode: optional CAM filter
+- @SinglePassSource: 1 = read Unified once into work tables (default), 0 = each step reads Unified
+- @PostLoadEnrichment: 0 = enrich inside the fact inserts (default), 1 = post-load UPDATE procs
 */
 CREATE PROCEDURE [Analytics].[sp_Run_Fact_Loads_With_Enrichment]
     @FromDate DATE = NULL,
     @ToDate DATE = NULL,
     @FinYearStart CHAR(4),
     @FinancialYear VARCHAR(9),
-    @ProviderCode VARCHAR(10) = NULL
+    @ProviderCode VARCHAR(10) = NULL,
+    @SinglePassSource BIT = 1,
+    @PostLoadEnrichment BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -50,57 +74,175 @@ BEGIN
         RETURN;
     END
 
-    EXEC [Analytics].[sp_Compute_CAM_Raw]
-        @FinYearStart = @FinYearStart,
-        @FinancialYear = @FinancialYear,
-        @ProviderCode = @ProviderCode,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Load_CAM_Assignment_Active]
-        @FinYearStart = @FinYearStart,
-        @FinancialYear = @FinancialYear,
-        @ProviderCode = @ProviderCode,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Load_ERF_Repriced_Active]
-        @FinYearStart = @FinYearStart,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Load_OpPlan_Active]
-        @FinYearStart = @FinYearStart,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Load_Fact_IP_Activity]
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Load_Fact_OP_Activity]
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    -- AE fact load is currently disabled (do not run)
-    -- EXEC [Analytics].[sp_Load_Fact_AE_Activity]
-    --     @FromDate = @FromDate,
-    --     @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Enrich_Facts_Operating_Plan]
-        @FinYearStart = @FinYearStart,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Enrich_Facts_ERF]
-        @FinYearStart = @FinYearStart,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
-
-    EXEC [Analytics].[sp_Enrich_Facts_CAM]
-        @FinancialYear = @FinancialYear,
-        @ProviderCode = @ProviderCode,
-        @FromDate = @FromDate,
-        @ToDate = @ToDate;
+    DECLARE @ExtractFrom DATE;
+    DECLARE @ExtractTo DATE;
+    DECLARE @FinYearStartDate DATE;
+    DECLARE @FinYearEndDate DATE;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @InlineEnrich BIT = CASE WHEN @PostLoadEnrichment = 1 THEN 0 ELSE 1 END;
+    DECLARE @LockResult INT;
+
+    SET @SinglePassSource = ISNULL(@SinglePassSource, 0);
+
+    IF @SinglePassSource = 1
+    BEGIN
+        -- Superset of the fact window (loader defaults) and the FY window (precompute)
+        SET @ExtractTo = ISNULL(@ToDate, [Analytics].[fn_SUS_Published_Cutoff_Date](NULL));
+        SET @ExtractTo = ISNULL(@ExtractTo, CAST(GETDATE() AS DATE));
+        SET @ExtractFrom = ISNULL(
+            @FromDate,
+            DATEADD(MONTH, -5, DATEFROMPARTS(YEAR(@ExtractTo), MONTH(@ExtractTo), 1))
+        );
+
+        SET @FinYearStartDate = CONVERT(DATE, @FinYearStart + '0401', 112);
+        SET @FinYearEndDate = DATEADD(DAY, -1, DATEADD(YEAR, 1, @FinYearStartDate));
+
+        IF @FinYearStartDate < @ExtractFrom
+            SET @ExtractFrom = @FinYearStartDate;
+        IF @FinYearEndDate > @ExtractTo
+            SET @ExtractTo = @FinYearEndDate;
+
+        -- One single-pass run at a time: the work tables belong to the lock holder
+        EXEC @LockResult = sp_getapplock
+            @Resource = 'Analytics.Fact_Source_Window',
+            @LockMode = 'Exclusive',
+            @LockOwner = 'Session',
+            @LockTimeout = 0;
+
+        IF @LockResult < 0
+        BEGIN
+            RAISERROR('Another single-pass fact run holds ''Analytics.Fact_Source_Window''. Wait for it to finish or run with @SinglePassSource = 0.', 16, 1);
+            RETURN;
+        END
+    END
+
+    BEGIN TRY
+        IF @SinglePassSource = 1
+        BEGIN
+            EXEC [Analytics].[sp_Extract_Fact_Source_Window]
+                @FromDate = @ExtractFrom,
+                @ToDate = @ExtractTo;
+        END
+
+        EXEC [Analytics].[sp_Compute_CAM_Raw]
+            @FinYearStart = @FinYearStart,
+            @FinancialYear = @FinancialYear,
+            @ProviderCode = @ProviderCode,
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Load_CAM_Assignment_Active]
+            @FinYearStart = @FinYearStart,
+            @FinancialYear = @FinancialYear,
+            @ProviderCode = @ProviderCode,
+            @FromDate = @FromDate,
+            @ToDate = @ToDate;
+
+        EXEC [Analytics].[sp_Load_ERF_Repriced_Active]
+            @FinYearStart = @FinYearStart,
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Load_OpPlan_Active]
+            @FinYearStart = @FinYearStart,
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Load_Fact_IP_Activity]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @Enrich = @InlineEnrich,
+            @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Load_Fact_OP_Activity]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @Enrich = @InlineEnrich,
+            @UseWorkSource = @SinglePassSource;
+
+        -- AE fact load is currently disabled (do not run)
+        -- EXEC [Analytics].[sp_Load_Fact_AE_Activity]
+        --     @FromDate = @FromDate,
+        --     @ToDate = @ToDate,
+        --     @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Load_Bridge_Encounter_Codes]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @UseWorkSource = @SinglePassSource;
+
+        EXEC [Analytics].[sp_Update_Fact_Statistics]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate;
+
+        -- AE is not enriched inline; IP/OP only on the post-load path
+        EXEC [Analytics].[sp_Enrich_Facts_Operating_Plan]
+            @FinYearStart = @FinYearStart,
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @AEOnly = @InlineEnrich;
+
+        IF @PostLoadEnrichment = 1
+        BEGIN
+            EXEC [Analytics].[sp_Enrich_Facts_ERF]
+                @FinYearStart = @FinYearStart,
+                @FromDate = @FromDate,
+                @ToDate = @ToDate;
+
+            EXEC [Analytics].[sp_Enrich_Facts_CAM]
+                @FinancialYear = @FinancialYear,
+                @ProviderCode = @ProviderCode,
+                @FromDate = @FromDate,
+                @ToDate = @ToDate;
+        END
+
+        EXEC [Analytics].[sp_Maintain_Fact_Columnstore]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate;
+
+        EXEC [Analytics].[sp_Load_Agg_Patient_Sketch]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate;
+
+        -- Before the work tables are cleared: the source side reads them
+        EXEC [Analytics].[sp_Capture_Fact_Fingerprint]
+            @FromDate = @FromDate,
+            @ToDate = @ToDate,
+            @UseWorkSource = @SinglePassSource;
+
+        IF @SinglePassSource = 1
+        BEGIN
+            EXEC [Analytics].[sp_Clear_Fact_Source_Window];
+
+            EXEC sp_releaseapplock
+                @Resource = 'Analytics.Fact_Source_Window',
+                @LockOwner = 'Session';
+        END
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+
+        -- Never keep the lock (or the extracted rows) past this run
+        IF @SinglePassSource = 1
+           AND APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session') = 'Exclusive'
+        BEGIN
+            BEGIN TRY
+                EXEC [Analytics].[sp_Clear_Fact_Source_Window];
+            END TRY
+            BEGIN CATCH
+                PRINT 'Could not clear fact source work tables: ' + ISNULL(ERROR_MESSAGE(), '');
+            END CATCH
+
+            EXEC sp_releaseapplock
+                @Resource = 'Analytics.Fact_Source_Window',
+                @LockOwner = 'Session';
+        END
+
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
 END
 GO
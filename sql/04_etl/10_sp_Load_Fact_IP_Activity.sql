@@ -25,13 +25,34 @@ Change Log:
   2026-01-27  Sridhar Peddi    Avoid @@ROWCOUNT after connection recovery
   2026-03-04  Sridhar Peddi     Accept legacy POD_Dataset 'APC' for IP POD lookup
   2026-03-12  Sridhar Peddi    Add temp key index and remove redundant anti-join for faster reloads
+  2026-03-20  Sridhar Peddi    Resolve dimension keys via tbl_Dim_Key_Lookup (no view joins in the insert)
+  2026-03-23  Sridhar Peddi    Read source via [Analytics].[syn_Src_*_Encounter] (single-pass extract in orchestrated runs)
+  2026-03-28  Sridhar Peddi    Compute CAM / Operating Plan / ERF columns in the insert (@Enrich); post-load enrich procs are the fallback
+  2026-03-28  Sridhar Peddi    Record the load window on tbl_ETL_Batch_Log (Power BI incremental refresh)
+  2026-03-28  Sridhar Peddi    Refresh changed key lookups before every load; *_Key codes VARCHAR(100) (no truncation)
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource); synonyms are no longer re-pointed
+  2026-03-28  Sridhar Peddi    @Enrich = 1 fails if an Active table has no rows for the window
+  2026-03-28  Sridhar Peddi    @Enrich defaults to 0 (standalone loads unenriched, as before); only the
+                               orchestrator passes 1. Enrichment is computed in the window INSERT, not a
+                               staging partition: this loader has no switch-in path (DELETE window + INSERT
+                               into the columnstore), so the insert is where rows are first written.
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_Fact_IP_Activity]
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @Enrich BIT = 0,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
+
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @RowsInserted INT = 0;
@@ -45,6 +66,7 @@ BEGIN
     DECLARE @NegativeLOSCount INT = 0;
     DECLARE @DuplicateKeyCount INT = 0;
     DECLARE @DQMessage NVARCHAR(4000);
+    DECLARE @EnrichMissing NVARCHAR(200);
 
     SET @ToDateActual = ISNULL(@ToDateActual, CAST(GETDATE() AS DATE));
     SET @FromDateActual = ISNULL(
@@ -61,14 +83,63 @@ BEGIN
     BEGIN TRY
         EXEC [Analytics].[sp_Start_ETL_Batch]
             @BatchName = @BatchName,
-            @BatchID = @BatchID OUTPUT;
+            @BatchID = @BatchID OUTPUT,
+            @WindowFromDate = @FromDateActual,
+            @WindowToDate = @ToDateActual;
+
+        IF @Enrich = 1
+           AND (
+                OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]', 'U') IS NULL
+             OR OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NULL
+             OR OBJECT_ID('[Analytics].[tbl_OpPlan_Active]', 'U') IS NULL
+           )
+        BEGIN
+            RAISERROR('Inline enrichment needs tbl_CAM_Assignment_Active, tbl_ERF_Repriced_Active and tbl_OpPlan_Active (run the precompute loads or pass @Enrich = 0).', 16, 1);
+        END
+
+        -- An empty Active table would silently write -1 / NULL for every row (the post-load
+        -- enrich procs refused to run against an empty table), so fail instead.
+        IF @Enrich = 1
+        BEGIN
+            SET @EnrichMissing = STUFF(CONCAT(
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_CAM_Assignment_Active] a
+                        WHERE a.[Dataset] = 'IP'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_CAM_Assignment_Active' END,
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_ERF_Repriced_Active] a
+                        WHERE a.[POD] = 'IP'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_ERF_Repriced_Active' END,
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_OpPlan_Active] a
+                        WHERE a.[Dataset] = 'Inpatient'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_OpPlan_Active' END
+            ), 1, 2, '');
+
+            IF @EnrichMissing IS NOT NULL
+            BEGIN
+                SET @DQMessage = 'Inline enrichment: no IP rows for the load window in ' + @EnrichMissing
+                    + ' (run the precompute loads for this window / FY or pass @Enrich = 0).';
+                RAISERROR(@DQMessage, 16, 1);
+            END
+        END
 
         PRINT 'Starting Load: [Analytics].[tbl_Fact_IP_Activity]';
         PRINT 'Load window: ' + CONVERT(VARCHAR(10), @FromDateActual, 120)
             + ' to ' + CONVERT(VARCHAR(10), @ToDateActual, 120);
 
+        -- Dimensions may have been loaded outside 00_Run_All_Dimension_Loads (run_pipeline.py,
+        -- ad-hoc EXEC): refresh any lookup that no longer matches its dimension.
+        EXEC [Analytics].[sp_Refresh_Dim_Key_Lookup] @OnlyIfChanged = 1;
+
         SELECT @NegativeLOSCount = COUNT(1)
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] SRC
+        FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) SRC
         WHERE SRC.End_Date_Hospital_Provider_Spell >= @FromDateActual
           AND SRC.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDateActual)
           AND TRY_CAST(SRC.dv_LengthOfStay_Gross AS INT) < 0;
@@ -106,7 +177,7 @@ BEGIN
         SELECT @DuplicateKeyCount = SUM(d.DuplicateRows)
         FROM (
             SELECT COUNT(1) - 1 AS DuplicateRows
-            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] SRC
+            FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) SRC
             WHERE SRC.End_Date_Hospital_Provider_Spell >= @FromDateActual
               AND SRC.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDateActual)
               AND (TRY_CAST(SRC.dv_LengthOfStay_Gross AS INT) IS NULL
@@ -160,8 +231,43 @@ BEGIN
                 NULLIF(LTRIM(RTRIM(SRC.Treatment_Function_Code)), '') AS Treatment_Function_Code_Norm,
                 NULLIF(LTRIM(RTRIM(SRC.Main_Specialty_Code)), '') AS Main_Specialty_Code_Norm,
                 NULLIF(LTRIM(RTRIM(SRC.Patient_Classification)), '') AS Patient_Classification_Code_Norm,
-                TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Patient_Classification)), '')) AS Patient_Classification_Code_Int
-            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] SRC
+                CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Patient_Classification)), '')) AS VARCHAR(100)) AS Patient_Classification_Int_Key,
+
+                -- Lookup keys (normalised as in sp_Refresh_Dim_Key_Lookup)
+                CAST(SRC.Start_Date_Hospital_Provider_Spell AS DATE) AS Admission_Date_Key,
+                CAST(SRC.End_Date_Hospital_Provider_Spell AS DATE) AS Discharge_Date_Key,
+                CASE
+                    WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 0 AND 99
+                        THEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date)
+                    WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 100 AND 110
+                        THEN 100
+                    ELSE -1
+                END AS Age_Key,
+                CAST(SRC.Gender_Code AS VARCHAR(100)) AS Gender_Key,
+                CAST(
+                    CASE
+                        WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = '99' THEN '99'
+                        WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = 'Z' THEN 'Z'
+                        ELSE LEFT(LTRIM(RTRIM(SRC.Ethnic_Category_Code)), 1)
+                    END AS VARCHAR(100)) AS Ethnicity_Key,
+                CAST(
+                    CASE
+                        WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
+                            THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
+                        ELSE SRC.Organisation_Code_Code_of_Provider
+                    END AS VARCHAR(100)) AS Provider_Key,
+                CAST(
+                    CASE
+                        WHEN RIGHT(SRC.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                            THEN LEFT(SRC.Organisation_Code_Code_of_Commissioner, 3)
+                        ELSE SRC.Organisation_Code_Code_of_Commissioner
+                    END AS VARCHAR(100)) AS Commissioner_Key,
+                CAST(SRC.Spell_Core_HRG AS VARCHAR(100)) AS HRG_Key,
+                CAST(SRC.Admission_Method_Hospital_Provider_Spell AS VARCHAR(100)) AS Admission_Method_Key,
+                CAST(SRC.Source_of_Admission_Hospital_Provider_Spell AS VARCHAR(100)) AS Admission_Source_Key,
+                CAST(SRC.Discharge_Method_Hospital_Provider_Spell AS VARCHAR(100)) AS Discharge_Method_Key,
+                CAST(SRC.Discharge_Destination_Hospital_Provider_Spell AS VARCHAR(100)) AS Discharge_Destination_Key
+            FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) SRC
             WHERE SRC.End_Date_Hospital_Provider_Spell >= @FromDateActual
               AND SRC.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDateActual)
         ),
@@ -180,49 +286,25 @@ BEGIN
             FROM SourceDeduped
             WHERE RowNum = 1
         )
-        SELECT *
+        SELECT
+            SF.*,
+            -- POD derived once per encounter (IP.GetPodType), then resolved via POD_IP lookup
+            CAST(UPPER([Data_Lab_SWL].[IP].[GetPodType](
+                SF.Admission_Method_Hospital_Provider_Spell,
+                SF.Patient_Classification,
+                SF.Intended_Management,
+                SF.Admission_Date,
+                SF.Discharge_Date,
+                SF.Spell_Core_HRG
+            )) AS VARCHAR(100)) AS POD_Key
         INTO #SourceFiltered
-        FROM SourceFiltered;
+        FROM SourceFiltered SF;
 
         CREATE UNIQUE CLUSTERED INDEX IX_SourceFiltered_IP_Key
             ON #SourceFiltered (SK_EncounterID, Discharge_Date);
 
         SELECT @SourceRows = COUNT(*) FROM #SourceFiltered;
 
-        IF OBJECT_ID('tempdb..#Dim_Specialty_Map') IS NOT NULL
-            DROP TABLE #Dim_Specialty_Map;
-        SELECT
-            ds.BK_SpecialtyCode,
-            MIN(ds.SK_SpecialtyID) AS SK_SpecialtyID
-        INTO #Dim_Specialty_Map
-        FROM [Analytics].[vw_Dim_Specialty] ds
-        WHERE ds.BK_SpecialtyCode IS NOT NULL
-        GROUP BY ds.BK_SpecialtyCode;
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_Specialty_Map_Code ON #Dim_Specialty_Map(BK_SpecialtyCode);
-
-        IF OBJECT_ID('tempdb..#Dim_IP_PatClass_Map_Norm') IS NOT NULL
-            DROP TABLE #Dim_IP_PatClass_Map_Norm;
-        SELECT
-            MIN(pc.SK_PatientClassificationID) AS SK_PatientClassificationID,
-            NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '') AS Code_Norm
-        INTO #Dim_IP_PatClass_Map_Norm
-        FROM [Analytics].[vw_Dim_IP_Patient_Classification] pc
-        WHERE NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '') IS NOT NULL
-        GROUP BY
-            NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '');
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_IP_PatClass_Map_Norm ON #Dim_IP_PatClass_Map_Norm(Code_Norm);
-
-        IF OBJECT_ID('tempdb..#Dim_IP_PatClass_Map_Int') IS NOT NULL
-            DROP TABLE #Dim_IP_PatClass_Map_Int;
-        SELECT
-            MIN(pc.SK_PatientClassificationID) AS SK_PatientClassificationID,
-            TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '')) AS Code_Int
-        INTO #Dim_IP_PatClass_Map_Int
-        FROM [Analytics].[vw_Dim_IP_Patient_Classification] pc
-        WHERE TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '')) IS NOT NULL
-        GROUP BY TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), ''));
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_IP_PatClass_Map_Int ON #Dim_IP_PatClass_Map_Int(Code_Int);
-
         SELECT @RowsDeleted = COUNT(*)
         FROM [Analytics].[tbl_Fact_IP_Activity] f
         INNER JOIN #SourceFiltered s
@@ -287,6 +369,21 @@ BEGIN
             [Base_Tariff],
             [MFF_Multiplier],
 
+            -- Enrichment (CAM / Operating Plan / ERF)
+            [SK_CAM_CommissionerID],
+            [SK_CAM_Service_CategoryID],
+            [SK_CAM_Assignment_ReasonID],
+            [CAM_Commissioner_Code],
+            [CAM_Service_Category],
+            [CAM_Assignment_Reason],
+            [Commissioner_Variance],
+            [Service_Category_Variance],
+            [Is_Operating_Plan],
+            [SK_OpPlan_MeasureSet],
+            [Is_ERF_Eligible],
+            [ERF_MFF_Applied],
+            [ERF_Total_Cost_Incl_MFF],
+
             [ETL_LoadDateTime]
         )
         OUTPUT inserted.SK_EncounterID, inserted.Discharge_Date INTO @InsertedKeys
@@ -299,29 +396,29 @@ BEGIN
             ISNULL(D_Dis.SK_Date, -1) AS [SK_DateDischargeID],
             SRC.Admission_Date AS [Admission_Date],
             SRC.Discharge_Date AS [Discharge_Date],
-            ISNULL(AB.Age, -1) AS [SK_Age_BandID],
-            COALESCE(CAST(G.SK_GenderID AS INT), -1) AS [SK_GenderID],
-            COALESCE(CAST(E.SK_EthnicityID AS INT), -1) AS [SK_EthnicityID],
-            COALESCE(CAST(Pr.SK_ProviderID AS INT), -1) AS [SK_ProviderID],
-            COALESCE(CAST(LSOA.SK_LSOA_ID AS INT), -1) AS [SK_LSOA_ID],
+            SRC.Age_Key AS [SK_Age_BandID],
+            ISNULL(G.SK_ID, -1) AS [SK_GenderID],
+            ISNULL(E.SK_ID, -1) AS [SK_EthnicityID],
+            ISNULL(Pr.SK_ID, -1) AS [SK_ProviderID],
+            ISNULL(LSOA.SK_ID, -1) AS [SK_LSOA_ID],
             NULLIF(LTRIM(RTRIM(SRC.dv_LSOACode)), '') AS [LSOA_Code],
             
-            COALESCE(CAST(SpecTfc.SK_SpecialtyID AS INT), CAST(SpecMain.SK_SpecialtyID AS INT), -1) AS [SK_SpecialtyID],
-            COALESCE(CAST(HRG.SK_HRGID AS INT), -1) AS [SK_HRG_ID],
+            COALESCE(SpecTfc.SK_ID, SpecMain.SK_ID, -1) AS [SK_SpecialtyID],
+            ISNULL(HRG.SK_ID, -1) AS [SK_HRG_ID],
             NULL AS [SK_DiagnosisID],
             NULL AS [SK_ProcedureID],
             
-            COALESCE(CAST(Comm.SK_CommissionerID AS INT), -1) AS [SK_CommissionerID],
-            COALESCE(CAST(GP.SK_GPPracticeID AS INT), -1) AS [SK_GPPracticeID],
-            COALESCE(CAST(PCN.SK_PCNID AS INT), -1) AS [SK_PCN_ID],
-            COALESCE(CAST(POD.SK_PodID AS INT), -1) AS [SK_POD_ID],
+            ISNULL(Comm.SK_ID, -1) AS [SK_CommissionerID],
+            ISNULL(GP.SK_ID, -1) AS [SK_GPPracticeID],
+            ISNULL(PCN.SK_ID, -1) AS [SK_PCN_ID],
+            ISNULL(POD.SK_ID, -1) AS [SK_POD_ID],
 
             -- IP Specific
-            COALESCE(CAST(AdmMet.SK_AdmissionMethodID AS INT), -1) AS [SK_Admission_MethodID],
-            COALESCE(CAST(AdmSrc.SK_AdmissionSourceID AS INT), -1) AS [SK_Admission_SourceID],
-            COALESCE(CAST(DisMet.SK_DischargeMethodID AS INT), -1) AS [SK_Discharge_MethodID],
-            COALESCE(CAST(DisDest.SK_DischargeDestinationID AS INT), -1) AS [SK_Discharge_DestinationID],
-            COALESCE(CAST(PatClassNorm.SK_PatientClassificationID AS INT), CAST(PatClassInt.SK_PatientClassificationID AS INT), -1) AS [SK_IP_Patient_ClassificationID],
+            ISNULL(AdmMet.SK_ID, -1) AS [SK_Admission_MethodID],
+            ISNULL(AdmSrc.SK_ID, -1) AS [SK_Admission_SourceID],
+            ISNULL(DisMet.SK_ID, -1) AS [SK_Discharge_MethodID],
+            ISNULL(DisDest.SK_ID, -1) AS [SK_Discharge_DestinationID],
+            COALESCE(PatClassNorm.SK_ID, PatClassInt.SK_ID, -1) AS [SK_IP_Patient_ClassificationID],
             -1 AS [SK_Attendance_StatusID],
             -1 AS [SK_Attendance_OutcomeID],
             -1 AS [SK_Attendance_TypeID],
@@ -341,85 +438,78 @@ BEGIN
             TRY_CAST(SRC.dv_RehabDays AS INT) AS [Rehab_Days],
             CAST(SRC.dv_Base_Cost AS DECIMAL(12,2)) AS [Base_Tariff],
             CAST(SRC.dv_MFF_Index_Applied AS DECIMAL(5,4)) AS [MFF_Multiplier],
-
+
+            -- Enrichment (CAM / Operating Plan / ERF)
+            ISNULL(Cam.[SK_CAM_CommissionerID], -1) AS [SK_CAM_CommissionerID],
+            ISNULL(Cam.[SK_CAM_Service_CategoryID], -1) AS [SK_CAM_Service_CategoryID],
+            ISNULL(Cam.[SK_CAM_Assignment_ReasonID], -1) AS [SK_CAM_Assignment_ReasonID],
+            Cam.[CAM_Commissioner_Code] AS [CAM_Commissioner_Code],
+            Cam.[CAM_Service_Category] AS [CAM_Service_Category],
+            Cam.[CAM_Assignment_Reason] AS [CAM_Assignment_Reason],
+            Cam.[Commissioner_Variance] AS [Commissioner_Variance],
+            Cam.[Service_Category_Variance] AS [Service_Category_Variance],
+            CASE WHEN OpPlan.SK_EncounterID IS NULL THEN 0 ELSE 1 END AS [Is_Operating_Plan],
+            COALESCE(OpPlan.SK_OpPlan_MeasureSet, -1) AS [SK_OpPlan_MeasureSet],
+            CASE WHEN Erf.SK_EncounterID IS NULL THEN 0 ELSE 1 END AS [Is_ERF_Eligible],
+            CAST(Erf.ERF_MFF_Applied AS DECIMAL(12,2)) AS [ERF_MFF_Applied],
+            CAST(Erf.ERF_Total_Cost_Incl_MFF AS DECIMAL(12,2)) AS [ERF_Total_Cost_Incl_MFF],
+
             @ETL_Start AS [ETL_LoadDateTime]
 
     FROM #SourceFiltered SRC
-    CROSS APPLY (
-        SELECT [Data_Lab_SWL].[IP].[GetPodType](
-            SRC.Admission_Method_Hospital_Provider_Spell,
-            SRC.Patient_Classification,
-            SRC.Intended_Management,
-            SRC.Admission_Date,
-            SRC.Discharge_Date,
-            SRC.Spell_Core_HRG
-        ) AS POD_Code
-    ) PodCalc
-
-        -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
-        LEFT JOIN [Analytics].[vw_Dim_Date] D_Adm ON CAST(SRC.Start_Date_Hospital_Provider_Spell AS DATE) = D_Adm.FullDate
-        LEFT JOIN [Analytics].[vw_Dim_Date] D_Dis ON CAST(SRC.End_Date_Hospital_Provider_Spell AS DATE) = D_Dis.FullDate
-        LEFT JOIN [Analytics].[vw_Dim_Age_Band] AB
-            ON AB.Age =
-                CASE
-                    WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 0 AND 99
-                        THEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date)
-                    WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 100 AND 110
-                        THEN 100
-                    ELSE -1
-                END
-        LEFT JOIN [Analytics].[vw_Dim_Gender] G ON SRC.Gender_Code = G.GenderCode
-        LEFT JOIN [Analytics].[vw_Dim_Ethnicity] E
-            ON E.EthnicityCode =
-                CASE
-                    WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = '99' THEN '99'
-                    WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = 'Z' THEN 'Z'
-                    ELSE LEFT(LTRIM(RTRIM(SRC.Ethnic_Category_Code)), 1)
-                END
-        LEFT JOIN [Analytics].[vw_Dim_Provider] Pr
-            ON Pr.Provider_Code =
-                CASE
-                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
-                        THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
-                    ELSE SRC.Organisation_Code_Code_of_Provider
-                END
-        LEFT JOIN [Analytics].[vw_Dim_LSOA] LSOA
-            ON LSOA.LSOA_Code = SRC.LSOA_Code_Norm
-        LEFT JOIN #Dim_Specialty_Map SpecTfc
-            ON SpecTfc.BK_SpecialtyCode = SRC.Treatment_Function_Code_Norm
-        LEFT JOIN #Dim_Specialty_Map SpecMain
-            ON SpecMain.BK_SpecialtyCode = SRC.Main_Specialty_Code_Norm
-        LEFT JOIN [Analytics].[vw_Dim_HRG] HRG ON SRC.Spell_Core_HRG = HRG.HRGCode
-
-        LEFT JOIN [Analytics].[tbl_Dim_Commissioner] Comm
-            ON Comm.Commissioner_Code =
-                CASE
-                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                        THEN LEFT(SRC.Organisation_Code_Code_of_Commissioner, 3)
-                    ELSE SRC.Organisation_Code_Code_of_Commissioner
-                END
-        LEFT JOIN [Analytics].[tbl_Dim_GPPractice] GP
-            ON GP.GPPractice_Code = SRC.GP_Practice_Code_Norm
-           AND GP.Is_Current = 1
-        LEFT JOIN [Analytics].[tbl_Dim_PCN] PCN
-            ON PCN.PCN_Code = GP.PCN_Code
-           AND PCN.Is_Current = 1
-
-        -- POD mapping (derived via IP.GetPodType for materialised source tables)
-        LEFT JOIN [Analytics].[tbl_Dim_POD] POD
-            ON POD.POD_Code = UPPER(PodCalc.POD_Code)
-           -- Backward compatibility: some POD loads use 'APC' for inpatient dataset.
-           AND POD.POD_Dataset IN ('IP', 'APC', 'Unbundled')
-
-        -- IP JOINS
-        LEFT JOIN [Analytics].[vw_Dim_Admission_Method] AdmMet ON SRC.Admission_Method_Hospital_Provider_Spell = AdmMet.Admission_Method_Code
-        LEFT JOIN [Analytics].[vw_Dim_Admission_Source] AdmSrc ON SRC.Source_of_Admission_Hospital_Provider_Spell = AdmSrc.Admission_Source_Code
-        LEFT JOIN [Analytics].[vw_Dim_Discharge_Method] DisMet ON SRC.Discharge_Method_Hospital_Provider_Spell = DisMet.Discharge_Method_Code
-        LEFT JOIN [Analytics].[vw_Dim_Discharge_Destination] DisDest ON SRC.Discharge_Destination_Hospital_Provider_Spell = DisDest.Discharge_Destination_Code
-        LEFT JOIN #Dim_IP_PatClass_Map_Norm PatClassNorm
-            ON PatClassNorm.Code_Norm = SRC.Patient_Classification_Code_Norm
-        LEFT JOIN #Dim_IP_PatClass_Map_Int PatClassInt
-            ON PatClassInt.Code_Int = SRC.Patient_Classification_Code_Int
+
+        -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
+        -- Dimension keys: clustered seeks on the key lookup cache (sp_Refresh_Dim_Key_Lookup)
+        LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Adm ON D_Adm.FullDate = SRC.Admission_Date_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Dis ON D_Dis.FullDate = SRC.Discharge_Date_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] G
+            ON G.Lookup_Name = 'Gender' AND G.Lookup_Code = SRC.Gender_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] E
+            ON E.Lookup_Name = 'Ethnicity' AND E.Lookup_Code = SRC.Ethnicity_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Pr
+            ON Pr.Lookup_Name = 'Provider' AND Pr.Lookup_Code = SRC.Provider_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] LSOA
+            ON LSOA.Lookup_Name = 'LSOA' AND LSOA.Lookup_Code = SRC.LSOA_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] SpecTfc
+            ON SpecTfc.Lookup_Name = 'Specialty' AND SpecTfc.Lookup_Code = SRC.Treatment_Function_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] SpecMain
+            ON SpecMain.Lookup_Name = 'Specialty' AND SpecMain.Lookup_Code = SRC.Main_Specialty_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] HRG
+            ON HRG.Lookup_Name = 'HRG' AND HRG.Lookup_Code = SRC.HRG_Key
+
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Comm
+            ON Comm.Lookup_Name = 'Commissioner' AND Comm.Lookup_Code = SRC.Commissioner_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] GP
+            ON GP.Lookup_Name = 'GPPractice' AND GP.Lookup_Code = SRC.GP_Practice_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] PCN
+            ON PCN.Lookup_Name = 'GPPractice_PCN' AND PCN.Lookup_Code = SRC.GP_Practice_Code_Norm
+
+        -- POD mapping (POD_Key derived via IP.GetPodType when #SourceFiltered is built)
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] POD
+            ON POD.Lookup_Name = 'POD_IP' AND POD.Lookup_Code = SRC.POD_Key
+
+        -- IP JOINS
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] AdmMet
+            ON AdmMet.Lookup_Name = 'Admission_Method' AND AdmMet.Lookup_Code = SRC.Admission_Method_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] AdmSrc
+            ON AdmSrc.Lookup_Name = 'Admission_Source' AND AdmSrc.Lookup_Code = SRC.Admission_Source_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] DisMet
+            ON DisMet.Lookup_Name = 'Discharge_Method' AND DisMet.Lookup_Code = SRC.Discharge_Method_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] DisDest
+            ON DisDest.Lookup_Name = 'Discharge_Destination' AND DisDest.Lookup_Code = SRC.Discharge_Destination_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] PatClassNorm
+            ON PatClassNorm.Lookup_Name = 'IP_Patient_Class' AND PatClassNorm.Lookup_Code = SRC.Patient_Classification_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] PatClassInt
+            ON PatClassInt.Lookup_Name = 'IP_Patient_Class_Int' AND PatClassInt.Lookup_Code = SRC.Patient_Classification_Int_Key
+
+        -- Inline enrichment (@Enrich = 1): precomputed Active tables are keyed 1:1 on
+        -- (SK_EncounterID, Dataset/POD), so these joins never fan out the insert.
+        LEFT JOIN [Analytics].[tbl_CAM_Assignment_Active] Cam
+            ON @Enrich = 1 AND Cam.[Dataset] = 'IP' AND Cam.[SK_EncounterID] = SRC.SK_EncounterID
+        LEFT JOIN [Analytics].[tbl_ERF_Repriced_Active] Erf
+            ON @Enrich = 1 AND Erf.[POD] = 'IP' AND Erf.[SK_EncounterID] = SRC.SK_EncounterID
+        LEFT JOIN [Analytics].[tbl_OpPlan_Active] OpPlan
+            ON @Enrich = 1 AND OpPlan.[Dataset] = 'Inpatient' AND OpPlan.[SK_EncounterID] = SRC.SK_EncounterID
 
         SELECT @RowsInserted = COUNT(*) FROM @InsertedKeys;
         SET @RowsSkipped = @SourceRows - @RowsInserted;
@@ -430,6 +520,7 @@ BEGIN
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Fact_IP_Activity',
+            @ProcID = @@PROCID,
             @LoadType = 'Full',
             @RowsAffected = @RowsInserted,
             @Status = 'Success';
@@ -457,7 +548,7 @@ BEGIN
                     COALESCE(CAST(SRC.Start_Date_Hospital_Provider_Spell AS DATE), CAST('1900-01-01' AS DATE)) AS Admission_Date,
                     COALESCE(CAST(SRC.End_Date_Hospital_Provider_Spell AS DATE), CAST('1900-01-01' AS DATE)) AS Discharge_Date,
                     TRY_CAST(SRC.dv_LengthOfStay_Gross AS INT) AS Length_Of_Stay
-                FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] SRC
+                FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) SRC
                 WHERE SRC.End_Date_Hospital_Provider_Spell >= @FromDateActual
                   AND SRC.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDateActual)
             ),
@@ -491,6 +582,7 @@ BEGIN
                 EXEC [Analytics].[sp_Log_Table_Load]
                     @BatchID = @BatchID,
                     @TableName = 'Analytics.tbl_Fact_IP_Activity',
+                    @ProcID = @@PROCID,
                     @LoadType = 'Full',
                     @RowsAffected = @RowsInserted,
                     @RowsFailed = 0,
@@ -514,6 +606,7 @@ BEGIN
             EXEC [Analytics].[sp_Log_Table_Load]
                 @BatchID = @BatchID,
                 @TableName = 'Analytics.tbl_Fact_IP_Activity',
+                @ProcID = @@PROCID,
                 @LoadType = 'Full',
                 @RowsAffected = 0,
                 @RowsFailed = 1,
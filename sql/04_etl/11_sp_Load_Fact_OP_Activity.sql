@@ -24,13 +24,34 @@ Change Log:
   2026-01-26  Sridhar Peddi    Add Is_FirstAttendance flag
   2026-01-27  Sridhar Peddi    Deduplicate source and avoid @@ROWCOUNT after recovery
   2026-03-12  Sridhar Peddi    Add temp key index and remove redundant anti-join for faster reloads
+  2026-03-20  Sridhar Peddi    Resolve dimension keys via tbl_Dim_Key_Lookup (no view joins in the insert)
+  2026-03-23  Sridhar Peddi    Read source via [Analytics].[syn_Src_*_Encounter] (single-pass extract in orchestrated runs)
+  2026-03-28  Sridhar Peddi    Compute CAM / Operating Plan / ERF columns in the insert (@Enrich); post-load enrich procs are the fallback
+  2026-03-28  Sridhar Peddi    Record the load window on tbl_ETL_Batch_Log (Power BI incremental refresh)
+  2026-03-28  Sridhar Peddi    Refresh changed key lookups before every load; *_Key codes VARCHAR(100) (no truncation)
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource); synonyms are no longer re-pointed
+  2026-03-28  Sridhar Peddi    @Enrich = 1 fails if an Active table has no rows for the window
+  2026-03-28  Sridhar Peddi    @Enrich defaults to 0 (standalone loads unenriched, as before); only the
+                               orchestrator passes 1. Enrichment is computed in the window INSERT, not a
+                               staging partition: this loader has no switch-in path (DELETE window + INSERT
+                               into the columnstore), so the insert is where rows are first written.
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_Fact_OP_Activity]
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @Enrich BIT = 0,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
+
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
@@ -40,6 +61,8 @@ BEGIN
     DECLARE @BatchID INT = NULL;
     DECLARE @ToDateActual DATE = ISNULL(@ToDate, [Analytics].[fn_SUS_Published_Cutoff_Date](NULL));
     DECLARE @FromDateActual DATE;
+    DECLARE @EnrichMissing NVARCHAR(200);
+    DECLARE @DQMessage NVARCHAR(4000);
 
     SET @ToDateActual = ISNULL(@ToDateActual, CAST(GETDATE() AS DATE));
     SET @FromDateActual = ISNULL(
@@ -56,12 +79,61 @@ BEGIN
     BEGIN TRY
         EXEC [Analytics].[sp_Start_ETL_Batch]
             @BatchName = @BatchName,
-            @BatchID = @BatchID OUTPUT;
+            @BatchID = @BatchID OUTPUT,
+            @WindowFromDate = @FromDateActual,
+            @WindowToDate = @ToDateActual;
+
+        IF @Enrich = 1
+           AND (
+                OBJECT_ID('[Analytics].[tbl_CAM_Assignment_Active]', 'U') IS NULL
+             OR OBJECT_ID('[Analytics].[tbl_ERF_Repriced_Active]', 'U') IS NULL
+             OR OBJECT_ID('[Analytics].[tbl_OpPlan_Active]', 'U') IS NULL
+           )
+        BEGIN
+            RAISERROR('Inline enrichment needs tbl_CAM_Assignment_Active, tbl_ERF_Repriced_Active and tbl_OpPlan_Active (run the precompute loads or pass @Enrich = 0).', 16, 1);
+        END
+
+        -- An empty Active table would silently write -1 / NULL for every row (the post-load
+        -- enrich procs refused to run against an empty table), so fail instead.
+        IF @Enrich = 1
+        BEGIN
+            SET @EnrichMissing = STUFF(CONCAT(
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_CAM_Assignment_Active] a
+                        WHERE a.[Dataset] = 'OP'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_CAM_Assignment_Active' END,
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_ERF_Repriced_Active] a
+                        WHERE a.[POD] = 'OP'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_ERF_Repriced_Active' END,
+                CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM [Analytics].[tbl_OpPlan_Active] a
+                        WHERE a.[Dataset] = 'Outpatient'
+                          AND a.Activity_Date >= @FromDateActual
+                          AND a.Activity_Date < DATEADD(DAY, 1, @ToDateActual))
+                     THEN ', tbl_OpPlan_Active' END
+            ), 1, 2, '');
+
+            IF @EnrichMissing IS NOT NULL
+            BEGIN
+                SET @DQMessage = 'Inline enrichment: no OP rows for the load window in ' + @EnrichMissing
+                    + ' (run the precompute loads for this window / FY or pass @Enrich = 0).';
+                RAISERROR(@DQMessage, 16, 1);
+            END
+        END
 
         PRINT 'Starting Load: [Analytics].[tbl_Fact_OP_Activity]';
         PRINT 'Load window: ' + CONVERT(VARCHAR(10), @FromDateActual, 120)
             + ' to ' + CONVERT(VARCHAR(10), @ToDateActual, 120);
 
+        -- Dimensions may have been loaded outside 00_Run_All_Dimension_Loads (run_pipeline.py,
+        -- ad-hoc EXEC): refresh any lookup that no longer matches its dimension.
+        EXEC [Analytics].[sp_Refresh_Dim_Key_Lookup] @OnlyIfChanged = 1;
+
         IF OBJECT_ID('tempdb..#SourceFiltered') IS NOT NULL
             DROP TABLE #SourceFiltered;
 
@@ -75,8 +147,43 @@ BEGIN
                 NULLIF(LTRIM(RTRIM(SRC.Treatment_Function_Code)), '') AS Treatment_Function_Code_Norm,
                 NULLIF(LTRIM(RTRIM(SRC.Main_Specialty_Code)), '') AS Main_Specialty_Code_Norm,
                 NULLIF(LTRIM(RTRIM(SRC.Source_of_Referral_for_Outpatients)), '') AS Referral_Source_Code_Norm,
-                TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Source_of_Referral_for_Outpatients)), '')) AS Referral_Source_Code_Int
-            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] SRC
+                CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Source_of_Referral_for_Outpatients)), '')) AS VARCHAR(100)) AS Referral_Source_Int_Key,
+
+                -- Lookup keys (normalised as in sp_Refresh_Dim_Key_Lookup)
+                CAST(SRC.Appointment_Date AS DATE) AS Appointment_Date_Key,
+                CAST(SRC.Referral_Request_Received_Date AS DATE) AS Referral_Date_Key,
+                CASE
+                    WHEN TRY_CONVERT(INT, SRC.Age) BETWEEN 0 AND 99
+                        THEN TRY_CONVERT(INT, SRC.Age)
+                    WHEN TRY_CONVERT(INT, SRC.Age) BETWEEN 100 AND 110
+                        THEN 100
+                    ELSE -1
+                END AS Age_Key,
+                CAST(SRC.Gender_Code AS VARCHAR(100)) AS Gender_Key,
+                CAST(
+                    CASE
+                        WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = '99' THEN '99'
+                        WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = 'Z' THEN 'Z'
+                        ELSE LEFT(LTRIM(RTRIM(SRC.Ethnic_Category_Code)), 1)
+                    END AS VARCHAR(100)) AS Ethnicity_Key,
+                CAST(
+                    CASE
+                        WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
+                            THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
+                        ELSE SRC.Organisation_Code_Code_of_Provider
+                    END AS VARCHAR(100)) AS Provider_Key,
+                CAST(
+                    CASE
+                        WHEN RIGHT(SRC.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                            THEN LEFT(SRC.Organisation_Code_Code_of_Commissioner, 3)
+                        ELSE SRC.Organisation_Code_Code_of_Commissioner
+                    END AS VARCHAR(100)) AS Commissioner_Key,
+                CAST(SRC.Core_HRG AS VARCHAR(100)) AS HRG_Key,
+                CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Outcome_of_Attendance)), '')) AS VARCHAR(100)) AS Attendance_Outcome_Int_Key,
+                CAST(NULLIF(LTRIM(RTRIM(SRC.Attended_Or_Did_Not_Attend)), '') AS VARCHAR(100)) AS Attendance_Status_Key,
+                CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.First_Attendance)), '')) AS VARCHAR(100)) AS Attendance_Type_Int_Key,
+                CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Priority_Type)), '')) AS VARCHAR(100)) AS Priority_Type_Int_Key
+            FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) SRC
             WHERE SRC.Appointment_Date >= @FromDateActual
               AND SRC.Appointment_Date < DATEADD(DAY, 1, @ToDateActual)
         ),
@@ -94,49 +201,23 @@ BEGIN
             FROM SourceDeduped
             WHERE RowNum = 1
         )
-        SELECT *
+        SELECT
+            SF.*,
+            -- POD derived once per encounter (OP.fn_GetPODType), then resolved via POD_OP lookup
+            CAST(UPPER([OP].[fn_GetPODType](
+                SF.Core_HRG,
+                SF.Attended_Or_Did_Not_Attend,
+                SF.First_Attendance,
+                SF.Main_Specialty_Code
+            )) AS VARCHAR(100)) AS POD_Key
         INTO #SourceFiltered
-        FROM SourceFiltered;
+        FROM SourceFiltered SF;
 
         CREATE UNIQUE CLUSTERED INDEX IX_SourceFiltered_OP_Key
             ON #SourceFiltered (SK_EncounterID, Appointment_Date_Cast);
 
         SELECT @SourceRows = COUNT(*) FROM #SourceFiltered;
 
-        IF OBJECT_ID('tempdb..#Dim_Specialty_Map') IS NOT NULL
-            DROP TABLE #Dim_Specialty_Map;
-        SELECT
-            ds.BK_SpecialtyCode,
-            MIN(ds.SK_SpecialtyID) AS SK_SpecialtyID
-        INTO #Dim_Specialty_Map
-        FROM [Analytics].[vw_Dim_Specialty] ds
-        WHERE ds.BK_SpecialtyCode IS NOT NULL
-        GROUP BY ds.BK_SpecialtyCode;
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_Specialty_Map_Code ON #Dim_Specialty_Map(BK_SpecialtyCode);
-
-        IF OBJECT_ID('tempdb..#Dim_Referral_Source_Map_Norm') IS NOT NULL
-            DROP TABLE #Dim_Referral_Source_Map_Norm;
-        SELECT
-            MIN(rs.SK_ReferralSourceID) AS SK_ReferralSourceID,
-            NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '') AS Code_Norm
-        INTO #Dim_Referral_Source_Map_Norm
-        FROM [Analytics].[vw_Dim_Referral_Source] rs
-        WHERE NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '') IS NOT NULL
-        GROUP BY
-            NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '');
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_Referral_Source_Map_Norm ON #Dim_Referral_Source_Map_Norm(Code_Norm);
-
-        IF OBJECT_ID('tempdb..#Dim_Referral_Source_Map_Int') IS NOT NULL
-            DROP TABLE #Dim_Referral_Source_Map_Int;
-        SELECT
-            MIN(rs.SK_ReferralSourceID) AS SK_ReferralSourceID,
-            TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '')) AS Code_Int
-        INTO #Dim_Referral_Source_Map_Int
-        FROM [Analytics].[vw_Dim_Referral_Source] rs
-        WHERE TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '')) IS NOT NULL
-        GROUP BY TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), ''));
-        CREATE UNIQUE CLUSTERED INDEX IX_Dim_Referral_Source_Map_Int ON #Dim_Referral_Source_Map_Int(Code_Int);
-
         SELECT @RowsDeleted = COUNT(*)
         FROM [Analytics].[tbl_Fact_OP_Activity] f
         INNER JOIN #SourceFiltered s
@@ -201,6 +282,21 @@ BEGIN
             [Clinic_Code],
             [Admin_Category_Code],
 
+            -- Enrichment (CAM / Operating Plan / ERF)
+            [SK_CAM_CommissionerID],
+            [SK_CAM_Service_CategoryID],
+            [SK_CAM_Assignment_ReasonID],
+            [CAM_Commissioner_Code],
+            [CAM_Service_Category],
+            [CAM_Assignment_Reason],
+            [Commissioner_Variance],
+            [Service_Category_Variance],
+            [Is_Operating_Plan],
+            [SK_OpPlan_MeasureSet],
+            [Is_ERF_Eligible],
+            [ERF_MFF_Applied],
+            [ERF_Total_Cost_Incl_MFF],
+
             [ETL_LoadDateTime]
         )
         OUTPUT inserted.SK_EncounterID, inserted.Appointment_Date INTO @InsertedKeys
@@ -211,29 +307,29 @@ BEGIN
             ISNULL(D_Ref.SK_Date, -1) AS [SK_DateReferralID],
             SRC.Appointment_Date_Cast AS [Appointment_Date],
             SRC.Referral_Date AS [Referral_Date],
-            ISNULL(AB.Age, -1) AS [SK_Age_BandID],
-            COALESCE(CAST(G.SK_GenderID AS INT), -1) AS [SK_GenderID],
-            COALESCE(CAST(E.SK_EthnicityID AS INT), -1) AS [SK_EthnicityID],
-            COALESCE(CAST(Pr.SK_ProviderID AS INT), -1) AS [SK_ProviderID],
-            COALESCE(CAST(LSOA.SK_LSOA_ID AS INT), -1) AS [SK_LSOA_ID],
+            SRC.Age_Key AS [SK_Age_BandID],
+            ISNULL(G.SK_ID, -1) AS [SK_GenderID],
+            ISNULL(E.SK_ID, -1) AS [SK_EthnicityID],
+            ISNULL(Pr.SK_ID, -1) AS [SK_ProviderID],
+            ISNULL(LSOA.SK_ID, -1) AS [SK_LSOA_ID],
             NULLIF(LTRIM(RTRIM(SRC.dv_LSOA)), '') AS [LSOA_Code],
             
-            COALESCE(CAST(SpecTfc.SK_SpecialtyID AS INT), CAST(SpecMain.SK_SpecialtyID AS INT), -1) AS [SK_SpecialtyID],
-            COALESCE(CAST(HRG.SK_HRGID AS INT), -1) AS [SK_HRG_ID],
+            COALESCE(SpecTfc.SK_ID, SpecMain.SK_ID, -1) AS [SK_SpecialtyID],
+            ISNULL(HRG.SK_ID, -1) AS [SK_HRG_ID],
             NULL AS [SK_ProcedureID],
             
-            COALESCE(CAST(Comm.SK_CommissionerID AS INT), -1) AS [SK_CommissionerID],
-            COALESCE(CAST(GP.SK_GPPracticeID AS INT), -1) AS [SK_GPPracticeID],
-            COALESCE(CAST(PCN.SK_PCNID AS INT), -1) AS [SK_PCN_ID],
-            COALESCE(CAST(POD.SK_PodID AS INT), -1) AS [SK_POD_ID],
+            ISNULL(Comm.SK_ID, -1) AS [SK_CommissionerID],
+            ISNULL(GP.SK_ID, -1) AS [SK_GPPracticeID],
+            ISNULL(PCN.SK_ID, -1) AS [SK_PCN_ID],
+            ISNULL(POD.SK_ID, -1) AS [SK_POD_ID],
 
             -- OP Specific
-            COALESCE(CAST(AttStat.SK_AttendanceStatusID AS INT), -1) AS [SK_Attendance_StatusID],
-            COALESCE(CAST(AttOut.SK_AttendanceOutcomeID AS INT), -1) AS [SK_Attendance_OutcomeID],
-            COALESCE(CAST(AttTyp.SK_AttendanceTypeID AS INT), -1) AS [SK_Attendance_TypeID],
-            COALESCE(CAST(DNA.SK_DNAIndicatorID AS INT), -1) AS [SK_DNA_IndicatorID],
-            COALESCE(CAST(Prio.SK_PriorityTypeID AS INT), -1) AS [SK_Priority_TypeID],
-            COALESCE(CAST(RefSrcNorm.SK_ReferralSourceID AS INT), CAST(RefSrcInt.SK_ReferralSourceID AS INT), -1) AS [SK_Referral_SourceID],
+            ISNULL(AttStat.SK_ID, -1) AS [SK_Attendance_StatusID],
+            ISNULL(AttOut.SK_ID, -1) AS [SK_Attendance_OutcomeID],
+            ISNULL(AttTyp.SK_ID, -1) AS [SK_Attendance_TypeID],
+            ISNULL(DNA.SK_ID, -1) AS [SK_DNA_IndicatorID],
+            ISNULL(Prio.SK_ID, -1) AS [SK_Priority_TypeID],
+            COALESCE(RefSrcNorm.SK_ID, RefSrcInt.SK_ID, -1) AS [SK_Referral_SourceID],
             -1 AS [SK_Admission_MethodID],
             -1 AS [SK_Admission_SourceID],
             -1 AS [SK_Discharge_MethodID],
@@ -263,91 +359,78 @@ BEGIN
             SRC.Clinic_Code AS [Clinic_Code],
             CAST(SRC.Administrative_Category AS VARCHAR(2)) AS [Admin_Category_Code],
 
+            -- Enrichment (CAM / Operating Plan / ERF)
+            ISNULL(Cam.[SK_CAM_CommissionerID], -1) AS [SK_CAM_CommissionerID],
+            ISNULL(Cam.[SK_CAM_Service_CategoryID], -1) AS [SK_CAM_Service_CategoryID],
+            ISNULL(Cam.[SK_CAM_Assignment_ReasonID], -1) AS [SK_CAM_Assignment_ReasonID],
+            Cam.[CAM_Commissioner_Code] AS [CAM_Commissioner_Code],
+            Cam.[CAM_Service_Category] AS [CAM_Service_Category],
+            Cam.[CAM_Assignment_Reason] AS [CAM_Assignment_Reason],
+            Cam.[Commissioner_Variance] AS [Commissioner_Variance],
+            Cam.[Service_Category_Variance] AS [Service_Category_Variance],
+            CASE WHEN OpPlan.SK_EncounterID IS NULL THEN 0 ELSE 1 END AS [Is_Operating_Plan],
+            COALESCE(OpPlan.SK_OpPlan_MeasureSet, -1) AS [SK_OpPlan_MeasureSet],
+            CASE WHEN Erf.SK_EncounterID IS NULL THEN 0 ELSE 1 END AS [Is_ERF_Eligible],
+            CAST(Erf.ERF_MFF_Applied AS DECIMAL(12,2)) AS [ERF_MFF_Applied],
+            CAST(Erf.ERF_Total_Cost_Incl_MFF AS DECIMAL(12,2)) AS [ERF_Total_Cost_Incl_MFF],
+
             @ETL_Start AS [ETL_LoadDateTime]
 
         FROM #SourceFiltered SRC
-        CROSS APPLY (
-            SELECT [OP].[fn_GetPODType](
-                SRC.Core_HRG,
-                SRC.Attended_Or_Did_Not_Attend,
-                SRC.First_Attendance,
-                SRC.Main_Specialty_Code
-            ) AS POD_Code
-        ) PodCalc
-        -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
-        LEFT JOIN [Analytics].[vw_Dim_Date] D_Appt ON CAST(SRC.Appointment_Date AS DATE) = D_Appt.FullDate
-        LEFT JOIN [Analytics].[vw_Dim_Date] D_Ref ON CAST(SRC.Referral_Request_Received_Date AS DATE) = D_Ref.FullDate
-        LEFT JOIN [Analytics].[vw_Dim_Age_Band] AB
-            ON AB.Age =
-                CASE
-                    WHEN TRY_CONVERT(INT, SRC.Age) BETWEEN 0 AND 99
-                        THEN TRY_CONVERT(INT, SRC.Age)
-                    WHEN TRY_CONVERT(INT, SRC.Age) BETWEEN 100 AND 110
-                        THEN 100
-                    ELSE -1
-                END
-        LEFT JOIN [Analytics].[vw_Dim_Gender] G ON SRC.Gender_Code = G.GenderCode
-        LEFT JOIN [Analytics].[vw_Dim_Ethnicity] E
-            ON E.EthnicityCode =
-                CASE
-                    WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = '99' THEN '99'
-                    WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = 'Z' THEN 'Z'
-                    ELSE LEFT(LTRIM(RTRIM(SRC.Ethnic_Category_Code)), 1)
-                END
-        LEFT JOIN [Analytics].[vw_Dim_Provider] Pr
-            ON Pr.Provider_Code =
-                CASE
-                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
-                        THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
-                    ELSE SRC.Organisation_Code_Code_of_Provider
-                END
-        LEFT JOIN [Analytics].[vw_Dim_LSOA] LSOA
-            ON LSOA.LSOA_Code = SRC.LSOA_Code_Norm
-        LEFT JOIN #Dim_Specialty_Map SpecTfc
-            ON SpecTfc.BK_SpecialtyCode = SRC.Treatment_Function_Code_Norm
-        LEFT JOIN #Dim_Specialty_Map SpecMain
-            ON SpecMain.BK_SpecialtyCode = SRC.Main_Specialty_Code_Norm
-        LEFT JOIN [Analytics].[vw_Dim_HRG] HRG ON SRC.Core_HRG = HRG.HRGCode
-        
-        LEFT JOIN [Analytics].[tbl_Dim_Commissioner] Comm
-            ON Comm.Commissioner_Code =
-                CASE
-                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                        THEN LEFT(SRC.Organisation_Code_Code_of_Commissioner, 3)
-                    ELSE SRC.Organisation_Code_Code_of_Commissioner
-                END
-        LEFT JOIN [Analytics].[tbl_Dim_GPPractice] GP
-            ON GP.GPPractice_Code = SRC.GP_Practice_Code_Norm
-           AND GP.Is_Current = 1
-        LEFT JOIN [Analytics].[tbl_Dim_PCN] PCN
-            ON PCN.PCN_Code = GP.PCN_Code
-           AND PCN.Is_Current = 1
+        -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
+        -- Dimension keys: clustered seeks on the key lookup cache (sp_Refresh_Dim_Key_Lookup)
+        LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Appt ON D_Appt.FullDate = SRC.Appointment_Date_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Ref ON D_Ref.FullDate = SRC.Referral_Date_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] G
+            ON G.Lookup_Name = 'Gender' AND G.Lookup_Code = SRC.Gender_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] E
+            ON E.Lookup_Name = 'Ethnicity' AND E.Lookup_Code = SRC.Ethnicity_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Pr
+            ON Pr.Lookup_Name = 'Provider' AND Pr.Lookup_Code = SRC.Provider_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] LSOA
+            ON LSOA.Lookup_Name = 'LSOA' AND LSOA.Lookup_Code = SRC.LSOA_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] SpecTfc
+            ON SpecTfc.Lookup_Name = 'Specialty' AND SpecTfc.Lookup_Code = SRC.Treatment_Function_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] SpecMain
+            ON SpecMain.Lookup_Name = 'Specialty' AND SpecMain.Lookup_Code = SRC.Main_Specialty_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] HRG
+            ON HRG.Lookup_Name = 'HRG' AND HRG.Lookup_Code = SRC.HRG_Key
 
-        -- POD mapping (derived via OP.fn_GetPODType for materialised source tables)
-        LEFT JOIN [Analytics].[tbl_Dim_POD] POD
-            ON POD.POD_Code = UPPER(PodCalc.POD_Code)
-           AND POD.POD_Dataset = 'OP'
-
-        -- OP Specific Joins
-        LEFT JOIN [Analytics].[vw_Dim_Attendance_Outcome] AttOut
-            ON TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Outcome_of_Attendance)), '')) =
-               TRY_CONVERT(INT, AttOut.Attendance_Outcome_Code)
-        LEFT JOIN [Analytics].[vw_Dim_Attendance_Status] AttStat
-            ON NULLIF(LTRIM(RTRIM(SRC.Attended_Or_Did_Not_Attend)), '') =
-               LTRIM(RTRIM(AttStat.Attendance_Status_Code))
-        LEFT JOIN [Analytics].[vw_Dim_Attendance_Type] AttTyp
-            ON TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.First_Attendance)), '')) =
-               TRY_CONVERT(INT, AttTyp.Attendance_Type_Code)
-        LEFT JOIN [Analytics].[vw_Dim_DNA_Indicator] DNA
-            ON NULLIF(LTRIM(RTRIM(SRC.Attended_Or_Did_Not_Attend)), '') =
-               LTRIM(RTRIM(DNA.DNA_Indicator_Code))
-        LEFT JOIN [Analytics].[vw_Dim_Priority_Type] Prio
-            ON TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(SRC.Priority_Type)), '')) =
-               TRY_CONVERT(INT, Prio.Priority_Type_Code)
-        LEFT JOIN #Dim_Referral_Source_Map_Norm RefSrcNorm
-            ON RefSrcNorm.Code_Norm = SRC.Referral_Source_Code_Norm
-        LEFT JOIN #Dim_Referral_Source_Map_Int RefSrcInt
-            ON RefSrcInt.Code_Int = SRC.Referral_Source_Code_Int
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Comm
+            ON Comm.Lookup_Name = 'Commissioner' AND Comm.Lookup_Code = SRC.Commissioner_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] GP
+            ON GP.Lookup_Name = 'GPPractice' AND GP.Lookup_Code = SRC.GP_Practice_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] PCN
+            ON PCN.Lookup_Name = 'GPPractice_PCN' AND PCN.Lookup_Code = SRC.GP_Practice_Code_Norm
+
+        -- POD mapping (POD_Key derived via OP.fn_GetPODType when #SourceFiltered is built)
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] POD
+            ON POD.Lookup_Name = 'POD_OP' AND POD.Lookup_Code = SRC.POD_Key
+
+        -- OP Specific Joins
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] AttOut
+            ON AttOut.Lookup_Name = 'Attendance_Outcome_Int' AND AttOut.Lookup_Code = SRC.Attendance_Outcome_Int_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] AttStat
+            ON AttStat.Lookup_Name = 'Attendance_Status' AND AttStat.Lookup_Code = SRC.Attendance_Status_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] AttTyp
+            ON AttTyp.Lookup_Name = 'Attendance_Type_Int' AND AttTyp.Lookup_Code = SRC.Attendance_Type_Int_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] DNA
+            ON DNA.Lookup_Name = 'DNA_Indicator' AND DNA.Lookup_Code = SRC.Attendance_Status_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Prio
+            ON Prio.Lookup_Name = 'Priority_Type_Int' AND Prio.Lookup_Code = SRC.Priority_Type_Int_Key
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] RefSrcNorm
+            ON RefSrcNorm.Lookup_Name = 'Referral_Source' AND RefSrcNorm.Lookup_Code = SRC.Referral_Source_Code_Norm
+        LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] RefSrcInt
+            ON RefSrcInt.Lookup_Name = 'Referral_Source_Int' AND RefSrcInt.Lookup_Code = SRC.Referral_Source_Int_Key
+
+        -- Inline enrichment (@Enrich = 1): precomputed Active tables are keyed 1:1 on
+        -- (SK_EncounterID, Dataset/POD), so these joins never fan out the insert.
+        LEFT JOIN [Analytics].[tbl_CAM_Assignment_Active] Cam
+            ON @Enrich = 1 AND Cam.[Dataset] = 'OP' AND Cam.[SK_EncounterID] = SRC.SK_EncounterID
+        LEFT JOIN [Analytics].[tbl_ERF_Repriced_Active] Erf
+            ON @Enrich = 1 AND Erf.[POD] = 'OP' AND Erf.[SK_EncounterID] = SRC.SK_EncounterID
+        LEFT JOIN [Analytics].[tbl_OpPlan_Active] OpPlan
+            ON @Enrich = 1 AND OpPlan.[Dataset] = 'Outpatient' AND OpPlan.[SK_EncounterID] = SRC.SK_EncounterID
 
         SELECT @RowsInserted = COUNT(*) FROM @InsertedKeys;
         SET @RowsSkipped = @SourceRows - @RowsInserted;
@@ -357,6 +440,7 @@ BEGIN
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Fact_OP_Activity',
+            @ProcID = @@PROCID,
             @LoadType = 'Full',
             @RowsAffected = @RowsInserted,
             @Status = 'Success';
@@ -381,7 +465,7 @@ BEGIN
                 SELECT
                     SRC.*,
                     COALESCE(CAST(SRC.Appointment_Date AS DATE), CAST('1900-01-01' AS DATE)) AS Appointment_Date_Cast
-                FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] SRC
+                FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) SRC
                 WHERE SRC.Appointment_Date >= @FromDateActual
                   AND SRC.Appointment_Date < DATEADD(DAY, 1, @ToDateActual)
             ),
@@ -414,6 +498,7 @@ BEGIN
                 EXEC [Analytics].[sp_Log_Table_Load]
                     @BatchID = @BatchID,
                     @TableName = 'Analytics.tbl_Fact_OP_Activity',
+                    @ProcID = @@PROCID,
                     @LoadType = 'Full',
                     @RowsAffected = @RowsInserted,
                     @RowsFailed = 0,
@@ -437,6 +522,7 @@ BEGIN
             EXEC [Analytics].[sp_Log_Table_Load]
                 @BatchID = @BatchID,
                 @TableName = 'Analytics.tbl_Fact_OP_Activity',
+                @ProcID = @@PROCID,
                 @LoadType = 'Full',
                 @RowsAffected = 0,
                 @RowsFailed = 1,
@@ -21,13 +21,27 @@ Created:       2026-01-09
 Change Log:
   2026-01-09  Sridhar Peddi    Initial creation
   2026-01-09  Sridhar Peddi    Add date parameters for dev window control
+  2026-03-20  Sridhar Peddi    Resolve dimension keys via tbl_Dim_Key_Lookup (no view joins in the insert)
+  2026-03-23  Sridhar Peddi    Read source via [Analytics].[syn_Src_*_Encounter] (single-pass extract in orchestrated runs)
+  2026-03-28  Sridhar Peddi    Record the load window on tbl_ETL_Batch_Log (Power BI incremental refresh)
+  2026-03-28  Sridhar Peddi    Refresh changed key lookups before every load; *_Key codes VARCHAR(100) (no truncation)
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource); synonyms are no longer re-pointed
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_Fact_AE_Activity]
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
+
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
@@ -51,15 +65,21 @@ BEGIN
     BEGIN TRY
         EXEC [Analytics].[sp_Start_ETL_Batch]
             @BatchName = @BatchName,
-            @BatchID = @BatchID OUTPUT;
+            @BatchID = @BatchID OUTPUT,
+            @WindowFromDate = @FromDateActual,
+            @WindowToDate = @ToDateActual;
 
         PRINT 'Starting Load: [Analytics].[tbl_Fact_AE_Activity]';
         PRINT 'Load window: ' + CONVERT(VARCHAR(10), @FromDateActual, 120)
             + ' to ' + CONVERT(VARCHAR(10), @ToDateActual, 120);
 
+        -- Dimensions may have been loaded outside 00_Run_All_Dimension_Loads (run_pipeline.py,
+        -- ad-hoc EXEC): refresh any lookup that no longer matches its dimension.
+        EXEC [Analytics].[sp_Refresh_Dim_Key_Lookup] @OnlyIfChanged = 1;
+
         ;WITH SourceKeys AS (
             SELECT DISTINCT SRC.SK_EncounterID
-            FROM [Data_Lab_SWL].[Unified].[tbl_ED_EncounterDenormalised_Active] SRC
+            FROM [Analytics].[fn_Src_ED_Encounter](@UseWorkSource) SRC
             WHERE SRC.Arrival_Date >= @FromDateActual
               AND SRC.Arrival_Date < DATEADD(DAY, 1, @ToDateActual)
         )
@@ -121,25 +141,25 @@ BEGIN
             ISNULL(D_Dep.SK_Date, -1) AS [SK_DateDepartureID],
             COALESCE(CAST(SRC.Arrival_Date AS DATE), CAST('1900-01-01' AS DATE)) AS [Arrival_Date],
             TRY_CAST(SRC.EM_Departure_Date AS DATE) AS [Departure_Date],
-            ISNULL(AB.Age, -1) AS [SK_Age_BandID],
-            COALESCE(CAST(G.SK_GenderID AS INT), -1) AS [SK_GenderID],
-            COALESCE(CAST(E.SK_EthnicityID AS INT), -1) AS [SK_EthnicityID],
-            COALESCE(CAST(Pr.SK_ProviderID AS INT), -1) AS [SK_ProviderID],
-            COALESCE(CAST(LSOA.SK_LSOA_ID AS INT), -1) AS [SK_LSOA_ID],
+            SRC.Age_Key AS [SK_Age_BandID],
+            ISNULL(G.SK_ID, -1) AS [SK_GenderID],
+            ISNULL(E.SK_ID, -1) AS [SK_EthnicityID],
+            ISNULL(Pr.SK_ID, -1) AS [SK_ProviderID],
+            ISNULL(LSOA.SK_ID, -1) AS [SK_LSOA_ID],
             NULLIF(LTRIM(RTRIM(SRC.dv_LSOA)), '') AS [LSOA_Code],
             
             -1 AS [SK_SpecialtyID],
-            COALESCE(CAST(HRG.SK_HRGID AS INT), -1) AS [SK_HRG_ID],
+            ISNULL(HRG.SK_ID, -1) AS [SK_HRG_ID],
             NULL AS [SK_DiagnosisID],
             NULL AS [SK_ProcedureID],
             
-            COALESCE(CAST(Comm.SK_CommissionerID AS INT), -1) AS [SK_CommissionerID],
-            COALESCE(CAST(GP.SK_GPPracticeID AS INT), -1) AS [SK_GPPracticeID],
-            COALESCE(CAST(PCN.SK_PCNID AS INT), -1) AS [SK_PCN_ID],
-            COALESCE(CAST(POD.SK_PodID AS INT), -1) AS [SK_POD_ID],
+            ISNULL(Comm.SK_ID, -1) AS [SK_CommissionerID],
+            ISNULL(GP.SK_ID, -1) AS [SK_GPPracticeID],
+            ISNULL(PCN.SK_ID, -1) AS [SK_PCN_ID],
+            ISNULL(POD.SK_ID, -1) AS [SK_POD_ID],
 
             -- AE Specific
-            COALESCE(CAST(Disp.SK_AttendanceDisposalID AS INT), -1) AS [SK_Attendance_DisposalID],
+            ISNULL(Disp.SK_ID, -1) AS [SK_Attendance_DisposalID],
 
             -- Measures
             1 AS [Attendances],
@@ -156,7 +176,7 @@ BEGIN
             CASE WHEN TRY_CAST(SRC.EM_Duration_Time AS INT) > 240 THEN 1 ELSE 0 END AS [Is_4Hour_Breach],
             CASE WHEN TRY_CAST(SRC.EM_Duration_Time AS INT) > 720 THEN 1 ELSE 0 END AS [Is_12Hour_Breach],
             CASE
-                WHEN Disp.Attendance_Disposal_Description LIKE '%Admitted%' THEN 1
+                WHEN DispAdm.SK_ID IS NOT NULL THEN 1
                 ELSE 0
             END AS [Is_Admitted],
 
@@ -168,42 +188,65 @@ BEGIN
 
             @ETL_Start AS [ETL_LoadDateTime]
 
-    FROM [Data_Lab_SWL].[Unified].[tbl_ED_EncounterDenormalised_Active] SRC
-    -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
-    LEFT JOIN [Analytics].[vw_Dim_Date] D_Arr ON CAST(SRC.Arrival_Date AS DATE) = D_Arr.FullDate
-    LEFT JOIN [Analytics].[vw_Dim_Date] D_Dep ON CAST(SRC.EM_Departure_Date AS DATE) = D_Dep.FullDate
-    LEFT JOIN [Analytics].[vw_Dim_Age_Band] AB
-        ON AB.Age =
-            CASE
-                WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 0 AND 99
-                    THEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date)
-                WHEN TRY_CONVERT(INT, SRC.Age_At_CDS_Activity_Date) BETWEEN 100 AND 110
-                    THEN 100
-                ELSE -1
-            END
-    LEFT JOIN [Analytics].[vw_Dim_Gender] G ON SRC.Gender_Code = G.GenderCode
-    LEFT JOIN [Analytics].[vw_Dim_Ethnicity] E
-        ON E.EthnicityCode =
+    FROM (
+        SELECT
+            ED.*,
+            -- Lookup keys (normalised as in sp_Refresh_Dim_Key_Lookup)
+            CAST(ED.Arrival_Date AS DATE) AS Arrival_Date_Key,
+            CAST(ED.EM_Departure_Date AS DATE) AS Departure_Date_Key,
             CASE
-                WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = '99' THEN '99'
-                WHEN LTRIM(RTRIM(SRC.Ethnic_Category_Code)) = 'Z' THEN 'Z'
-                ELSE LEFT(LTRIM(RTRIM(SRC.Ethnic_Category_Code)), 1)
-            END
-    LEFT JOIN [Analytics].[vw_Dim_Provider] Pr ON SRC.Organisation_Code_Code_of_Provider = Pr.Provider_Code
-    LEFT JOIN [Analytics].[vw_Dim_LSOA] LSOA
-        ON LSOA.LSOA_Code = NULLIF(LTRIM(RTRIM(SRC.dv_LSOA)), '')
-
-    LEFT JOIN [Analytics].[vw_Dim_HRG] HRG ON SRC.Core_HRG = HRG.HRGCode
+                WHEN TRY_CONVERT(INT, ED.Age_At_CDS_Activity_Date) BETWEEN 0 AND 99
+                    THEN TRY_CONVERT(INT, ED.Age_At_CDS_Activity_Date)
+                WHEN TRY_CONVERT(INT, ED.Age_At_CDS_Activity_Date) BETWEEN 100 AND 110
+                    THEN 100
+                ELSE -1
+            END AS Age_Key,
+            CAST(ED.Gender_Code AS VARCHAR(100)) AS Gender_Key,
+            CAST(
+                CASE
+                    WHEN LTRIM(RTRIM(ED.Ethnic_Category_Code)) = '99' THEN '99'
+                    WHEN LTRIM(RTRIM(ED.Ethnic_Category_Code)) = 'Z' THEN 'Z'
+                    ELSE LEFT(LTRIM(RTRIM(ED.Ethnic_Category_Code)), 1)
+                END AS VARCHAR(100)) AS Ethnicity_Key,
+            CAST(ED.Organisation_Code_Code_of_Provider AS VARCHAR(100)) AS Provider_Key,
+            CAST(ED.Organisation_Code_Code_of_Commissioner AS VARCHAR(100)) AS Commissioner_Key,
+            CAST(NULLIF(LTRIM(RTRIM(ED.dv_LSOA)), '') AS VARCHAR(100)) AS LSOA_Key,
+            CAST(ED.GP_Practice_Code_Original_Data AS VARCHAR(100)) AS GP_Practice_Key,
+            CAST(ED.Core_HRG AS VARCHAR(100)) AS HRG_Key,
+            CAST(ED.EM_Attendance_Disposal AS VARCHAR(100)) AS Attendance_Disposal_Key
+        FROM [Analytics].[fn_Src_ED_Encounter](@UseWorkSource) ED
+        WHERE ED.Arrival_Date >= @FromDateActual
+          AND ED.Arrival_Date < DATEADD(DAY, 1, @ToDateActual)
+    ) SRC
+    -- LEFT JOIN [Analytics].[tbl_Dim_Patient] P ON SRC.SK_PatientID = P.SK_PatientID
+    -- Dimension keys: clustered seeks on the key lookup cache (sp_Refresh_Dim_Key_Lookup)
+    LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Arr ON D_Arr.FullDate = SRC.Arrival_Date_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Date_Key_Lookup] D_Dep ON D_Dep.FullDate = SRC.Departure_Date_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] G
+        ON G.Lookup_Name = 'Gender' AND G.Lookup_Code = SRC.Gender_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] E
+        ON E.Lookup_Name = 'Ethnicity' AND E.Lookup_Code = SRC.Ethnicity_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Pr
+        ON Pr.Lookup_Name = 'Provider' AND Pr.Lookup_Code = SRC.Provider_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] LSOA
+        ON LSOA.Lookup_Name = 'LSOA' AND LSOA.Lookup_Code = SRC.LSOA_Key
 
-    LEFT JOIN [Analytics].[tbl_Dim_Commissioner] Comm ON SRC.Organisation_Code_Code_of_Commissioner = Comm.Commissioner_Code
-    LEFT JOIN [Analytics].[tbl_Dim_GPPractice] GP ON SRC.GP_Practice_Code_Original_Data = GP.GPPractice_Code
-    LEFT JOIN [Analytics].[tbl_Dim_PCN] PCN ON GP.PCN_Code = PCN.PCN_Code
-    LEFT JOIN [Analytics].[tbl_Dim_POD] POD ON POD.POD_Code = 'AE'
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] HRG
+        ON HRG.Lookup_Name = 'HRG' AND HRG.Lookup_Code = SRC.HRG_Key
 
-    LEFT JOIN [Analytics].[vw_Dim_Attendance_Disposal] Disp ON SRC.EM_Attendance_Disposal = Disp.Attendance_Disposal_Code
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Comm
+        ON Comm.Lookup_Name = 'Commissioner' AND Comm.Lookup_Code = SRC.Commissioner_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] GP
+        ON GP.Lookup_Name = 'GPPractice' AND GP.Lookup_Code = SRC.GP_Practice_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] PCN
+        ON PCN.Lookup_Name = 'GPPractice_PCN' AND PCN.Lookup_Code = SRC.GP_Practice_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] POD
+        ON POD.Lookup_Name = 'POD_AE' AND POD.Lookup_Code = 'AE'
 
-    WHERE SRC.Arrival_Date >= @FromDateActual
-      AND SRC.Arrival_Date < DATEADD(DAY, 1, @ToDateActual)
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Disp
+        ON Disp.Lookup_Name = 'Attendance_Disposal' AND Disp.Lookup_Code = SRC.Attendance_Disposal_Key
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] DispAdm
+        ON DispAdm.Lookup_Name = 'Attendance_Disposal_Admitted' AND DispAdm.Lookup_Code = SRC.Attendance_Disposal_Key
 
         SET @RowsInserted = @@ROWCOUNT;
         PRINT 'Rows Inserted: ' + CAST(@RowsInserted AS VARCHAR(20));
@@ -211,6 +254,7 @@ BEGIN
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Fact_AE_Activity',
+            @ProcID = @@PROCID,
             @LoadType = 'Full',
             @RowsAffected = @RowsInserted,
             @Status = 'Success';
@@ -232,6 +276,7 @@ BEGIN
             EXEC [Analytics].[sp_Log_Table_Load]
                 @BatchID = @BatchID,
                 @TableName = 'Analytics.tbl_Fact_AE_Activity',
+                @ProcID = @@PROCID,
                 @LoadType = 'Full',
                 @RowsAffected = 0,
                 @RowsFailed = 1,
@@ -28,6 +28,8 @@ Notes:
     [Commissioner Assignment Reason], Commissioner_Variance, Service_Category_Variance
 -- Populates CAM dimension keys on facts (commissioner, service category, assignment reason).
 -- Designed as an explicit post-load enrichment step (deploy now; run later).
+-- Post-load fallback: sp_Load_Fact_IP/OP_Activity now write these columns in the insert (@Enrich = 1);
+   run this after standalone loads (default @Enrich = 0) or @PostLoadEnrichment = 1 runs.
 
 Parameters:
 - @FinancialYear: 'YYYY/YYYY' e.g. '2025/2026'
@@ -37,6 +39,7 @@ Parameters:
 Change Log:
   2026-01-12  Sridhar Peddi    Add ETL batch/table logging
   2026-01-26  Sridhar Peddi    Add table-level timings for logging
+  2026-03-28  Sridhar Peddi    Now the post-load fallback (facts are enriched inline by default)
 */
 CREATE PROCEDURE [Analytics].[sp_Enrich_Facts_CAM]
     @FinancialYear VARCHAR(9),
@@ -12,6 +12,7 @@
 -- 2026-01-26  Sridhar Peddi    Use Unified materialised tables (IP/OP) only
 -- 2026-01-26  Sridhar Peddi    Rename to CF_Segment_Patient (clear intent)
 -- 2026-01-26  Sridhar Peddi    Deprecated in favor of patient snapshot loader
+-- 2026-03-26  Sridhar Peddi    Read diagnoses from tbl_Bridge_Encounter_Diagnosis
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -81,65 +82,17 @@ BEGIN
         FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
         WHERE r.Is_Active = 1
     ),
-    -- Pull ICD10 diagnoses from Unified IP/OP materialised tables (patient-level segmentation).
-    IPDiag AS (
-        SELECT
-            v.SK_PatientID,
-            v.Start_Date_Hospital_Provider_Spell AS Activity_Date,
-            UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-            x.Is_Primary
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
-        CROSS APPLY (VALUES
-            (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-            (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-        ) x(Diagnosis_Code, Is_Primary)
-        WHERE v.Start_Date_Hospital_Provider_Spell >= @LookbackStart
-          AND v.Start_Date_Hospital_Provider_Spell <= @SnapshotEnd
-          AND x.Diagnosis_Code IS NOT NULL
-          AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-    ),
-    OPDiag AS (
-        SELECT
-            v.SK_PatientID,
-            v.Appointment_Date AS Activity_Date,
-            UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-            x.Is_Primary
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
-        CROSS APPLY (VALUES
-            (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-            (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-        ) x(Diagnosis_Code, Is_Primary)
-        WHERE v.Appointment_Date >= @LookbackStart
-          AND v.Appointment_Date <= @SnapshotEnd
-          AND x.Diagnosis_Code IS NOT NULL
-          AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-    ),
+    -- ICD10 diagnoses pre-unpivoted in tbl_Bridge_Encounter_Diagnosis (sp_Load_Bridge_Encounter_Codes).
     AllDiag AS (
-        SELECT * FROM IPDiag
-        UNION ALL
-        SELECT * FROM OPDiag
+        SELECT
+            b.SK_PatientID,
+            b.Start_Date AS Activity_Date,
+            b.Diagnosis_Code,
+            b.Is_Primary_Diagnosis AS Is_Primary
+        FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis] b
+        WHERE b.Start_Date >= @LookbackStart
+          AND b.Start_Date <= @SnapshotEnd
+          AND b.Activity_Date >= @LookbackStart
     ),
     MatchedRules AS (
         SELECT
@@ -12,6 +12,8 @@
 -- 2026-01-26  Sridhar Peddi    Use Unified materialised tables (IP/OP) only
 -- 2026-01-26  Sridhar Peddi    Support month ranges in one execution
 -- 2026-01-26  Sridhar Peddi    Deprecated in favor of patient snapshot loader
+-- 2026-03-26  Sridhar Peddi    Read diagnoses from tbl_Bridge_Encounter_Diagnosis
+-- 2026-03-27  Sridhar Peddi    One set-based statement over fn_Month_Calendar months (no month cursor)
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -48,213 +50,153 @@ BEGIN
         RETURN;
     END
 
-    DECLARE @RowsInserted INT = 0;
-    DECLARE @BatchName VARCHAR(100) = 'Bridge_Patient_Segment_Agg';
-    DECLARE @BatchID INT = NULL;
-    DECLARE @RunMonth INT;
-    DECLARE @SnapshotYear INT;
-    DECLARE @SnapshotMon INT;
-    DECLARE @AsAtDate DATE;
-    DECLARE @SnapshotEnd DATE;
-    DECLARE @LookbackStart DATE;
-
-    CREATE TABLE #SnapshotMonths (
-        SnapshotMonth INT NOT NULL PRIMARY KEY
-    );
-
-    IF @SnapshotMonth IS NOT NULL
-    BEGIN
-        INSERT INTO #SnapshotMonths (SnapshotMonth)
-        VALUES (@SnapshotMonth);
-    END
-    ELSE
-    BEGIN
-        IF @FromMonth > @ToMonth
-        BEGIN
-            RAISERROR('FromMonth must be <= ToMonth.', 16, 1);
-            RETURN;
-        END
-
-        SET @RunMonth = @FromMonth;
-        WHILE @RunMonth <= @ToMonth
-        BEGIN
-            INSERT INTO #SnapshotMonths (SnapshotMonth)
-            VALUES (@RunMonth);
-
-            SET @RunMonth = CASE
-                WHEN RIGHT(@RunMonth, 2) = 12 THEN ((@RunMonth / 100) + 1) * 100 + 1
-                ELSE @RunMonth + 1
-            END;
-        END
-    END
-
-    PRINT 'Loading Patient Segment Agg (CF_Segment)';
-    PRINT '  DefaultLookbackMonths: ' + CONVERT(VARCHAR(10), @DefaultLookbackMonths);
-
-    BEGIN TRY
-        EXEC [Analytics].[sp_Start_ETL_Batch]
-            @BatchName = @BatchName,
-            @BatchID = @BatchID OUTPUT;
-
-        DECLARE SnapshotCursor CURSOR LOCAL FAST_FORWARD FOR
-            SELECT SnapshotMonth FROM #SnapshotMonths ORDER BY SnapshotMonth;
-
-        OPEN SnapshotCursor;
-        FETCH NEXT FROM SnapshotCursor INTO @RunMonth;
-
-        WHILE @@FETCH_STATUS = 0
-        BEGIN
-            SET @SnapshotYear = @RunMonth / 100;
-            SET @SnapshotMon = @RunMonth % 100;
-
-            IF @SnapshotYear < 2000 OR @SnapshotMon NOT BETWEEN 1 AND 12
-            BEGIN
-                RAISERROR('SnapshotMonth must be in YYYYMM format', 16, 1);
-                CLOSE SnapshotCursor;
-                DEALLOCATE SnapshotCursor;
-                RETURN;
-            END
-
-            SET @AsAtDate = DATEFROMPARTS(@SnapshotYear, @SnapshotMon, 1);
-            SET @SnapshotEnd = EOMONTH(@AsAtDate);
-            SET @LookbackStart = DATEADD(MONTH, -@DefaultLookbackMonths, DATEADD(DAY, 1, @SnapshotEnd));
-
-            DELETE FROM [Analytics].[tbl_Bridge_Patient_Segment_Agg]
-            WHERE Snapshot_Month = @RunMonth
-              AND Segment_Type = 'CF_Segment';
-
-            ;WITH Rules AS (
-        SELECT
-            r.Rule_ID,
-            r.Segment_Score,
-            r.ICD10_Like,
-            r.Is_Primary_Only,
-            COALESCE(r.Lookback_Months, @DefaultLookbackMonths) AS Lookback_Months
-        FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
-        WHERE r.Is_Active = 1
-    ),
-    IPDiag AS (
-        SELECT
-            v.SK_PatientID,
-            v.Start_Date_Hospital_Provider_Spell AS Activity_Date,
-            UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-            x.Is_Primary
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
-        CROSS APPLY (VALUES
-            (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-            (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-        ) x(Diagnosis_Code, Is_Primary)
-        WHERE v.Start_Date_Hospital_Provider_Spell >= @LookbackStart
-          AND v.Start_Date_Hospital_Provider_Spell <= @SnapshotEnd
-          AND x.Diagnosis_Code IS NOT NULL
-          AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-    ),
-    OPDiag AS (
-        SELECT
-            v.SK_PatientID,
-            v.Appointment_Date AS Activity_Date,
-            UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-            x.Is_Primary
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
-        CROSS APPLY (VALUES
-            (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-            (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-            (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-        ) x(Diagnosis_Code, Is_Primary)
-        WHERE v.Appointment_Date >= @LookbackStart
-          AND v.Appointment_Date <= @SnapshotEnd
-          AND x.Diagnosis_Code IS NOT NULL
-          AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-    ),
-    AllDiag AS (
-        SELECT * FROM IPDiag
-        UNION ALL
-        SELECT * FROM OPDiag
-    ),
-    MatchedRules AS (
-        SELECT
-            d.SK_PatientID,
-            r.Segment_Score
-        FROM AllDiag d
-        INNER JOIN Rules r
-            ON d.Diagnosis_Code LIKE r.ICD10_Like
-           AND (r.Is_Primary_Only = 0 OR d.Is_Primary = 1)
-        WHERE d.Activity_Date >= DATEADD(MONTH, -r.Lookback_Months, DATEADD(DAY, 1, @SnapshotEnd))
-          AND d.Activity_Date <= @SnapshotEnd
-    ),
-    PatientScore AS (
-        SELECT
-            m.SK_PatientID,
-            MAX(m.Segment_Score) AS Segment_Score
-        FROM MatchedRules m
-        GROUP BY m.SK_PatientID
-    ),
-    PatientAll AS (
-        SELECT DISTINCT v.SK_PatientID
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
-        UNION
-        SELECT DISTINCT v.SK_PatientID
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
-    ),
-    PatientWithSegment AS (
+    IF @SnapshotMonth IS NOT NULL
+    BEGIN
+        SET @FromMonth = @SnapshotMonth;
+        SET @ToMonth = @SnapshotMonth;
+    END
+
+    IF @FromMonth / 100 < 2000 OR @FromMonth % 100 NOT BETWEEN 1 AND 12
+       OR @ToMonth / 100 < 2000 OR @ToMonth % 100 NOT BETWEEN 1 AND 12
+    BEGIN
+        RAISERROR('SnapshotMonth must be in YYYYMM format', 16, 1);
+        RETURN;
+    END
+
+    IF @FromMonth > @ToMonth
+    BEGIN
+        RAISERROR('FromMonth must be <= ToMonth.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
+    DECLARE @BatchName VARCHAR(100) = 'Bridge_Patient_Segment_Agg';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @LookbackStart DATE;
+    DECLARE @RangeEnd DATE;
+
+    CREATE TABLE #SnapshotMonths (
+        SnapshotMonth INT NOT NULL PRIMARY KEY,
+        Next_Month_Start DATE NOT NULL,
+        Snapshot_End DATE NOT NULL
+    );
+
+    INSERT INTO #SnapshotMonths (SnapshotMonth, Next_Month_Start, Snapshot_End)
+    SELECT c.Month_Key, c.Next_Month_Start, c.Month_End
+    FROM [Analytics].[fn_Month_Calendar](
+        DATEFROMPARTS(@FromMonth / 100, @FromMonth % 100, 1),
+        DATEFROMPARTS(@ToMonth / 100, @ToMonth % 100, 1)
+    ) c;
+
+    SELECT
+        @LookbackStart = DATEADD(MONTH, -@DefaultLookbackMonths, MIN(Next_Month_Start)),
+        @RangeEnd = MAX(Snapshot_End)
+    FROM #SnapshotMonths;
+
+    PRINT 'Loading Patient Segment Agg (CF_Segment)';
+    PRINT '  DefaultLookbackMonths: ' + CONVERT(VARCHAR(10), @DefaultLookbackMonths);
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        DELETE t
+        FROM [Analytics].[tbl_Bridge_Patient_Segment_Agg] t
+        INNER JOIN #SnapshotMonths m
+            ON m.SnapshotMonth = t.Snapshot_Month
+        WHERE t.Segment_Type = 'CF_Segment';
+
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        -- All requested months in one statement (partitioned by snapshot month)
+        ;WITH Rules AS (
+            SELECT
+                r.Rule_ID,
+                r.Segment_Score,
+                r.ICD10_Like,
+                r.Is_Primary_Only,
+                COALESCE(r.Lookback_Months, @DefaultLookbackMonths) AS Lookback_Months
+            FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
+            WHERE r.Is_Active = 1
+        ),
+        -- ICD10 diagnoses pre-unpivoted in tbl_Bridge_Encounter_Diagnosis (sp_Load_Bridge_Encounter_Codes).
+        AllDiag AS (
+            SELECT
+                b.SK_PatientID,
+                b.Start_Date AS Activity_Date,
+                b.Diagnosis_Code,
+                b.Is_Primary_Diagnosis AS Is_Primary
+            FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis] b
+            WHERE b.Start_Date >= @LookbackStart
+              AND b.Start_Date <= @RangeEnd
+              AND b.Activity_Date >= @LookbackStart
+        ),
+        MatchedRules AS (
+            SELECT
+                m.SnapshotMonth,
+                d.SK_PatientID,
+                r.Segment_Score
+            FROM AllDiag d
+            INNER JOIN Rules r
+                ON d.Diagnosis_Code LIKE r.ICD10_Like
+               AND (r.Is_Primary_Only = 0 OR d.Is_Primary = 1)
+            INNER JOIN #SnapshotMonths m
+                ON d.Activity_Date <= m.Snapshot_End
+               AND d.Activity_Date >= DATEADD(MONTH, -@DefaultLookbackMonths, m.Next_Month_Start)
+               AND d.Activity_Date >= DATEADD(MONTH, -r.Lookback_Months, m.Next_Month_Start)
+        ),
+        PatientScore AS (
+            SELECT
+                mr.SnapshotMonth,
+                mr.SK_PatientID,
+                MAX(mr.Segment_Score) AS Segment_Score
+            FROM MatchedRules mr
+            GROUP BY mr.SnapshotMonth, mr.SK_PatientID
+        ),
+        PatientAll AS (
+            SELECT DISTINCT v.SK_PatientID
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
+            UNION
+            SELECT DISTINCT v.SK_PatientID
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
+        ),
+        PatientWithSegment AS (
+            SELECT
+                m.SnapshotMonth,
+                p.SK_PatientID,
+                COALESCE(ps.Segment_Score, 0) AS Segment_Score
+            FROM #SnapshotMonths m
+            CROSS JOIN PatientAll p
+            LEFT JOIN PatientScore ps
+                ON ps.SnapshotMonth = m.SnapshotMonth
+               AND ps.SK_PatientID = p.SK_PatientID
+        )
+        INSERT INTO [Analytics].[tbl_Bridge_Patient_Segment_Agg] (
+            [Snapshot_Month],
+            [Segment_Type],
+            [Segment_Value],
+            [Patient_Count],
+            [Avg_Age_Years],
+            [Pct_Core20],
+            [Total_Cost_12M]
+        )
         SELECT
-            p.SK_PatientID,
-            COALESCE(ps.Segment_Score, 0) AS Segment_Score
-        FROM PatientAll p
-        LEFT JOIN PatientScore ps
-            ON ps.SK_PatientID = p.SK_PatientID
-    )
-    INSERT INTO [Analytics].[tbl_Bridge_Patient_Segment_Agg] (
-        [Snapshot_Month],
-        [Segment_Type],
-        [Segment_Value],
-        [Patient_Count],
-        [Avg_Age_Years],
-        [Pct_Core20],
-        [Total_Cost_12M]
-    )
-    SELECT
-        @RunMonth AS Snapshot_Month,
-        'CF_Segment' AS Segment_Type,
-        COALESCE(s.Segment_Value, 'CF_Score_0') AS Segment_Value,
-        COUNT_BIG(1) AS Patient_Count,
-        NULL AS Avg_Age_Years,
-        NULL AS Pct_Core20,
-        NULL AS Total_Cost_12M
-    FROM PatientWithSegment pws
-    LEFT JOIN [Analytics].[tbl_Ref_CF_Segment] s
-        ON s.Segment_Score = pws.Segment_Score
-    GROUP BY COALESCE(s.Segment_Value, 'CF_Score_0');
-
-    SET @RowsInserted = @RowsInserted + @@ROWCOUNT;
-
-            FETCH NEXT FROM SnapshotCursor INTO @RunMonth;
-        END
-
-        CLOSE SnapshotCursor;
-        DEALLOCATE SnapshotCursor;
-
+            pws.SnapshotMonth AS Snapshot_Month,
+            'CF_Segment' AS Segment_Type,
+            COALESCE(s.Segment_Value, 'CF_Score_0') AS Segment_Value,
+            COUNT_BIG(1) AS Patient_Count,
+            NULL AS Avg_Age_Years,
+            NULL AS Pct_Core20,
+            NULL AS Total_Cost_12M
+        FROM PatientWithSegment pws
+        LEFT JOIN [Analytics].[tbl_Ref_CF_Segment] s
+            ON s.Segment_Score = pws.Segment_Score
+        GROUP BY pws.SnapshotMonth, COALESCE(s.Segment_Value, 'CF_Score_0');
+
+        SET @RowsInserted = @@ROWCOUNT;
+
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Bridge_Patient_Segment_Agg',
@@ -267,7 +209,7 @@ BEGIN
             @Status = 'Success',
             @RowsInserted = @RowsInserted,
             @RowsUpdated = 0,
-            @RowsDeleted = 0,
+            @RowsDeleted = @RowsDeleted,
             @RowsFailed = 0,
             @ErrorMessage = NULL;
     END TRY
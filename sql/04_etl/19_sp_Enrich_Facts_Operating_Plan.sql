@@ -19,14 +19,22 @@ Created:       2026-01-13
 Change Log:
   2026-01-13  Sridhar Peddi    Initial creation
   2026-01-26  Sridhar Peddi    Add table-level timings and temp index
+  2026-03-28  Sridhar Peddi    Now the post-load fallback for IP/OP (AE still enriched here)
+  2026-03-28  Sridhar Peddi    @AEOnly: refresh only AE (run by the orchestrator on the inline path)
 Notes:
   - Uses Analytics.tbl_OpPlan_Active (precomputed from OpPlan TVFs).
   - @FromDate/@ToDate optionally constrain the fact update window.
+  - IP/OP post-load fallback: sp_Load_Fact_IP/OP_Activity now write these columns in the insert (@Enrich = 1);
+    run this after standalone loads (default @Enrich = 0) or @PostLoadEnrichment = 1 runs.
+  - AE is not loaded inline, so AE Operating Plan flags still come from this procedure:
+    sp_Run_Fact_Loads_With_Enrichment runs it with @AEOnly = 1 on every inline (default) run.
+  - @AEOnly = 1 skips the IP/OP updates (they were written by the fact inserts).
 */
 CREATE PROCEDURE [Analytics].[sp_Enrich_Facts_Operating_Plan]
     @FinYearStart CHAR(4),
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @AEOnly BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -99,7 +107,8 @@ BEGIN
         INTO #OpPlanActive
         FROM [Analytics].[tbl_OpPlan_Active] a
         WHERE a.Activity_Date >= @WindowStartDate
-          AND a.Activity_Date <= @WindowEndDate;
+          AND a.Activity_Date <= @WindowEndDate
+          AND (@AEOnly = 0 OR a.Dataset = 'ED');
 
         CREATE INDEX [IX_OpPlanActive_Dataset_Encounter]
             ON #OpPlanActive ([Dataset], [SK_EncounterID]);
@@ -109,13 +118,15 @@ BEGIN
                 EXISTS (
                     SELECT 1
                     FROM [Analytics].[tbl_Fact_IP_Activity] f
-                    WHERE f.Discharge_Date >= @WindowStartDate
+                    WHERE @AEOnly = 0
+                      AND f.Discharge_Date >= @WindowStartDate
                       AND f.Discharge_Date <= @WindowEndDate
                 )
                 OR EXISTS (
                     SELECT 1
                     FROM [Analytics].[tbl_Fact_OP_Activity] f
-                    WHERE f.Appointment_Date >= @WindowStartDate
+                    WHERE @AEOnly = 0
+                      AND f.Appointment_Date >= @WindowStartDate
                       AND f.Appointment_Date <= @WindowEndDate
                 )
                 OR EXISTS (
@@ -129,41 +140,44 @@ BEGIN
             RAISERROR('No OpPlan active rows found in Analytics.tbl_OpPlan_Active for the requested window.', 16, 1);
         END
 
-        SET @IP_StartTime = SYSDATETIME();
-        UPDATE f
-        SET f.Is_Operating_Plan = CASE WHEN o.SK_EncounterID IS NULL THEN 0 ELSE 1 END,
-            f.SK_OpPlan_MeasureSet = COALESCE(o.SK_OpPlan_MeasureSet, -1)
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        LEFT JOIN #OpPlanActive o
-            ON f.SK_EncounterID = o.SK_EncounterID
-           AND o.Dataset = 'Inpatient'
-        WHERE f.Discharge_Date >= @WindowStartDate
-          AND f.Discharge_Date <= @WindowEndDate
-          AND (
-                (o.SK_EncounterID IS NULL AND (f.Is_Operating_Plan <> 0 OR f.SK_OpPlan_MeasureSet <> -1))
-             OR (o.SK_EncounterID IS NOT NULL AND (f.Is_Operating_Plan <> 1 OR f.SK_OpPlan_MeasureSet <> o.SK_OpPlan_MeasureSet))
-          );
+        IF @AEOnly = 0
+        BEGIN
+            SET @IP_StartTime = SYSDATETIME();
+            UPDATE f
+            SET f.Is_Operating_Plan = CASE WHEN o.SK_EncounterID IS NULL THEN 0 ELSE 1 END,
+                f.SK_OpPlan_MeasureSet = COALESCE(o.SK_OpPlan_MeasureSet, -1)
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            LEFT JOIN #OpPlanActive o
+                ON f.SK_EncounterID = o.SK_EncounterID
+               AND o.Dataset = 'Inpatient'
+            WHERE f.Discharge_Date >= @WindowStartDate
+              AND f.Discharge_Date <= @WindowEndDate
+              AND (
+                    (o.SK_EncounterID IS NULL AND (f.Is_Operating_Plan <> 0 OR f.SK_OpPlan_MeasureSet <> -1))
+                 OR (o.SK_EncounterID IS NOT NULL AND (f.Is_Operating_Plan <> 1 OR f.SK_OpPlan_MeasureSet <> o.SK_OpPlan_MeasureSet))
+              );
 
-        SET @RowsIP = @@ROWCOUNT;
-        SET @IP_EndTime = SYSDATETIME();
+            SET @RowsIP = @@ROWCOUNT;
+            SET @IP_EndTime = SYSDATETIME();
 
-        SET @OP_StartTime = SYSDATETIME();
-        UPDATE f
-        SET f.Is_Operating_Plan = CASE WHEN o.SK_EncounterID IS NULL THEN 0 ELSE 1 END,
-            f.SK_OpPlan_MeasureSet = COALESCE(o.SK_OpPlan_MeasureSet, -1)
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        LEFT JOIN #OpPlanActive o
-            ON f.SK_EncounterID = o.SK_EncounterID
-           AND o.Dataset = 'Outpatient'
-        WHERE f.Appointment_Date >= @WindowStartDate
-          AND f.Appointment_Date <= @WindowEndDate
-          AND (
-                (o.SK_EncounterID IS NULL AND (f.Is_Operating_Plan <> 0 OR f.SK_OpPlan_MeasureSet <> -1))
-             OR (o.SK_EncounterID IS NOT NULL AND (f.Is_Operating_Plan <> 1 OR f.SK_OpPlan_MeasureSet <> o.SK_OpPlan_MeasureSet))
-          );
+            SET @OP_StartTime = SYSDATETIME();
+            UPDATE f
+            SET f.Is_Operating_Plan = CASE WHEN o.SK_EncounterID IS NULL THEN 0 ELSE 1 END,
+                f.SK_OpPlan_MeasureSet = COALESCE(o.SK_OpPlan_MeasureSet, -1)
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            LEFT JOIN #OpPlanActive o
+                ON f.SK_EncounterID = o.SK_EncounterID
+               AND o.Dataset = 'Outpatient'
+            WHERE f.Appointment_Date >= @WindowStartDate
+              AND f.Appointment_Date <= @WindowEndDate
+              AND (
+                    (o.SK_EncounterID IS NULL AND (f.Is_Operating_Plan <> 0 OR f.SK_OpPlan_MeasureSet <> -1))
+                 OR (o.SK_EncounterID IS NOT NULL AND (f.Is_Operating_Plan <> 1 OR f.SK_OpPlan_MeasureSet <> o.SK_OpPlan_MeasureSet))
+              );
 
-        SET @RowsOP = @@ROWCOUNT;
-        SET @OP_EndTime = SYSDATETIME();
+            SET @RowsOP = @@ROWCOUNT;
+            SET @OP_EndTime = SYSDATETIME();
+        END
 
         SET @AE_StartTime = SYSDATETIME();
         UPDATE f
@@ -186,23 +200,26 @@ BEGIN
         SELECT @RowsUpdated = SUM(v)
         FROM (VALUES (@RowsIP), (@RowsOP), (@RowsAE)) AS x(v);
 
-        EXEC [Analytics].[sp_Log_Table_Load]
-            @BatchID = @BatchID,
-            @TableName = 'Analytics.tbl_Fact_IP_Activity',
-            @LoadType = 'Update',
-            @RowsAffected = @RowsIP,
-            @Status = 'Success',
-            @StartDateTime = @IP_StartTime,
-            @EndDateTime = @IP_EndTime;
+        IF @AEOnly = 0
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Fact_IP_Activity',
+                @LoadType = 'Update',
+                @RowsAffected = @RowsIP,
+                @Status = 'Success',
+                @StartDateTime = @IP_StartTime,
+                @EndDateTime = @IP_EndTime;
 
-        EXEC [Analytics].[sp_Log_Table_Load]
-            @BatchID = @BatchID,
-            @TableName = 'Analytics.tbl_Fact_OP_Activity',
-            @LoadType = 'Update',
-            @RowsAffected = @RowsOP,
-            @Status = 'Success',
-            @StartDateTime = @OP_StartTime,
-            @EndDateTime = @OP_EndTime;
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Fact_OP_Activity',
+                @LoadType = 'Update',
+                @RowsAffected = @RowsOP,
+                @Status = 'Success',
+                @StartDateTime = @OP_StartTime,
+                @EndDateTime = @OP_EndTime;
+        END
 
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
@@ -20,11 +20,14 @@ Created:       2026-01-14
 Change Log:
   2026-01-14  Sridhar Peddi    Initial creation
   2026-01-26  Sridhar Peddi    Add table-level timings and #ERF index
+  2026-03-28  Sridhar Peddi    Now the post-load fallback (facts are enriched inline by default)
 
 Notes:
 - Uses Analytics.tbl_ERF_Repriced_Active as the eligibility source (precomputed).
 - Updates only the requested date window (Admission/Appointment date).
 - If @FinYearStart is supplied, it also filters ERF view rows by dv_FinYear.
+- Post-load fallback: sp_Load_Fact_IP/OP_Activity now write these columns in the insert (@Enrich = 1);
+  run this after standalone loads (default @Enrich = 0) or @PostLoadEnrichment = 1 runs.
 
 Parameters:
 - @FinYearStart: Optional 4-char year filter, e.g. '2025' (matches LEFT(dv_FinYear,4)).
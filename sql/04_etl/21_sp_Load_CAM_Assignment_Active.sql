@@ -20,9 +20,14 @@ Notes:
 - Window defaults to FY start through SUS inclusion cutoff.
 - Source is Data_Lab_SWL.CAM.tbl_CAM_Raw (precomputed).
 - Activity_Date is Discharge_Date for IP and Appointment_Date for OP.
+- The moved-encounter DELETE and the duplicate-key check only read months outside the cleared
+  window (Activity_Date < @WindowStartDate OR > @WindowEndDate); the window is already empty.
 
 Change Log:
   2026-03-04  Sridhar Peddi    Auto-seed CAM category/reason dimensions from CAM raw to prevent blanket Unknown mappings
+  2026-03-28  Sridhar Peddi    Clear window via sp_Clear_Active_Window (partition TRUNCATE); clear + insert in one transaction
+  2026-03-28  Sridhar Peddi    Fail the load if an encounter ends up with rows in more than one month
+  2026-03-28  Sridhar Peddi    Moved-encounter delete / duplicate check limited to months outside the window
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_CAM_Assignment_Active]
     @FinYearStart CHAR(4),
@@ -40,6 +45,7 @@ BEGIN
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
     DECLARE @DuplicateKeyCount INT = 0;
+    DECLARE @ActiveDuplicateKeys INT = 0;
     DECLARE @ErrorMessage NVARCHAR(4000);
     DECLARE @DQMessage NVARCHAR(4000);
     DECLARE @FinYearInt INT;
@@ -251,13 +257,26 @@ BEGIN
         FROM Ranked
         WHERE RowNum = 1;
 
-        DELETE FROM [Analytics].[tbl_CAM_Assignment_Active]
-        WHERE [Activity_Date] >= @WindowStartDate
-          AND [Activity_Date] <= @WindowEndDate;
+        BEGIN TRANSACTION;
 
-        SET @RowsDeleted = @@ROWCOUNT;
+        EXEC [Analytics].[sp_Clear_Active_Window]
+            @TableName = 'tbl_CAM_Assignment_Active',
+            @FromDate = @WindowStartDate,
+            @ToDate = @WindowEndDate,
+            @RowsDeleted = @RowsDeleted OUTPUT;
 
-        INSERT INTO [Analytics].[tbl_CAM_Assignment_Active] (
+        -- Encounters whose Activity_Date moved out of another month
+        DELETE a
+        FROM [Analytics].[tbl_CAM_Assignment_Active] a
+        INNER JOIN #CAM c
+            ON c.[SK_EncounterID] = a.[SK_EncounterID]
+           AND c.[Dataset] = a.[Dataset]
+        WHERE a.[Activity_Date] < @WindowStartDate
+           OR a.[Activity_Date] > @WindowEndDate;
+
+        SET @RowsDeleted = @RowsDeleted + @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_CAM_Assignment_Active] WITH (TABLOCK) (
             [SK_EncounterID],
             [Dataset],
             [Activity_Date],
@@ -290,6 +309,37 @@ BEGIN
 
         SET @RowsInserted = @@ROWCOUNT;
 
+        -- The PK includes Activity_Date (partitioning), so it does not stop an encounter
+        -- having rows in two months. The window was emptied above, so a key can only repeat
+        -- inside the staged rows or in a month outside the window.
+        SELECT @ActiveDuplicateKeys = COUNT(*)
+        FROM (
+            SELECT k.[SK_EncounterID], k.[Dataset]
+            FROM #CAM k
+            GROUP BY k.[SK_EncounterID], k.[Dataset]
+            HAVING COUNT(*) > 1
+        ) d;
+
+        SELECT @ActiveDuplicateKeys = @ActiveDuplicateKeys + COUNT(*)
+        FROM (
+            SELECT DISTINCT a.[SK_EncounterID], a.[Dataset]
+            FROM [Analytics].[tbl_CAM_Assignment_Active] a
+            WHERE (a.[Activity_Date] < @WindowStartDate
+                   OR a.[Activity_Date] > @WindowEndDate)
+              AND EXISTS (SELECT 1 FROM #CAM k
+                          WHERE k.[SK_EncounterID] = a.[SK_EncounterID]
+                            AND k.[Dataset] = a.[Dataset])
+        ) d;
+
+        IF @ActiveDuplicateKeys > 0
+        BEGIN
+            SET @ErrorMessage = CAST(@ActiveDuplicateKeys AS VARCHAR(20))
+                + ' (SK_EncounterID, Dataset) keys have more than one row in tbl_CAM_Assignment_Active';
+            RAISERROR(@ErrorMessage, 16, 1);
+        END
+
+        COMMIT TRANSACTION;
+
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_CAM_Assignment_Active',
@@ -307,6 +357,9 @@ BEGIN
             @ErrorMessage = NULL;
     END TRY
     BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
         SET @ErrorMessage = ERROR_MESSAGE();
         PRINT 'Error Loading CAM Assignment Active: ' + ISNULL(@ErrorMessage, '');
         IF @BatchID IS NOT NULL
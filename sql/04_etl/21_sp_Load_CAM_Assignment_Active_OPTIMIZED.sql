@@ -17,14 +17,24 @@ PERFORMANCE IMPROVEMENTS:
 2. Add clustered index on #CAM_Dedup temp table for fast lookups
 3. Remove redundant duplicate check (ROW_NUMBER already handles it)
 4. Use OPTION (RECOMPILE) for optimal query plans with parameter sniffing
-5. Batch DELETE if deleting >1M rows
+5. Clear the window with partition TRUNCATE (sp_Clear_Active_Window), not a DELETE TOP loop
 6. Use TABLOCK hint for faster INSERT
 7. Update statistics after load for optimal query plans
 
+- The moved-encounter DELETE and the duplicate-key check only read months outside the cleared
+  window (Activity_Date < @WindowStartDate OR > @WindowEndDate); the window is already empty.
+
 EXPECTED IMPROVEMENT: 28 minutes → 6-10 minutes (3-5x faster)
 
 Original Performance: 1682 seconds (28 min) for 5.1M rows @ 3069 rows/sec
 Target Performance: 400-600 seconds (6-10 min) @ 8,500-12,900 rows/sec
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Replace batched DELETE TOP loop with sp_Clear_Active_Window
+                               (TRUNCATE WITH PARTITIONS on PS_Active_Monthly); clear + insert
+                               in one transaction; remove moved encounters (PK includes Activity_Date)
+  2026-03-28  Sridhar Peddi    Fail the load if an encounter ends up with rows in more than one month
+  2026-03-28  Sridhar Peddi    Moved-encounter delete / duplicate check limited to months outside the window
 **/
 
 IF OBJECT_ID('[Analytics].[sp_Load_CAM_Assignment_Active]', 'P') IS NOT NULL
@@ -46,6 +56,7 @@ BEGIN
     DECLARE @BatchID INT = NULL;
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
+    DECLARE @ActiveDuplicateKeys INT = 0;
     DECLARE @ErrorMessage NVARCHAR(4000);
     DECLARE @FinYearInt INT;
     DECLARE @FinYearStartDate DATE;
@@ -53,7 +64,6 @@ BEGIN
     DECLARE @WindowStartDate DATE;
     DECLARE @WindowEndDate DATE;
     DECLARE @CutoffDate DATE;
-    DECLARE @DeleteBatchSize INT = 100000; -- Batch deletes if >100k rows
 
     SET @FinYearInt = CASE
         WHEN ISNUMERIC(@FinYearStart) = 1 THEN CAST(@FinYearStart AS INT)
@@ -264,49 +274,28 @@ BEGIN
         PRINT '  Joined dimension lookups to ' + CAST(@@ROWCOUNT AS VARCHAR(20)) + ' rows';
 
         -- ================================================================
-        -- OPTIMIZATION 6: Batch DELETE if deleting >1M rows
-        -- Large deletes can block; batching reduces lock duration
+        -- OPTIMIZATION 6: Clear the window by partition
+        -- Whole months are truncated (metadata only); part months at the
+        -- window edges are deleted. Clear + insert commit together.
         -- ================================================================
-        DECLARE @DeleteCount INT = 0;
-        DECLARE @TotalDeleted INT = 0;
+        BEGIN TRANSACTION;
 
-        -- Check if we're deleting a lot of rows
-        SELECT @DeleteCount = COUNT(*)
-        FROM [Analytics].[tbl_CAM_Assignment_Active]
-        WHERE [Activity_Date] >= @WindowStartDate
-          AND [Activity_Date] <= @WindowEndDate;
+        EXEC [Analytics].[sp_Clear_Active_Window]
+            @TableName = 'tbl_CAM_Assignment_Active',
+            @FromDate = @WindowStartDate,
+            @ToDate = @WindowEndDate,
+            @RowsDeleted = @RowsDeleted OUTPUT;
 
-        PRINT '  Deleting ' + CAST(@DeleteCount AS VARCHAR(20)) + ' existing rows...';
-
-        IF @DeleteCount > @DeleteBatchSize * 2 -- If >200k rows, batch it
-        BEGIN
-            PRINT '  Using batched delete for large dataset';
-            WHILE 1 = 1
-            BEGIN
-                DELETE TOP (@DeleteBatchSize)
-                FROM [Analytics].[tbl_CAM_Assignment_Active]
-                WHERE [Activity_Date] >= @WindowStartDate
-                  AND [Activity_Date] <= @WindowEndDate;
-
-                SET @RowsDeleted = @@ROWCOUNT;
-                SET @TotalDeleted = @TotalDeleted + @RowsDeleted;
-
-                IF @RowsDeleted = 0 BREAK;
-
-                IF @TotalDeleted % (@DeleteBatchSize * 5) = 0
-                    PRINT '    Deleted ' + CAST(@TotalDeleted AS VARCHAR(20)) + ' rows so far...';
-            END
-            SET @RowsDeleted = @TotalDeleted;
-        END
-        ELSE
-        BEGIN
-            -- Small delete, do it in one shot
-            DELETE FROM [Analytics].[tbl_CAM_Assignment_Active]
-            WHERE [Activity_Date] >= @WindowStartDate
-              AND [Activity_Date] <= @WindowEndDate;
+        -- Encounters whose Activity_Date moved out of another month
+        DELETE a
+        FROM [Analytics].[tbl_CAM_Assignment_Active] a
+        INNER JOIN #CAM_Final f
+            ON f.[SK_EncounterID] = a.[SK_EncounterID]
+           AND f.[Dataset] = a.[Dataset]
+        WHERE a.[Activity_Date] < @WindowStartDate
+           OR a.[Activity_Date] > @WindowEndDate;
 
-            SET @RowsDeleted = @@ROWCOUNT;
-        END
+        SET @RowsDeleted = @RowsDeleted + @@ROWCOUNT;
 
         PRINT '  Deleted ' + CAST(@RowsDeleted AS VARCHAR(20)) + ' rows';
 
@@ -350,6 +339,37 @@ BEGIN
 
         SET @RowsInserted = @@ROWCOUNT;
 
+        -- The PK includes Activity_Date (partitioning), so it does not stop an encounter
+        -- having rows in two months. The window was emptied above, so a key can only repeat
+        -- inside the staged rows or in a month outside the window.
+        SELECT @ActiveDuplicateKeys = COUNT(*)
+        FROM (
+            SELECT k.[SK_EncounterID], k.[Dataset]
+            FROM #CAM_Final k
+            GROUP BY k.[SK_EncounterID], k.[Dataset]
+            HAVING COUNT(*) > 1
+        ) d;
+
+        SELECT @ActiveDuplicateKeys = @ActiveDuplicateKeys + COUNT(*)
+        FROM (
+            SELECT DISTINCT a.[SK_EncounterID], a.[Dataset]
+            FROM [Analytics].[tbl_CAM_Assignment_Active] a
+            WHERE (a.[Activity_Date] < @WindowStartDate
+                   OR a.[Activity_Date] > @WindowEndDate)
+              AND EXISTS (SELECT 1 FROM #CAM_Final k
+                          WHERE k.[SK_EncounterID] = a.[SK_EncounterID]
+                            AND k.[Dataset] = a.[Dataset])
+        ) d;
+
+        IF @ActiveDuplicateKeys > 0
+        BEGIN
+            SET @ErrorMessage = CAST(@ActiveDuplicateKeys AS VARCHAR(20))
+                + ' (SK_EncounterID, Dataset) keys have more than one row in tbl_CAM_Assignment_Active';
+            RAISERROR(@ErrorMessage, 16, 1);
+        END
+
+        COMMIT TRANSACTION;
+
         PRINT '  Inserted ' + CAST(@RowsInserted AS VARCHAR(20)) + ' rows';
 
         -- Update statistics for optimal query plans
@@ -377,6 +397,9 @@ BEGIN
 
     END TRY
     BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
         SET @ErrorMessage = ERROR_MESSAGE();
         PRINT 'Error Loading CAM Assignment Active: ' + ISNULL(@ErrorMessage, '');
         IF @BatchID IS NOT NULL
@@ -413,7 +436,7 @@ PRINT '1. Deduplicate FIRST, then join dimensions (save 3 joins on millions of r
 PRINT '2. Clustered indexes on temp tables for faster processing';
 PRINT '3. Removed redundant duplicate check';
 PRINT '4. OPTION (RECOMPILE) for optimal query plans';
-PRINT '5. Batched DELETE for large datasets';
+PRINT '5. Partition TRUNCATE of the reload window (sp_Clear_Active_Window)';
 PRINT '6. TABLOCK hint for faster INSERT';
 PRINT '7. Update statistics after load for optimal query plans';
 PRINT '';
@@ -19,20 +19,42 @@ Created:       2026-01-15
 Notes:
 - Window defaults to FY start through SUS inclusion cutoff.
 - Current FY only.
+- Window keys read via [Analytics].[fn_Src_*_Encounter](@UseWorkSource): Unified, or the orchestrator's
+  extract when it passes @UseWorkSource = 1.
+- Activity_Date is End_Date_Hospital_Provider_Spell for IP and Appointment_Date for OP.
+- Window cleared via sp_Clear_Active_Window (partition TRUNCATE of whole months), then window
+  keys are deleted from any other month (moved / pre-Activity_Date rows); clear + insert commit together.
+- The moved-encounter DELETE and the duplicate-key check only read months outside the cleared
+  window (Activity_Date < @WindowStartDate OR > @WindowEndDate); the window is already empty.
+
+Change Log:
+  2026-03-28  Sridhar Peddi    Load Activity_Date; clear window via sp_Clear_Active_Window in one transaction
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource); synonyms are no longer re-pointed
+  2026-03-28  Sridhar Peddi    Fail the load if an encounter ends up with rows in more than one month
+  2026-03-28  Sridhar Peddi    Moved-encounter delete / duplicate check limited to months outside the window
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_ERF_Repriced_Active]
     @FinYearStart CHAR(4),
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
 
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @BatchName VARCHAR(100) = 'Load_ERF_Repriced_Active';
     DECLARE @BatchID INT = NULL;
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
+    DECLARE @ActiveDuplicateKeys INT = 0;
     DECLARE @ErrorMessage NVARCHAR(4000);
     DECLARE @FinYearInt INT;
     DECLARE @FinancialYear VARCHAR(9);
@@ -83,6 +105,11 @@ BEGIN
         RAISERROR('Column [dv_FinYear] in [Analytics].[tbl_ERF_Repriced_Active] must be VARCHAR(9). Run the DDL script to apply the change.', 16, 1);
         RETURN;
     END
+    IF COL_LENGTH('[Analytics].[tbl_ERF_Repriced_Active]', 'Activity_Date') IS NULL
+    BEGIN
+        RAISERROR('Column [Activity_Date] is missing from [Analytics].[tbl_ERF_Repriced_Active]. Run the DDL script to apply the change.', 16, 1);
+        RETURN;
+    END
 
     BEGIN TRY
         EXEC [Analytics].[sp_Start_ETL_Batch]
@@ -96,7 +123,7 @@ BEGIN
             src.SK_EncounterID,
             CAST('IP' AS VARCHAR(2)) AS POD
         INTO #ERF_WindowKeys
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] src
+        FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) src
         WHERE src.End_Date_Hospital_Provider_Spell >= @WindowStartDate
           AND src.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @WindowEndDate)
           AND src.dv_FinYear = @FinancialYear;
@@ -105,40 +132,26 @@ BEGIN
         SELECT DISTINCT
             src.SK_EncounterID,
             CAST('OP' AS VARCHAR(2)) AS POD
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] src
+        FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) src
         WHERE src.Appointment_Date >= @WindowStartDate
           AND src.Appointment_Date < DATEADD(DAY, 1, @WindowEndDate)
           AND src.dv_FinYear = @FinancialYear;
 
-        DELETE t
-        FROM [Analytics].[tbl_ERF_Repriced_Active] t
-        INNER JOIN #ERF_WindowKeys w
-            ON w.SK_EncounterID = t.SK_EncounterID
-           AND w.POD = t.POD;
-
-        SET @RowsDeleted = @@ROWCOUNT;
+        IF OBJECT_ID('tempdb..#ERF') IS NOT NULL
+            DROP TABLE #ERF;
 
-        INSERT INTO [Analytics].[tbl_ERF_Repriced_Active] (
-            [SK_EncounterID],
-            [POD],
-            [dv_FinYear],
-            [ERF_National_Price],
-            [ERF_MFF_Applied],
-            [ERF_Total_Cost_Incl_MFF],
-            [ERF_Tariff_Used],
-            [ETL_LoadDateTime]
-        )
         SELECT
             v.SK_EncounterID,
-            'IP' AS POD,
+            CAST('IP' AS VARCHAR(2)) AS POD,
             v.dv_FinYear,
+            CAST(src.End_Date_Hospital_Provider_Spell AS DATE) AS Activity_Date,
             CAST(v.Price AS DECIMAL(12,2)) AS ERF_National_Price,
             CAST(v.MFF_Applied AS DECIMAL(12,6)) AS ERF_MFF_Applied,
             CAST(v.TotalCostInclMFF AS DECIMAL(12,2)) AS ERF_Total_Cost_Incl_MFF,
-            CAST(v.Tariff_Used AS VARCHAR(50)) AS ERF_Tariff_Used,
-            @ETL_Start
+            CAST(v.Tariff_Used AS VARCHAR(50)) AS ERF_Tariff_Used
+        INTO #ERF
         FROM [Analytics].[vw_IP_ERF] v
-        INNER JOIN [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] src
+        INNER JOIN [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) src
             ON src.SK_EncounterID = v.SK_EncounterID
         WHERE v.dv_FinYear = @FinancialYear
           AND src.End_Date_Hospital_Provider_Spell >= @WindowStartDate
@@ -148,20 +161,92 @@ BEGIN
             v.SK_EncounterID,
             'OP' AS POD,
             v.dv_FinYear,
+            CAST(src.Appointment_Date AS DATE) AS Activity_Date,
             CAST(v.National_Price AS DECIMAL(12,2)) AS ERF_National_Price,
             CAST(v.MFF AS DECIMAL(12,6)) AS ERF_MFF_Applied,
             CAST(v.TotalCostInclMFF AS DECIMAL(12,2)) AS ERF_Total_Cost_Incl_MFF,
-            CAST(v.Tariff_Used AS VARCHAR(50)) AS ERF_Tariff_Used,
-            @ETL_Start
+            CAST(v.Tariff_Used AS VARCHAR(50)) AS ERF_Tariff_Used
         FROM [Analytics].[vw_OP_ERF] v
-        INNER JOIN [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] src
+        INNER JOIN [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) src
             ON src.SK_EncounterID = v.SK_EncounterID
         WHERE v.dv_FinYear = @FinancialYear
           AND src.Appointment_Date >= @WindowStartDate
           AND src.Appointment_Date < DATEADD(DAY, 1, @WindowEndDate);
 
+        BEGIN TRANSACTION;
+
+        EXEC [Analytics].[sp_Clear_Active_Window]
+            @TableName = 'tbl_ERF_Repriced_Active',
+            @FromDate = @WindowStartDate,
+            @ToDate = @WindowEndDate,
+            @RowsDeleted = @RowsDeleted OUTPUT;
+
+        DELETE t
+        FROM [Analytics].[tbl_ERF_Repriced_Active] t
+        INNER JOIN #ERF_WindowKeys w
+            ON w.SK_EncounterID = t.SK_EncounterID
+           AND w.POD = t.POD
+        WHERE t.Activity_Date < @WindowStartDate
+           OR t.Activity_Date > @WindowEndDate;
+
+        SET @RowsDeleted = @RowsDeleted + @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_ERF_Repriced_Active] WITH (TABLOCK) (
+            [SK_EncounterID],
+            [POD],
+            [dv_FinYear],
+            [Activity_Date],
+            [ERF_National_Price],
+            [ERF_MFF_Applied],
+            [ERF_Total_Cost_Incl_MFF],
+            [ERF_Tariff_Used],
+            [ETL_LoadDateTime]
+        )
+        SELECT
+            SK_EncounterID,
+            POD,
+            dv_FinYear,
+            Activity_Date,
+            ERF_National_Price,
+            ERF_MFF_Applied,
+            ERF_Total_Cost_Incl_MFF,
+            ERF_Tariff_Used,
+            @ETL_Start
+        FROM #ERF;
+
         SET @RowsInserted = @@ROWCOUNT;
 
+        -- The PK includes Activity_Date (partitioning), so it does not stop an encounter
+        -- having rows in two months. The window was emptied above, so a key can only repeat
+        -- inside the staged rows or in a month outside the window.
+        SELECT @ActiveDuplicateKeys = COUNT(*)
+        FROM (
+            SELECT k.[SK_EncounterID], k.[POD]
+            FROM #ERF k
+            GROUP BY k.[SK_EncounterID], k.[POD]
+            HAVING COUNT(*) > 1
+        ) d;
+
+        SELECT @ActiveDuplicateKeys = @ActiveDuplicateKeys + COUNT(*)
+        FROM (
+            SELECT DISTINCT a.[SK_EncounterID], a.[POD]
+            FROM [Analytics].[tbl_ERF_Repriced_Active] a
+            WHERE (a.[Activity_Date] < @WindowStartDate
+                   OR a.[Activity_Date] > @WindowEndDate)
+              AND EXISTS (SELECT 1 FROM #ERF k
+                          WHERE k.[SK_EncounterID] = a.[SK_EncounterID]
+                            AND k.[POD] = a.[POD])
+        ) d;
+
+        IF @ActiveDuplicateKeys > 0
+        BEGIN
+            SET @ErrorMessage = CAST(@ActiveDuplicateKeys AS VARCHAR(20))
+                + ' (SK_EncounterID, POD) keys have more than one row in tbl_ERF_Repriced_Active';
+            RAISERROR(@ErrorMessage, 16, 1);
+        END
+
+        COMMIT TRANSACTION;
+
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_ERF_Repriced_Active',
@@ -179,6 +264,9 @@ BEGIN
             @ErrorMessage = NULL;
     END TRY
     BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
         SET @ErrorMessage = ERROR_MESSAGE();
         PRINT 'Error Loading ERF Repriced Active: ' + ISNULL(@ErrorMessage, '');
         IF @BatchID IS NOT NULL
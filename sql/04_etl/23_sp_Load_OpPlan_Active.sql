@@ -20,27 +20,58 @@ Notes:
 - Current FY by default; explicit @FinYearStart allows prior years.
 - Uses OpPlan TVFs (no LogId dependency).
 - Activity_Date uses Discharge (IP), Appointment (OP), Arrival (ED).
+- Activity dates are read via [Analytics].[fn_Src_*_Encounter](@UseWorkSource): Unified, or the
+  orchestrator's extract when it passes @UseWorkSource = 1.
+- Limitation: the PLNG.Get_OpPlan_ActivityBridge_* functions live in Data_Lab_SWL and always scan
+  Unified, so this step still reads Unified for its measures in a single-pass run.
+- Measure sets resolve through [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] (BINARY(32) SetHash -> SK);
+  only sets not in the dictionary are inserted into tbl_Dim_OpPlan_MeasureSet and its bridge.
+- Encounters whose measures match their stored set (tbl_OpPlan_Active + bridge) keep it without
+  rebuilding the MeasureIds string; only new/changed encounters are aggregated and hashed.
+- The moved-encounter DELETE and the duplicate-key check only read months outside the cleared
+  window (Activity_Date < @WindowStartDate OR > @WindowEndDate); the window is already empty.
 Flow (summary):
 1) Read MeasureId per encounter from OpPlan TVFs (IP/OP/ED).
 2) Attach activity dates from Unified materialised tables.
-3) Build distinct measure-sets per encounter (sorted MeasureIds + hash).
-4) Upsert measure-set dimension and bridge, then load tbl_OpPlan_Active.
+3) Split encounters into unchanged (stored set still matches) and new/changed;
+   build sorted MeasureIds + SHA2_256 hash for new/changed only.
+4) Insert novel sets into the dimension, dictionary and bridge, then load tbl_OpPlan_Active
+   (window cleared via sp_Clear_Active_Window partition TRUNCATE; clear + insert in one transaction).
+
+Change Log:
+  2026-01-15  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Hash dictionary for measure sets; aggregate only new/changed encounters
+  2026-03-28  Sridhar Peddi    Clear window via sp_Clear_Active_Window (partitioned table); remove moved encounters
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource); synonyms are no longer re-pointed
+  2026-03-28  Sridhar Peddi    Fail the load if an encounter ends up with rows in more than one month
+  2026-03-28  Sridhar Peddi    Moved-encounter delete / duplicate check limited to months outside the window
 **/
 CREATE PROCEDURE [Analytics].[sp_Load_OpPlan_Active]
     @FinYearStart CHAR(4),
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
 
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @BatchName VARCHAR(100) = 'Load_OpPlan_Active';
     DECLARE @BatchID INT = NULL;
     DECLARE @RowsInserted INT = 0;
     DECLARE @RowsDeleted INT = 0;
+    DECLARE @ActiveDuplicateKeys INT = 0;
     DECLARE @RowsDim INT = 0;
     DECLARE @RowsBridge INT = 0;
+    DECLARE @RowsUnchanged INT = 0;
+    DECLARE @RowsChanged INT = 0;
     DECLARE @ErrorMessage NVARCHAR(4000);
     DECLARE @FinYearInt INT;
     DECLARE @FinYearStartDate DATE;
@@ -105,6 +136,12 @@ BEGIN
         RETURN;
     END
 
+    IF OBJECT_ID('[Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]', 'U') IS NULL
+    BEGIN
+        RAISERROR('Required table [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] was not found (run 36_Create_Dim_OpPlan_MeasureSet_Hash.sql).', 16, 1);
+        RETURN;
+    END
+
     BEGIN TRY
         EXEC [Analytics].[sp_Start_ETL_Batch]
             @BatchName = @BatchName,
@@ -114,11 +151,69 @@ BEGIN
             DROP TABLE #OpPlanRaw;
         IF OBJECT_ID('tempdb..#OpPlanActivity') IS NOT NULL
             DROP TABLE #OpPlanActivity;
+        IF OBJECT_ID('tempdb..#EncounterMeasures') IS NOT NULL
+            DROP TABLE #EncounterMeasures;
+        IF OBJECT_ID('tempdb..#EncounterSummary') IS NOT NULL
+            DROP TABLE #EncounterSummary;
+        IF OBJECT_ID('tempdb..#UnchangedMeasureSet') IS NOT NULL
+            DROP TABLE #UnchangedMeasureSet;
         IF OBJECT_ID('tempdb..#EncounterMeasureSet') IS NOT NULL
             DROP TABLE #EncounterMeasureSet;
+        IF OBJECT_ID('tempdb..#NewMeasureSet') IS NOT NULL
+            DROP TABLE #NewMeasureSet;
         IF OBJECT_ID('tempdb..#OpPlanActive') IS NOT NULL
             DROP TABLE #OpPlanActive;
 
+        CREATE TABLE #NewMeasureSet (
+            SetHash BINARY(32) NOT NULL PRIMARY KEY,
+            SK_OpPlan_MeasureSet BIGINT NOT NULL,
+            MeasureCount INT NOT NULL,
+            MeasureIds VARCHAR(4000) NOT NULL
+        );
+
+        -- Keep the hash dictionary in step with the dimension (rebuilt dimension, first run)
+        IF (SELECT COUNT(*) FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash])
+               <> (SELECT COUNT(*) FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet] WHERE SK_OpPlan_MeasureSet <> -1)
+           OR ISNULL((SELECT MAX(SK_OpPlan_MeasureSet) FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash]), -1)
+               <> ISNULL((SELECT MAX(SK_OpPlan_MeasureSet) FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet]), -1)
+        BEGIN
+            PRINT '[INFO] Measure-set hash dictionary out of step with the dimension - rebuilding.';
+
+            BEGIN TRANSACTION;
+
+            DELETE FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash];
+
+            INSERT INTO [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] (SetHash, SK_OpPlan_MeasureSet, MeasureCount)
+            SELECT
+                CAST(d.SetHash AS BINARY(32)),
+                MIN(d.SK_OpPlan_MeasureSet),
+                MIN(d.MeasureCount)
+            FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
+            WHERE d.SK_OpPlan_MeasureSet <> -1
+            GROUP BY CAST(d.SetHash AS BINARY(32));
+
+            -- Bridge rows for sets that have none (bridge rebuilt separately)
+            INSERT INTO [Analytics].[tbl_Bridge_OpPlan_MeasureSet] (
+                [SK_OpPlan_MeasureSet],
+                [MeasureID],
+                [ETL_LoadDateTime]
+            )
+            SELECT DISTINCT
+                d.SK_OpPlan_MeasureSet,
+                LTRIM(RTRIM(m.value)) AS MeasureID,
+                @ETL_Start
+            FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
+            CROSS APPLY STRING_SPLIT(d.MeasureIds, ',') m
+            WHERE d.SK_OpPlan_MeasureSet <> -1
+              AND NOT EXISTS (
+                    SELECT 1
+                    FROM [Analytics].[tbl_Bridge_OpPlan_MeasureSet] b
+                    WHERE b.SK_OpPlan_MeasureSet = d.SK_OpPlan_MeasureSet
+              );
+
+            COMMIT TRANSACTION;
+        END
+
         SELECT
             o.SK_EncounterID,
             o.MeasureId,
@@ -145,7 +240,7 @@ BEGIN
             d.Activity_Date
         INTO #OpPlanActivity
         FROM #OpPlanRaw r
-        INNER JOIN [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] ip
+        INNER JOIN [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) ip
             ON r.SK_EncounterID = ip.SK_EncounterID
         CROSS APPLY (
             SELECT TRY_CONVERT(DATE, ip.End_Date_Hospital_Provider_Spell) AS Activity_Date
@@ -162,7 +257,7 @@ BEGIN
             r.Dataset,
             d.Activity_Date
         FROM #OpPlanRaw r
-        INNER JOIN [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] op
+        INNER JOIN [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) op
             ON r.SK_EncounterID = op.SK_EncounterID
         CROSS APPLY (
             SELECT TRY_CONVERT(DATE, op.Appointment_Date) AS Activity_Date
@@ -179,7 +274,7 @@ BEGIN
             r.Dataset,
             d.Activity_Date
         FROM #OpPlanRaw r
-        INNER JOIN [Data_Lab_SWL].[Unified].[tbl_ED_EncounterDenormalised_Active] ed
+        INNER JOIN [Analytics].[fn_Src_ED_Encounter](@UseWorkSource) ed
             ON r.SK_EncounterID = ed.SK_EncounterID
         CROSS APPLY (
             SELECT TRY_CONVERT(DATE, ed.Arrival_Date) AS Activity_Date
@@ -189,36 +284,90 @@ BEGIN
           AND d.Activity_Date >= @WindowStartDate
           AND d.Activity_Date <= @WindowEndDate;
 
-        ;WITH DistinctMeasures AS (
-            SELECT DISTINCT SK_EncounterID, Dataset, MeasureId, Activity_Date
-            FROM #OpPlanActivity
-        ),
-        MeasureSets AS (
-            SELECT
-                d.SK_EncounterID,
-                d.Dataset,
-                MAX(d.Activity_Date) AS Activity_Date,
-                COUNT(*) AS MeasureCount,
-                STUFF((
-                    SELECT ',' + CONVERT(VARCHAR(20), d2.MeasureId)
-                    FROM DistinctMeasures d2
-                    WHERE d2.SK_EncounterID = d.SK_EncounterID
-                      AND d2.Dataset = d.Dataset
-                    ORDER BY d2.MeasureId
-                    FOR XML PATH(''), TYPE
-                ).value('.', 'VARCHAR(MAX)'), 1, 1, '') AS MeasureIds
-            FROM DistinctMeasures d
-            GROUP BY d.SK_EncounterID, d.Dataset
-        )
+        -- 3. Distinct measures per encounter (no string work yet)
+        SELECT DISTINCT
+            a.SK_EncounterID,
+            a.Dataset,
+            a.MeasureId,
+            CONVERT(VARCHAR(20), a.MeasureId) AS Measure_Text
+        INTO #EncounterMeasures
+        FROM #OpPlanActivity a;
+
+        CREATE CLUSTERED INDEX [CX_EncounterMeasures]
+            ON #EncounterMeasures ([SK_EncounterID], [Dataset]);
+
+        SELECT
+            a.SK_EncounterID,
+            a.Dataset,
+            MAX(a.Activity_Date) AS Activity_Date,
+            COUNT(DISTINCT a.MeasureId) AS MeasureCount
+        INTO #EncounterSummary
+        FROM #OpPlanActivity a
+        GROUP BY a.SK_EncounterID, a.Dataset;
+
+        -- Unchanged encounters: same measure count as the stored set and every measure is in
+        -- that set's bridge rows (equal size + subset = same set). They keep their stored key.
+        SELECT
+            s.SK_EncounterID,
+            s.Dataset,
+            s.Activity_Date,
+            a.MeasureIds,
+            a.MeasureCount,
+            a.SetHash,
+            a.SK_OpPlan_MeasureSet
+        INTO #UnchangedMeasureSet
+        FROM #EncounterSummary s
+        INNER JOIN [Analytics].[tbl_OpPlan_Active] a
+            ON a.SK_EncounterID = s.SK_EncounterID
+           AND a.Dataset = s.Dataset
+           AND a.MeasureCount = s.MeasureCount
+        INNER JOIN [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] h
+            ON h.SetHash = CAST(a.SetHash AS BINARY(32))
+           AND h.SK_OpPlan_MeasureSet = a.SK_OpPlan_MeasureSet
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM #EncounterMeasures m
+            WHERE m.SK_EncounterID = s.SK_EncounterID
+              AND m.Dataset = s.Dataset
+              AND NOT EXISTS (
+                    SELECT 1
+                    FROM [Analytics].[tbl_Bridge_OpPlan_MeasureSet] b
+                    WHERE b.SK_OpPlan_MeasureSet = a.SK_OpPlan_MeasureSet
+                      AND b.MeasureID = LTRIM(RTRIM(m.Measure_Text))
+              )
+        );
+
+        SET @RowsUnchanged = @@ROWCOUNT;
+
+        -- Changed/new encounters only: sorted MeasureIds + hash
         SELECT
-            SK_EncounterID,
-            Dataset,
-            Activity_Date,
-            MeasureCount,
-            MeasureIds,
-            HASHBYTES('SHA2_256', MeasureIds) AS SetHash
+            s.SK_EncounterID,
+            s.Dataset,
+            s.Activity_Date,
+            s.MeasureCount,
+            ms.MeasureIds,
+            CAST(HASHBYTES('SHA2_256', ms.MeasureIds) AS BINARY(32)) AS SetHash
         INTO #EncounterMeasureSet
-        FROM MeasureSets;
+        FROM #EncounterSummary s
+        CROSS APPLY (
+            SELECT STRING_AGG(m.Measure_Text, ',') WITHIN GROUP (ORDER BY m.MeasureId) AS MeasureIds
+            FROM #EncounterMeasures m
+            WHERE m.SK_EncounterID = s.SK_EncounterID
+              AND m.Dataset = s.Dataset
+        ) ms
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM #UnchangedMeasureSet u
+            WHERE u.SK_EncounterID = s.SK_EncounterID
+              AND u.Dataset = s.Dataset
+        );
+
+        SET @RowsChanged = @@ROWCOUNT;
+        PRINT 'Encounter measure sets: ' + CAST(@RowsUnchanged AS VARCHAR(20)) + ' unchanged, '
+            + CAST(@RowsChanged AS VARCHAR(20)) + ' new/changed';
+
+        -- 4. Resolve sets through the hash dictionary; insert novel sets only
+        BEGIN TRANSACTION;
 
         INSERT INTO [Analytics].[tbl_Dim_OpPlan_MeasureSet] (
             [MeasureIds],
@@ -227,71 +376,96 @@ BEGIN
             [Is_Active],
             [Created_Date]
         )
-        SELECT DISTINCT
+        OUTPUT
+            CAST(inserted.SetHash AS BINARY(32)),
+            inserted.SK_OpPlan_MeasureSet,
+            inserted.MeasureCount,
+            inserted.MeasureIds
+        INTO #NewMeasureSet (SetHash, SK_OpPlan_MeasureSet, MeasureCount, MeasureIds)
+        SELECT
             ms.MeasureIds,
             ms.MeasureCount,
             ms.SetHash,
             1,
             CURRENT_TIMESTAMP
-        FROM #EncounterMeasureSet ms
-        LEFT JOIN [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
-            ON d.SetHash = ms.SetHash
-           AND d.MeasureIds = ms.MeasureIds
-        WHERE d.SK_OpPlan_MeasureSet IS NULL;
+        FROM (
+            SELECT SetHash, MIN(MeasureIds) AS MeasureIds, MIN(MeasureCount) AS MeasureCount
+            FROM #EncounterMeasureSet
+            GROUP BY SetHash
+        ) ms
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] h
+            WHERE h.SetHash = ms.SetHash
+        );
 
         SET @RowsDim = @@ROWCOUNT;
 
-        ;WITH DistinctSets AS (
-            SELECT DISTINCT MeasureIds, SetHash
-            FROM #EncounterMeasureSet
-        )
+        INSERT INTO [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] (SetHash, SK_OpPlan_MeasureSet, MeasureCount)
+        SELECT SetHash, SK_OpPlan_MeasureSet, MeasureCount
+        FROM #NewMeasureSet;
+
         INSERT INTO [Analytics].[tbl_Bridge_OpPlan_MeasureSet] (
             [SK_OpPlan_MeasureSet],
             [MeasureID],
             [ETL_LoadDateTime]
         )
-        SELECT
-            d.SK_OpPlan_MeasureSet,
-            LTRIM(RTRIM(m.n.value('.', 'VARCHAR(20)'))) AS MeasureID,
+        SELECT DISTINCT
+            n.SK_OpPlan_MeasureSet,
+            LTRIM(RTRIM(m.value)) AS MeasureID,
             @ETL_Start
-        FROM DistinctSets s
-        INNER JOIN [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
-            ON d.SetHash = s.SetHash
-           AND d.MeasureIds = s.MeasureIds
-        CROSS APPLY (
-            SELECT CAST('<x>' + REPLACE(s.MeasureIds, ',', '</x><x>') + '</x>' AS XML) AS MeasureXml
-        ) x
-        CROSS APPLY x.MeasureXml.nodes('/x') AS m(n)
-        LEFT JOIN [Analytics].[tbl_Bridge_OpPlan_MeasureSet] b
-            ON b.SK_OpPlan_MeasureSet = d.SK_OpPlan_MeasureSet
-           AND b.MeasureID = LTRIM(RTRIM(m.n.value('.', 'VARCHAR(20)')))
-        WHERE d.SK_OpPlan_MeasureSet <> -1
-          AND b.SK_OpPlan_MeasureSet IS NULL;
+        FROM #NewMeasureSet n
+        CROSS APPLY STRING_SPLIT(n.MeasureIds, ',') m;
 
         SET @RowsBridge = @@ROWCOUNT;
 
+        COMMIT TRANSACTION;
+
         SELECT
             e.SK_EncounterID,
             e.Dataset,
             e.Activity_Date,
             e.MeasureIds,
             e.MeasureCount,
-            e.SetHash,
-            d.SK_OpPlan_MeasureSet,
+            CAST(e.SetHash AS VARBINARY(32)) AS SetHash,
+            h.SK_OpPlan_MeasureSet,
             CAST(NULL AS INT) AS LogId
         INTO #OpPlanActive
         FROM #EncounterMeasureSet e
-        INNER JOIN [Analytics].[tbl_Dim_OpPlan_MeasureSet] d
-            ON d.SetHash = e.SetHash
-           AND d.MeasureIds = e.MeasureIds;
+        INNER JOIN [Analytics].[tbl_Dim_OpPlan_MeasureSet_Hash] h
+            ON h.SetHash = e.SetHash
+        UNION ALL
+        SELECT
+            u.SK_EncounterID,
+            u.Dataset,
+            u.Activity_Date,
+            u.MeasureIds,
+            u.MeasureCount,
+            u.SetHash,
+            u.SK_OpPlan_MeasureSet,
+            CAST(NULL AS INT) AS LogId
+        FROM #UnchangedMeasureSet u;
+
+        BEGIN TRANSACTION;
 
-        DELETE FROM [Analytics].[tbl_OpPlan_Active]
-        WHERE [Activity_Date] >= @WindowStartDate
-          AND [Activity_Date] <= @WindowEndDate;
+        EXEC [Analytics].[sp_Clear_Active_Window]
+            @TableName = 'tbl_OpPlan_Active',
+            @FromDate = @WindowStartDate,
+            @ToDate = @WindowEndDate,
+            @RowsDeleted = @RowsDeleted OUTPUT;
 
-        SET @RowsDeleted = @@ROWCOUNT;
+        -- Encounters whose Activity_Date moved out of another month
+        DELETE a
+        FROM [Analytics].[tbl_OpPlan_Active] a
+        INNER JOIN #OpPlanActive o
+            ON o.SK_EncounterID = a.SK_EncounterID
+           AND o.Dataset = a.Dataset
+        WHERE a.Activity_Date < @WindowStartDate
+           OR a.Activity_Date > @WindowEndDate;
 
-        INSERT INTO [Analytics].[tbl_OpPlan_Active] (
+        SET @RowsDeleted = @RowsDeleted + @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_OpPlan_Active] WITH (TABLOCK) (
             [SK_EncounterID],
             [Dataset],
             [Activity_Date],
@@ -316,6 +490,37 @@ BEGIN
 
         SET @RowsInserted = @@ROWCOUNT;
 
+        -- The PK includes Activity_Date (partitioning), so it does not stop an encounter
+        -- having rows in two months. The window was emptied above, so a key can only repeat
+        -- inside the staged rows or in a month outside the window.
+        SELECT @ActiveDuplicateKeys = COUNT(*)
+        FROM (
+            SELECT k.[SK_EncounterID], k.[Dataset]
+            FROM #OpPlanActive k
+            GROUP BY k.[SK_EncounterID], k.[Dataset]
+            HAVING COUNT(*) > 1
+        ) d;
+
+        SELECT @ActiveDuplicateKeys = @ActiveDuplicateKeys + COUNT(*)
+        FROM (
+            SELECT DISTINCT a.[SK_EncounterID], a.[Dataset]
+            FROM [Analytics].[tbl_OpPlan_Active] a
+            WHERE (a.[Activity_Date] < @WindowStartDate
+                   OR a.[Activity_Date] > @WindowEndDate)
+              AND EXISTS (SELECT 1 FROM #OpPlanActive k
+                          WHERE k.[SK_EncounterID] = a.[SK_EncounterID]
+                            AND k.[Dataset] = a.[Dataset])
+        ) d;
+
+        IF @ActiveDuplicateKeys > 0
+        BEGIN
+            SET @ErrorMessage = CAST(@ActiveDuplicateKeys AS VARCHAR(20))
+                + ' (SK_EncounterID, Dataset) keys have more than one row in tbl_OpPlan_Active';
+            RAISERROR(@ErrorMessage, 16, 1);
+        END
+
+        COMMIT TRANSACTION;
+
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Dim_OpPlan_MeasureSet',
@@ -323,6 +528,13 @@ BEGIN
             @RowsAffected = @RowsDim,
             @Status = 'Success';
 
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Dim_OpPlan_MeasureSet_Hash',
+            @LoadType = 'Upsert',
+            @RowsAffected = @RowsDim,
+            @Status = 'Success';
+
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Analytics.tbl_Bridge_OpPlan_MeasureSet',
@@ -347,6 +559,9 @@ BEGIN
             @ErrorMessage = NULL;
     END TRY
     BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
         SET @ErrorMessage = ERROR_MESSAGE();
         PRINT 'Error Loading OpPlan Active: ' + ISNULL(@ErrorMessage, '');
         IF @BatchID IS NOT NULL
@@ -20,7 +20,8 @@ Notes:
 - Uses SWL.fn_SUS_Published_Cutoff_Date for rolling window defaults.
 - Deletes/reloads the rolling window (no TRUNCATE).
 - De-duplicates per (RecordIdentifier, Dataset).
-- Reads Unified.tbl_*_EncounterDenormalised_Active directly (no view dependency).
+- Reads Unified.tbl_*_EncounterDenormalised_Active via [Analytics].[fn_Src_*_Encounter](@UseWorkSource)
+  (no view dependency); @UseWorkSource = 1 reads the orchestrator's extract instead.
 - Stages base rows into #CAM_Base with indexes for CAM logic joins.
 - Logs ETL activity to Data_Lab_SWL_Live Analytics audit tables.
 **/
@@ -29,11 +30,19 @@ CREATE PROCEDURE [Analytics].[sp_Compute_CAM_Raw]
     @FinancialYear VARCHAR(9) = NULL,
     @ProviderCode VARCHAR(10) = NULL,
     @FromDate DATE = NULL,
-    @ToDate DATE = NULL
+    @ToDate DATE = NULL,
+    @UseWorkSource BIT = 0
 AS
 BEGIN
     SET NOCOUNT ON;
 
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
     DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
     DECLARE @BatchName VARCHAR(100) = 'Compute_CAM_Raw';
     DECLARE @BatchID INT = NULL;
@@ -154,7 +163,7 @@ BEGIN
             CAST(ip.[End_Date_Hospital_Provider_Spell] AS DATE) AS [DischargeDate],
             CAST(ip.[End_Date_Hospital_Provider_Spell] AS DATE) AS [Activity_Date]
         INTO #CAM_Base
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] ip
+        FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) ip
         WHERE ip.[dv_FinYear] = @FinancialYear
           AND ip.[dv_IsSpell] = 1
           AND ip.[End_Date_Hospital_Provider_Spell] >= @FromDate
@@ -196,7 +205,7 @@ BEGIN
             CAST(op.[Appointment_Date] AS DATE) AS [AdmissionDate],
             CAST(op.[Appointment_Date] AS DATE) AS [DischargeDate],
             CAST(op.[Appointment_Date] AS DATE) AS [Activity_Date]
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] op
+        FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) op
         WHERE op.[dv_FinYear] = @FinancialYear
           AND op.[Appointment_Date] >= @FromDate
           AND op.[Appointment_Date] < DATEADD(DAY, 1, @ToDate)
@@ -623,6 +632,7 @@ BEGIN
         EXEC [Data_Lab_SWL_Live].[Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
             @TableName = 'Data_Lab_SWL.CAM.tbl_CAM_Raw',
+            @ProcID = @@PROCID,
             @LoadType = 'Full',
             @RowsAffected = @RowsInserted,
             @Status = 'Success';
@@ -645,6 +655,7 @@ BEGIN
             EXEC [Data_Lab_SWL_Live].[Analytics].[sp_Log_Table_Load]
                 @BatchID = @BatchID,
                 @TableName = 'Data_Lab_SWL.CAM.tbl_CAM_Raw',
+                @ProcID = @@PROCID,
                 @LoadType = 'Full',
                 @RowsAffected = 0,
                 @RowsFailed = 1,
@@ -1,12 +1,23 @@
 /**
 -- Script Name: 26_sp_Load_Bridge_CF_Segment_Patient_Snapshot.sql
--- Description: Build monthly patient-level CF segment snapshots from Unified SUS (IP/OP).
+-- Description: Build monthly patient-level CF segment snapshots from SUS IP/OP diagnoses.
 --              Grain: Snapshot_Month + SK_PatientID + Segment_Type.
 -- Author:      Sridhar Peddi
 -- Created:     2026-01-26
 -- Notes:       ICD10-only (IP/OP). Does NOT use HI.vw_CF_Segmentation.
+--              Diagnoses are read pre-unpivoted from tbl_Bridge_Encounter_Diagnosis.
+--              Single pass: IP/OP diagnoses are scanned and matched to rules once for the
+--              whole range (#CF_Event: patient x rule x activity month). Each event month
+--              covers the snapshots inside its rule lookback, so every snapshot is a
+--              window aggregate over #CF_Event rather than a fresh scan of Unified.
 -- Change Log:
 -- 2026-01-26  Sridhar Peddi    Initial creation
+-- 2026-03-24  Sridhar Peddi    Replace per-month SnapshotCursor rescans with one event pass + sliding window
+-- 2026-03-25  Sridhar Peddi    Match rules via compiled prefix index (equi-join) instead of LIKE
+-- 2026-03-26  Sridhar Peddi    Read diagnoses from tbl_Bridge_Encounter_Diagnosis (no per-run unpivot)
+-- 2026-03-27  Sridhar Peddi    Snapshot months from fn_Month_Calendar (no WHILE month loop)
+-- 2026-03-28  Sridhar Peddi    Bridge coverage guard checks every IP/OP month of the event range
+-- 2026-03-28  Sridhar Peddi    Coverage guard stops at the SUS published cutoff (later months warn only)
 **/
 
 USE [Data_Lab_SWL_Live];
@@ -44,45 +55,50 @@ BEGIN
     END
 
     DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
     DECLARE @BatchName VARCHAR(100) = 'Bridge_CF_Segment_Patient_Snapshot';
     DECLARE @BatchID INT = NULL;
-    DECLARE @RunMonth INT;
-    DECLARE @SnapshotYear INT;
-    DECLARE @SnapshotMon INT;
-    DECLARE @AsAtDate DATE;
-    DECLARE @SnapshotEnd DATE;
-    DECLARE @LookbackStart DATE;
-
-    CREATE TABLE #SnapshotMonths (
-        SnapshotMonth INT NOT NULL PRIMARY KEY
-    );
+    DECLARE @MaxLookbackMonths INT;
+    DECLARE @EventStart DATE;
+    DECLARE @EventEnd DATE;
+    DECLARE @CoverageEnd DATE;
+    DECLARE @CoverageMessage NVARCHAR(2000);
+    DECLARE @MissingMonths NVARCHAR(MAX);
+    DECLARE @MissingCount INT;
+    DECLARE @FirstMissing DATE;
 
     IF @SnapshotMonth IS NOT NULL
     BEGIN
-        INSERT INTO #SnapshotMonths (SnapshotMonth)
-        VALUES (@SnapshotMonth);
+        SET @FromMonth = @SnapshotMonth;
+        SET @ToMonth = @SnapshotMonth;
     END
-    ELSE
-    BEGIN
-        IF @FromMonth > @ToMonth
-        BEGIN
-            RAISERROR('FromMonth must be <= ToMonth.', 16, 1);
-            RETURN;
-        END
 
-        SET @RunMonth = @FromMonth;
-        WHILE @RunMonth <= @ToMonth
-        BEGIN
-            INSERT INTO #SnapshotMonths (SnapshotMonth)
-            VALUES (@RunMonth);
+    IF @FromMonth / 100 < 2000 OR @FromMonth % 100 NOT BETWEEN 1 AND 12
+       OR @ToMonth / 100 < 2000 OR @ToMonth % 100 NOT BETWEEN 1 AND 12
+    BEGIN
+        RAISERROR('SnapshotMonth must be in YYYYMM format', 16, 1);
+        RETURN;
+    END
 
-            SET @RunMonth = CASE
-                WHEN RIGHT(@RunMonth, 2) = 12 THEN ((@RunMonth / 100) + 1) * 100 + 1
-                ELSE @RunMonth + 1
-            END;
-        END
+    IF @FromMonth > @ToMonth
+    BEGIN
+        RAISERROR('FromMonth must be <= ToMonth.', 16, 1);
+        RETURN;
     END
 
+    CREATE TABLE #SnapshotMonths (
+        SnapshotMonth INT NOT NULL PRIMARY KEY,
+        Month_Start DATE NOT NULL,
+        Snapshot_End DATE NOT NULL
+    );
+
+    INSERT INTO #SnapshotMonths (SnapshotMonth, Month_Start, Snapshot_End)
+    SELECT c.Month_Key, c.Month_Start, c.Month_End
+    FROM [Analytics].[fn_Month_Calendar](
+        DATEFROMPARTS(@FromMonth / 100, @FromMonth % 100, 1),
+        DATEFROMPARTS(@ToMonth / 100, @ToMonth % 100, 1)
+    ) c;
+
     PRINT 'Loading CF Segment Patient Snapshot';
     PRINT '  DefaultLookbackMonths: ' + CONVERT(VARCHAR(10), @DefaultLookbackMonths);
 
@@ -91,157 +107,236 @@ BEGIN
             @BatchName = @BatchName,
             @BatchID = @BatchID OUTPUT;
 
-        DECLARE SnapshotCursor CURSOR LOCAL FAST_FORWARD FOR
-            SELECT SnapshotMonth FROM #SnapshotMonths ORDER BY SnapshotMonth;
+        -- 1. Active rules (compiled prefix index) with the effective lookback
+        --    (capped at @DefaultLookbackMonths: the diagnosis scan never reaches further back)
+        EXEC [Analytics].[sp_Compile_CF_Segment_Rule_ICD10];
 
-        OPEN SnapshotCursor;
-        FETCH NEXT FROM SnapshotCursor INTO @RunMonth;
+        IF OBJECT_ID('tempdb..#CF_Rules') IS NOT NULL
+            DROP TABLE #CF_Rules;
+        IF OBJECT_ID('tempdb..#CF_Key_Lengths') IS NOT NULL
+            DROP TABLE #CF_Key_Lengths;
 
-        WHILE @@FETCH_STATUS = 0
-        BEGIN
-            SET @SnapshotYear = @RunMonth / 100;
-            SET @SnapshotMon = @RunMonth % 100;
-
-            IF @SnapshotYear < 2000 OR @SnapshotMon NOT BETWEEN 1 AND 12
-            BEGIN
-                RAISERROR('SnapshotMonth must be in YYYYMM format', 16, 1);
-                CLOSE SnapshotCursor;
-                DEALLOCATE SnapshotCursor;
-                RETURN;
-            END
-
-            SET @AsAtDate = DATEFROMPARTS(@SnapshotYear, @SnapshotMon, 1);
-            SET @SnapshotEnd = EOMONTH(@AsAtDate);
-            SET @LookbackStart = DATEADD(MONTH, -@DefaultLookbackMonths, DATEADD(DAY, 1, @SnapshotEnd));
-
-            DELETE FROM [Analytics].[tbl_Bridge_CF_Segment_Patient_Snapshot]
-            WHERE Snapshot_Month = @RunMonth
-              AND Segment_Type = 'CF_Segment';
-
-            ;WITH Rules AS (
-                SELECT
-                    r.Rule_ID,
-                    r.Segment_Score,
-                    r.ICD10_Like,
-                    r.Is_Primary_Only,
-                    COALESCE(r.Lookback_Months, @DefaultLookbackMonths) AS Lookback_Months
-                FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
-                WHERE r.Is_Active = 1
-            ),
-            IPDiag AS (
-                SELECT
-                    v.SK_PatientID,
-                    v.Start_Date_Hospital_Provider_Spell AS Activity_Date,
-                    UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-                    x.Is_Primary
-                FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
-                CROSS APPLY (VALUES
-                    (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-                ) x(Diagnosis_Code, Is_Primary)
-                WHERE v.Start_Date_Hospital_Provider_Spell >= @LookbackStart
-                  AND v.Start_Date_Hospital_Provider_Spell <= @SnapshotEnd
-                  AND x.Diagnosis_Code IS NOT NULL
-                  AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-            ),
-            OPDiag AS (
-                SELECT
-                    v.SK_PatientID,
-                    v.Appointment_Date AS Activity_Date,
-                    UPPER(REPLACE(REPLACE(x.Diagnosis_Code, '.', ''), ' ', '')) AS Diagnosis_Code,
-                    x.Is_Primary
-                FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
-                CROSS APPLY (VALUES
-                    (v.Primary_Diagnosis_Code, CAST(1 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_1, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_2, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_3, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_4, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_5, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_6, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_7, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_8, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_9, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_10, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_11, CAST(0 AS BIT)),
-                    (v.Secondary_Diagnosis_Code_12, CAST(0 AS BIT))
-                ) x(Diagnosis_Code, Is_Primary)
-                WHERE v.Appointment_Date >= @LookbackStart
-                  AND v.Appointment_Date <= @SnapshotEnd
-                  AND x.Diagnosis_Code IS NOT NULL
-                  AND LTRIM(RTRIM(x.Diagnosis_Code)) <> ''
-            ),
-            AllDiag AS (
-                SELECT * FROM IPDiag
-                UNION ALL
-                SELECT * FROM OPDiag
-            ),
-            MatchedRules AS (
-                SELECT
-                    d.SK_PatientID,
-                    r.Segment_Score
-                FROM AllDiag d
-                INNER JOIN Rules r
-                    ON d.Diagnosis_Code LIKE r.ICD10_Like
-                   AND (r.Is_Primary_Only = 0 OR d.Is_Primary = 1)
-                WHERE d.Activity_Date >= DATEADD(MONTH, -r.Lookback_Months, DATEADD(DAY, 1, @SnapshotEnd))
-                  AND d.Activity_Date <= @SnapshotEnd
-            ),
-            PatientScore AS (
-                SELECT
-                    m.SK_PatientID,
-                    MAX(m.Segment_Score) AS Segment_Score
-                FROM MatchedRules m
-                GROUP BY m.SK_PatientID
-            ),
-            PatientAll AS (
-                SELECT DISTINCT v.SK_PatientID
-                FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
-                UNION
-                SELECT DISTINCT v.SK_PatientID
-                FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v
-            )
-            INSERT INTO [Analytics].[tbl_Bridge_CF_Segment_Patient_Snapshot] (
-                [Snapshot_Month],
-                [Snapshot_End_Date],
-                [SK_PatientID],
-                [Segment_Type],
-                [Segment_Value],
-                [Segment_Score],
-                [Source_System]
-            )
+        SELECT
+            r.Rule_ID,
+            r.Segment_Score,
+            r.Match_Type,
+            r.Prefix_Length,
+            r.Code_Prefix,
+            r.Is_Primary_Only,
+            CASE
+                WHEN COALESCE(r.Lookback_Months, @DefaultLookbackMonths) > @DefaultLookbackMonths
+                    THEN @DefaultLookbackMonths
+                ELSE COALESCE(r.Lookback_Months, @DefaultLookbackMonths)
+            END AS Lookback_Months
+        INTO #CF_Rules
+        FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] r;
+
+        CREATE CLUSTERED INDEX IX_CF_Rules_Key
+            ON #CF_Rules (Prefix_Length, Code_Prefix);
+
+        SELECT DISTINCT r.Prefix_Length
+        INTO #CF_Key_Lengths
+        FROM #CF_Rules r
+        WHERE r.Match_Type IN ('Exact', 'Prefix');
+
+        SELECT @MaxLookbackMonths = MAX(Lookback_Months) FROM #CF_Rules;
+        SET @MaxLookbackMonths = COALESCE(@MaxLookbackMonths, @DefaultLookbackMonths);
+
+        -- Lookback windows are whole months ending at the snapshot month, so the
+        -- event range is the earliest snapshot's longest lookback through the last snapshot.
+        SELECT
+            @EventStart = DATEADD(MONTH, 1 - @MaxLookbackMonths, MIN(Month_Start)),
+            @EventEnd = MAX(Snapshot_End)
+        FROM #SnapshotMonths;
+
+        PRINT '  Snapshots: ' + CONVERT(VARCHAR(10), (SELECT COUNT(*) FROM #SnapshotMonths))
+            + ', event range: ' + CONVERT(VARCHAR(10), @EventStart, 120)
+            + ' to ' + CONVERT(VARCHAR(10), @EventEnd, 120);
+
+        -- 2. One pass over IP/OP diagnoses: patient x rule x activity month
+        IF OBJECT_ID('tempdb..#CF_Event') IS NOT NULL
+            DROP TABLE #CF_Event;
+
+        -- Diagnoses come from the persisted bridge (loaded by sp_Load_Bridge_Encounter_Codes);
+        -- refuse to build snapshots if any published IP or OP month of the event range is
+        -- missing (a partially backfilled bridge would silently undercount). Months after the
+        -- SUS published cutoff are not required: current-month snapshots use the partial data.
+        SET @CoverageEnd = [Analytics].[fn_SUS_Published_Cutoff_Date](NULL);
+        IF @CoverageEnd IS NULL OR @CoverageEnd > @EventEnd
+            SET @CoverageEnd = @EventEnd;
+
+        IF @CoverageEnd < @EventEnd
+            PRINT '  [WARN] Months after the SUS published cutoff (' + CONVERT(VARCHAR(10), @CoverageEnd, 120)
+                + ') are built from unpublished data and not coverage-checked.';
+
+        ;WITH Covered AS (
             SELECT
-                @RunMonth AS Snapshot_Month,
-                @SnapshotEnd AS Snapshot_End_Date,
-                p.SK_PatientID,
-                'CF_Segment' AS Segment_Type,
-                COALESCE(s.Segment_Value, 'CF_Score_0') AS Segment_Value,
-                COALESCE(ps.Segment_Score, 0) AS Segment_Score,
-                'Derived_CF_Unified_IP_OP' AS Source_System
-            FROM PatientAll p
-            LEFT JOIN PatientScore ps
-                ON ps.SK_PatientID = p.SK_PatientID
-            LEFT JOIN [Analytics].[tbl_Ref_CF_Segment] s
-                ON s.Segment_Score = COALESCE(ps.Segment_Score, 0);
-
-            SET @RowsInserted = @RowsInserted + @@ROWCOUNT;
-
-            FETCH NEXT FROM SnapshotCursor INTO @RunMonth;
+                b.Dataset,
+                DATEFROMPARTS(YEAR(b.Activity_Date), MONTH(b.Activity_Date), 1) AS Month_Start
+            FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis] b
+            WHERE b.Activity_Date >= @EventStart
+              AND b.Activity_Date <= @CoverageEnd
+            GROUP BY b.Dataset, DATEFROMPARTS(YEAR(b.Activity_Date), MONTH(b.Activity_Date), 1)
+        )
+        SELECT
+            @MissingCount = COUNT(*),
+            @FirstMissing = MIN(m.Month_Start),
+            @MissingMonths = STRING_AGG(CAST(ds.Dataset + ' ' + CONVERT(VARCHAR(7), m.Month_Start, 120) AS NVARCHAR(MAX)), ', ')
+                WITHIN GROUP (ORDER BY m.Month_Start, ds.Dataset)
+        FROM [Analytics].[fn_Month_Calendar](@EventStart, @CoverageEnd) m
+        CROSS JOIN (VALUES ('IP'), ('OP')) ds (Dataset)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Covered c
+            WHERE c.Dataset = ds.Dataset
+              AND c.Month_Start = m.Month_Start
+        );
+
+        IF @MissingCount > 0
+        BEGIN
+            SET @CoverageMessage = 'tbl_Bridge_Encounter_Diagnosis is missing '
+                + CAST(@MissingCount AS VARCHAR(10)) + ' IP/OP month(s) of the CF lookback ('
+                + LEFT(@MissingMonths, 300) + CASE WHEN LEN(@MissingMonths) > 300 THEN ', ...' ELSE '' END
+                + '). Backfill with sp_Load_Bridge_Encounter_Codes @FromDate = '''
+                + CONVERT(VARCHAR(10), @FirstMissing, 120) + ''', @ToDate = '''
+                + CONVERT(VARCHAR(10), @CoverageEnd, 120) + ''' first.';
+            RAISERROR(@CoverageMessage, 16, 1);
         END
 
-        CLOSE SnapshotCursor;
-        DEALLOCATE SnapshotCursor;
+        ;WITH AllDiag AS (
+            SELECT
+                b.SK_PatientID,
+                b.Start_Date AS Activity_Date,
+                b.Diagnosis_Code,
+                b.Is_Primary_Diagnosis AS Is_Primary
+            FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis] b
+            WHERE b.Start_Date >= @EventStart
+              AND b.Start_Date <= @EventEnd
+              AND b.Activity_Date >= @EventStart   -- discharge/appointment never precedes Start_Date
+        ),
+        DiagKey AS (
+            -- One key per compiled prefix length the code is long enough to satisfy
+            SELECT
+                d.SK_PatientID,
+                d.Activity_Date,
+                d.Diagnosis_Code,
+                d.Is_Primary,
+                l.Prefix_Length,
+                LEFT(d.Diagnosis_Code, l.Prefix_Length) AS Code_Prefix
+            FROM AllDiag d
+            INNER JOIN #CF_Key_Lengths l
+                ON l.Prefix_Length <= LEN(d.Diagnosis_Code)
+        ),
+        MatchedRules AS (
+            SELECT
+                k.SK_PatientID,
+                k.Activity_Date,
+                r.Rule_ID
+            FROM DiagKey k
+            INNER JOIN #CF_Rules r
+                ON r.Prefix_Length = k.Prefix_Length
+               AND r.Code_Prefix = k.Code_Prefix
+               AND (r.Match_Type = 'Prefix'
+                    OR (r.Match_Type = 'Exact' AND k.Prefix_Length = LEN(k.Diagnosis_Code)))
+               AND (r.Is_Primary_Only = 0 OR k.Is_Primary = 1)
+            UNION ALL
+            -- Patterns the compiler could not reduce to a prefix ('_', '[...]', inner '%')
+            SELECT
+                d.SK_PatientID,
+                d.Activity_Date,
+                r.Rule_ID
+            FROM AllDiag d
+            INNER JOIN #CF_Rules r
+                ON r.Match_Type = 'Like'
+               AND d.Diagnosis_Code LIKE r.Code_Prefix
+               AND (r.Is_Primary_Only = 0 OR d.Is_Primary = 1)
+        )
+        SELECT DISTINCT
+            m.SK_PatientID,
+            m.Rule_ID,
+            DATEFROMPARTS(YEAR(m.Activity_Date), MONTH(m.Activity_Date), 1) AS Activity_Month
+        INTO #CF_Event
+        FROM MatchedRules m;
+
+        -- 3. Event month -> covered snapshot months [Activity_Month, Activity_Month + lookback - 1]
+        IF OBJECT_ID('tempdb..#CF_Event_Cover') IS NOT NULL
+            DROP TABLE #CF_Event_Cover;
+
+        SELECT
+            e.SK_PatientID,
+            r.Segment_Score,
+            e.Activity_Month AS Cover_From,
+            DATEADD(MONTH, r.Lookback_Months - 1, e.Activity_Month) AS Cover_To
+        INTO #CF_Event_Cover
+        FROM #CF_Event e
+        INNER JOIN #CF_Rules r
+            ON r.Rule_ID = e.Rule_ID;
+
+        CREATE CLUSTERED INDEX IX_CF_Event_Cover
+            ON #CF_Event_Cover (Cover_From, Cover_To);
+
+        IF OBJECT_ID('tempdb..#CF_Patient_Score') IS NOT NULL
+            DROP TABLE #CF_Patient_Score;
+
+        SELECT
+            m.SnapshotMonth,
+            c.SK_PatientID,
+            MAX(c.Segment_Score) AS Segment_Score
+        INTO #CF_Patient_Score
+        FROM #SnapshotMonths m
+        INNER JOIN #CF_Event_Cover c
+            ON c.Cover_From <= m.Month_Start
+           AND c.Cover_To >= m.Month_Start
+        GROUP BY m.SnapshotMonth, c.SK_PatientID;
+
+        CREATE CLUSTERED INDEX IX_CF_Patient_Score
+            ON #CF_Patient_Score (SnapshotMonth, SK_PatientID);
+
+        -- 4. Patient population is the same for every snapshot (all IP/OP patients)
+        IF OBJECT_ID('tempdb..#CF_Patients') IS NOT NULL
+            DROP TABLE #CF_Patients;
+
+        SELECT v.SK_PatientID
+        INTO #CF_Patients
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] v
+        UNION
+        SELECT v.SK_PatientID
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] v;
+
+        -- 5. Replace all requested snapshots
+        DELETE t
+        FROM [Analytics].[tbl_Bridge_CF_Segment_Patient_Snapshot] t
+        INNER JOIN #SnapshotMonths m
+            ON m.SnapshotMonth = t.Snapshot_Month
+        WHERE t.Segment_Type = 'CF_Segment';
+
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_Bridge_CF_Segment_Patient_Snapshot] (
+            [Snapshot_Month],
+            [Snapshot_End_Date],
+            [SK_PatientID],
+            [Segment_Type],
+            [Segment_Value],
+            [Segment_Score],
+            [Source_System]
+        )
+        SELECT
+            m.SnapshotMonth AS Snapshot_Month,
+            m.Snapshot_End AS Snapshot_End_Date,
+            p.SK_PatientID,
+            'CF_Segment' AS Segment_Type,
+            COALESCE(s.Segment_Value, 'CF_Score_0') AS Segment_Value,
+            COALESCE(ps.Segment_Score, 0) AS Segment_Score,
+            'Derived_CF_Unified_IP_OP' AS Source_System
+        FROM #SnapshotMonths m
+        CROSS JOIN #CF_Patients p
+        LEFT JOIN #CF_Patient_Score ps
+            ON ps.SnapshotMonth = m.SnapshotMonth
+           AND ps.SK_PatientID = p.SK_PatientID
+        LEFT JOIN [Analytics].[tbl_Ref_CF_Segment] s
+            ON s.Segment_Score = COALESCE(ps.Segment_Score, 0);
+
+        SET @RowsInserted = @@ROWCOUNT;
 
         EXEC [Analytics].[sp_Log_Table_Load]
             @BatchID = @BatchID,
@@ -255,7 +350,7 @@ BEGIN
             @Status = 'Success',
             @RowsInserted = @RowsInserted,
             @RowsUpdated = 0,
-            @RowsDeleted = 0,
+            @RowsDeleted = @RowsDeleted,
             @RowsFailed = 0,
             @ErrorMessage = NULL;
     END TRY
@@ -0,0 +1,290 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Load_Agg_Patient_Sketch]', 'P') IS NOT NULL
+DROP PROCEDURE [Analytics].[sp_Load_Agg_Patient_Sketch];
+GO
+
+/**
+Script Name:   27_sp_Load_Agg_Patient_Sketch.sql
+Description:   Rebuilds monthly patient sketches (HyperLogLog) for IP/OP facts.
+Author:        Sridhar Peddi
+Created:       2026-03-16
+
+Notes:
+- Grain: Dataset + Activity_Month + SK_CommissionerID + SK_ProviderID.
+- Window is widened to whole months; every month touched is rebuilt from the fact.
+- Activity month: Discharge_Date (IP), Appointment_Date (OP).
+- Run after fact loads (called by sp_Run_Fact_Loads_With_Enrichment).
+Flow (summary):
+1) Distinct patients per grain from the facts.
+2) Map each patient to its register (fn_Patient_Sketch_Register), MAX per register.
+3) Encode registers as a dense 1024-byte sketch (zero-filled gaps).
+4) Replace the window months in tbl_Agg_Patient_Sketch_Monthly (delete + insert in one transaction).
+
+Change Log:
+  2026-03-16  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Window delete and rebuild in one transaction
+**/
+CREATE PROCEDURE [Analytics].[sp_Load_Agg_Patient_Sketch]
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @BatchName VARCHAR(100) = 'Agg_Patient_Sketch';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ToDateActual DATE = ISNULL(@ToDate, [Analytics].[fn_SUS_Published_Cutoff_Date](NULL));
+    DECLARE @FromDateActual DATE;
+    DECLARE @MonthStart DATE;
+    DECLARE @MonthEnd DATE;
+    DECLARE @FromMonth INT;
+    DECLARE @ToMonth INT;
+
+    SET @ToDateActual = ISNULL(@ToDateActual, CAST(GETDATE() AS DATE));
+    SET @FromDateActual = ISNULL(
+        @FromDate,
+        DATEADD(MONTH, -5, DATEFROMPARTS(YEAR(@ToDateActual), MONTH(@ToDateActual), 1))
+    );
+
+    IF @ToDateActual < @FromDateActual
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
+
+    SET @MonthStart = DATEFROMPARTS(YEAR(@FromDateActual), MONTH(@FromDateActual), 1);
+    SET @MonthEnd = EOMONTH(@ToDateActual);
+    SET @FromMonth = YEAR(@MonthStart) * 100 + MONTH(@MonthStart);
+    SET @ToMonth = YEAR(@MonthEnd) * 100 + MONTH(@MonthEnd);
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        PRINT 'Loading Patient Sketches: months ' + CAST(@FromMonth AS VARCHAR(6))
+            + ' to ' + CAST(@ToMonth AS VARCHAR(6));
+
+        IF OBJECT_ID('tempdb..#PatientGrain') IS NOT NULL
+            DROP TABLE #PatientGrain;
+        IF OBJECT_ID('tempdb..#SketchGrain') IS NOT NULL
+            DROP TABLE #SketchGrain;
+        IF OBJECT_ID('tempdb..#SketchRegisters') IS NOT NULL
+            DROP TABLE #SketchRegisters;
+
+        -- 1. Distinct patients per grain
+        SELECT
+            CAST('IP' AS VARCHAR(2)) AS Dataset,
+            YEAR(f.Discharge_Date) * 100 + MONTH(f.Discharge_Date) AS Activity_Month,
+            f.SK_CommissionerID,
+            f.SK_ProviderID,
+            f.SK_PatientID,
+            COUNT_BIG(1) AS Activity_Count
+        INTO #PatientGrain
+        FROM [Analytics].[tbl_Fact_IP_Activity] f
+        WHERE f.Discharge_Date >= @MonthStart
+          AND f.Discharge_Date <= @MonthEnd
+        GROUP BY
+            YEAR(f.Discharge_Date) * 100 + MONTH(f.Discharge_Date),
+            f.SK_CommissionerID,
+            f.SK_ProviderID,
+            f.SK_PatientID
+
+        UNION ALL
+
+        SELECT
+            CAST('OP' AS VARCHAR(2)) AS Dataset,
+            YEAR(f.Appointment_Date) * 100 + MONTH(f.Appointment_Date) AS Activity_Month,
+            f.SK_CommissionerID,
+            f.SK_ProviderID,
+            f.SK_PatientID,
+            COUNT_BIG(1) AS Activity_Count
+        FROM [Analytics].[tbl_Fact_OP_Activity] f
+        WHERE f.Appointment_Date >= @MonthStart
+          AND f.Appointment_Date <= @MonthEnd
+        GROUP BY
+            YEAR(f.Appointment_Date) * 100 + MONTH(f.Appointment_Date),
+            f.SK_CommissionerID,
+            f.SK_ProviderID,
+            f.SK_PatientID;
+
+        SELECT
+            pg.Dataset,
+            pg.Activity_Month,
+            pg.SK_CommissionerID,
+            pg.SK_ProviderID,
+            SUM(pg.Activity_Count) AS Activity_Count,
+            COUNT_BIG(1) AS Patient_Count
+        INTO #SketchGrain
+        FROM #PatientGrain pg
+        GROUP BY
+            pg.Dataset,
+            pg.Activity_Month,
+            pg.SK_CommissionerID,
+            pg.SK_ProviderID;
+
+        CREATE UNIQUE CLUSTERED INDEX IX_SketchGrain
+            ON #SketchGrain (Dataset, Activity_Month, SK_CommissionerID, SK_ProviderID);
+
+        -- 2. Register ranks per grain (only registers that were hit)
+        SELECT
+            pg.Dataset,
+            pg.Activity_Month,
+            pg.SK_CommissionerID,
+            pg.SK_ProviderID,
+            r.Register_Index,
+            MAX(r.Register_Value) AS Register_Value
+        INTO #SketchRegisters
+        FROM #PatientGrain pg
+        CROSS APPLY [Analytics].[fn_Patient_Sketch_Register](pg.SK_PatientID) r
+        GROUP BY
+            pg.Dataset,
+            pg.Activity_Month,
+            pg.SK_CommissionerID,
+            pg.SK_ProviderID,
+            r.Register_Index;
+
+        CREATE UNIQUE CLUSTERED INDEX IX_SketchRegisters
+            ON #SketchRegisters (Dataset, Activity_Month, SK_CommissionerID, SK_ProviderID, Register_Index);
+
+        -- Delete + rebuild commit together, so a failure never leaves the window months empty
+        BEGIN TRANSACTION;
+
+        DELETE FROM [Analytics].[tbl_Agg_Patient_Sketch_Monthly]
+        WHERE [Dataset] IN ('IP', 'OP')
+          AND [Activity_Month] >= @FromMonth
+          AND [Activity_Month] <= @ToMonth;
+
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        -- 3. Dense encode: pad the gap before each hit register and after the last one
+        ;WITH OrderedRegisters AS (
+            SELECT
+                sr.Dataset,
+                sr.Activity_Month,
+                sr.SK_CommissionerID,
+                sr.SK_ProviderID,
+                sr.Register_Index,
+                sr.Register_Value,
+                LAG(sr.Register_Index, 1, -1) OVER (
+                    PARTITION BY sr.Dataset, sr.Activity_Month, sr.SK_CommissionerID, sr.SK_ProviderID
+                    ORDER BY sr.Register_Index
+                ) AS Prev_Register_Index
+            FROM #SketchRegisters sr
+        ),
+        EncodedSketch AS (
+            SELECT
+                o.Dataset,
+                o.Activity_Month,
+                o.SK_CommissionerID,
+                o.SK_ProviderID,
+                STRING_AGG(
+                    CAST(
+                        REPLICATE('00', o.Register_Index - o.Prev_Register_Index - 1)
+                        + CONVERT(VARCHAR(2), CAST(o.Register_Value AS BINARY(1)), 2)
+                    AS VARCHAR(MAX)),
+                    ''
+                ) WITHIN GROUP (ORDER BY o.Register_Index) AS Sketch_Hex,
+                MAX(o.Register_Index) AS Last_Register_Index
+            FROM OrderedRegisters o
+            GROUP BY
+                o.Dataset,
+                o.Activity_Month,
+                o.SK_CommissionerID,
+                o.SK_ProviderID
+        )
+        INSERT INTO [Analytics].[tbl_Agg_Patient_Sketch_Monthly] WITH (TABLOCK) (
+            [Dataset],
+            [Activity_Month],
+            [SK_Month_DateID],
+            [SK_CommissionerID],
+            [SK_ProviderID],
+            [Activity_Count],
+            [Patient_Count],
+            [Patient_Sketch],
+            [ETL_LoadDateTime]
+        )
+        SELECT
+            g.Dataset,
+            g.Activity_Month,
+            ISNULL(d.SK_Date, -1) AS SK_Month_DateID,
+            g.SK_CommissionerID,
+            g.SK_ProviderID,
+            CAST(g.Activity_Count AS INT),
+            CAST(g.Patient_Count AS INT),
+            CONVERT(VARBINARY(1024), e.Sketch_Hex + REPLICATE('00', 1023 - e.Last_Register_Index), 2),
+            @ETL_Start
+        FROM #SketchGrain g
+        INNER JOIN EncodedSketch e
+            ON e.Dataset = g.Dataset
+           AND e.Activity_Month = g.Activity_Month
+           AND e.SK_CommissionerID = g.SK_CommissionerID
+           AND e.SK_ProviderID = g.SK_ProviderID
+        LEFT JOIN [Analytics].[vw_Dim_Date] d
+            ON d.FullDate = DATEFROMPARTS(g.Activity_Month / 100, g.Activity_Month % 100, 1);
+
+        SET @RowsInserted = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+
+        PRINT 'Rows Inserted: ' + CAST(@RowsInserted AS VARCHAR(20));
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Agg_Patient_Sketch_Monthly',
+            @LoadType = 'Incremental',
+            @RowsAffected = @RowsInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @RowsInserted,
+            @RowsUpdated = 0,
+            @RowsDeleted = @RowsDeleted,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        IF XACT_STATE() <> 0
+            ROLLBACK TRANSACTION;
+
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Loading Patient Sketches: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Agg_Patient_Sketch_Monthly',
+                @LoadType = 'Incremental',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
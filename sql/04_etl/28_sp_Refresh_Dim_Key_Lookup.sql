@@ -0,0 +1,423 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Refresh_Dim_Key_Lookup]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Refresh_Dim_Key_Lookup];
+GO
+
+/**
+Script Name:   28_sp_Refresh_Dim_Key_Lookup.sql
+Description:   Rebuilds the dimension key lookup cache used by the IP/OP/AE fact loaders.
+Author:        Sridhar Peddi
+Created:       2026-03-20
+
+Notes:
+- Run after dimension loads (final step of 00_Run_All_Dimension_Loads.sql).
+- The IP/OP/AE fact loaders call it with @OnlyIfChanged = 1 before every load, so a
+  dimension loaded outside the orchestrator (run_pipeline.py, an ad-hoc EXEC) never
+  leaves the cache stale. Unchanged lookups are compared, not rewritten.
+- @LookupName = NULL refreshes everything (including dates); otherwise only that lookup
+  ('Date' refreshes tbl_Dim_Date_Key_Lookup).
+- Normalisation here must mirror the *_Key columns built in the fact loaders' #SourceFiltered
+  (VARCHAR(100), the width of Lookup_Code).
+- Serialised with a waiting session applock ('Analytics.Dim_Key_Lookup'), taken after staging.
+  A concurrent caller waits, then finds the cache already refreshed and returns. The
+  'Refresh_Dim_Key_Lookup' ETL batch (fail-fast lock) is started only when something is
+  rewritten, so IP/OP/AE loads can run at the same time.
+Flow (summary):
+1) Stage (Lookup_Name, Lookup_Code, MIN(SK)) from every dimension into #KeyLookup.
+2) Take the refresh lock; @OnlyIfChanged = 1: keep only lookups whose codes/SKs differ from the
+   cache (EXCEPT both ways) and return without a batch when none do.
+3) Replace those lookups in tbl_Dim_Key_Lookup in one transaction.
+4) Same for tbl_Dim_Date_Key_Lookup from vw_Dim_Date.
+
+Change Log:
+  2026-03-20  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    @OnlyIfChanged (fact loaders refresh stale lookups); Lookup_Code widened to VARCHAR(100)
+  2026-03-28  Sridhar Peddi    Unchanged check runs without an ETL batch; waiting session lock serialises rewrites
+**/
+CREATE PROCEDURE [Analytics].[sp_Refresh_Dim_Key_Lookup]
+    @LookupName VARCHAR(40) = NULL,
+    @OnlyIfChanged BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @BatchName VARCHAR(100) = 'Refresh_Dim_Key_Lookup';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
+    DECLARE @DateRowsInserted INT = 0;
+    DECLARE @DateRowsDeleted INT = 0;
+    DECLARE @RefreshDates BIT = CASE WHEN @LookupName IS NULL OR @LookupName = 'Date' THEN 1 ELSE 0 END;
+    DECLARE @LockResult INT;
+    DECLARE @LockHeld BIT = 0;
+    DECLARE @ChangedLookups NVARCHAR(4000);
+    DECLARE @ErrorMessage NVARCHAR(4000);
+
+    BEGIN TRY
+        PRINT 'Refreshing Dim Key Lookup: ' + ISNULL(@LookupName, '(all)');
+
+        IF OBJECT_ID('tempdb..#KeyLookupSource') IS NOT NULL
+            DROP TABLE #KeyLookupSource;
+        IF OBJECT_ID('tempdb..#KeyLookup') IS NOT NULL
+            DROP TABLE #KeyLookup;
+        IF OBJECT_ID('tempdb..#DateLookup') IS NOT NULL
+            DROP TABLE #DateLookup;
+        IF OBJECT_ID('tempdb..#ChangedLookup') IS NOT NULL
+            DROP TABLE #ChangedLookup;
+
+        CREATE TABLE #KeyLookupSource (
+            Lookup_Name VARCHAR(40) COLLATE DATABASE_DEFAULT NOT NULL,
+            Lookup_Code VARCHAR(100) COLLATE DATABASE_DEFAULT NULL,
+            SK_ID INT NULL
+        );
+
+        -- 1. Stage codes from every dimension (normalised the same way as the loaders)
+
+        -- Demographics / organisation
+        INSERT INTO #KeyLookupSource (Lookup_Name, Lookup_Code, SK_ID)
+        SELECT 'Gender', CAST(g.GenderCode AS VARCHAR(100)), CAST(g.SK_GenderID AS INT)
+        FROM [Analytics].[vw_Dim_Gender] g
+        UNION ALL
+        SELECT 'Ethnicity', CAST(e.EthnicityCode AS VARCHAR(100)), CAST(e.SK_EthnicityID AS INT)
+        FROM [Analytics].[vw_Dim_Ethnicity] e
+        UNION ALL
+        SELECT 'Provider', CAST(p.Provider_Code AS VARCHAR(100)), CAST(p.SK_ProviderID AS INT)
+        FROM [Analytics].[vw_Dim_Provider] p
+        UNION ALL
+        SELECT 'LSOA', CAST(l.LSOA_Code AS VARCHAR(100)), CAST(l.SK_LSOA_ID AS INT)
+        FROM [Analytics].[vw_Dim_LSOA] l
+        UNION ALL
+        SELECT 'Commissioner', CAST(c.Commissioner_Code AS VARCHAR(100)), CAST(c.SK_CommissionerID AS INT)
+        FROM [Analytics].[tbl_Dim_Commissioner] c
+        UNION ALL
+        SELECT 'GPPractice', CAST(gp.GPPractice_Code AS VARCHAR(100)), CAST(gp.SK_GPPracticeID AS INT)
+        FROM [Analytics].[tbl_Dim_GPPractice] gp
+        WHERE gp.Is_Current = 1
+        UNION ALL
+        SELECT 'GPPractice_PCN', CAST(gp.GPPractice_Code AS VARCHAR(100)), CAST(pcn.SK_PCNID AS INT)
+        FROM [Analytics].[tbl_Dim_GPPractice] gp
+        INNER JOIN [Analytics].[tbl_Dim_PCN] pcn
+            ON pcn.PCN_Code = gp.PCN_Code
+           AND pcn.Is_Current = 1
+        WHERE gp.Is_Current = 1;
+
+        -- Clinical
+        INSERT INTO #KeyLookupSource (Lookup_Name, Lookup_Code, SK_ID)
+        SELECT 'Specialty', CAST(s.BK_SpecialtyCode AS VARCHAR(100)), CAST(s.SK_SpecialtyID AS INT)
+        FROM [Analytics].[vw_Dim_Specialty] s
+        UNION ALL
+        SELECT 'HRG', CAST(h.HRGCode AS VARCHAR(100)), CAST(h.SK_HRGID AS INT)
+        FROM [Analytics].[vw_Dim_HRG] h
+        UNION ALL
+        -- Backward compatibility: some POD loads use 'APC' for inpatient dataset.
+        SELECT 'POD_IP', UPPER(CAST(pod.POD_Code AS VARCHAR(100))), CAST(pod.SK_PodID AS INT)
+        FROM [Analytics].[tbl_Dim_POD] pod
+        WHERE pod.POD_Dataset IN ('IP', 'APC', 'Unbundled')
+        UNION ALL
+        SELECT 'POD_OP', UPPER(CAST(pod.POD_Code AS VARCHAR(100))), CAST(pod.SK_PodID AS INT)
+        FROM [Analytics].[tbl_Dim_POD] pod
+        WHERE pod.POD_Dataset = 'OP'
+        UNION ALL
+        SELECT 'POD_AE', UPPER(CAST(pod.POD_Code AS VARCHAR(100))), CAST(pod.SK_PodID AS INT)
+        FROM [Analytics].[tbl_Dim_POD] pod
+        WHERE pod.POD_Code = 'AE';
+
+        -- IP codes
+        INSERT INTO #KeyLookupSource (Lookup_Name, Lookup_Code, SK_ID)
+        SELECT 'Admission_Method', CAST(am.Admission_Method_Code AS VARCHAR(100)), CAST(am.SK_AdmissionMethodID AS INT)
+        FROM [Analytics].[vw_Dim_Admission_Method] am
+        UNION ALL
+        SELECT 'Admission_Source', CAST(ads.Admission_Source_Code AS VARCHAR(100)), CAST(ads.SK_AdmissionSourceID AS INT)
+        FROM [Analytics].[vw_Dim_Admission_Source] ads
+        UNION ALL
+        SELECT 'Discharge_Method', CAST(dm.Discharge_Method_Code AS VARCHAR(100)), CAST(dm.SK_DischargeMethodID AS INT)
+        FROM [Analytics].[vw_Dim_Discharge_Method] dm
+        UNION ALL
+        SELECT 'Discharge_Destination', CAST(dd.Discharge_Destination_Code AS VARCHAR(100)), CAST(dd.SK_DischargeDestinationID AS INT)
+        FROM [Analytics].[vw_Dim_Discharge_Destination] dd
+        UNION ALL
+        SELECT 'IP_Patient_Class', CAST(LTRIM(RTRIM(pc.Patient_Classification_Code)) AS VARCHAR(100)), CAST(pc.SK_PatientClassificationID AS INT)
+        FROM [Analytics].[vw_Dim_IP_Patient_Classification] pc
+        UNION ALL
+        SELECT 'IP_Patient_Class_Int', CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(pc.Patient_Classification_Code)), '')) AS VARCHAR(100)), CAST(pc.SK_PatientClassificationID AS INT)
+        FROM [Analytics].[vw_Dim_IP_Patient_Classification] pc;
+
+        -- OP codes
+        INSERT INTO #KeyLookupSource (Lookup_Name, Lookup_Code, SK_ID)
+        SELECT 'Attendance_Outcome_Int', CAST(TRY_CONVERT(INT, ao.Attendance_Outcome_Code) AS VARCHAR(100)), CAST(ao.SK_AttendanceOutcomeID AS INT)
+        FROM [Analytics].[vw_Dim_Attendance_Outcome] ao
+        UNION ALL
+        SELECT 'Attendance_Status', CAST(LTRIM(RTRIM(ast.Attendance_Status_Code)) AS VARCHAR(100)), CAST(ast.SK_AttendanceStatusID AS INT)
+        FROM [Analytics].[vw_Dim_Attendance_Status] ast
+        UNION ALL
+        SELECT 'Attendance_Type_Int', CAST(TRY_CONVERT(INT, att.Attendance_Type_Code) AS VARCHAR(100)), CAST(att.SK_AttendanceTypeID AS INT)
+        FROM [Analytics].[vw_Dim_Attendance_Type] att
+        UNION ALL
+        SELECT 'DNA_Indicator', CAST(LTRIM(RTRIM(dna.DNA_Indicator_Code)) AS VARCHAR(100)), CAST(dna.SK_DNAIndicatorID AS INT)
+        FROM [Analytics].[vw_Dim_DNA_Indicator] dna
+        UNION ALL
+        SELECT 'Priority_Type_Int', CAST(TRY_CONVERT(INT, pt.Priority_Type_Code) AS VARCHAR(100)), CAST(pt.SK_PriorityTypeID AS INT)
+        FROM [Analytics].[vw_Dim_Priority_Type] pt
+        UNION ALL
+        SELECT 'Referral_Source', CAST(LTRIM(RTRIM(rs.Referral_Source_Code)) AS VARCHAR(100)), CAST(rs.SK_ReferralSourceID AS INT)
+        FROM [Analytics].[vw_Dim_Referral_Source] rs
+        UNION ALL
+        SELECT 'Referral_Source_Int', CAST(TRY_CONVERT(INT, NULLIF(LTRIM(RTRIM(rs.Referral_Source_Code)), '')) AS VARCHAR(100)), CAST(rs.SK_ReferralSourceID AS INT)
+        FROM [Analytics].[vw_Dim_Referral_Source] rs;
+
+        -- AE codes
+        INSERT INTO #KeyLookupSource (Lookup_Name, Lookup_Code, SK_ID)
+        SELECT 'Attendance_Disposal', CAST(disp.Attendance_Disposal_Code AS VARCHAR(100)), CAST(disp.SK_AttendanceDisposalID AS INT)
+        FROM [Analytics].[vw_Dim_Attendance_Disposal] disp
+        UNION ALL
+        -- Drives tbl_Fact_AE_Activity.Is_Admitted
+        SELECT 'Attendance_Disposal_Admitted', CAST(disp.Attendance_Disposal_Code AS VARCHAR(100)), CAST(disp.SK_AttendanceDisposalID AS INT)
+        FROM [Analytics].[vw_Dim_Attendance_Disposal] disp
+        WHERE disp.Attendance_Disposal_Description LIKE '%Admitted%';
+
+        SELECT
+            s.Lookup_Name,
+            s.Lookup_Code,
+            MIN(s.SK_ID) AS SK_ID
+        INTO #KeyLookup
+        FROM #KeyLookupSource s
+        WHERE (@LookupName IS NULL OR s.Lookup_Name = @LookupName)
+          AND NULLIF(s.Lookup_Code, '') IS NOT NULL
+          AND s.SK_ID IS NOT NULL
+        GROUP BY
+            s.Lookup_Name,
+            s.Lookup_Code;
+
+        CREATE TABLE #DateLookup (
+            FullDate DATE NOT NULL PRIMARY KEY,
+            SK_Date INT NOT NULL
+        );
+
+        IF @RefreshDates = 1
+        BEGIN
+            INSERT INTO #DateLookup (FullDate, SK_Date)
+            SELECT
+                d.FullDate,
+                MIN(d.SK_Date)
+            FROM [Analytics].[vw_Dim_Date] d
+            WHERE d.FullDate IS NOT NULL
+            GROUP BY d.FullDate;
+        END
+
+        -- Waits (up to 10 minutes) while another session refreshes, then compares against
+        -- what that session wrote, so concurrent fact loads wait or skip rather than fail.
+        EXEC @LockResult = sp_getapplock
+            @Resource = 'Analytics.Dim_Key_Lookup',
+            @LockMode = 'Exclusive',
+            @LockOwner = 'Session',
+            @LockTimeout = 600000;
+
+        IF @LockResult < 0
+            RAISERROR('Could not acquire the Dim_Key_Lookup refresh lock (result %d).', 16, 1, @LockResult);
+
+        SET @LockHeld = 1;
+
+        -- 2. Lookups to replace: all in scope, or only those that differ from the cache
+        CREATE TABLE #ChangedLookup (
+            Lookup_Name VARCHAR(40) COLLATE DATABASE_DEFAULT NOT NULL PRIMARY KEY
+        );
+
+        IF @OnlyIfChanged = 1
+        BEGIN
+            -- New/changed codes, then codes no longer in the dimension
+            INSERT INTO #ChangedLookup (Lookup_Name)
+            SELECT n.Lookup_Name
+            FROM (
+                SELECT Lookup_Name, Lookup_Code, SK_ID FROM #KeyLookup
+                EXCEPT
+                SELECT Lookup_Name, Lookup_Code, SK_ID FROM [Analytics].[tbl_Dim_Key_Lookup]
+            ) n
+            UNION
+            SELECT o.Lookup_Name
+            FROM (
+                SELECT Lookup_Name, Lookup_Code, SK_ID FROM [Analytics].[tbl_Dim_Key_Lookup]
+                WHERE @LookupName IS NULL OR Lookup_Name = @LookupName
+                EXCEPT
+                SELECT Lookup_Name, Lookup_Code, SK_ID FROM #KeyLookup
+            ) o;
+        END
+        ELSE
+        BEGIN
+            INSERT INTO #ChangedLookup (Lookup_Name)
+            SELECT Lookup_Name FROM #KeyLookup
+            UNION
+            SELECT Lookup_Name FROM [Analytics].[tbl_Dim_Key_Lookup]
+            WHERE @LookupName IS NULL OR Lookup_Name = @LookupName;
+        END
+
+        IF @OnlyIfChanged = 1
+           AND @RefreshDates = 1
+           AND NOT EXISTS (
+                SELECT FullDate, SK_Date FROM #DateLookup
+                EXCEPT
+                SELECT FullDate, SK_Date FROM [Analytics].[tbl_Dim_Date_Key_Lookup]
+           )
+           AND NOT EXISTS (
+                SELECT FullDate, SK_Date FROM [Analytics].[tbl_Dim_Date_Key_Lookup]
+                EXCEPT
+                SELECT FullDate, SK_Date FROM #DateLookup
+           )
+        BEGIN
+            SET @RefreshDates = 0;
+        END
+
+        -- Nothing changed: no batch, no rewrite
+        IF @OnlyIfChanged = 1
+           AND @RefreshDates = 0
+           AND NOT EXISTS (SELECT 1 FROM #ChangedLookup)
+        BEGIN
+            EXEC sp_releaseapplock
+                @Resource = 'Analytics.Dim_Key_Lookup',
+                @LockOwner = 'Session';
+            SET @LockHeld = 0;
+
+            PRINT 'Dim key lookups unchanged; nothing to refresh';
+            RETURN;
+        END
+
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        SELECT @ChangedLookups = STRING_AGG(CAST(Lookup_Name AS NVARCHAR(MAX)), ', ')
+            WITHIN GROUP (ORDER BY Lookup_Name)
+        FROM #ChangedLookup;
+
+        PRINT 'Lookups to refresh: ' + ISNULL(@ChangedLookups, '(none)')
+            + CASE WHEN @RefreshDates = 1 THEN ' + Date' ELSE '' END;
+
+        BEGIN TRANSACTION;
+
+        -- 3. Replace the affected lookups
+        DELETE k
+        FROM [Analytics].[tbl_Dim_Key_Lookup] k
+        INNER JOIN #ChangedLookup c
+            ON c.Lookup_Name = k.Lookup_Name;
+
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_Dim_Key_Lookup] WITH (TABLOCK) (
+            Lookup_Name,
+            Lookup_Code,
+            SK_ID,
+            Refreshed_DateTime
+        )
+        SELECT
+            k.Lookup_Name,
+            k.Lookup_Code,
+            k.SK_ID,
+            @ETL_Start
+        FROM #KeyLookup k
+        INNER JOIN #ChangedLookup c
+            ON c.Lookup_Name = k.Lookup_Name;
+
+        SET @RowsInserted = @@ROWCOUNT;
+
+        -- 4. Date lookup
+        IF @RefreshDates = 1
+        BEGIN
+            DELETE FROM [Analytics].[tbl_Dim_Date_Key_Lookup];
+            SET @DateRowsDeleted = @@ROWCOUNT;
+
+            INSERT INTO [Analytics].[tbl_Dim_Date_Key_Lookup] WITH (TABLOCK) (
+                FullDate,
+                SK_Date
+            )
+            SELECT
+                d.FullDate,
+                d.SK_Date
+            FROM #DateLookup d;
+
+            SET @DateRowsInserted = @@ROWCOUNT;
+        END
+
+        COMMIT TRANSACTION;
+
+        PRINT 'Key lookup rows: ' + CAST(@RowsInserted AS VARCHAR(20))
+            + ' (date rows: ' + CAST(@DateRowsInserted AS VARCHAR(20)) + ')';
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Dim_Key_Lookup',
+            @LoadType = 'Full',
+            @RowsAffected = @RowsInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        IF @RefreshDates = 1
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Dim_Date_Key_Lookup',
+                @LoadType = 'Full',
+                @RowsAffected = @DateRowsInserted,
+                @Status = 'Success',
+                @StartDateTime = @ETL_Start;
+        END
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @RowsInserted,
+            @RowsUpdated = 0,
+            @RowsDeleted = @RowsDeleted,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+
+        EXEC sp_releaseapplock
+            @Resource = 'Analytics.Dim_Key_Lookup',
+            @LockOwner = 'Session';
+        SET @LockHeld = 0;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        IF @LockHeld = 1
+            EXEC sp_releaseapplock
+                @Resource = 'Analytics.Dim_Key_Lookup',
+                @LockOwner = 'Session';
+
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Refreshing Dim Key Lookup: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Dim_Key_Lookup',
+                @LoadType = 'Full',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Refresh_Dim_Key_Lookup]';
+GO
@@ -0,0 +1,330 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Extract_Fact_Source_Window]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Extract_Fact_Source_Window];
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Clear_Fact_Source_Window]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Clear_Fact_Source_Window];
+GO
+
+-- Replaced by fn_Src_*_Encounter(@UseWorkSource); the synonyms are no longer re-pointed.
+IF OBJECT_ID('[Analytics].[sp_Set_Fact_Source_Mode]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Set_Fact_Source_Mode];
+GO
+
+/**
+Script Name:   29_sp_Extract_Fact_Source_Window.sql
+Description:   Extracts the Unified IP/OP/ED encounter rows for a window into indexed
+               work tables, read once per orchestrated run.
+Author:        Sridhar Peddi
+Created:       2026-03-23
+
+Notes:
+- Work tables ([Analytics].[tbl_Work_IP_Source], _OP_, _ED_) are permanent (00_setup/15) and
+  are truncated and refilled here. If the Unified columns change, the work table is rebuilt
+  from the synonym and its fn_Src_*_Encounter function refreshed.
+- Window columns: End_Date_Hospital_Provider_Spell (IP), Appointment_Date (OP), Arrival_Date (ED).
+- Caller must pass a window covering every consumer (fact window + financial year for precompute).
+- Caller must hold the session applock 'Analytics.Fact_Source_Window' (Exclusive) for the whole
+  run, so a second run cannot truncate the work tables under the first.
+- Consumers read the window through [Analytics].[fn_Src_*_Encounter](@UseWorkSource = 1); the
+  [Analytics].[syn_Src_*_Encounter] synonyms are never re-pointed, so other sessions keep
+  reading all of Unified.
+Flow (summary):
+1) Check the caller holds the applock.
+2) Per work table: rebuild if the Unified columns changed, truncate, insert the window
+   (one scan per Unified table).
+3) Log row counts per work table.
+
+Change Log:
+  2026-03-23  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Permanent work tables + applock; replaces synonym re-pointing
+**/
+CREATE PROCEDURE [Analytics].[sp_Extract_Fact_Source_Window]
+    @FromDate DATE,
+    @ToDate DATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @StepStart DATETIME2;
+    DECLARE @BatchName VARCHAR(100) = 'Extract_Fact_Source_Window';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @RowsIP INT = 0;
+    DECLARE @RowsOP INT = 0;
+    DECLARE @RowsED INT = 0;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+
+    IF @FromDate IS NULL OR @ToDate IS NULL
+    BEGIN
+        RAISERROR('Parameters @FromDate and @ToDate are required.', 16, 1);
+        RETURN;
+    END
+
+    IF @ToDate < @FromDate
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
+
+    IF ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('Caller must hold the session applock ''Analytics.Fact_Source_Window'' (see sp_Run_Fact_Loads_With_Enrichment).', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        PRINT 'Extracting fact source window: ' + CONVERT(VARCHAR(10), @FromDate, 120)
+            + ' to ' + CONVERT(VARCHAR(10), @ToDate, 120);
+
+        -- 1. IP
+        SET @StepStart = SYSDATETIME();
+
+        IF EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_IP_Encounter]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_IP_Source]', NULL, 0)
+           )
+           OR EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_IP_Source]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_IP_Encounter]', NULL, 0)
+           )
+        BEGIN
+            PRINT 'Unified IP columns changed - rebuilding [Analytics].[tbl_Work_IP_Source]';
+
+            IF OBJECT_ID('[Analytics].[tbl_Work_IP_Source]', 'U') IS NOT NULL
+                DROP TABLE [Analytics].[tbl_Work_IP_Source];
+
+            SELECT TOP (0) src.*
+            INTO [Analytics].[tbl_Work_IP_Source]
+            FROM [Analytics].[syn_Src_IP_Encounter] src
+            LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+            CREATE CLUSTERED INDEX IX_Work_IP_Source_Encounter
+                ON [Analytics].[tbl_Work_IP_Source] (SK_EncounterID);
+            CREATE NONCLUSTERED INDEX IX_Work_IP_Source_Date
+                ON [Analytics].[tbl_Work_IP_Source] (End_Date_Hospital_Provider_Spell);
+
+            EXEC sys.sp_refreshsqlmodule N'[Analytics].[fn_Src_IP_Encounter]';
+        END
+
+        TRUNCATE TABLE [Analytics].[tbl_Work_IP_Source];
+
+        INSERT INTO [Analytics].[tbl_Work_IP_Source] WITH (TABLOCK)
+        SELECT src.*
+        FROM [Analytics].[syn_Src_IP_Encounter] src
+        WHERE src.End_Date_Hospital_Provider_Spell >= @FromDate
+          AND src.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDate);
+
+        SET @RowsIP = @@ROWCOUNT;
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Work_IP_Source',
+            @LoadType = 'Full',
+            @RowsAffected = @RowsIP,
+            @Status = 'Success',
+            @StartDateTime = @StepStart;
+
+        -- 2. OP
+        SET @StepStart = SYSDATETIME();
+
+        IF EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_OP_Encounter]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_OP_Source]', NULL, 0)
+           )
+           OR EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_OP_Source]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_OP_Encounter]', NULL, 0)
+           )
+        BEGIN
+            PRINT 'Unified OP columns changed - rebuilding [Analytics].[tbl_Work_OP_Source]';
+
+            IF OBJECT_ID('[Analytics].[tbl_Work_OP_Source]', 'U') IS NOT NULL
+                DROP TABLE [Analytics].[tbl_Work_OP_Source];
+
+            SELECT TOP (0) src.*
+            INTO [Analytics].[tbl_Work_OP_Source]
+            FROM [Analytics].[syn_Src_OP_Encounter] src
+            LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+            CREATE CLUSTERED INDEX IX_Work_OP_Source_Encounter
+                ON [Analytics].[tbl_Work_OP_Source] (SK_EncounterID);
+            CREATE NONCLUSTERED INDEX IX_Work_OP_Source_Date
+                ON [Analytics].[tbl_Work_OP_Source] (Appointment_Date);
+
+            EXEC sys.sp_refreshsqlmodule N'[Analytics].[fn_Src_OP_Encounter]';
+        END
+
+        TRUNCATE TABLE [Analytics].[tbl_Work_OP_Source];
+
+        INSERT INTO [Analytics].[tbl_Work_OP_Source] WITH (TABLOCK)
+        SELECT src.*
+        FROM [Analytics].[syn_Src_OP_Encounter] src
+        WHERE src.Appointment_Date >= @FromDate
+          AND src.Appointment_Date < DATEADD(DAY, 1, @ToDate);
+
+        SET @RowsOP = @@ROWCOUNT;
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Work_OP_Source',
+            @LoadType = 'Full',
+            @RowsAffected = @RowsOP,
+            @Status = 'Success',
+            @StartDateTime = @StepStart;
+
+        -- 3. ED (OpPlan ED measures; AE fact when enabled)
+        SET @StepStart = SYSDATETIME();
+
+        IF EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_ED_Encounter]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_ED_Source]', NULL, 0)
+           )
+           OR EXISTS (
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[tbl_Work_ED_Source]', NULL, 0)
+               EXCEPT
+               SELECT column_ordinal, name, system_type_name
+               FROM sys.dm_exec_describe_first_result_set(N'SELECT * FROM [Analytics].[syn_Src_ED_Encounter]', NULL, 0)
+           )
+        BEGIN
+            PRINT 'Unified ED columns changed - rebuilding [Analytics].[tbl_Work_ED_Source]';
+
+            IF OBJECT_ID('[Analytics].[tbl_Work_ED_Source]', 'U') IS NOT NULL
+                DROP TABLE [Analytics].[tbl_Work_ED_Source];
+
+            SELECT TOP (0) src.*
+            INTO [Analytics].[tbl_Work_ED_Source]
+            FROM [Analytics].[syn_Src_ED_Encounter] src
+            LEFT JOIN (SELECT 1 AS No_Identity) ni ON 1 = 0;
+
+            CREATE CLUSTERED INDEX IX_Work_ED_Source_Encounter
+                ON [Analytics].[tbl_Work_ED_Source] (SK_EncounterID);
+            CREATE NONCLUSTERED INDEX IX_Work_ED_Source_Date
+                ON [Analytics].[tbl_Work_ED_Source] (Arrival_Date);
+
+            EXEC sys.sp_refreshsqlmodule N'[Analytics].[fn_Src_ED_Encounter]';
+        END
+
+        TRUNCATE TABLE [Analytics].[tbl_Work_ED_Source];
+
+        INSERT INTO [Analytics].[tbl_Work_ED_Source] WITH (TABLOCK)
+        SELECT src.*
+        FROM [Analytics].[syn_Src_ED_Encounter] src
+        WHERE src.Arrival_Date >= @FromDate
+          AND src.Arrival_Date < DATEADD(DAY, 1, @ToDate);
+
+        SET @RowsED = @@ROWCOUNT;
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Work_ED_Source',
+            @LoadType = 'Full',
+            @RowsAffected = @RowsED,
+            @Status = 'Success',
+            @StartDateTime = @StepStart;
+
+        PRINT 'Rows extracted - IP: ' + CAST(@RowsIP AS VARCHAR(20))
+            + ', OP: ' + CAST(@RowsOP AS VARCHAR(20))
+            + ', ED: ' + CAST(@RowsED AS VARCHAR(20));
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @RowsIP + @RowsOP + @RowsED,
+            @RowsUpdated = 0,
+            @RowsDeleted = 0,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Extracting Fact Source Window: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Work_*_Source',
+                @LoadType = 'Full',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+/**
+Script Name:   29_sp_Extract_Fact_Source_Window.sql
+Description:   Empties the fact source work tables at the end of an orchestrated run.
+Author:        Sridhar Peddi
+Created:       2026-03-28
+
+Notes:
+- Tables are truncated, not dropped, so fn_Src_*_Encounter stays bound to them.
+- Caller must hold the 'Analytics.Fact_Source_Window' applock, as for the extract.
+**/
+CREATE PROCEDURE [Analytics].[sp_Clear_Fact_Source_Window]
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('Caller must hold the session applock ''Analytics.Fact_Source_Window'' (see sp_Run_Fact_Loads_With_Enrichment).', 16, 1);
+        RETURN;
+    END
+
+    IF OBJECT_ID('[Analytics].[tbl_Work_IP_Source]', 'U') IS NOT NULL
+        TRUNCATE TABLE [Analytics].[tbl_Work_IP_Source];
+    IF OBJECT_ID('[Analytics].[tbl_Work_OP_Source]', 'U') IS NOT NULL
+        TRUNCATE TABLE [Analytics].[tbl_Work_OP_Source];
+    IF OBJECT_ID('[Analytics].[tbl_Work_ED_Source]', 'U') IS NOT NULL
+        TRUNCATE TABLE [Analytics].[tbl_Work_ED_Source];
+
+    PRINT 'Fact source work tables cleared';
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Extract_Fact_Source_Window]';
+PRINT '[OK] Created procedure: [Analytics].[sp_Clear_Fact_Source_Window]';
+GO
@@ -0,0 +1,185 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Compile_CF_Segment_Rule_ICD10]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Compile_CF_Segment_Rule_ICD10];
+GO
+
+/**
+Script Name:   30_sp_Compile_CF_Segment_Rule_ICD10.sql
+Description:   Compiles active CF ICD10 LIKE rules into tbl_Ref_CF_Segment_Rule_ICD10_Prefix
+               (Exact / Prefix / Like) for equi-join matching in the CF loaders.
+Author:        Sridhar Peddi
+Created:       2026-03-25
+
+Notes:
+- No-op when the compiled table already matches the active rules (SHA2_256 hash of the rules
+  in Rule_ID order + row count); CF loaders call it on every run, so rule edits are picked up
+  automatically.
+- @Force = 1 recompiles regardless.
+- Pattern text is not altered (case/normalisation as stored), so compiled matching is
+  identical to LIKE. Validate with scripts/validate_cf_rule_prefix_index.py.
+Flow (summary):
+1) Hash active rules; return if compiled rows carry the same hash and count.
+2) Classify each pattern: no wildcard -> Exact; literal + trailing '%' only -> Prefix; else Like.
+3) Replace tbl_Ref_CF_Segment_Rule_ICD10_Prefix in one transaction.
+
+Change Log:
+  2026-03-25  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    SHA2_256 rules hash instead of CHECKSUM_AGG (XOR-based, collides)
+**/
+CREATE PROCEDURE [Analytics].[sp_Compile_CF_Segment_Rule_ICD10]
+    @Force BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @BatchName VARCHAR(100) = 'Compile_CF_Segment_Rule_ICD10';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @RulesHash BINARY(32);
+    DECLARE @RuleCount INT;
+    DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+
+    -- Every rule field the compile uses, '|'-separated, one line per rule in Rule_ID order
+    SELECT
+        @RulesHash = HASHBYTES('SHA2_256', ISNULL(STRING_AGG(CAST(CONCAT(
+            r.Rule_ID, '|', r.Segment_Score, '|', r.ICD10_Like, '|',
+            r.Is_Primary_Only, '|', ISNULL(CAST(r.Lookback_Months AS VARCHAR(11)), 'NULL')
+        ) AS NVARCHAR(MAX)), NCHAR(10)) WITHIN GROUP (ORDER BY r.Rule_ID), N'')),
+        @RuleCount = COUNT(*)
+    FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
+    WHERE r.Is_Active = 1;
+
+    IF @Force = 0
+       AND (SELECT COUNT(*) FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]) = @RuleCount
+       AND NOT EXISTS (
+            SELECT 1
+            FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix]
+            WHERE Rules_Hash <> @RulesHash
+       )
+    BEGIN
+        PRINT '[INFO] CF rule prefix index is current (' + CAST(@RuleCount AS VARCHAR(20)) + ' rules).';
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        BEGIN TRANSACTION;
+
+        DELETE FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix];
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] (
+            [Prefix_Length],
+            [Code_Prefix],
+            [Rule_ID],
+            [Match_Type],
+            [Segment_Score],
+            [Is_Primary_Only],
+            [Lookback_Months],
+            [Rules_Hash]
+        )
+        SELECT
+            CASE c.Match_Type
+                WHEN 'Prefix' THEN p.Pct_Pos - 1
+                ELSE LEN(r.ICD10_Like)
+            END AS Prefix_Length,
+            CASE c.Match_Type
+                WHEN 'Prefix' THEN LEFT(r.ICD10_Like, p.Pct_Pos - 1)
+                ELSE r.ICD10_Like
+            END AS Code_Prefix,
+            r.Rule_ID,
+            c.Match_Type,
+            r.Segment_Score,
+            r.Is_Primary_Only,
+            r.Lookback_Months,
+            @RulesHash
+        FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10] r
+        CROSS APPLY (
+            SELECT
+                CHARINDEX('%', r.ICD10_Like) AS Pct_Pos,
+                CASE
+                    WHEN CHARINDEX('_', r.ICD10_Like) > 0 OR CHARINDEX('[', r.ICD10_Like) > 0 THEN 1
+                    ELSE 0
+                END AS Has_Other_Wildcard
+        ) p
+        CROSS APPLY (
+            SELECT CAST(CASE
+                WHEN p.Has_Other_Wildcard = 0 AND p.Pct_Pos = 0 THEN 'Exact'
+                WHEN p.Has_Other_Wildcard = 0
+                     AND REPLACE(SUBSTRING(r.ICD10_Like, p.Pct_Pos, 20), '%', '') = '' THEN 'Prefix'
+                ELSE 'Like'
+            END AS VARCHAR(10)) AS Match_Type
+        ) c
+        WHERE r.Is_Active = 1;
+
+        SET @RowsInserted = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+
+        PRINT '[OK] Compiled CF rule prefix index: ' + CAST(@RowsInserted AS VARCHAR(20)) + ' rules ('
+            + CAST((SELECT COUNT(*) FROM [Analytics].[tbl_Ref_CF_Segment_Rule_ICD10_Prefix] WHERE Match_Type = 'Like') AS VARCHAR(20))
+            + ' LIKE fallback)';
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Ref_CF_Segment_Rule_ICD10_Prefix',
+            @LoadType = 'Full',
+            @RowsAffected = @RowsInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @RowsInserted,
+            @RowsUpdated = 0,
+            @RowsDeleted = @RowsDeleted,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Compiling CF Segment Rules: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Ref_CF_Segment_Rule_ICD10_Prefix',
+                @LoadType = 'Full',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Compile_CF_Segment_Rule_ICD10]';
+GO
@@ -0,0 +1,407 @@
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Load_Bridge_Encounter_Codes]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Load_Bridge_Encounter_Codes];
+GO
+
+/**
+Script Name:   31_sp_Load_Bridge_Encounter_Codes.sql
+Description:   Loads tbl_Bridge_Encounter_Diagnosis and tbl_Bridge_Encounter_Procedure for a
+               load window: unpivots the wide IP/OP diagnosis/procedure columns once, with
+               cleaned codes and slot position.
+Author:        Sridhar Peddi
+Created:       2026-03-26
+
+Notes:
+- Window follows the fact loaders: IP on End_Date_Hospital_Provider_Spell, OP on Appointment_Date;
+  default = 6 months to the SUS published cut-off.
+- Open IP spells (no discharge yet) are kept, dated by Start_Date_Hospital_Provider_Spell
+  (Activity_Date = ISNULL(End, Start)), so CF segmentation counts them as it did before the bridge.
+  When such a spell closes its rows move to the discharge month; for window spells that started
+  before the window, the rows dated at their Start_Date are removed first (only those months'
+  partitions are touched).
+- Reads via [Analytics].[fn_Src_*_Encounter](@UseWorkSource); the orchestrator passes 1 to reuse
+  its single-pass extract.
+- Codes cleaned as UPPER(REPLACE(REPLACE(code, '.', ''), ' ', '')); blank slots are not stored.
+- One row per SK_EncounterID per dataset (latest spell / appointment wins, as the facts dedupe).
+- Procedures: only Primary_Procedure_Code is available in Unified today (position 1).
+- sp_Load_Bridge_CF_Segment_Patient_Snapshot reads diagnoses from this bridge and fails if any
+  IP/OP month of its lookback up to the SUS published cutoff is missing; backfill the full CF lookback (24 months before the earliest snapshot)
+  before their first run (post-deploy step 7 / docs/00_RUNBOOK.md). The nightly window then keeps
+  it current.
+Flow (summary):
+1) Resolve window; stage deduped IP/OP encounters in the window.
+2) Delete bridge rows for the window (partition-aligned Activity_Date filter), and the start-month
+   rows of spells that were open at the last load and have since closed (#Moved).
+3) Insert unpivoted diagnoses (positions 1-13) and primary procedures.
+
+Change Log:
+  2026-03-26  Sridhar Peddi    Initial creation
+  2026-03-28  Sridhar Peddi    Read source via fn_Src_*_Encounter(@UseWorkSource)
+  2026-03-28  Sridhar Peddi    Keep open IP spells (Activity_Date = ISNULL(End, Start)); remove moved encounters
+  2026-03-28  Sridhar Peddi    Moved-spell delete limited to discharged spells' start months (no all-partition probe)
+**/
+CREATE PROCEDURE [Analytics].[sp_Load_Bridge_Encounter_Codes]
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL,
+    @UseWorkSource BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @BatchName VARCHAR(100) = 'Bridge_Encounter_Codes';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @ToDateActual DATE = ISNULL(@ToDate, [Analytics].[fn_SUS_Published_Cutoff_Date](NULL));
+    DECLARE @FromDateActual DATE;
+    DECLARE @ToDateExclusive DATE;
+    DECLARE @DiagInserted INT = 0;
+    DECLARE @DiagDeleted INT = 0;
+    DECLARE @ProcInserted INT = 0;
+    DECLARE @ProcDeleted INT = 0;
+    DECLARE @MovedFrom DATE;
+    DECLARE @MovedTo DATE;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+
+    SET @ToDateActual = ISNULL(@ToDateActual, CAST(GETDATE() AS DATE));
+    SET @FromDateActual = ISNULL(
+        @FromDate,
+        DATEADD(MONTH, -5, DATEFROMPARTS(YEAR(@ToDateActual), MONTH(@ToDateActual), 1))
+    );
+    SET @ToDateExclusive = DATEADD(DAY, 1, @ToDateActual);
+
+    IF @ToDateActual < @FromDateActual
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT;
+
+        PRINT 'Starting Load: [Analytics].[tbl_Bridge_Encounter_Diagnosis] / [tbl_Bridge_Encounter_Procedure]';
+        PRINT 'Load window: ' + CONVERT(VARCHAR(10), @FromDateActual, 120)
+            + ' to ' + CONVERT(VARCHAR(10), @ToDateActual, 120);
+
+        -- 1. Stage window encounters (one row per encounter per dataset)
+        IF OBJECT_ID('tempdb..#Enc') IS NOT NULL DROP TABLE #Enc;
+
+        CREATE TABLE #Enc (
+            SK_EncounterID BIGINT NOT NULL,
+            Dataset VARCHAR(2) NOT NULL,
+            SK_PatientID BIGINT NULL,
+            Activity_Date DATE NOT NULL,
+            Start_Date DATE NULL,
+            Procedure_Date DATE NULL,
+            Primary_Procedure_Code VARCHAR(20) NULL,
+            Primary_Diagnosis_Code VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_1 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_2 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_3 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_4 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_5 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_6 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_7 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_8 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_9 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_10 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_11 VARCHAR(20) NULL,
+            Secondary_Diagnosis_Code_12 VARCHAR(20) NULL
+        );
+
+        INSERT INTO #Enc
+        SELECT
+            s.SK_EncounterID, 'IP', s.SK_PatientID, s.Activity_Date, s.Start_Date, NULL,
+            s.Primary_Procedure_Code, s.Primary_Diagnosis_Code,
+            s.Secondary_Diagnosis_Code_1, s.Secondary_Diagnosis_Code_2, s.Secondary_Diagnosis_Code_3,
+            s.Secondary_Diagnosis_Code_4, s.Secondary_Diagnosis_Code_5, s.Secondary_Diagnosis_Code_6,
+            s.Secondary_Diagnosis_Code_7, s.Secondary_Diagnosis_Code_8, s.Secondary_Diagnosis_Code_9,
+            s.Secondary_Diagnosis_Code_10, s.Secondary_Diagnosis_Code_11, s.Secondary_Diagnosis_Code_12
+        FROM (
+            SELECT
+                v.SK_EncounterID,
+                v.SK_PatientID,
+                CAST(ISNULL(v.End_Date_Hospital_Provider_Spell, v.Start_Date_Hospital_Provider_Spell) AS DATE) AS Activity_Date,
+                CAST(v.Start_Date_Hospital_Provider_Spell AS DATE) AS Start_Date,
+                CAST(v.Primary_Procedure_Code AS VARCHAR(20)) AS Primary_Procedure_Code,
+                CAST(v.Primary_Diagnosis_Code AS VARCHAR(20)) AS Primary_Diagnosis_Code,
+                CAST(v.Secondary_Diagnosis_Code_1 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_1,
+                CAST(v.Secondary_Diagnosis_Code_2 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_2,
+                CAST(v.Secondary_Diagnosis_Code_3 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_3,
+                CAST(v.Secondary_Diagnosis_Code_4 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_4,
+                CAST(v.Secondary_Diagnosis_Code_5 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_5,
+                CAST(v.Secondary_Diagnosis_Code_6 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_6,
+                CAST(v.Secondary_Diagnosis_Code_7 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_7,
+                CAST(v.Secondary_Diagnosis_Code_8 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_8,
+                CAST(v.Secondary_Diagnosis_Code_9 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_9,
+                CAST(v.Secondary_Diagnosis_Code_10 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_10,
+                CAST(v.Secondary_Diagnosis_Code_11 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_11,
+                CAST(v.Secondary_Diagnosis_Code_12 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_12,
+                ROW_NUMBER() OVER (
+                    PARTITION BY v.SK_EncounterID
+                    ORDER BY v.End_Date_Hospital_Provider_Spell DESC, v.Start_Date_Hospital_Provider_Spell DESC
+                ) AS RowNum
+            FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) v
+            WHERE ((v.End_Date_Hospital_Provider_Spell >= @FromDateActual
+                    AND v.End_Date_Hospital_Provider_Spell < @ToDateExclusive)
+                   OR (v.End_Date_Hospital_Provider_Spell IS NULL
+                       AND v.Start_Date_Hospital_Provider_Spell >= @FromDateActual
+                       AND v.Start_Date_Hospital_Provider_Spell < @ToDateExclusive))
+              AND v.SK_EncounterID IS NOT NULL
+        ) s
+        WHERE s.RowNum = 1;
+
+        INSERT INTO #Enc
+        SELECT
+            s.SK_EncounterID, 'OP', s.SK_PatientID, s.Activity_Date, s.Activity_Date, s.Procedure_Date,
+            s.Primary_Procedure_Code, s.Primary_Diagnosis_Code,
+            s.Secondary_Diagnosis_Code_1, s.Secondary_Diagnosis_Code_2, s.Secondary_Diagnosis_Code_3,
+            s.Secondary_Diagnosis_Code_4, s.Secondary_Diagnosis_Code_5, s.Secondary_Diagnosis_Code_6,
+            s.Secondary_Diagnosis_Code_7, s.Secondary_Diagnosis_Code_8, s.Secondary_Diagnosis_Code_9,
+            s.Secondary_Diagnosis_Code_10, s.Secondary_Diagnosis_Code_11, s.Secondary_Diagnosis_Code_12
+        FROM (
+            SELECT
+                v.SK_EncounterID,
+                v.SK_PatientID,
+                CAST(v.Appointment_Date AS DATE) AS Activity_Date,
+                TRY_CAST(v.Primary_Procedure_Date AS DATE) AS Procedure_Date,
+                CAST(v.Primary_Procedure_Code AS VARCHAR(20)) AS Primary_Procedure_Code,
+                CAST(v.Primary_Diagnosis_Code AS VARCHAR(20)) AS Primary_Diagnosis_Code,
+                CAST(v.Secondary_Diagnosis_Code_1 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_1,
+                CAST(v.Secondary_Diagnosis_Code_2 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_2,
+                CAST(v.Secondary_Diagnosis_Code_3 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_3,
+                CAST(v.Secondary_Diagnosis_Code_4 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_4,
+                CAST(v.Secondary_Diagnosis_Code_5 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_5,
+                CAST(v.Secondary_Diagnosis_Code_6 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_6,
+                CAST(v.Secondary_Diagnosis_Code_7 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_7,
+                CAST(v.Secondary_Diagnosis_Code_8 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_8,
+                CAST(v.Secondary_Diagnosis_Code_9 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_9,
+                CAST(v.Secondary_Diagnosis_Code_10 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_10,
+                CAST(v.Secondary_Diagnosis_Code_11 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_11,
+                CAST(v.Secondary_Diagnosis_Code_12 AS VARCHAR(20)) AS Secondary_Diagnosis_Code_12,
+                ROW_NUMBER() OVER (
+                    PARTITION BY v.SK_EncounterID
+                    ORDER BY v.Appointment_Date DESC, v.Referral_Request_Received_Date DESC
+                ) AS RowNum
+            FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) v
+            WHERE v.Appointment_Date >= @FromDateActual
+              AND v.Appointment_Date < @ToDateExclusive
+              AND v.SK_EncounterID IS NOT NULL
+        ) s
+        WHERE s.RowNum = 1;
+
+        CREATE UNIQUE CLUSTERED INDEX IX_Enc ON #Enc (Dataset, SK_EncounterID);
+
+        -- Closed IP spells that started before the window: while open they were dated by
+        -- Start_Date, so any earlier rows sit in the start month. Only these can be in another
+        -- month (OP is always dated by Appointment_Date).
+        IF OBJECT_ID('tempdb..#Moved') IS NOT NULL DROP TABLE #Moved;
+
+        SELECT e.SK_EncounterID, e.Dataset, e.Start_Date AS Prior_Activity_Date
+        INTO #Moved
+        FROM #Enc e
+        WHERE e.Dataset = 'IP'
+          AND e.Start_Date < @FromDateActual
+          AND e.Activity_Date >= @FromDateActual;
+
+        SELECT
+            @MovedFrom = MIN(Prior_Activity_Date),
+            @MovedTo = MAX(Prior_Activity_Date)
+        FROM #Moved;
+
+        BEGIN TRANSACTION;
+
+        -- 2. Clear the window (Activity_Date predicate eliminates partitions)
+        DELETE FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis]
+        WHERE Activity_Date >= @FromDateActual
+          AND Activity_Date < @ToDateExclusive;
+        SET @DiagDeleted = @@ROWCOUNT;
+
+        DELETE FROM [Analytics].[tbl_Bridge_Encounter_Procedure]
+        WHERE Activity_Date >= @FromDateActual
+          AND Activity_Date < @ToDateExclusive;
+        SET @ProcDeleted = @@ROWCOUNT;
+
+        -- Open spells since discharged: remove their rows from the start month. The
+        -- @MovedFrom/@MovedTo range limits the delete to those months' partitions.
+        IF @MovedFrom IS NOT NULL
+        BEGIN
+            DELETE b
+            FROM [Analytics].[tbl_Bridge_Encounter_Diagnosis] b
+            INNER JOIN #Moved m
+                ON m.SK_EncounterID = b.SK_EncounterID
+               AND m.Dataset = b.Dataset
+               AND m.Prior_Activity_Date = b.Activity_Date
+            WHERE b.Activity_Date >= @MovedFrom
+              AND b.Activity_Date <= @MovedTo;
+            SET @DiagDeleted = @DiagDeleted + @@ROWCOUNT;
+
+            DELETE b
+            FROM [Analytics].[tbl_Bridge_Encounter_Procedure] b
+            INNER JOIN #Moved m
+                ON m.SK_EncounterID = b.SK_EncounterID
+               AND m.Dataset = b.Dataset
+               AND m.Prior_Activity_Date = b.Activity_Date
+            WHERE b.Activity_Date >= @MovedFrom
+              AND b.Activity_Date <= @MovedTo;
+            SET @ProcDeleted = @ProcDeleted + @@ROWCOUNT;
+        END
+
+        -- 3. Insert unpivoted codes
+        INSERT INTO [Analytics].[tbl_Bridge_Encounter_Diagnosis] (
+            [SK_EncounterID],
+            [Dataset],
+            [Diagnosis_Position],
+            [Diagnosis_Code],
+            [Is_Primary_Diagnosis],
+            [SK_PatientID],
+            [Activity_Date],
+            [Start_Date],
+            [ETL_BatchID]
+        )
+        SELECT
+            e.SK_EncounterID,
+            e.Dataset,
+            d.Diagnosis_Position,
+            c.Diagnosis_Code,
+            CASE WHEN d.Diagnosis_Position = 1 THEN 1 ELSE 0 END,
+            e.SK_PatientID,
+            e.Activity_Date,
+            e.Start_Date,
+            @BatchID
+        FROM #Enc e
+        CROSS APPLY (VALUES
+            (CAST(1 AS TINYINT), e.Primary_Diagnosis_Code),
+            (CAST(2 AS TINYINT), e.Secondary_Diagnosis_Code_1),
+            (CAST(3 AS TINYINT), e.Secondary_Diagnosis_Code_2),
+            (CAST(4 AS TINYINT), e.Secondary_Diagnosis_Code_3),
+            (CAST(5 AS TINYINT), e.Secondary_Diagnosis_Code_4),
+            (CAST(6 AS TINYINT), e.Secondary_Diagnosis_Code_5),
+            (CAST(7 AS TINYINT), e.Secondary_Diagnosis_Code_6),
+            (CAST(8 AS TINYINT), e.Secondary_Diagnosis_Code_7),
+            (CAST(9 AS TINYINT), e.Secondary_Diagnosis_Code_8),
+            (CAST(10 AS TINYINT), e.Secondary_Diagnosis_Code_9),
+            (CAST(11 AS TINYINT), e.Secondary_Diagnosis_Code_10),
+            (CAST(12 AS TINYINT), e.Secondary_Diagnosis_Code_11),
+            (CAST(13 AS TINYINT), e.Secondary_Diagnosis_Code_12)
+        ) d (Diagnosis_Position, Raw_Code)
+        CROSS APPLY (
+            SELECT CAST(UPPER(REPLACE(REPLACE(d.Raw_Code, '.', ''), ' ', '')) AS VARCHAR(20)) AS Diagnosis_Code
+        ) c
+        WHERE c.Diagnosis_Code <> '';
+
+        SET @DiagInserted = @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_Bridge_Encounter_Procedure] (
+            [SK_EncounterID],
+            [Dataset],
+            [Procedure_Position],
+            [Procedure_Code],
+            [Is_Primary_Procedure],
+            [Procedure_Date],
+            [SK_PatientID],
+            [Activity_Date],
+            [ETL_BatchID]
+        )
+        SELECT
+            e.SK_EncounterID,
+            e.Dataset,
+            CAST(1 AS TINYINT),
+            c.Procedure_Code,
+            1,
+            e.Procedure_Date,
+            e.SK_PatientID,
+            e.Activity_Date,
+            @BatchID
+        FROM #Enc e
+        CROSS APPLY (
+            SELECT CAST(UPPER(REPLACE(REPLACE(e.Primary_Procedure_Code, '.', ''), ' ', '')) AS VARCHAR(20)) AS Procedure_Code
+        ) c
+        WHERE c.Procedure_Code <> '';
+
+        SET @ProcInserted = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+
+        PRINT 'Diagnosis rows: ' + CAST(@DiagInserted AS VARCHAR(20)) + ' inserted, '
+            + CAST(@DiagDeleted AS VARCHAR(20)) + ' deleted';
+        PRINT 'Procedure rows: ' + CAST(@ProcInserted AS VARCHAR(20)) + ' inserted, '
+            + CAST(@ProcDeleted AS VARCHAR(20)) + ' deleted';
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Bridge_Encounter_Diagnosis',
+            @LoadType = 'Incremental',
+            @RowsAffected = @DiagInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_Bridge_Encounter_Procedure',
+            @LoadType = 'Incremental',
+            @RowsAffected = @ProcInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @DiagInserted + @ProcInserted,
+            @RowsUpdated = 0,
+            @RowsDeleted = @DiagDeleted + @ProcDeleted,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+
+        DROP TABLE #Enc;
+        DROP TABLE #Moved;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Loading Bridge Encounter Codes: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_Bridge_Encounter_Diagnosis',
+                @LoadType = 'Incremental',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Load_Bridge_Encounter_Codes]';
+GO
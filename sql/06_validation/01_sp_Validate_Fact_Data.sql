@@ -18,10 +18,17 @@ Description:   Comprehensive automated validation comparing Analytics facts vs U
                Returns PASS/FAIL for each test with variance details.
 
                v2.0 - Enhanced distribution validation with health scores and materiality filtering
+               v2.1 - @ValidationMode = 'SINGLE_SCAN' (default): one GROUPING SETS pass per domain
+                      and side into #ScanCounts; row counts, monthly counts, distributions,
+                      unknown rates, missing members and dictionary checks are derived from it.
+                      'PER_TEST' keeps the original query-per-test path for comparison.
+               v2.2 - @Domain ('IP' | 'OP') and @Sections ('1,2,3', ...) run a subset of the
+                      single-scan validation, so scripts/validate_fact_data_parallel.py can
+                      run domains and sections on separate connections and merge the results.
 
 Author:        Sridhar Peddi
 Created:       2026-01-28
-Updated:       2026-01-29
+Updated:       2026-03-28
 
 Usage:
     EXEC [Analytics].[sp_Validate_Fact_Data]
@@ -29,7 +36,10 @@ Usage:
         @ToDate = '2025-12-31',
         @VarianceThresholdPct = 1.0,
         @UnknownThresholdPct = 5.0,
-        @MaterialityThreshold = 100;
+        @MaterialityThreshold = 100,
+        @ValidationMode = 'SINGLE_SCAN',   -- or 'PER_TEST'
+        @Domain = NULL,                    -- 'IP' | 'OP' | NULL = both
+        @Sections = NULL;                  -- e.g. '1,2,3,5,6,7' | NULL = all
 
 Source Tables (same as fact loaders):
     IP: [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
@@ -41,11 +51,52 @@ CREATE PROCEDURE [Analytics].[sp_Validate_Fact_Data]
     @VarianceThresholdPct DECIMAL(5,2) = 1.0,
     @UnknownThresholdPct DECIMAL(5,2) = 5.0,
     @MaterialityThreshold INT = 100,  -- Minimum records for a code to be flagged
-    @FailOnError BIT = 0
+    @FailOnError BIT = 0,
+    @ValidationMode VARCHAR(20) = 'SINGLE_SCAN',  -- SINGLE_SCAN | PER_TEST
+    @Domain VARCHAR(10) = NULL,                   -- IP | OP | NULL = both (SINGLE_SCAN only)
+    @Sections VARCHAR(50) = NULL                  -- Comma list of 1-7 | NULL = all (SINGLE_SCAN only)
 AS
 BEGIN
     SET NOCOUNT ON;
 
+    IF @ValidationMode NOT IN ('SINGLE_SCAN', 'PER_TEST')
+    BEGIN
+        RAISERROR('@ValidationMode must be SINGLE_SCAN or PER_TEST.', 16, 1);
+        RETURN;
+    END
+
+    IF @ValidationMode = 'PER_TEST' AND (@Domain IS NOT NULL OR @Sections IS NOT NULL)
+    BEGIN
+        RAISERROR('@Domain / @Sections need @ValidationMode = SINGLE_SCAN.', 16, 1);
+        RETURN;
+    END
+
+    IF @Domain IS NOT NULL AND @Domain NOT IN ('IP', 'OP')
+    BEGIN
+        RAISERROR('@Domain must be IP, OP or NULL.', 16, 1);
+        RETURN;
+    END
+
+    -- Domain / section switches (all on unless @Domain / @Sections narrow them)
+    DECLARE @SectionList VARCHAR(60) = ',' + REPLACE(ISNULL(@Sections, '1,2,3,4,5,6,7'), ' ', '') + ',';
+    DECLARE @RunIP BIT = CASE WHEN ISNULL(@Domain, 'IP') = 'IP' THEN 1 ELSE 0 END;
+    DECLARE @RunOP BIT = CASE WHEN ISNULL(@Domain, 'OP') = 'OP' THEN 1 ELSE 0 END;
+    DECLARE @Run1 BIT = CASE WHEN @SectionList LIKE '%,1,%' THEN 1 ELSE 0 END;
+    DECLARE @Run2 BIT = CASE WHEN @SectionList LIKE '%,2,%' THEN 1 ELSE 0 END;
+    DECLARE @Run3 BIT = CASE WHEN @SectionList LIKE '%,3,%' THEN 1 ELSE 0 END;
+    DECLARE @Run4 BIT = CASE WHEN @SectionList LIKE '%,4,%' THEN 1 ELSE 0 END;
+    DECLARE @Run5 BIT = CASE WHEN @SectionList LIKE '%,5,%' THEN 1 ELSE 0 END;
+    DECLARE @Run6 BIT = CASE WHEN @SectionList LIKE '%,6,%' THEN 1 ELSE 0 END;
+    DECLARE @Run7 BIT = CASE WHEN @SectionList LIKE '%,7,%' THEN 1 ELSE 0 END;
+    -- Every section except 4 (orphans) reads #ScanCounts
+    DECLARE @RunScan BIT = CASE WHEN 1 IN (@Run1, @Run2, @Run3, @Run5, @Run6, @Run7) THEN 1 ELSE 0 END;
+
+    IF 1 NOT IN (@Run1, @Run2, @Run3, @Run4, @Run5, @Run6, @Run7)
+    BEGIN
+        RAISERROR('@Sections must list one or more of 1-7.', 16, 1);
+        RETURN;
+    END
+
     -- Results table
     CREATE TABLE #ValidationResults (
         Test_ID INT IDENTITY(1,1),
@@ -87,6 +138,40 @@ BEGIN
         Health_Status VARCHAR(20)
     );
 
+    -- Missing dimension members (Section 6)
+    CREATE TABLE #MissingMembers (
+        Domain VARCHAR(10),
+        Dimension_Name VARCHAR(50),
+        Missing_Code VARCHAR(50),
+        Source_Record_Count BIGINT
+    );
+
+    -- Dictionary comparison (Section 7)
+    CREATE TABLE #DictionaryValidation (
+        Domain VARCHAR(10),
+        Dimension_Name VARCHAR(50),
+        Code VARCHAR(50),
+        Source_Record_Count BIGINT,
+        In_Dictionary BIT,
+        In_Dimension BIT,
+        Action_Required VARCHAR(100)
+    );
+
+    -- Grouped counts per domain and side (SINGLE_SCAN mode)
+    -- Dimension_Name 'Total' / 'Month' / dimension; Unknown_* only on the Target 'Total' row
+    CREATE TABLE #ScanCounts (
+        Domain VARCHAR(10),
+        Side VARCHAR(10),
+        Dimension_Name VARCHAR(50),
+        Code VARCHAR(100),
+        Is_Matched BIT,
+        Row_Count BIGINT,
+        Unknown_Commissioner BIGINT,
+        Unknown_GP_Practice BIGINT,
+        Unknown_Provider BIGINT,
+        Unknown_Specialty BIGINT
+    );
+
     DECLARE @SourceCount BIGINT, @TargetCount BIGINT, @Variance DECIMAL(10,4);
     DECLARE @TotalCount BIGINT, @UnknownCount BIGINT, @UnknownPct DECIMAL(10,4);
     DECLARE @OrphanCount BIGINT;
@@ -97,399 +182,771 @@ BEGIN
     PRINT 'Row Count Variance Threshold: ' + CAST(@VarianceThresholdPct AS VARCHAR) + '%';
     PRINT 'Unknown Rate Threshold: ' + CAST(@UnknownThresholdPct AS VARCHAR) + '%';
     PRINT 'Materiality Threshold: ' + CAST(@MaterialityThreshold AS VARCHAR) + ' records';
+    PRINT 'Validation Mode: ' + @ValidationMode;
+    PRINT 'Domain: ' + ISNULL(@Domain, 'IP, OP') + ' | Sections: ' + ISNULL(@Sections, 'all');
     PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
     PRINT '================================================================';
     PRINT '';
 
-    -- ==========================================================================
-    -- SECTION 1: ROW COUNT VALIDATION
-    -- ==========================================================================
-    PRINT '>>> Section 1: Row Count Validation';
-
-    -- IP Total Row Count (same source as loader: tbl_IP_EncounterDenormalised_Active)
-    SELECT @TargetCount = COUNT(*)
-    FROM [Analytics].[tbl_Fact_IP_Activity]
-    WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
-
-    SELECT @SourceCount = COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-    WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate;
-
-    SET @Variance = CASE WHEN @SourceCount = 0 THEN 0 ELSE ABS(@TargetCount - @SourceCount) * 100.0 / @SourceCount END;
-
-    INSERT INTO #ValidationResults VALUES ('IP', 'Row Count', 'Total Records', @SourceCount, @TargetCount, @Variance, @VarianceThresholdPct,
-        CASE WHEN @Variance <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        'Source: ' + FORMAT(@SourceCount, 'N0') + ' | Target: ' + FORMAT(@TargetCount, 'N0'));
+    IF @ValidationMode = 'SINGLE_SCAN'
+    BEGIN
+        -- ======================================================================
+        -- SINGLE-SCAN MODE: one GROUPING SETS pass per domain and side
+        -- Each pass fills #ScanCounts with the total, monthly and per-code counts
+        -- (plus unknown SK counts on the target); Sections 1-3 and 5-7 are then
+        -- derived from #ScanCounts instead of re-reading the fact and source.
+        -- ======================================================================
+        PRINT '>>> Sections 1-3, 5-7: Single-Scan Counts (one grouped pass per domain and side)';
+
+        IF @RunScan = 1 AND @RunIP = 1
+        BEGIN
+            -- ----- IP SOURCE -----
+            ;WITH Src AS (
+                SELECT
+                    CAST(CONVERT(CHAR(7), End_Date_Hospital_Provider_Spell, 126) AS VARCHAR(100)) AS Month_Code,
+                    CAST(CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                              THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                              ELSE Organisation_Code_Code_of_Commissioner END AS VARCHAR(100)) AS Commissioner_Code,
+                    CAST(CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                              THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                              ELSE Organisation_Code_Code_of_Provider END AS VARCHAR(100)) AS Provider_Code,
+                    CAST(Treatment_Function_Code AS VARCHAR(100)) AS Specialty_Code,
+                    CAST(Gender_Code AS VARCHAR(100)) AS Gender_Code,
+                    CAST(Admission_Method_Hospital_Provider_Spell AS VARCHAR(100)) AS Admission_Method_Code,
+                    CAST(Discharge_Method_Hospital_Provider_Spell AS VARCHAR(100)) AS Discharge_Method_Code,
+                    CAST(GP_Practice_Code_Original_Data AS VARCHAR(100)) AS GP_Practice_Code
+                FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+                WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            )
+            INSERT INTO #ScanCounts (Domain, Side, Dimension_Name, Code, Is_Matched, Row_Count)
+            SELECT 'IP', 'Source',
+                   CASE
+                       WHEN GROUPING(Month_Code) = 0 THEN 'Month'
+                       WHEN GROUPING(Commissioner_Code) = 0 THEN 'Commissioner'
+                       WHEN GROUPING(Provider_Code) = 0 THEN 'Provider'
+                       WHEN GROUPING(Specialty_Code) = 0 THEN 'Specialty'
+                       WHEN GROUPING(Gender_Code) = 0 THEN 'Gender'
+                       WHEN GROUPING(Admission_Method_Code) = 0 THEN 'Admission Method'
+                       WHEN GROUPING(Discharge_Method_Code) = 0 THEN 'Discharge Method'
+                       WHEN GROUPING(GP_Practice_Code) = 0 THEN 'GP Practice'
+                       ELSE 'Total'
+                   END,
+                   COALESCE(Month_Code, Commissioner_Code, Provider_Code, Specialty_Code, Gender_Code,
+                            Admission_Method_Code, Discharge_Method_Code, GP_Practice_Code),
+                   1,
+                   COUNT_BIG(*)
+            FROM Src
+            GROUP BY GROUPING SETS (
+                (Month_Code), (Commissioner_Code), (Provider_Code), (Specialty_Code), (Gender_Code),
+                (Admission_Method_Code), (Discharge_Method_Code), (GP_Practice_Code), ()
+            );
+
+            -- ----- IP TARGET -----
+            -- Dimensions are LEFT JOINed once; *_Matched keeps the per-dimension
+            -- INNER JOIN semantics of the per-test distribution queries
+            ;WITH Tgt AS (
+                SELECT
+                    CAST(CONVERT(CHAR(7), f.Discharge_Date, 126) AS VARCHAR(100)) AS Month_Code,
+                    CAST(dc.Commissioner_Code AS VARCHAR(100)) AS Commissioner_Code,
+                    CASE WHEN dc.SK_CommissionerID IS NULL THEN 0 ELSE 1 END AS Commissioner_Matched,
+                    CAST(dp.Provider_Code AS VARCHAR(100)) AS Provider_Code,
+                    CASE WHEN dp.SK_ProviderID IS NULL THEN 0 ELSE 1 END AS Provider_Matched,
+                    CAST(ds.BK_SpecialtyCode AS VARCHAR(100)) AS Specialty_Code,
+                    CASE WHEN ds.SK_SpecialtyID IS NULL THEN 0 ELSE 1 END AS Specialty_Matched,
+                    CAST(dg.GenderCode AS VARCHAR(100)) AS Gender_Code,
+                    CASE WHEN dg.SK_GenderID IS NULL THEN 0 ELSE 1 END AS Gender_Matched,
+                    CAST(dam.Admission_Method_Code AS VARCHAR(100)) AS Admission_Method_Code,
+                    CASE WHEN dam.SK_AdmissionMethodID IS NULL THEN 0 ELSE 1 END AS Admission_Method_Matched,
+                    CAST(ddm.Discharge_Method_Code AS VARCHAR(100)) AS Discharge_Method_Code,
+                    CASE WHEN ddm.SK_DischargeMethodID IS NULL THEN 0 ELSE 1 END AS Discharge_Method_Matched,
+                    CAST(dgp.GPPractice_Code AS VARCHAR(100)) AS GP_Practice_Code,
+                    CASE WHEN dgp.SK_GPPracticeID IS NULL THEN 0 ELSE 1 END AS GP_Practice_Matched,
+                    f.SK_CommissionerID, f.SK_GPPracticeID, f.SK_ProviderID, f.SK_SpecialtyID
+                FROM [Analytics].[tbl_Fact_IP_Activity] f
+                LEFT JOIN [Analytics].[tbl_Dim_Commissioner] dc ON f.SK_CommissionerID = dc.SK_CommissionerID
+                LEFT JOIN [Analytics].[vw_Dim_Provider] dp ON f.SK_ProviderID = dp.SK_ProviderID
+                LEFT JOIN [Analytics].[vw_Dim_Specialty] ds ON f.SK_SpecialtyID = ds.SK_SpecialtyID
+                LEFT JOIN [Analytics].[vw_Dim_Gender] dg ON f.SK_GenderID = dg.SK_GenderID
+                LEFT JOIN [Analytics].[vw_Dim_Admission_Method] dam ON f.SK_Admission_MethodID = dam.SK_AdmissionMethodID
+                LEFT JOIN [Analytics].[vw_Dim_Discharge_Method] ddm ON f.SK_Discharge_MethodID = ddm.SK_DischargeMethodID
+                LEFT JOIN [Analytics].[tbl_Dim_GPPractice] dgp ON f.SK_GPPracticeID = dgp.SK_GPPracticeID
+                WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            )
+            INSERT INTO #ScanCounts (Domain, Side, Dimension_Name, Code, Is_Matched, Row_Count,
+                                     Unknown_Commissioner, Unknown_GP_Practice, Unknown_Provider, Unknown_Specialty)
+            SELECT 'IP', 'Target',
+                   CASE
+                       WHEN GROUPING(Month_Code) = 0 THEN 'Month'
+                       WHEN GROUPING(Commissioner_Code) = 0 THEN 'Commissioner'
+                       WHEN GROUPING(Provider_Code) = 0 THEN 'Provider'
+                       WHEN GROUPING(Specialty_Code) = 0 THEN 'Specialty'
+                       WHEN GROUPING(Gender_Code) = 0 THEN 'Gender'
+                       WHEN GROUPING(Admission_Method_Code) = 0 THEN 'Admission Method'
+                       WHEN GROUPING(Discharge_Method_Code) = 0 THEN 'Discharge Method'
+                       WHEN GROUPING(GP_Practice_Code) = 0 THEN 'GP Practice'
+                       ELSE 'Total'
+                   END,
+                   COALESCE(Month_Code, Commissioner_Code, Provider_Code, Specialty_Code, Gender_Code,
+                            Admission_Method_Code, Discharge_Method_Code, GP_Practice_Code),
+                   COALESCE(Commissioner_Matched, Provider_Matched, Specialty_Matched, Gender_Matched,
+                            Admission_Method_Matched, Discharge_Method_Matched, GP_Practice_Matched, 1),
+                   COUNT_BIG(*),
+                   SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
+            FROM Tgt
+            GROUP BY GROUPING SETS (
+                (Month_Code),
+                (Commissioner_Code, Commissioner_Matched),
+                (Provider_Code, Provider_Matched),
+                (Specialty_Code, Specialty_Matched),
+                (Gender_Code, Gender_Matched),
+                (Admission_Method_Code, Admission_Method_Matched),
+                (Discharge_Method_Code, Discharge_Method_Matched),
+                (GP_Practice_Code, GP_Practice_Matched),
+                ()
+            );
+        END
+
+        IF @RunScan = 1 AND @RunOP = 1
+        BEGIN
+            -- ----- OP SOURCE -----
+            ;WITH Src AS (
+                SELECT
+                    CAST(CONVERT(CHAR(7), Appointment_Date, 126) AS VARCHAR(100)) AS Month_Code,
+                    CAST(CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                              THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                              ELSE Organisation_Code_Code_of_Commissioner END AS VARCHAR(100)) AS Commissioner_Code,
+                    CAST(CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                              THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                              ELSE Organisation_Code_Code_of_Provider END AS VARCHAR(100)) AS Provider_Code,
+                    CAST(Treatment_Function_Code AS VARCHAR(100)) AS Specialty_Code,
+                    CAST(NULLIF(LTRIM(RTRIM(Attended_Or_Did_Not_Attend)), '') AS VARCHAR(100)) AS Attendance_Status_Code,
+                    CAST(GP_Practice_Code_Original_Data AS VARCHAR(100)) AS GP_Practice_Code
+                FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+                WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            )
+            INSERT INTO #ScanCounts (Domain, Side, Dimension_Name, Code, Is_Matched, Row_Count)
+            SELECT 'OP', 'Source',
+                   CASE
+                       WHEN GROUPING(Month_Code) = 0 THEN 'Month'
+                       WHEN GROUPING(Commissioner_Code) = 0 THEN 'Commissioner'
+                       WHEN GROUPING(Provider_Code) = 0 THEN 'Provider'
+                       WHEN GROUPING(Specialty_Code) = 0 THEN 'Specialty'
+                       WHEN GROUPING(Attendance_Status_Code) = 0 THEN 'Attendance Status'
+                       WHEN GROUPING(GP_Practice_Code) = 0 THEN 'GP Practice'
+                       ELSE 'Total'
+                   END,
+                   COALESCE(Month_Code, Commissioner_Code, Provider_Code, Specialty_Code, Attendance_Status_Code, GP_Practice_Code),
+                   1,
+                   COUNT_BIG(*)
+            FROM Src
+            GROUP BY GROUPING SETS (
+                (Month_Code), (Commissioner_Code), (Provider_Code), (Specialty_Code),
+                (Attendance_Status_Code), (GP_Practice_Code), ()
+            );
+
+            -- ----- OP TARGET -----
+            ;WITH Tgt AS (
+                SELECT
+                    CAST(CONVERT(CHAR(7), f.Appointment_Date, 126) AS VARCHAR(100)) AS Month_Code,
+                    CAST(dc.Commissioner_Code AS VARCHAR(100)) AS Commissioner_Code,
+                    CASE WHEN dc.SK_CommissionerID IS NULL THEN 0 ELSE 1 END AS Commissioner_Matched,
+                    CAST(dp.Provider_Code AS VARCHAR(100)) AS Provider_Code,
+                    CASE WHEN dp.SK_ProviderID IS NULL THEN 0 ELSE 1 END AS Provider_Matched,
+                    CAST(ds.BK_SpecialtyCode AS VARCHAR(100)) AS Specialty_Code,
+                    CASE WHEN ds.SK_SpecialtyID IS NULL THEN 0 ELSE 1 END AS Specialty_Matched,
+                    CAST(LTRIM(RTRIM(da.Attendance_Status_Code)) AS VARCHAR(100)) AS Attendance_Status_Code,
+                    CASE WHEN da.SK_AttendanceStatusID IS NULL THEN 0 ELSE 1 END AS Attendance_Status_Matched,
+                    CAST(dgp.GPPractice_Code AS VARCHAR(100)) AS GP_Practice_Code,
+                    CASE WHEN dgp.SK_GPPracticeID IS NULL THEN 0 ELSE 1 END AS GP_Practice_Matched,
+                    f.SK_CommissionerID, f.SK_GPPracticeID, f.SK_ProviderID, f.SK_SpecialtyID
+                FROM [Analytics].[tbl_Fact_OP_Activity] f
+                LEFT JOIN [Analytics].[tbl_Dim_Commissioner] dc ON f.SK_CommissionerID = dc.SK_CommissionerID
+                LEFT JOIN [Analytics].[vw_Dim_Provider] dp ON f.SK_ProviderID = dp.SK_ProviderID
+                LEFT JOIN [Analytics].[vw_Dim_Specialty] ds ON f.SK_SpecialtyID = ds.SK_SpecialtyID
+                LEFT JOIN [Analytics].[vw_Dim_Attendance_Status] da ON f.SK_Attendance_StatusID = da.SK_AttendanceStatusID
+                LEFT JOIN [Analytics].[tbl_Dim_GPPractice] dgp ON f.SK_GPPracticeID = dgp.SK_GPPracticeID
+                WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            )
+            INSERT INTO #ScanCounts (Domain, Side, Dimension_Name, Code, Is_Matched, Row_Count,
+                                     Unknown_Commissioner, Unknown_GP_Practice, Unknown_Provider, Unknown_Specialty)
+            SELECT 'OP', 'Target',
+                   CASE
+                       WHEN GROUPING(Month_Code) = 0 THEN 'Month'
+                       WHEN GROUPING(Commissioner_Code) = 0 THEN 'Commissioner'
+                       WHEN GROUPING(Provider_Code) = 0 THEN 'Provider'
+                       WHEN GROUPING(Specialty_Code) = 0 THEN 'Specialty'
+                       WHEN GROUPING(Attendance_Status_Code) = 0 THEN 'Attendance Status'
+                       WHEN GROUPING(GP_Practice_Code) = 0 THEN 'GP Practice'
+                       ELSE 'Total'
+                   END,
+                   COALESCE(Month_Code, Commissioner_Code, Provider_Code, Specialty_Code, Attendance_Status_Code, GP_Practice_Code),
+                   COALESCE(Commissioner_Matched, Provider_Matched, Specialty_Matched, Attendance_Status_Matched, GP_Practice_Matched, 1),
+                   COUNT_BIG(*),
+                   SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
+            FROM Tgt
+            GROUP BY GROUPING SETS (
+                (Month_Code),
+                (Commissioner_Code, Commissioner_Matched),
+                (Provider_Code, Provider_Matched),
+                (Specialty_Code, Specialty_Matched),
+                (Attendance_Status_Code, Attendance_Status_Matched),
+                (GP_Practice_Code, GP_Practice_Matched),
+                ()
+            );
+        END
+
+        -- Section 1: Row counts (missing Total row = empty window)
+        IF @Run1 = 1
+        BEGIN
+            INSERT INTO #ValidationResults
+            SELECT d.Domain, 'Row Count', 'Total Records', c.Source_Count, c.Target_Count, v.Variance_Pct, @VarianceThresholdPct,
+                   CASE WHEN v.Variance_Pct <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+                   'Source: ' + FORMAT(c.Source_Count, 'N0') + ' | Target: ' + FORMAT(c.Target_Count, 'N0')
+            FROM (VALUES ('IP', @RunIP), ('OP', @RunOP)) d (Domain, Is_Run)
+            CROSS APPLY (
+                SELECT ISNULL(SUM(CASE WHEN sc.Side = 'Source' THEN sc.Row_Count END), 0) AS Source_Count,
+                       ISNULL(SUM(CASE WHEN sc.Side = 'Target' THEN sc.Row_Count END), 0) AS Target_Count
+                FROM #ScanCounts sc
+                WHERE sc.Domain = d.Domain AND sc.Dimension_Name = 'Total'
+            ) c
+            CROSS APPLY (
+                SELECT CAST(CASE WHEN c.Source_Count = 0 THEN 0 ELSE ABS(c.Target_Count - c.Source_Count) * 100.0 / c.Source_Count END AS DECIMAL(10,4)) AS Variance_Pct
+            ) v
+            WHERE d.Is_Run = 1;
+        END
+
+        -- Section 2: Monthly
+        IF @Run2 = 1
+        BEGIN
+            ;WITH SourceMonthly AS (
+                SELECT Domain, Code AS Month, Row_Count AS Cnt FROM #ScanCounts WHERE Side = 'Source' AND Dimension_Name = 'Month'
+            ),
+            TargetMonthly AS (
+                SELECT Domain, Code AS Month, Row_Count AS Cnt FROM #ScanCounts WHERE Side = 'Target' AND Dimension_Name = 'Month'
+            )
+            INSERT INTO #ValidationResults
+            SELECT COALESCE(s.Domain, t.Domain), 'Monthly', 'Month: ' + COALESCE(s.Month, t.Month),
+                   ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+                   CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+                   @VarianceThresholdPct,
+                   CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+                   'Source: ' + FORMAT(ISNULL(s.Cnt, 0), 'N0') + ' | Target: ' + FORMAT(ISNULL(t.Cnt, 0), 'N0')
+            FROM SourceMonthly s FULL OUTER JOIN TargetMonthly t ON s.Domain = t.Domain AND s.Month = t.Month;
+        END
+
+        -- Section 3: Dimension distribution detail (NULL codes never join, as in PER_TEST)
+        IF @Run3 = 1
+        BEGIN
+            ;WITH SourceDist AS (
+                SELECT Domain, Dimension_Name, Code, Row_Count AS Cnt
+                FROM #ScanCounts
+                WHERE Side = 'Source' AND Dimension_Name NOT IN ('Total', 'Month')
+            ),
+            TargetDist AS (
+                SELECT Domain, Dimension_Name, Code, Row_Count AS Cnt
+                FROM #ScanCounts
+                WHERE Side = 'Target' AND Dimension_Name NOT IN ('Total', 'Month') AND Is_Matched = 1
+            )
+            INSERT INTO #DistributionDetail
+            SELECT COALESCE(s.Domain, t.Domain), COALESCE(s.Dimension_Name, t.Dimension_Name),
+                   ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+                   ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+                   ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+                   CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+                   CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+                   CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+            FROM SourceDist s
+            FULL OUTER JOIN TargetDist t
+                ON s.Domain = t.Domain AND s.Dimension_Name = t.Dimension_Name AND s.Code = t.Code;
+        END
+
+        -- Section 5: Unknown/default member rates (target Total row)
+        IF @Run5 = 1
+        BEGIN
+            INSERT INTO #ValidationResults
+            SELECT d.Domain, 'Data Quality', 'Unknown ' + u.Dimension_Name + ' Rate', c.Total_Count, u.Unknown_Count, p.Unknown_Pct, @UnknownThresholdPct,
+                   CASE WHEN p.Unknown_Pct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+                   FORMAT(p.Unknown_Pct, 'N2') + '% (' + FORMAT(u.Unknown_Count, 'N0') + ' of ' + FORMAT(c.Total_Count, 'N0') + ')'
+            FROM (VALUES ('IP', @RunIP), ('OP', @RunOP)) d (Domain, Is_Run)
+            OUTER APPLY (
+                SELECT Row_Count, Unknown_Commissioner, Unknown_GP_Practice, Unknown_Provider, Unknown_Specialty
+                FROM #ScanCounts sc
+                WHERE sc.Domain = d.Domain AND sc.Side = 'Target' AND sc.Dimension_Name = 'Total'
+            ) sc
+            CROSS APPLY (SELECT ISNULL(sc.Row_Count, 0) AS Total_Count) c
+            CROSS APPLY (VALUES
+                ('Commissioner', sc.Unknown_Commissioner),
+                ('GP Practice', sc.Unknown_GP_Practice),
+                ('Provider', sc.Unknown_Provider),
+                ('Specialty', sc.Unknown_Specialty)
+            ) u (Dimension_Name, Unknown_Count)
+            CROSS APPLY (
+                SELECT CAST(CASE WHEN c.Total_Count = 0 THEN 0 ELSE u.Unknown_Count * 100.0 / c.Total_Count END AS DECIMAL(10,4)) AS Unknown_Pct
+            ) p
+            WHERE d.Is_Run = 1;
+        END
+
+        -- Section 6: Missing dimension members (source codes not in the dimension)
+        IF @Run6 = 1 OR @Run7 = 1
+        BEGIN
+            INSERT INTO #MissingMembers
+            SELECT sc.Domain, sc.Dimension_Name, sc.Code, sc.Row_Count
+            FROM #ScanCounts sc
+            WHERE sc.Side = 'Source'
+              AND (
+                    (sc.Dimension_Name = 'Commissioner'
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[tbl_Dim_Commissioner] d WHERE d.Commissioner_Code = sc.Code))
+                 OR (sc.Dimension_Name = 'Provider'
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[vw_Dim_Provider] d WHERE d.Provider_Code = sc.Code))
+                 OR (sc.Dimension_Name = 'Specialty' AND sc.Code IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[vw_Dim_Specialty] d WHERE d.BK_SpecialtyCode = sc.Code))
+                 OR (sc.Dimension_Name = 'Admission Method' AND sc.Code IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[vw_Dim_Admission_Method] d WHERE d.Admission_Method_Code = sc.Code))
+                 OR (sc.Dimension_Name = 'Discharge Method' AND sc.Code IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[vw_Dim_Discharge_Method] d WHERE d.Discharge_Method_Code = sc.Code))
+                 OR (sc.Dimension_Name = 'GP Practice' AND sc.Code IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[tbl_Dim_GPPractice] d WHERE d.GPPractice_Code = sc.Code))
+                 OR (sc.Dimension_Name = 'Attendance Status' AND sc.Code IS NOT NULL
+                     AND NOT EXISTS (SELECT 1 FROM [Analytics].[vw_Dim_Attendance_Status] d WHERE LTRIM(RTRIM(d.Attendance_Status_Code)) = sc.Code))
+              );
+        END
+
+        -- Section 7: Dictionary validation (IP codes missing from the dimension)
+        IF @Run7 = 1
+        BEGIN
+            INSERT INTO #DictionaryValidation
+            SELECT CASE WHEN m.Dimension_Name IN ('Discharge Method', 'Admission Method') THEN 'IP' ELSE 'IP/OP' END,
+                   m.Dimension_Name,
+                   m.Missing_Code,
+                   m.Source_Record_Count,
+                   x.In_Dictionary,
+                   0,
+                   CASE
+                       WHEN x.In_Dictionary = 1 THEN 'Add to Dimension (valid NHS code)'
+                       WHEN m.Dimension_Name IN ('Commissioner', 'Provider', 'GP Practice') THEN 'Invalid/Unknown code (not in NHS Dictionary)'
+                       ELSE 'Invalid code (not in NHS Dictionary)'
+                   END
+            FROM #MissingMembers m
+            CROSS APPLY (
+                SELECT CAST(CASE
+                    WHEN m.Dimension_Name = 'Discharge Method'
+                         AND EXISTS (SELECT 1 FROM [Dictionary].[IP].[DischargeMethod] dict WHERE dict.BK_DischargeMethodCode = m.Missing_Code) THEN 1
+                    WHEN m.Dimension_Name = 'Admission Method'
+                         AND EXISTS (SELECT 1 FROM [Dictionary].[IP].[AdmissionMethods] dict WHERE dict.BK_AdmissionMethodCode = m.Missing_Code) THEN 1
+                    WHEN m.Dimension_Name = 'Commissioner'
+                         AND EXISTS (SELECT 1 FROM [Dictionary].[dbo].[Commissioner] dict WHERE dict.CommissionerCode = m.Missing_Code) THEN 1
+                    WHEN m.Dimension_Name = 'Specialty'
+                         AND EXISTS (SELECT 1 FROM [Dictionary].[dbo].[Specialties] dict WHERE dict.BK_SpecialtyCode = m.Missing_Code) THEN 1
+                    WHEN m.Dimension_Name IN ('Provider', 'GP Practice')
+                         AND EXISTS (SELECT 1 FROM [Dictionary].[dbo].[Organisation] dict WHERE dict.Organisation_Code = m.Missing_Code) THEN 1
+                    ELSE 0
+                END AS BIT) AS In_Dictionary
+            ) x
+            WHERE m.Domain = 'IP';
+        END
+
+        -- Section 7 only: #MissingMembers was just its input
+        IF @Run6 = 0
+            DELETE FROM #MissingMembers;
+    END
+    ELSE
+    BEGIN
+        -- ==========================================================================
+        -- SECTION 1: ROW COUNT VALIDATION
+        -- ==========================================================================
+        PRINT '>>> Section 1: Row Count Validation';
 
-    -- OP Total Row Count (same source as loader: tbl_OP_EncounterDenormalised_Active)
-    SELECT @TargetCount = COUNT(*)
-    FROM [Analytics].[tbl_Fact_OP_Activity]
-    WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        -- IP Total Row Count (same source as loader: tbl_IP_EncounterDenormalised_Active)
+        SELECT @TargetCount = COUNT(*)
+        FROM [Analytics].[tbl_Fact_IP_Activity]
+        WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
 
-    SELECT @SourceCount = COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-    WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        SELECT @SourceCount = COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate;
 
-    SET @Variance = CASE WHEN @SourceCount = 0 THEN 0 ELSE ABS(@TargetCount - @SourceCount) * 100.0 / @SourceCount END;
+        SET @Variance = CASE WHEN @SourceCount = 0 THEN 0 ELSE ABS(@TargetCount - @SourceCount) * 100.0 / @SourceCount END;
 
-    INSERT INTO #ValidationResults VALUES ('OP', 'Row Count', 'Total Records', @SourceCount, @TargetCount, @Variance, @VarianceThresholdPct,
-        CASE WHEN @Variance <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        'Source: ' + FORMAT(@SourceCount, 'N0') + ' | Target: ' + FORMAT(@TargetCount, 'N0'));
+        INSERT INTO #ValidationResults VALUES ('IP', 'Row Count', 'Total Records', @SourceCount, @TargetCount, @Variance, @VarianceThresholdPct,
+            CASE WHEN @Variance <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            'Source: ' + FORMAT(@SourceCount, 'N0') + ' | Target: ' + FORMAT(@TargetCount, 'N0'));
 
-    -- ==========================================================================
-    -- SECTION 2: MONTHLY DISTRIBUTION VALIDATION
-    -- ==========================================================================
-    PRINT '>>> Section 2: Monthly Distribution';
-
-    -- IP Monthly
-    ;WITH SourceMonthly AS (
-        SELECT FORMAT(End_Date_Hospital_Provider_Spell, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY FORMAT(End_Date_Hospital_Provider_Spell, 'yyyy-MM')
-    ),
-    TargetMonthly AS (
-        SELECT FORMAT(Discharge_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity]
-        WHERE Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY FORMAT(Discharge_Date, 'yyyy-MM')
-    )
-    INSERT INTO #ValidationResults
-    SELECT 'IP', 'Monthly', 'Month: ' + COALESCE(s.Month, t.Month),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           @VarianceThresholdPct,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-           'Source: ' + FORMAT(ISNULL(s.Cnt, 0), 'N0') + ' | Target: ' + FORMAT(ISNULL(t.Cnt, 0), 'N0')
-    FROM SourceMonthly s FULL OUTER JOIN TargetMonthly t ON s.Month = t.Month;
-
-    -- OP Monthly
-    ;WITH SourceMonthly AS (
-        SELECT FORMAT(Appointment_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY FORMAT(Appointment_Date, 'yyyy-MM')
-    ),
-    TargetMonthly AS (
-        SELECT FORMAT(Appointment_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
+        -- OP Total Row Count (same source as loader: tbl_OP_EncounterDenormalised_Active)
+        SELECT @TargetCount = COUNT(*)
         FROM [Analytics].[tbl_Fact_OP_Activity]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY FORMAT(Appointment_Date, 'yyyy-MM')
-    )
-    INSERT INTO #ValidationResults
-    SELECT 'OP', 'Monthly', 'Month: ' + COALESCE(s.Month, t.Month),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           @VarianceThresholdPct,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-           'Source: ' + FORMAT(ISNULL(s.Cnt, 0), 'N0') + ' | Target: ' + FORMAT(ISNULL(t.Cnt, 0), 'N0')
-    FROM SourceMonthly s FULL OUTER JOIN TargetMonthly t ON s.Month = t.Month;
+        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
 
-    -- ==========================================================================
-    -- SECTION 3: DIMENSION DISTRIBUTION VALIDATION (Enhanced with Health Scores)
-    -- Collects ALL codes, calculates health metrics, flags material issues
-    -- ==========================================================================
-    PRINT '>>> Section 3: Dimension Distribution (Source vs Target)';
-
-    -- ----- IP COMMISSIONER -----
-    ;WITH SourceDist AS (
-        SELECT
-            CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
-                 THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
-                 ELSE Organisation_Code_Code_of_Commissioner END AS Code,
-            COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
-                      THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
-                      ELSE Organisation_Code_Code_of_Commissioner END
-    ),
-    TargetDist AS (
-        SELECT d.Commissioner_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Commissioner_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Commissioner', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP PROVIDER -----
-    ;WITH SourceDist AS (
-        SELECT
-            CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
-                 THEN LEFT(Organisation_Code_Code_of_Provider, 3)
-                 ELSE Organisation_Code_Code_of_Provider END AS Code,
-            COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
-                      THEN LEFT(Organisation_Code_Code_of_Provider, 3)
-                      ELSE Organisation_Code_Code_of_Provider END
-    ),
-    TargetDist AS (
-        SELECT d.Provider_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Provider_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Provider', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP SPECIALTY -----
-    ;WITH SourceDist AS (
-        SELECT Treatment_Function_Code AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY Treatment_Function_Code
-    ),
-    TargetDist AS (
-        SELECT d.BK_SpecialtyCode AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.BK_SpecialtyCode
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Specialty', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP GENDER -----
-    ;WITH SourceDist AS (
-        SELECT Gender_Code AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY Gender_Code
-    ),
-    TargetDist AS (
-        SELECT d.GenderCode AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[vw_Dim_Gender] d ON f.SK_GenderID = d.SK_GenderID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.GenderCode
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Gender', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP ADMISSION METHOD -----
-    ;WITH SourceDist AS (
-        SELECT Admission_Method_Hospital_Provider_Spell AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY Admission_Method_Hospital_Provider_Spell
-    ),
-    TargetDist AS (
-        SELECT d.Admission_Method_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[vw_Dim_Admission_Method] d ON f.SK_Admission_MethodID = d.SK_AdmissionMethodID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Admission_Method_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Admission Method', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP DISCHARGE METHOD -----
-    ;WITH SourceDist AS (
-        SELECT Discharge_Method_Hospital_Provider_Spell AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY Discharge_Method_Hospital_Provider_Spell
-    ),
-    TargetDist AS (
-        SELECT d.Discharge_Method_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[vw_Dim_Discharge_Method] d ON f.SK_Discharge_MethodID = d.SK_DischargeMethodID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Discharge_Method_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'Discharge Method', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- IP GP PRACTICE -----
-    ;WITH SourceDist AS (
-        SELECT GP_Practice_Code_Original_Data AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
-        WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-        GROUP BY GP_Practice_Code_Original_Data
-    ),
-    TargetDist AS (
-        SELECT d.GPPractice_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_IP_Activity] f
-        JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID
-        WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.GPPractice_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'IP', 'GP Practice', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- OP COMMISSIONER -----
-    ;WITH SourceDist AS (
-        SELECT
-            CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
-                 THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
-                 ELSE Organisation_Code_Code_of_Commissioner END AS Code,
-            COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
-                      THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
-                      ELSE Organisation_Code_Code_of_Commissioner END
-    ),
-    TargetDist AS (
-        SELECT d.Commissioner_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID
-        WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Commissioner_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'OP', 'Commissioner', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- OP PROVIDER -----
-    ;WITH SourceDist AS (
-        SELECT
-            CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
-                 THEN LEFT(Organisation_Code_Code_of_Provider, 3)
-                 ELSE Organisation_Code_Code_of_Provider END AS Code,
-            COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
-                      THEN LEFT(Organisation_Code_Code_of_Provider, 3)
-                      ELSE Organisation_Code_Code_of_Provider END
-    ),
-    TargetDist AS (
-        SELECT d.Provider_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID
-        WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.Provider_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'OP', 'Provider', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- OP SPECIALTY -----
-    ;WITH SourceDist AS (
-        SELECT Treatment_Function_Code AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY Treatment_Function_Code
-    ),
-    TargetDist AS (
-        SELECT d.BK_SpecialtyCode AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID
-        WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.BK_SpecialtyCode
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'OP', 'Specialty', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- OP ATTENDANCE STATUS -----
-    ;WITH SourceDist AS (
-        SELECT NULLIF(LTRIM(RTRIM(Attended_Or_Did_Not_Attend)), '') AS Code, COUNT(*) AS Cnt
+        SELECT @SourceCount = COUNT(*)
         FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY NULLIF(LTRIM(RTRIM(Attended_Or_Did_Not_Attend)), '')
-    ),
-    TargetDist AS (
-        SELECT LTRIM(RTRIM(d.Attendance_Status_Code)) AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        JOIN [Analytics].[vw_Dim_Attendance_Status] d ON f.SK_Attendance_StatusID = d.SK_AttendanceStatusID
-        WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY LTRIM(RTRIM(d.Attendance_Status_Code))
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'OP', 'Attendance Status', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
-
-    -- ----- OP GP PRACTICE -----
-    ;WITH SourceDist AS (
-        SELECT GP_Practice_Code_Original_Data AS Code, COUNT(*) AS Cnt
-        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
-        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY GP_Practice_Code_Original_Data
-    ),
-    TargetDist AS (
-        SELECT d.GPPractice_Code AS Code, COUNT(*) AS Cnt
-        FROM [Analytics].[tbl_Fact_OP_Activity] f
-        JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID
-        WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
-        GROUP BY d.GPPractice_Code
-    )
-    INSERT INTO #DistributionDetail
-    SELECT 'OP', 'GP Practice', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
-           ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
-           ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
-           CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
-           CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
-           CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
-    FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+        WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+
+        SET @Variance = CASE WHEN @SourceCount = 0 THEN 0 ELSE ABS(@TargetCount - @SourceCount) * 100.0 / @SourceCount END;
+
+        INSERT INTO #ValidationResults VALUES ('OP', 'Row Count', 'Total Records', @SourceCount, @TargetCount, @Variance, @VarianceThresholdPct,
+            CASE WHEN @Variance <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            'Source: ' + FORMAT(@SourceCount, 'N0') + ' | Target: ' + FORMAT(@TargetCount, 'N0'));
+
+        -- ==========================================================================
+        -- SECTION 2: MONTHLY DISTRIBUTION VALIDATION
+        -- ==========================================================================
+        PRINT '>>> Section 2: Monthly Distribution';
+
+        -- IP Monthly
+        ;WITH SourceMonthly AS (
+            SELECT FORMAT(End_Date_Hospital_Provider_Spell, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY FORMAT(End_Date_Hospital_Provider_Spell, 'yyyy-MM')
+        ),
+        TargetMonthly AS (
+            SELECT FORMAT(Discharge_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity]
+            WHERE Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY FORMAT(Discharge_Date, 'yyyy-MM')
+        )
+        INSERT INTO #ValidationResults
+        SELECT 'IP', 'Monthly', 'Month: ' + COALESCE(s.Month, t.Month),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               @VarianceThresholdPct,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+               'Source: ' + FORMAT(ISNULL(s.Cnt, 0), 'N0') + ' | Target: ' + FORMAT(ISNULL(t.Cnt, 0), 'N0')
+        FROM SourceMonthly s FULL OUTER JOIN TargetMonthly t ON s.Month = t.Month;
+
+        -- OP Monthly
+        ;WITH SourceMonthly AS (
+            SELECT FORMAT(Appointment_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY FORMAT(Appointment_Date, 'yyyy-MM')
+        ),
+        TargetMonthly AS (
+            SELECT FORMAT(Appointment_Date, 'yyyy-MM') AS Month, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY FORMAT(Appointment_Date, 'yyyy-MM')
+        )
+        INSERT INTO #ValidationResults
+        SELECT 'OP', 'Monthly', 'Month: ' + COALESCE(s.Month, t.Month),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               @VarianceThresholdPct,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END <= @VarianceThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+               'Source: ' + FORMAT(ISNULL(s.Cnt, 0), 'N0') + ' | Target: ' + FORMAT(ISNULL(t.Cnt, 0), 'N0')
+        FROM SourceMonthly s FULL OUTER JOIN TargetMonthly t ON s.Month = t.Month;
+
+        -- ==========================================================================
+        -- SECTION 3: DIMENSION DISTRIBUTION VALIDATION (Enhanced with Health Scores)
+        -- Collects ALL codes, calculates health metrics, flags material issues
+        -- ==========================================================================
+        PRINT '>>> Section 3: Dimension Distribution (Source vs Target)';
+
+        -- ----- IP COMMISSIONER -----
+        ;WITH SourceDist AS (
+            SELECT
+                CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                     THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                     ELSE Organisation_Code_Code_of_Commissioner END AS Code,
+                COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                          THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                          ELSE Organisation_Code_Code_of_Commissioner END
+        ),
+        TargetDist AS (
+            SELECT d.Commissioner_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Commissioner_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Commissioner', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP PROVIDER -----
+        ;WITH SourceDist AS (
+            SELECT
+                CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                     THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                     ELSE Organisation_Code_Code_of_Provider END AS Code,
+                COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                          THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                          ELSE Organisation_Code_Code_of_Provider END
+        ),
+        TargetDist AS (
+            SELECT d.Provider_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Provider_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Provider', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP SPECIALTY -----
+        ;WITH SourceDist AS (
+            SELECT Treatment_Function_Code AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY Treatment_Function_Code
+        ),
+        TargetDist AS (
+            SELECT d.BK_SpecialtyCode AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.BK_SpecialtyCode
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Specialty', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP GENDER -----
+        ;WITH SourceDist AS (
+            SELECT Gender_Code AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY Gender_Code
+        ),
+        TargetDist AS (
+            SELECT d.GenderCode AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[vw_Dim_Gender] d ON f.SK_GenderID = d.SK_GenderID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.GenderCode
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Gender', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP ADMISSION METHOD -----
+        ;WITH SourceDist AS (
+            SELECT Admission_Method_Hospital_Provider_Spell AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY Admission_Method_Hospital_Provider_Spell
+        ),
+        TargetDist AS (
+            SELECT d.Admission_Method_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[vw_Dim_Admission_Method] d ON f.SK_Admission_MethodID = d.SK_AdmissionMethodID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Admission_Method_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Admission Method', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP DISCHARGE METHOD -----
+        ;WITH SourceDist AS (
+            SELECT Discharge_Method_Hospital_Provider_Spell AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY Discharge_Method_Hospital_Provider_Spell
+        ),
+        TargetDist AS (
+            SELECT d.Discharge_Method_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[vw_Dim_Discharge_Method] d ON f.SK_Discharge_MethodID = d.SK_DischargeMethodID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Discharge_Method_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'Discharge Method', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- IP GP PRACTICE -----
+        ;WITH SourceDist AS (
+            SELECT GP_Practice_Code_Original_Data AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active]
+            WHERE End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+            GROUP BY GP_Practice_Code_Original_Data
+        ),
+        TargetDist AS (
+            SELECT d.GPPractice_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_IP_Activity] f
+            JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID
+            WHERE f.Discharge_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.GPPractice_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'IP', 'GP Practice', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- OP COMMISSIONER -----
+        ;WITH SourceDist AS (
+            SELECT
+                CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                     THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                     ELSE Organisation_Code_Code_of_Commissioner END AS Code,
+                COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Commissioner, 2) = '00'
+                          THEN LEFT(Organisation_Code_Code_of_Commissioner, 3)
+                          ELSE Organisation_Code_Code_of_Commissioner END
+        ),
+        TargetDist AS (
+            SELECT d.Commissioner_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID
+            WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Commissioner_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'OP', 'Commissioner', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- OP PROVIDER -----
+        ;WITH SourceDist AS (
+            SELECT
+                CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                     THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                     ELSE Organisation_Code_Code_of_Provider END AS Code,
+                COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY CASE WHEN RIGHT(Organisation_Code_Code_of_Provider, 2) = '00'
+                          THEN LEFT(Organisation_Code_Code_of_Provider, 3)
+                          ELSE Organisation_Code_Code_of_Provider END
+        ),
+        TargetDist AS (
+            SELECT d.Provider_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID
+            WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.Provider_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'OP', 'Provider', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- OP SPECIALTY -----
+        ;WITH SourceDist AS (
+            SELECT Treatment_Function_Code AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY Treatment_Function_Code
+        ),
+        TargetDist AS (
+            SELECT d.BK_SpecialtyCode AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID
+            WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.BK_SpecialtyCode
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'OP', 'Specialty', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- OP ATTENDANCE STATUS -----
+        ;WITH SourceDist AS (
+            SELECT NULLIF(LTRIM(RTRIM(Attended_Or_Did_Not_Attend)), '') AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY NULLIF(LTRIM(RTRIM(Attended_Or_Did_Not_Attend)), '')
+        ),
+        TargetDist AS (
+            SELECT LTRIM(RTRIM(d.Attendance_Status_Code)) AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            JOIN [Analytics].[vw_Dim_Attendance_Status] d ON f.SK_Attendance_StatusID = d.SK_AttendanceStatusID
+            WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY LTRIM(RTRIM(d.Attendance_Status_Code))
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'OP', 'Attendance Status', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+
+        -- ----- OP GP PRACTICE -----
+        ;WITH SourceDist AS (
+            SELECT GP_Practice_Code_Original_Data AS Code, COUNT(*) AS Cnt
+            FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active]
+            WHERE Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY GP_Practice_Code_Original_Data
+        ),
+        TargetDist AS (
+            SELECT d.GPPractice_Code AS Code, COUNT(*) AS Cnt
+            FROM [Analytics].[tbl_Fact_OP_Activity] f
+            JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID
+            WHERE f.Appointment_Date BETWEEN @FromDate AND @ToDate
+            GROUP BY d.GPPractice_Code
+        )
+        INSERT INTO #DistributionDetail
+        SELECT 'OP', 'GP Practice', ISNULL(COALESCE(s.Code, t.Code), 'NULL'),
+               ISNULL(s.Cnt, 0), ISNULL(t.Cnt, 0),
+               ISNULL(t.Cnt, 0) - ISNULL(s.Cnt, 0),
+               CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END,
+               CASE WHEN ISNULL(s.Cnt, 0) >= @MaterialityThreshold OR ISNULL(t.Cnt, 0) >= @MaterialityThreshold THEN 1 ELSE 0 END,
+               CASE WHEN CASE WHEN ISNULL(s.Cnt, 0) = 0 THEN 100.0 ELSE ABS(ISNULL(t.Cnt, 0) - s.Cnt) * 100.0 / s.Cnt END > @VarianceThresholdPct THEN 1 ELSE 0 END
+        FROM SourceDist s FULL OUTER JOIN TargetDist t ON s.Code = t.Code;
+    END
 
     -- Calculate Distribution Health Summary
     INSERT INTO #DistributionHealth
@@ -534,458 +991,448 @@ BEGIN
     PRINT '>>> Section 4: Referential Integrity (Orphan Detection)';
 
     -- IP Orphan checks
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
-    LEFT JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID WHERE d.SK_CommissionerID IS NULL;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Commissioner Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
-    LEFT JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID WHERE d.SK_GPPracticeID IS NULL AND f.SK_GPPracticeID IS NOT NULL;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'GP Practice Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
-    LEFT JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID WHERE d.SK_ProviderID IS NULL;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Provider Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
-    LEFT JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID WHERE d.SK_SpecialtyID IS NULL AND f.SK_SpecialtyID IS NOT NULL;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Specialty Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+    IF @Run4 = 1 AND @RunIP = 1
+    BEGIN
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
+        LEFT JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID WHERE d.SK_CommissionerID IS NULL;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Commissioner Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
+        LEFT JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID WHERE d.SK_GPPracticeID IS NULL AND f.SK_GPPracticeID IS NOT NULL;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'GP Practice Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
+        LEFT JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID WHERE d.SK_ProviderID IS NULL;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Provider Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_IP_Activity] f
+        LEFT JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID WHERE d.SK_SpecialtyID IS NULL AND f.SK_SpecialtyID IS NOT NULL;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Referential Integrity', 'Specialty Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+    END
 
     -- OP Orphan checks
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
-    LEFT JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID WHERE d.SK_CommissionerID IS NULL;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Commissioner Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
-    LEFT JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID WHERE d.SK_GPPracticeID IS NULL AND f.SK_GPPracticeID IS NOT NULL;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'GP Practice Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
-    LEFT JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID WHERE d.SK_ProviderID IS NULL;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Provider Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
-    LEFT JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID WHERE d.SK_SpecialtyID IS NULL AND f.SK_SpecialtyID IS NOT NULL;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Specialty Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
-        CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
-
-    -- ==========================================================================
-    -- SECTION 5: UNKNOWN/DEFAULT MEMBER RATES
-    -- ==========================================================================
-    PRINT '>>> Section 5: Unknown/Default Member Rates';
-
-    -- IP Unknown rates
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Commissioner Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown GP Practice Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Provider Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Specialty Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    -- OP Unknown rates
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Commissioner Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown GP Practice Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Provider Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
-    FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
-    SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
-    INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Specialty Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
-        CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
-        FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
-
-    -- ==========================================================================
-    -- SECTION 6: MISSING DIMENSION MEMBERS
-    -- Shows source codes that don't exist in dimension tables
-    -- ==========================================================================
-    PRINT '>>> Section 6: Missing Dimension Members';
-
-    -- Temp table for missing members
-    CREATE TABLE #MissingMembers (
-        Domain VARCHAR(10),
-        Dimension_Name VARCHAR(50),
-        Missing_Code VARCHAR(50),
-        Source_Record_Count BIGINT
-    );
-
-    -- IP Missing Commissioners
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'Commissioner',
-        CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-             THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-             ELSE s.Organisation_Code_Code_of_Commissioner END,
-        COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                  ELSE s.Organisation_Code_Code_of_Commissioner END
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[tbl_Dim_Commissioner] d
-        WHERE d.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                                         THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                                         ELSE s.Organisation_Code_Code_of_Commissioner END
-    );
-
-    -- IP Missing Providers
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'Provider',
-        CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-             THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-             ELSE s.Organisation_Code_Code_of_Provider END,
-        COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                  ELSE s.Organisation_Code_Code_of_Provider END
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Provider] d
-        WHERE d.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                                     THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                                     ELSE s.Organisation_Code_Code_of_Provider END
-    );
-
-    -- IP Missing Specialties
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'Specialty', s.Treatment_Function_Code, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Treatment_Function_Code IS NOT NULL
-    GROUP BY s.Treatment_Function_Code
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Specialty] d
-        WHERE d.BK_SpecialtyCode = s.Treatment_Function_Code
-    );
-
-    -- IP Missing Admission Methods
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'Admission Method', s.Admission_Method_Hospital_Provider_Spell, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Admission_Method_Hospital_Provider_Spell IS NOT NULL
-    GROUP BY s.Admission_Method_Hospital_Provider_Spell
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Admission_Method] d
-        WHERE d.Admission_Method_Code = s.Admission_Method_Hospital_Provider_Spell
-    );
-
-    -- IP Missing Discharge Methods
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'Discharge Method', s.Discharge_Method_Hospital_Provider_Spell, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Discharge_Method_Hospital_Provider_Spell IS NOT NULL
-    GROUP BY s.Discharge_Method_Hospital_Provider_Spell
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Discharge_Method] d
-        WHERE d.Discharge_Method_Code = s.Discharge_Method_Hospital_Provider_Spell
-    );
-
-    -- IP Missing GP Practices
-    INSERT INTO #MissingMembers
-    SELECT 'IP', 'GP Practice', s.GP_Practice_Code_Original_Data, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.GP_Practice_Code_Original_Data IS NOT NULL
-    GROUP BY s.GP_Practice_Code_Original_Data
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[tbl_Dim_GPPractice] d
-        WHERE d.GPPractice_Code = s.GP_Practice_Code_Original_Data
-    );
-
-    -- OP Missing Commissioners
-    INSERT INTO #MissingMembers
-    SELECT 'OP', 'Commissioner',
-        CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-             THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-             ELSE s.Organisation_Code_Code_of_Commissioner END,
-        COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
-    WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                  ELSE s.Organisation_Code_Code_of_Commissioner END
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[tbl_Dim_Commissioner] d
-        WHERE d.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                                         THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                                         ELSE s.Organisation_Code_Code_of_Commissioner END
-    );
-
-    -- OP Missing Providers
-    INSERT INTO #MissingMembers
-    SELECT 'OP', 'Provider',
-        CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-             THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-             ELSE s.Organisation_Code_Code_of_Provider END,
-        COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
-    WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                  ELSE s.Organisation_Code_Code_of_Provider END
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Provider] d
-        WHERE d.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                                     THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                                     ELSE s.Organisation_Code_Code_of_Provider END
-    );
-
-    -- OP Missing Specialties
-    INSERT INTO #MissingMembers
-    SELECT 'OP', 'Specialty', s.Treatment_Function_Code, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
-    WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
-      AND s.Treatment_Function_Code IS NOT NULL
-    GROUP BY s.Treatment_Function_Code
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Specialty] d
-        WHERE d.BK_SpecialtyCode = s.Treatment_Function_Code
-    );
-
-    -- OP Missing Attendance Statuses
-    INSERT INTO #MissingMembers
-    SELECT 'OP', 'Attendance Status', NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), ''), COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
-    WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
-      AND NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '') IS NOT NULL
-    GROUP BY NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '')
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[vw_Dim_Attendance_Status] d
-        WHERE LTRIM(RTRIM(d.Attendance_Status_Code)) = NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '')
-    );
-
-    -- OP Missing GP Practices
-    INSERT INTO #MissingMembers
-    SELECT 'OP', 'GP Practice', s.GP_Practice_Code_Original_Data, COUNT(*)
-    FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
-    WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
-      AND s.GP_Practice_Code_Original_Data IS NOT NULL
-    GROUP BY s.GP_Practice_Code_Original_Data
-    HAVING NOT EXISTS (
-        SELECT 1 FROM [Analytics].[tbl_Dim_GPPractice] d
-        WHERE d.GPPractice_Code = s.GP_Practice_Code_Original_Data
-    );
-
-    -- ==========================================================================
-    -- SECTION 7: DICTIONARY VALIDATION
-    -- Compare source codes against NHS Data Dictionary (authoritative reference)
-    -- ==========================================================================
-    PRINT '>>> Section 7: Dictionary Validation';
-
-    -- Temp table for dictionary comparison
-    CREATE TABLE #DictionaryValidation (
-        Domain VARCHAR(10),
-        Dimension_Name VARCHAR(50),
-        Code VARCHAR(50),
-        Source_Record_Count BIGINT,
-        In_Dictionary BIT,
-        In_Dimension BIT,
-        Action_Required VARCHAR(100)
-    );
+    IF @Run4 = 1 AND @RunOP = 1
+    BEGIN
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
+        LEFT JOIN [Analytics].[tbl_Dim_Commissioner] d ON f.SK_CommissionerID = d.SK_CommissionerID WHERE d.SK_CommissionerID IS NULL;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Commissioner Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
+        LEFT JOIN [Analytics].[tbl_Dim_GPPractice] d ON f.SK_GPPracticeID = d.SK_GPPracticeID WHERE d.SK_GPPracticeID IS NULL AND f.SK_GPPracticeID IS NOT NULL;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'GP Practice Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
+        LEFT JOIN [Analytics].[vw_Dim_Provider] d ON f.SK_ProviderID = d.SK_ProviderID WHERE d.SK_ProviderID IS NULL;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Provider Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+
+        SELECT @OrphanCount = COUNT(*) FROM [Analytics].[tbl_Fact_OP_Activity] f
+        LEFT JOIN [Analytics].[vw_Dim_Specialty] d ON f.SK_SpecialtyID = d.SK_SpecialtyID WHERE d.SK_SpecialtyID IS NULL AND f.SK_SpecialtyID IS NOT NULL;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Referential Integrity', 'Specialty Orphans', 0, @OrphanCount, CASE WHEN @OrphanCount = 0 THEN 0 ELSE 100 END, 0,
+            CASE WHEN @OrphanCount = 0 THEN 'PASS' ELSE 'FAIL' END, FORMAT(@OrphanCount, 'N0') + ' orphan records');
+    END
 
-    -- IP Discharge Methods - Compare against Dictionary
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP', 'Discharge Method',
-           s.Discharge_Method_Hospital_Provider_Spell,
-           COUNT(*),
-           MAX(CASE WHEN dict.BK_DischargeMethodCode IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.Discharge_Method_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.BK_DischargeMethodCode IS NOT NULL AND dim.Discharge_Method_Code IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.BK_DischargeMethodCode IS NULL
-                   THEN 'Invalid code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[IP].[DischargeMethod] dict
-        ON dict.BK_DischargeMethodCode = s.Discharge_Method_Hospital_Provider_Spell
-    LEFT JOIN [Analytics].[vw_Dim_Discharge_Method] dim
-        ON dim.Discharge_Method_Code = s.Discharge_Method_Hospital_Provider_Spell
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Discharge_Method_Hospital_Provider_Spell IS NOT NULL
-    GROUP BY s.Discharge_Method_Hospital_Provider_Spell
-    HAVING MAX(CASE WHEN dim.Discharge_Method_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
-
-    -- IP Admission Methods - Compare against Dictionary
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP', 'Admission Method',
-           s.Admission_Method_Hospital_Provider_Spell,
-           COUNT(*),
-           MAX(CASE WHEN dict.BK_AdmissionMethodCode IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.Admission_Method_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.BK_AdmissionMethodCode IS NOT NULL AND dim.Admission_Method_Code IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.BK_AdmissionMethodCode IS NULL
-                   THEN 'Invalid code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[IP].[AdmissionMethods] dict
-        ON dict.BK_AdmissionMethodCode = s.Admission_Method_Hospital_Provider_Spell
-    LEFT JOIN [Analytics].[vw_Dim_Admission_Method] dim
-        ON dim.Admission_Method_Code = s.Admission_Method_Hospital_Provider_Spell
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Admission_Method_Hospital_Provider_Spell IS NOT NULL
-    GROUP BY s.Admission_Method_Hospital_Provider_Spell
-    HAVING MAX(CASE WHEN dim.Admission_Method_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
-
-    -- Commissioner - Compare against Dictionary
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP/OP', 'Commissioner',
-           CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                ELSE s.Organisation_Code_Code_of_Commissioner END,
-           COUNT(*),
-           MAX(CASE WHEN dict.CommissionerCode IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.Commissioner_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.CommissionerCode IS NOT NULL AND dim.Commissioner_Code IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.CommissionerCode IS NULL
-                   THEN 'Invalid/Unknown code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[dbo].[Commissioner] dict
-        ON dict.CommissionerCode = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                                        THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                                        ELSE s.Organisation_Code_Code_of_Commissioner END
-    LEFT JOIN [Analytics].[tbl_Dim_Commissioner] dim
-        ON dim.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                                        THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                                        ELSE s.Organisation_Code_Code_of_Commissioner END
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
-                  ELSE s.Organisation_Code_Code_of_Commissioner END
-    HAVING MAX(CASE WHEN dim.Commissioner_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
-
-    -- Specialty - Compare against Dictionary
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP/OP', 'Specialty',
-           s.Treatment_Function_Code,
-           COUNT(*),
-           MAX(CASE WHEN dict.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.BK_SpecialtyCode IS NOT NULL AND dim.BK_SpecialtyCode IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.BK_SpecialtyCode IS NULL
-                   THEN 'Invalid code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[dbo].[Specialties] dict
-        ON dict.BK_SpecialtyCode = s.Treatment_Function_Code
-    LEFT JOIN [Analytics].[vw_Dim_Specialty] dim
-        ON dim.BK_SpecialtyCode = s.Treatment_Function_Code
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.Treatment_Function_Code IS NOT NULL
-    GROUP BY s.Treatment_Function_Code
-    HAVING MAX(CASE WHEN dim.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END) = 0;
-
-    -- Provider - Compare against Dictionary.dbo.Organisation
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP/OP', 'Provider',
-           CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                ELSE s.Organisation_Code_Code_of_Provider END,
-           COUNT(*),
-           MAX(CASE WHEN dict.Organisation_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.Provider_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.Organisation_Code IS NOT NULL AND dim.Provider_Code IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.Organisation_Code IS NULL
-                   THEN 'Invalid/Unknown code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[dbo].[Organisation] dict
-        ON dict.Organisation_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+    IF @ValidationMode = 'PER_TEST'
+    BEGIN
+        -- ==========================================================================
+        -- SECTION 5: UNKNOWN/DEFAULT MEMBER RATES
+        -- ==========================================================================
+        PRINT '>>> Section 5: Unknown/Default Member Rates';
+
+        -- IP Unknown rates
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Commissioner Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown GP Practice Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Provider Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_IP_Activity] WHERE Discharge_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('IP', 'Data Quality', 'Unknown Specialty Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        -- OP Unknown rates
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_CommissionerID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Commissioner Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_GPPracticeID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown GP Practice Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_ProviderID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Provider Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        SELECT @TotalCount = COUNT(*), @UnknownCount = SUM(CASE WHEN SK_SpecialtyID = -1 THEN 1 ELSE 0 END)
+        FROM [Analytics].[tbl_Fact_OP_Activity] WHERE Appointment_Date BETWEEN @FromDate AND @ToDate;
+        SET @UnknownPct = CASE WHEN @TotalCount = 0 THEN 0 ELSE @UnknownCount * 100.0 / @TotalCount END;
+        INSERT INTO #ValidationResults VALUES ('OP', 'Data Quality', 'Unknown Specialty Rate', @TotalCount, @UnknownCount, @UnknownPct, @UnknownThresholdPct,
+            CASE WHEN @UnknownPct <= @UnknownThresholdPct THEN 'PASS' ELSE 'FAIL' END,
+            FORMAT(@UnknownPct, 'N2') + '% (' + FORMAT(@UnknownCount, 'N0') + ' of ' + FORMAT(@TotalCount, 'N0') + ')');
+
+        -- ==========================================================================
+        -- SECTION 6: MISSING DIMENSION MEMBERS
+        -- Shows source codes that don't exist in dimension tables
+        -- ==========================================================================
+        PRINT '>>> Section 6: Missing Dimension Members';
+
+        -- IP Missing Commissioners
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'Commissioner',
+            CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                 THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                 ELSE s.Organisation_Code_Code_of_Commissioner END,
+            COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                      ELSE s.Organisation_Code_Code_of_Commissioner END
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[tbl_Dim_Commissioner] d
+            WHERE d.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                                             THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                                             ELSE s.Organisation_Code_Code_of_Commissioner END
+        );
+
+        -- IP Missing Providers
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'Provider',
+            CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                 THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                 ELSE s.Organisation_Code_Code_of_Provider END,
+            COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                      ELSE s.Organisation_Code_Code_of_Provider END
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Provider] d
+            WHERE d.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
                                          THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
                                          ELSE s.Organisation_Code_Code_of_Provider END
-    LEFT JOIN [Analytics].[vw_Dim_Provider] dim
-        ON dim.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                                    THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                                    ELSE s.Organisation_Code_Code_of_Provider END
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-    GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
-                  THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
-                  ELSE s.Organisation_Code_Code_of_Provider END
-    HAVING MAX(CASE WHEN dim.Provider_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
-
-    -- GP Practice - Compare against Dictionary.dbo.Organisation
-    INSERT INTO #DictionaryValidation
-    SELECT 'IP/OP', 'GP Practice',
-           s.GP_Practice_Code_Original_Data,
-           COUNT(*),
-           MAX(CASE WHEN dict.Organisation_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE WHEN dim.GPPractice_Code IS NOT NULL THEN 1 ELSE 0 END),
-           MAX(CASE
-               WHEN dict.Organisation_Code IS NOT NULL AND dim.GPPractice_Code IS NULL
-                   THEN 'Add to Dimension (valid NHS code)'
-               WHEN dict.Organisation_Code IS NULL
-                   THEN 'Invalid/Unknown code (not in NHS Dictionary)'
-               ELSE 'OK'
-           END)
-    FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
-    LEFT JOIN [Dictionary].[dbo].[Organisation] dict
-        ON dict.Organisation_Code = s.GP_Practice_Code_Original_Data
-    LEFT JOIN [Analytics].[tbl_Dim_GPPractice] dim
-        ON dim.GPPractice_Code = s.GP_Practice_Code_Original_Data
-    WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
-      AND s.GP_Practice_Code_Original_Data IS NOT NULL
-    GROUP BY s.GP_Practice_Code_Original_Data
-    HAVING MAX(CASE WHEN dim.GPPractice_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+        );
+
+        -- IP Missing Specialties
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'Specialty', s.Treatment_Function_Code, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Treatment_Function_Code IS NOT NULL
+        GROUP BY s.Treatment_Function_Code
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Specialty] d
+            WHERE d.BK_SpecialtyCode = s.Treatment_Function_Code
+        );
+
+        -- IP Missing Admission Methods
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'Admission Method', s.Admission_Method_Hospital_Provider_Spell, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Admission_Method_Hospital_Provider_Spell IS NOT NULL
+        GROUP BY s.Admission_Method_Hospital_Provider_Spell
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Admission_Method] d
+            WHERE d.Admission_Method_Code = s.Admission_Method_Hospital_Provider_Spell
+        );
+
+        -- IP Missing Discharge Methods
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'Discharge Method', s.Discharge_Method_Hospital_Provider_Spell, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Discharge_Method_Hospital_Provider_Spell IS NOT NULL
+        GROUP BY s.Discharge_Method_Hospital_Provider_Spell
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Discharge_Method] d
+            WHERE d.Discharge_Method_Code = s.Discharge_Method_Hospital_Provider_Spell
+        );
+
+        -- IP Missing GP Practices
+        INSERT INTO #MissingMembers
+        SELECT 'IP', 'GP Practice', s.GP_Practice_Code_Original_Data, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.GP_Practice_Code_Original_Data IS NOT NULL
+        GROUP BY s.GP_Practice_Code_Original_Data
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[tbl_Dim_GPPractice] d
+            WHERE d.GPPractice_Code = s.GP_Practice_Code_Original_Data
+        );
+
+        -- OP Missing Commissioners
+        INSERT INTO #MissingMembers
+        SELECT 'OP', 'Commissioner',
+            CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                 THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                 ELSE s.Organisation_Code_Code_of_Commissioner END,
+            COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
+        WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                      ELSE s.Organisation_Code_Code_of_Commissioner END
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[tbl_Dim_Commissioner] d
+            WHERE d.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                                             THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                                             ELSE s.Organisation_Code_Code_of_Commissioner END
+        );
+
+        -- OP Missing Providers
+        INSERT INTO #MissingMembers
+        SELECT 'OP', 'Provider',
+            CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                 THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                 ELSE s.Organisation_Code_Code_of_Provider END,
+            COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
+        WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                      ELSE s.Organisation_Code_Code_of_Provider END
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Provider] d
+            WHERE d.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                                         THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                                         ELSE s.Organisation_Code_Code_of_Provider END
+        );
+
+        -- OP Missing Specialties
+        INSERT INTO #MissingMembers
+        SELECT 'OP', 'Specialty', s.Treatment_Function_Code, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
+        WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
+          AND s.Treatment_Function_Code IS NOT NULL
+        GROUP BY s.Treatment_Function_Code
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Specialty] d
+            WHERE d.BK_SpecialtyCode = s.Treatment_Function_Code
+        );
+
+        -- OP Missing Attendance Statuses
+        INSERT INTO #MissingMembers
+        SELECT 'OP', 'Attendance Status', NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), ''), COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
+        WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
+          AND NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '') IS NOT NULL
+        GROUP BY NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '')
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[vw_Dim_Attendance_Status] d
+            WHERE LTRIM(RTRIM(d.Attendance_Status_Code)) = NULLIF(LTRIM(RTRIM(s.Attended_Or_Did_Not_Attend)), '')
+        );
+
+        -- OP Missing GP Practices
+        INSERT INTO #MissingMembers
+        SELECT 'OP', 'GP Practice', s.GP_Practice_Code_Original_Data, COUNT(*)
+        FROM [Data_Lab_SWL].[Unified].[tbl_OP_EncounterDenormalised_Active] s
+        WHERE s.Appointment_Date BETWEEN @FromDate AND @ToDate
+          AND s.GP_Practice_Code_Original_Data IS NOT NULL
+        GROUP BY s.GP_Practice_Code_Original_Data
+        HAVING NOT EXISTS (
+            SELECT 1 FROM [Analytics].[tbl_Dim_GPPractice] d
+            WHERE d.GPPractice_Code = s.GP_Practice_Code_Original_Data
+        );
+
+        -- ==========================================================================
+        -- SECTION 7: DICTIONARY VALIDATION
+        -- Compare source codes against NHS Data Dictionary (authoritative reference)
+        -- ==========================================================================
+        PRINT '>>> Section 7: Dictionary Validation';
+
+        -- IP Discharge Methods - Compare against Dictionary
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP', 'Discharge Method',
+               s.Discharge_Method_Hospital_Provider_Spell,
+               COUNT(*),
+               MAX(CASE WHEN dict.BK_DischargeMethodCode IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.Discharge_Method_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.BK_DischargeMethodCode IS NOT NULL AND dim.Discharge_Method_Code IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.BK_DischargeMethodCode IS NULL
+                       THEN 'Invalid code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[IP].[DischargeMethod] dict
+            ON dict.BK_DischargeMethodCode = s.Discharge_Method_Hospital_Provider_Spell
+        LEFT JOIN [Analytics].[vw_Dim_Discharge_Method] dim
+            ON dim.Discharge_Method_Code = s.Discharge_Method_Hospital_Provider_Spell
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Discharge_Method_Hospital_Provider_Spell IS NOT NULL
+        GROUP BY s.Discharge_Method_Hospital_Provider_Spell
+        HAVING MAX(CASE WHEN dim.Discharge_Method_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+
+        -- IP Admission Methods - Compare against Dictionary
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP', 'Admission Method',
+               s.Admission_Method_Hospital_Provider_Spell,
+               COUNT(*),
+               MAX(CASE WHEN dict.BK_AdmissionMethodCode IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.Admission_Method_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.BK_AdmissionMethodCode IS NOT NULL AND dim.Admission_Method_Code IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.BK_AdmissionMethodCode IS NULL
+                       THEN 'Invalid code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[IP].[AdmissionMethods] dict
+            ON dict.BK_AdmissionMethodCode = s.Admission_Method_Hospital_Provider_Spell
+        LEFT JOIN [Analytics].[vw_Dim_Admission_Method] dim
+            ON dim.Admission_Method_Code = s.Admission_Method_Hospital_Provider_Spell
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Admission_Method_Hospital_Provider_Spell IS NOT NULL
+        GROUP BY s.Admission_Method_Hospital_Provider_Spell
+        HAVING MAX(CASE WHEN dim.Admission_Method_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+
+        -- Commissioner - Compare against Dictionary
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP/OP', 'Commissioner',
+               CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                    THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                    ELSE s.Organisation_Code_Code_of_Commissioner END,
+               COUNT(*),
+               MAX(CASE WHEN dict.CommissionerCode IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.Commissioner_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.CommissionerCode IS NOT NULL AND dim.Commissioner_Code IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.CommissionerCode IS NULL
+                       THEN 'Invalid/Unknown code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[dbo].[Commissioner] dict
+            ON dict.CommissionerCode = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                                            THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                                            ELSE s.Organisation_Code_Code_of_Commissioner END
+        LEFT JOIN [Analytics].[tbl_Dim_Commissioner] dim
+            ON dim.Commissioner_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                                            THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                                            ELSE s.Organisation_Code_Code_of_Commissioner END
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Commissioner, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Commissioner, 3)
+                      ELSE s.Organisation_Code_Code_of_Commissioner END
+        HAVING MAX(CASE WHEN dim.Commissioner_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+
+        -- Specialty - Compare against Dictionary
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP/OP', 'Specialty',
+               s.Treatment_Function_Code,
+               COUNT(*),
+               MAX(CASE WHEN dict.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.BK_SpecialtyCode IS NOT NULL AND dim.BK_SpecialtyCode IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.BK_SpecialtyCode IS NULL
+                       THEN 'Invalid code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[dbo].[Specialties] dict
+            ON dict.BK_SpecialtyCode = s.Treatment_Function_Code
+        LEFT JOIN [Analytics].[vw_Dim_Specialty] dim
+            ON dim.BK_SpecialtyCode = s.Treatment_Function_Code
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.Treatment_Function_Code IS NOT NULL
+        GROUP BY s.Treatment_Function_Code
+        HAVING MAX(CASE WHEN dim.BK_SpecialtyCode IS NOT NULL THEN 1 ELSE 0 END) = 0;
+
+        -- Provider - Compare against Dictionary.dbo.Organisation
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP/OP', 'Provider',
+               CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                    THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                    ELSE s.Organisation_Code_Code_of_Provider END,
+               COUNT(*),
+               MAX(CASE WHEN dict.Organisation_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.Provider_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.Organisation_Code IS NOT NULL AND dim.Provider_Code IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.Organisation_Code IS NULL
+                       THEN 'Invalid/Unknown code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[dbo].[Organisation] dict
+            ON dict.Organisation_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                                             THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                                             ELSE s.Organisation_Code_Code_of_Provider END
+        LEFT JOIN [Analytics].[vw_Dim_Provider] dim
+            ON dim.Provider_Code = CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                                        THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                                        ELSE s.Organisation_Code_Code_of_Provider END
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+        GROUP BY CASE WHEN RIGHT(s.Organisation_Code_Code_of_Provider, 2) = '00'
+                      THEN LEFT(s.Organisation_Code_Code_of_Provider, 3)
+                      ELSE s.Organisation_Code_Code_of_Provider END
+        HAVING MAX(CASE WHEN dim.Provider_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+
+        -- GP Practice - Compare against Dictionary.dbo.Organisation
+        INSERT INTO #DictionaryValidation
+        SELECT 'IP/OP', 'GP Practice',
+               s.GP_Practice_Code_Original_Data,
+               COUNT(*),
+               MAX(CASE WHEN dict.Organisation_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE WHEN dim.GPPractice_Code IS NOT NULL THEN 1 ELSE 0 END),
+               MAX(CASE
+                   WHEN dict.Organisation_Code IS NOT NULL AND dim.GPPractice_Code IS NULL
+                       THEN 'Add to Dimension (valid NHS code)'
+                   WHEN dict.Organisation_Code IS NULL
+                       THEN 'Invalid/Unknown code (not in NHS Dictionary)'
+                   ELSE 'OK'
+               END)
+        FROM [Data_Lab_SWL].[Unified].[tbl_IP_EncounterDenormalised_Active] s
+        LEFT JOIN [Dictionary].[dbo].[Organisation] dict
+            ON dict.Organisation_Code = s.GP_Practice_Code_Original_Data
+        LEFT JOIN [Analytics].[tbl_Dim_GPPractice] dim
+            ON dim.GPPractice_Code = s.GP_Practice_Code_Original_Data
+        WHERE s.End_Date_Hospital_Provider_Spell BETWEEN @FromDate AND @ToDate
+          AND s.GP_Practice_Code_Original_Data IS NOT NULL
+        GROUP BY s.GP_Practice_Code_Original_Data
+        HAVING MAX(CASE WHEN dim.GPPractice_Code IS NOT NULL THEN 1 ELSE 0 END) = 0;
+    END
 
     -- ==========================================================================
     -- OUTPUT RESULTS
@@ -1128,6 +1575,7 @@ BEGIN
     DROP TABLE #DistributionHealth;
     DROP TABLE #MissingMembers;
     DROP TABLE #DictionaryValidation;
+    DROP TABLE #ScanCounts;
 END
 GO
 
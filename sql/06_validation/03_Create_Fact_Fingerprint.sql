@@ -0,0 +1,706 @@
+/**
+-- Script Name: 03_Create_Fact_Fingerprint.sql
+-- Description: Partition-level fingerprint reconciliation between Unified source and Analytics facts.
+--              Grain: Dataset + Activity Month + Provider.
+--              Each bucket stores row count, sum of hashed encounter keys and sum of cost
+--              for both sides, captured after every fact load. Mismatched buckets are
+--              drilled into provider -> day -> encounter without re-reading clean months.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-28
+
+-- Change Log:
+-- 2026-03-28   | Sridhar Peddi    | Initial creation - fingerprint table, source/target TVFs, capture + reconcile procs
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating Fact Fingerprint Reconciliation';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Reconcile_Fact_Fingerprint]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Reconcile_Fact_Fingerprint];
+GO
+
+IF OBJECT_ID('[Analytics].[sp_Capture_Fact_Fingerprint]', 'P') IS NOT NULL
+    DROP PROCEDURE [Analytics].[sp_Capture_Fact_Fingerprint];
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Fact_Fingerprint_Target]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Fact_Fingerprint_Target];
+GO
+
+IF OBJECT_ID('[Analytics].[fn_Fact_Fingerprint_Source]', 'IF') IS NOT NULL
+    DROP FUNCTION [Analytics].[fn_Fact_Fingerprint_Source];
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_ETL_Fact_Fingerprint]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_ETL_Fact_Fingerprint] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_ETL_Fact_Fingerprint];
+END
+GO
+
+/**
+-- Table Name:  tbl_ETL_Fact_Fingerprint
+-- Description: Latest fingerprint per bucket (replaced for the window months on each capture).
+--              Key_Hash is the sum of the first 8 bytes of SHA2_256(SK_EncounterID|date),
+--              so a swapped encounter changes it even when count and cost still agree.
+--              Window_*_Date is the load window the bucket was captured for (the first
+--              and last month can be partial); the drill-down reuses it.
+**/
+CREATE TABLE [Analytics].[tbl_ETL_Fact_Fingerprint] (
+    [Dataset] VARCHAR(2) NOT NULL,                     -- 'IP', 'OP'
+    [Activity_Month] INT NOT NULL,                     -- 202504, 202505
+    [SK_ProviderID] INT NOT NULL,
+
+    -- SOURCE (Unified, after loader filters + dedupe)
+    [Source_Row_Count] BIGINT NOT NULL,
+    [Source_Key_Hash] DECIMAL(38,0) NOT NULL,
+    [Source_Cost] DECIMAL(38,2) NOT NULL,
+
+    -- TARGET (Analytics fact)
+    [Target_Row_Count] BIGINT NOT NULL,
+    [Target_Key_Hash] DECIMAL(38,0) NOT NULL,
+    [Target_Cost] DECIMAL(38,2) NOT NULL,
+
+    [Is_Match] AS CAST(
+        CASE WHEN [Source_Row_Count] = [Target_Row_Count]
+              AND [Source_Key_Hash] = [Target_Key_Hash]
+              AND [Source_Cost] = [Target_Cost]
+             THEN 1 ELSE 0 END AS BIT),
+
+    -- AUDIT
+    [Window_From_Date] DATE NOT NULL,
+    [Window_To_Date] DATE NOT NULL,
+    [Batch_ID] INT NULL,
+    [Captured_DateTime] DATETIME2 NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT [PK_ETL_Fact_Fingerprint]
+        PRIMARY KEY CLUSTERED ([Dataset], [Activity_Month], [SK_ProviderID])
+) ON [PRIMARY];
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_ETL_Fact_Fingerprint]';
+GO
+
+/**
+-- Function Name: fn_Fact_Fingerprint_Source
+-- Description:   Source rows the fact loaders would insert for the window, one row per
+--                (SK_EncounterID, activity date): same window, negative-LOS filter (IP),
+--                dedupe order and provider key lookup as sp_Load_Fact_IP/OP_Activity.
+--                Reads [Analytics].[fn_Src_*_Encounter](@UseWorkSource): Unified when 0, the
+--                orchestrator's work tables when 1.
+-- Example:
+--   SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Source]('IP', '2025-04-01', '2025-04-30', 0);
+**/
+CREATE FUNCTION [Analytics].[fn_Fact_Fingerprint_Source]
+(
+    @Dataset VARCHAR(2),
+    @FromDate DATE,
+    @ToDate DATE,
+    @UseWorkSource BIT
+)
+RETURNS TABLE
+AS
+RETURN
+    WITH IPWindow AS (
+        SELECT
+            SRC.SK_EncounterID,
+            CAST(SRC.End_Date_Hospital_Provider_Spell AS DATE) AS Activity_Date,
+            CAST(
+                CASE
+                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
+                        THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
+                    ELSE SRC.Organisation_Code_Code_of_Provider
+                END AS VARCHAR(100)) AS Provider_Key,
+            CAST(SRC.Pbr_Final_Tariff AS DECIMAL(12,2)) AS Total_Cost,
+            ROW_NUMBER() OVER (
+                PARTITION BY SRC.SK_EncounterID, CAST(SRC.End_Date_Hospital_Provider_Spell AS DATE)
+                ORDER BY SRC.Start_Date_Hospital_Provider_Spell DESC, SRC.End_Date_Hospital_Provider_Spell DESC
+            ) AS RowNum
+        FROM [Analytics].[fn_Src_IP_Encounter](@UseWorkSource) SRC
+        WHERE @Dataset = 'IP'
+          AND SRC.End_Date_Hospital_Provider_Spell >= @FromDate
+          AND SRC.End_Date_Hospital_Provider_Spell < DATEADD(DAY, 1, @ToDate)
+          AND (TRY_CAST(SRC.dv_LengthOfStay_Gross AS INT) IS NULL
+               OR TRY_CAST(SRC.dv_LengthOfStay_Gross AS INT) >= 0)
+    ),
+    OPWindow AS (
+        SELECT
+            SRC.SK_EncounterID,
+            CAST(SRC.Appointment_Date AS DATE) AS Activity_Date,
+            CAST(
+                CASE
+                    WHEN RIGHT(SRC.Organisation_Code_Code_of_Provider, 2) = '00'
+                        THEN LEFT(SRC.Organisation_Code_Code_of_Provider, 3)
+                    ELSE SRC.Organisation_Code_Code_of_Provider
+                END AS VARCHAR(100)) AS Provider_Key,
+            TRY_CAST(SRC.Pbr_Final_Tariff AS DECIMAL(12,2)) AS Total_Cost,
+            ROW_NUMBER() OVER (
+                PARTITION BY SRC.SK_EncounterID, CAST(SRC.Appointment_Date AS DATE)
+                ORDER BY SRC.Appointment_Date DESC, SRC.Referral_Request_Received_Date DESC
+            ) AS RowNum
+        FROM [Analytics].[fn_Src_OP_Encounter](@UseWorkSource) SRC
+        WHERE @Dataset = 'OP'
+          AND SRC.Appointment_Date >= @FromDate
+          AND SRC.Appointment_Date < DATEADD(DAY, 1, @ToDate)
+    ),
+    Deduped AS (
+        SELECT CAST('IP' AS VARCHAR(2)) AS Dataset, SK_EncounterID, Activity_Date, Provider_Key, Total_Cost
+        FROM IPWindow
+        WHERE RowNum = 1
+
+        UNION ALL
+
+        SELECT CAST('OP' AS VARCHAR(2)) AS Dataset, SK_EncounterID, Activity_Date, Provider_Key, Total_Cost
+        FROM OPWindow
+        WHERE RowNum = 1
+    )
+    SELECT
+        d.Dataset,
+        d.SK_EncounterID,
+        d.Activity_Date,
+        ISNULL(Pr.SK_ID, -1) AS SK_ProviderID,
+        d.Total_Cost,
+        CAST(CAST(HASHBYTES('SHA2_256',
+            CONCAT(d.SK_EncounterID, '|', CONVERT(CHAR(8), d.Activity_Date, 112))) AS BINARY(8)) AS BIGINT) AS Key_Hash
+    FROM Deduped d
+    LEFT JOIN [Analytics].[tbl_Dim_Key_Lookup] Pr
+        ON Pr.Lookup_Name = 'Provider' AND Pr.Lookup_Code = d.Provider_Key;
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Fact_Fingerprint_Source]';
+GO
+
+/**
+-- Function Name: fn_Fact_Fingerprint_Target
+-- Description:   Fact rows for the window in the same shape as fn_Fact_Fingerprint_Source.
+-- Example:
+--   SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Target]('OP', '2025-04-01', '2025-04-30');
+**/
+CREATE FUNCTION [Analytics].[fn_Fact_Fingerprint_Target]
+(
+    @Dataset VARCHAR(2),
+    @FromDate DATE,
+    @ToDate DATE
+)
+RETURNS TABLE
+AS
+RETURN
+    WITH FactRows AS (
+        SELECT CAST('IP' AS VARCHAR(2)) AS Dataset, f.SK_EncounterID, f.Discharge_Date AS Activity_Date,
+               f.SK_ProviderID, f.Total_Cost
+        FROM [Analytics].[tbl_Fact_IP_Activity] f
+        WHERE @Dataset = 'IP'
+          AND f.Discharge_Date >= @FromDate
+          AND f.Discharge_Date <= @ToDate
+
+        UNION ALL
+
+        SELECT CAST('OP' AS VARCHAR(2)) AS Dataset, f.SK_EncounterID, f.Appointment_Date AS Activity_Date,
+               f.SK_ProviderID, f.Total_Cost
+        FROM [Analytics].[tbl_Fact_OP_Activity] f
+        WHERE @Dataset = 'OP'
+          AND f.Appointment_Date >= @FromDate
+          AND f.Appointment_Date <= @ToDate
+    )
+    SELECT
+        r.Dataset,
+        r.SK_EncounterID,
+        r.Activity_Date,
+        r.SK_ProviderID,
+        r.Total_Cost,
+        CAST(CAST(HASHBYTES('SHA2_256',
+            CONCAT(r.SK_EncounterID, '|', CONVERT(CHAR(8), r.Activity_Date, 112))) AS BINARY(8)) AS BIGINT) AS Key_Hash
+    FROM FactRows r;
+GO
+
+PRINT '[OK] Created function: [Analytics].[fn_Fact_Fingerprint_Target]';
+GO
+
+/**
+Script Name:   sp_Capture_Fact_Fingerprint
+Description:   Stores month x provider fingerprints (count, key hash, cost) for source and fact.
+Author:        Sridhar Peddi
+Created:       2026-03-28
+
+Notes:
+- Same window defaults as the fact loaders (ToDate = SUS cutoff, FromDate = 5 months back).
+- Every month touched by the window is replaced in tbl_ETL_Fact_Fingerprint.
+- Run after fact loads (called by sp_Run_Fact_Loads_With_Enrichment with @UseWorkSource = 1,
+  before the work tables are cleared, so the source side reads the run's extract).
+- @Dataset NULL = IP and OP.
+**/
+CREATE PROCEDURE [Analytics].[sp_Capture_Fact_Fingerprint]
+    @FromDate DATE = NULL,
+    @ToDate DATE = NULL,
+    @Dataset VARCHAR(2) = NULL,
+    @UseWorkSource BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF @UseWorkSource = 1
+       AND ISNULL(APPLOCK_MODE('public', 'Analytics.Fact_Source_Window', 'Session'), 'NoLock') <> 'Exclusive'
+    BEGIN
+        RAISERROR('@UseWorkSource = 1 is only valid inside sp_Run_Fact_Loads_With_Enrichment (work tables are run-scoped).', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @ETL_Start DATETIME2 = CURRENT_TIMESTAMP;
+    DECLARE @BatchName VARCHAR(100) = 'Fact_Fingerprint';
+    DECLARE @BatchID INT = NULL;
+    DECLARE @RowsInserted INT = 0;
+    DECLARE @RowsDeleted INT = 0;
+    DECLARE @Mismatched INT = 0;
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ToDateActual DATE = ISNULL(@ToDate, [Analytics].[fn_SUS_Published_Cutoff_Date](NULL));
+    DECLARE @FromDateActual DATE;
+    DECLARE @FromMonth INT;
+    DECLARE @ToMonth INT;
+
+    SET @ToDateActual = ISNULL(@ToDateActual, CAST(GETDATE() AS DATE));
+    SET @FromDateActual = ISNULL(
+        @FromDate,
+        DATEADD(MONTH, -5, DATEFROMPARTS(YEAR(@ToDateActual), MONTH(@ToDateActual), 1))
+    );
+
+    IF @ToDateActual < @FromDateActual
+    BEGIN
+        RAISERROR('ToDate must be on or after FromDate.', 16, 1);
+        RETURN;
+    END
+
+    IF @Dataset IS NOT NULL AND @Dataset NOT IN ('IP', 'OP')
+    BEGIN
+        RAISERROR('@Dataset must be IP, OP or NULL.', 16, 1);
+        RETURN;
+    END
+
+    SET @FromMonth = YEAR(@FromDateActual) * 100 + MONTH(@FromDateActual);
+    SET @ToMonth = YEAR(@ToDateActual) * 100 + MONTH(@ToDateActual);
+
+    BEGIN TRY
+        EXEC [Analytics].[sp_Start_ETL_Batch]
+            @BatchName = @BatchName,
+            @BatchID = @BatchID OUTPUT,
+            @WindowFromDate = @FromDateActual,
+            @WindowToDate = @ToDateActual;
+
+        PRINT 'Capturing Fact Fingerprints: ' + CONVERT(VARCHAR(10), @FromDateActual, 120)
+            + ' to ' + CONVERT(VARCHAR(10), @ToDateActual, 120);
+
+        IF OBJECT_ID('tempdb..#Fingerprint') IS NOT NULL
+            DROP TABLE #Fingerprint;
+
+        CREATE TABLE #Fingerprint (
+            Dataset VARCHAR(2) NOT NULL,
+            Side CHAR(1) NOT NULL,                     -- 'S' source, 'T' target
+            Activity_Month INT NOT NULL,
+            SK_ProviderID INT NOT NULL,
+            Row_Count BIGINT NOT NULL,
+            Key_Hash DECIMAL(38,0) NOT NULL,
+            Cost DECIMAL(38,2) NOT NULL
+        );
+
+        -- 1. One grouped pass per dataset and side
+        INSERT INTO #Fingerprint
+        SELECT s.Dataset, 'S',
+               YEAR(s.Activity_Date) * 100 + MONTH(s.Activity_Date),
+               s.SK_ProviderID,
+               COUNT_BIG(1),
+               SUM(CAST(s.Key_Hash AS DECIMAL(38,0))),
+               ISNULL(SUM(CAST(s.Total_Cost AS DECIMAL(38,2))), 0)
+        FROM (
+            SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Source]('IP', @FromDateActual, @ToDateActual, @UseWorkSource)
+            WHERE ISNULL(@Dataset, 'IP') = 'IP'
+            UNION ALL
+            SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Source]('OP', @FromDateActual, @ToDateActual, @UseWorkSource)
+            WHERE ISNULL(@Dataset, 'OP') = 'OP'
+        ) s
+        GROUP BY s.Dataset, YEAR(s.Activity_Date) * 100 + MONTH(s.Activity_Date), s.SK_ProviderID;
+
+        INSERT INTO #Fingerprint
+        SELECT t.Dataset, 'T',
+               YEAR(t.Activity_Date) * 100 + MONTH(t.Activity_Date),
+               t.SK_ProviderID,
+               COUNT_BIG(1),
+               SUM(CAST(t.Key_Hash AS DECIMAL(38,0))),
+               ISNULL(SUM(CAST(t.Total_Cost AS DECIMAL(38,2))), 0)
+        FROM (
+            SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Target]('IP', @FromDateActual, @ToDateActual)
+            WHERE ISNULL(@Dataset, 'IP') = 'IP'
+            UNION ALL
+            SELECT * FROM [Analytics].[fn_Fact_Fingerprint_Target]('OP', @FromDateActual, @ToDateActual)
+            WHERE ISNULL(@Dataset, 'OP') = 'OP'
+        ) t
+        GROUP BY t.Dataset, YEAR(t.Activity_Date) * 100 + MONTH(t.Activity_Date), t.SK_ProviderID;
+
+        -- 2. Replace the window months
+        DELETE FROM [Analytics].[tbl_ETL_Fact_Fingerprint]
+        WHERE (@Dataset IS NULL OR [Dataset] = @Dataset)
+          AND [Activity_Month] >= @FromMonth
+          AND [Activity_Month] <= @ToMonth;
+
+        SET @RowsDeleted = @@ROWCOUNT;
+
+        INSERT INTO [Analytics].[tbl_ETL_Fact_Fingerprint] (
+            [Dataset],
+            [Activity_Month],
+            [SK_ProviderID],
+            [Source_Row_Count],
+            [Source_Key_Hash],
+            [Source_Cost],
+            [Target_Row_Count],
+            [Target_Key_Hash],
+            [Target_Cost],
+            [Window_From_Date],
+            [Window_To_Date],
+            [Batch_ID],
+            [Captured_DateTime]
+        )
+        SELECT
+            fp.Dataset,
+            fp.Activity_Month,
+            fp.SK_ProviderID,
+            SUM(CASE WHEN fp.Side = 'S' THEN fp.Row_Count ELSE 0 END),
+            SUM(CASE WHEN fp.Side = 'S' THEN fp.Key_Hash ELSE 0 END),
+            SUM(CASE WHEN fp.Side = 'S' THEN fp.Cost ELSE 0 END),
+            SUM(CASE WHEN fp.Side = 'T' THEN fp.Row_Count ELSE 0 END),
+            SUM(CASE WHEN fp.Side = 'T' THEN fp.Key_Hash ELSE 0 END),
+            SUM(CASE WHEN fp.Side = 'T' THEN fp.Cost ELSE 0 END),
+            @FromDateActual,
+            @ToDateActual,
+            @BatchID,
+            @ETL_Start
+        FROM #Fingerprint fp
+        GROUP BY fp.Dataset, fp.Activity_Month, fp.SK_ProviderID;
+
+        SET @RowsInserted = @@ROWCOUNT;
+
+        SELECT @Mismatched = COUNT(*)
+        FROM [Analytics].[tbl_ETL_Fact_Fingerprint]
+        WHERE (@Dataset IS NULL OR [Dataset] = @Dataset)
+          AND [Activity_Month] >= @FromMonth
+          AND [Activity_Month] <= @ToMonth
+          AND [Is_Match] = 0;
+
+        PRINT 'Buckets Captured: ' + CAST(@RowsInserted AS VARCHAR(20));
+        IF @Mismatched > 0
+            PRINT '[INFO] ' + CAST(@Mismatched AS VARCHAR(20))
+                + ' mismatched buckets - run sp_Reconcile_Fact_Fingerprint to drill down.';
+        ELSE
+            PRINT '[OK] All fingerprint buckets match.';
+
+        EXEC [Analytics].[sp_Log_Table_Load]
+            @BatchID = @BatchID,
+            @TableName = 'Analytics.tbl_ETL_Fact_Fingerprint',
+            @LoadType = 'Incremental',
+            @RowsAffected = @RowsInserted,
+            @Status = 'Success',
+            @StartDateTime = @ETL_Start;
+
+        EXEC [Analytics].[sp_End_ETL_Batch]
+            @BatchID = @BatchID,
+            @Status = 'Success',
+            @RowsInserted = @RowsInserted,
+            @RowsUpdated = 0,
+            @RowsDeleted = @RowsDeleted,
+            @RowsFailed = 0,
+            @ErrorMessage = NULL;
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+        PRINT 'Error Capturing Fact Fingerprints: ' + ISNULL(@ErrorMessage, '');
+        IF @BatchID IS NOT NULL
+        BEGIN
+            EXEC [Analytics].[sp_Log_Table_Load]
+                @BatchID = @BatchID,
+                @TableName = 'Analytics.tbl_ETL_Fact_Fingerprint',
+                @LoadType = 'Incremental',
+                @RowsAffected = 0,
+                @RowsFailed = 1,
+                @Status = 'Failed',
+                @ErrorMessage = @ErrorMessage;
+
+            EXEC [Analytics].[sp_End_ETL_Batch]
+                @BatchID = @BatchID,
+                @Status = 'Failed',
+                @RowsInserted = 0,
+                @RowsUpdated = 0,
+                @RowsDeleted = 0,
+                @RowsFailed = 1,
+                @ErrorMessage = @ErrorMessage;
+        END
+        RAISERROR(@ErrorMessage, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Capture_Fact_Fingerprint]';
+GO
+
+/**
+Script Name:   sp_Reconcile_Fact_Fingerprint
+Description:   Drills mismatched fingerprint buckets down to the encounters that differ.
+Author:        Sridhar Peddi
+Created:       2026-03-28
+
+Notes:
+- Level 1 (provider): mismatched rows of tbl_ETL_Fact_Fingerprint in the month range.
+- Level 2 (day): per-day fingerprints, only for the mismatched month x provider buckets.
+- Level 3 (encounter): FULL OUTER JOIN on (SK_EncounterID, date), only for mismatched days.
+  Issue: MISSING_IN_FACT, NOT_IN_SOURCE, COST_DIFF, PROVIDER_DIFF.
+- Clean months are never re-read; run sp_Capture_Fact_Fingerprint first (or @Recapture = 1)
+  if the facts were reloaded outside the orchestrator.
+- Returns three result sets (buckets, days, encounters).
+
+Usage:
+    EXEC [Analytics].[sp_Reconcile_Fact_Fingerprint]
+        @FromMonth = 202504,
+        @ToMonth = 202512,
+        @Dataset = 'IP',
+        @MaxEncounters = 1000;
+**/
+CREATE PROCEDURE [Analytics].[sp_Reconcile_Fact_Fingerprint]
+    @FromMonth INT = NULL,
+    @ToMonth INT = NULL,
+    @Dataset VARCHAR(2) = NULL,
+    @Recapture BIT = 0,
+    @MaxEncounters INT = 1000
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @BucketCount INT = 0;
+    DECLARE @DayCount INT = 0;
+    DECLARE @EncounterCount INT = 0;
+    DECLARE @CaptureFrom DATE;
+    DECLARE @CaptureTo DATE;
+
+    IF @Dataset IS NOT NULL AND @Dataset NOT IN ('IP', 'OP')
+    BEGIN
+        RAISERROR('@Dataset must be IP, OP or NULL.', 16, 1);
+        RETURN;
+    END
+
+    IF @Recapture = 1
+    BEGIN
+        IF @FromMonth IS NOT NULL
+            SET @CaptureFrom = DATEFROMPARTS(@FromMonth / 100, @FromMonth % 100, 1);
+        IF @ToMonth IS NOT NULL
+            SET @CaptureTo = EOMONTH(DATEFROMPARTS(@ToMonth / 100, @ToMonth % 100, 1));
+
+        EXEC [Analytics].[sp_Capture_Fact_Fingerprint]
+            @FromDate = @CaptureFrom,
+            @ToDate = @CaptureTo,
+            @Dataset = @Dataset;
+    END
+
+    IF OBJECT_ID('tempdb..#Buckets') IS NOT NULL
+        DROP TABLE #Buckets;
+    IF OBJECT_ID('tempdb..#DayDiff') IS NOT NULL
+        DROP TABLE #DayDiff;
+    IF OBJECT_ID('tempdb..#EncounterDiff') IS NOT NULL
+        DROP TABLE #EncounterDiff;
+
+    -- 1. Mismatched buckets, with the date range each one was captured over
+    SELECT
+        fp.Dataset,
+        fp.Activity_Month,
+        fp.SK_ProviderID,
+        CASE WHEN fp.Window_From_Date > DATEFROMPARTS(fp.Activity_Month / 100, fp.Activity_Month % 100, 1)
+             THEN fp.Window_From_Date
+             ELSE DATEFROMPARTS(fp.Activity_Month / 100, fp.Activity_Month % 100, 1) END AS Bucket_From_Date,
+        CASE WHEN fp.Window_To_Date < EOMONTH(DATEFROMPARTS(fp.Activity_Month / 100, fp.Activity_Month % 100, 1))
+             THEN fp.Window_To_Date
+             ELSE EOMONTH(DATEFROMPARTS(fp.Activity_Month / 100, fp.Activity_Month % 100, 1)) END AS Bucket_To_Date,
+        fp.Source_Row_Count,
+        fp.Target_Row_Count,
+        fp.Source_Cost,
+        fp.Target_Cost,
+        CAST(CASE WHEN fp.Source_Key_Hash = fp.Target_Key_Hash THEN 1 ELSE 0 END AS BIT) AS Key_Hash_Match
+    INTO #Buckets
+    FROM [Analytics].[tbl_ETL_Fact_Fingerprint] fp
+    WHERE fp.Is_Match = 0
+      AND (@Dataset IS NULL OR fp.Dataset = @Dataset)
+      AND (@FromMonth IS NULL OR fp.Activity_Month >= @FromMonth)
+      AND (@ToMonth IS NULL OR fp.Activity_Month <= @ToMonth);
+
+    SET @BucketCount = @@ROWCOUNT;
+
+    IF @BucketCount = 0
+    BEGIN
+        PRINT '[OK] All fingerprint buckets match - nothing to drill into.';
+        RETURN;
+    END
+
+    PRINT '[INFO] Mismatched month x provider buckets: ' + CAST(@BucketCount AS VARCHAR(20));
+
+    CREATE TABLE #DayDiff (
+        Dataset VARCHAR(2) NOT NULL,
+        Activity_Date DATE NOT NULL,
+        SK_ProviderID INT NOT NULL,
+        Source_Row_Count BIGINT NOT NULL,
+        Source_Key_Hash DECIMAL(38,0) NOT NULL,
+        Source_Cost DECIMAL(38,2) NOT NULL,
+        Target_Row_Count BIGINT NOT NULL,
+        Target_Key_Hash DECIMAL(38,0) NOT NULL,
+        Target_Cost DECIMAL(38,2) NOT NULL
+    );
+
+    CREATE TABLE #EncounterDiff (
+        Dataset VARCHAR(2) NOT NULL,
+        Activity_Date DATE NOT NULL,
+        SK_EncounterID BIGINT NOT NULL,
+        Source_SK_ProviderID INT NULL,
+        Target_SK_ProviderID INT NULL,
+        Source_Cost DECIMAL(12,2) NULL,
+        Target_Cost DECIMAL(12,2) NULL,
+        Issue VARCHAR(20) NOT NULL
+    );
+
+    -- 2. Day level: only the mismatched buckets are re-read (TVF per bucket range)
+    ;WITH SourceDay AS (
+        SELECT s.Dataset, s.Activity_Date, s.SK_ProviderID,
+               COUNT_BIG(1) AS Row_Count,
+               SUM(CAST(s.Key_Hash AS DECIMAL(38,0))) AS Key_Hash,
+               ISNULL(SUM(CAST(s.Total_Cost AS DECIMAL(38,2))), 0) AS Cost
+        FROM #Buckets b
+        CROSS APPLY [Analytics].[fn_Fact_Fingerprint_Source](b.Dataset, b.Bucket_From_Date, b.Bucket_To_Date, 0) s
+        WHERE s.SK_ProviderID = b.SK_ProviderID
+        GROUP BY s.Dataset, s.Activity_Date, s.SK_ProviderID
+    ),
+    TargetDay AS (
+        SELECT t.Dataset, t.Activity_Date, t.SK_ProviderID,
+               COUNT_BIG(1) AS Row_Count,
+               SUM(CAST(t.Key_Hash AS DECIMAL(38,0))) AS Key_Hash,
+               ISNULL(SUM(CAST(t.Total_Cost AS DECIMAL(38,2))), 0) AS Cost
+        FROM #Buckets b
+        CROSS APPLY [Analytics].[fn_Fact_Fingerprint_Target](b.Dataset, b.Bucket_From_Date, b.Bucket_To_Date) t
+        WHERE t.SK_ProviderID = b.SK_ProviderID
+        GROUP BY t.Dataset, t.Activity_Date, t.SK_ProviderID
+    )
+    INSERT INTO #DayDiff
+    SELECT
+        COALESCE(s.Dataset, t.Dataset),
+        COALESCE(s.Activity_Date, t.Activity_Date),
+        COALESCE(s.SK_ProviderID, t.SK_ProviderID),
+        ISNULL(s.Row_Count, 0), ISNULL(s.Key_Hash, 0), ISNULL(s.Cost, 0),
+        ISNULL(t.Row_Count, 0), ISNULL(t.Key_Hash, 0), ISNULL(t.Cost, 0)
+    FROM SourceDay s
+    FULL OUTER JOIN TargetDay t
+        ON t.Dataset = s.Dataset
+       AND t.Activity_Date = s.Activity_Date
+       AND t.SK_ProviderID = s.SK_ProviderID
+    WHERE ISNULL(s.Row_Count, 0) <> ISNULL(t.Row_Count, 0)
+       OR ISNULL(s.Key_Hash, 0) <> ISNULL(t.Key_Hash, 0)
+       OR ISNULL(s.Cost, 0) <> ISNULL(t.Cost, 0);
+
+    SET @DayCount = @@ROWCOUNT;
+    PRINT '[INFO] Mismatched provider days: ' + CAST(@DayCount AS VARCHAR(20));
+
+    -- 3. Encounter level: all providers on the mismatched days, so an encounter
+    --    that moved provider shows as PROVIDER_DIFF rather than missing on both sides
+    ;WITH Days AS (
+        SELECT DISTINCT Dataset, Activity_Date
+        FROM #DayDiff
+    ),
+    SourceRows AS (
+        SELECT s.*
+        FROM Days d
+        CROSS APPLY [Analytics].[fn_Fact_Fingerprint_Source](d.Dataset, d.Activity_Date, d.Activity_Date, 0) s
+    ),
+    TargetRows AS (
+        SELECT t.*
+        FROM Days d
+        CROSS APPLY [Analytics].[fn_Fact_Fingerprint_Target](d.Dataset, d.Activity_Date, d.Activity_Date) t
+    )
+    INSERT INTO #EncounterDiff
+    SELECT
+        COALESCE(s.Dataset, t.Dataset),
+        COALESCE(s.Activity_Date, t.Activity_Date),
+        COALESCE(s.SK_EncounterID, t.SK_EncounterID),
+        s.SK_ProviderID,
+        t.SK_ProviderID,
+        s.Total_Cost,
+        t.Total_Cost,
+        CASE
+            WHEN t.SK_EncounterID IS NULL THEN 'MISSING_IN_FACT'
+            WHEN s.SK_EncounterID IS NULL THEN 'NOT_IN_SOURCE'
+            WHEN s.SK_ProviderID <> t.SK_ProviderID THEN 'PROVIDER_DIFF'
+            ELSE 'COST_DIFF'
+        END
+    FROM SourceRows s
+    FULL OUTER JOIN TargetRows t
+        ON t.Dataset = s.Dataset
+       AND t.SK_EncounterID = s.SK_EncounterID
+       AND t.Activity_Date = s.Activity_Date
+    WHERE s.SK_EncounterID IS NULL
+       OR t.SK_EncounterID IS NULL
+       OR s.SK_ProviderID <> t.SK_ProviderID
+       OR ISNULL(s.Total_Cost, 0) <> ISNULL(t.Total_Cost, 0);
+
+    SET @EncounterCount = @@ROWCOUNT;
+    PRINT '[INFO] Differing encounters: ' + CAST(@EncounterCount AS VARCHAR(20));
+
+    -- Results
+    SELECT
+        b.Dataset,
+        b.Activity_Month,
+        b.SK_ProviderID,
+        p.Provider_Code,
+        b.Source_Row_Count,
+        b.Target_Row_Count,
+        b.Target_Row_Count - b.Source_Row_Count AS Row_Difference,
+        b.Source_Cost,
+        b.Target_Cost,
+        b.Target_Cost - b.Source_Cost AS Cost_Difference,
+        b.Key_Hash_Match
+    FROM #Buckets b
+    LEFT JOIN [Analytics].[vw_Dim_Provider] p
+        ON p.SK_ProviderID = b.SK_ProviderID
+    ORDER BY b.Dataset, b.Activity_Month, ABS(b.Target_Row_Count - b.Source_Row_Count) DESC;
+
+    SELECT
+        d.Dataset,
+        d.Activity_Date,
+        d.SK_ProviderID,
+        d.Source_Row_Count,
+        d.Target_Row_Count,
+        d.Target_Row_Count - d.Source_Row_Count AS Row_Difference,
+        d.Target_Cost - d.Source_Cost AS Cost_Difference,
+        CAST(CASE WHEN d.Source_Key_Hash = d.Target_Key_Hash THEN 1 ELSE 0 END AS BIT) AS Key_Hash_Match
+    FROM #DayDiff d
+    ORDER BY d.Dataset, d.Activity_Date, d.SK_ProviderID;
+
+    SELECT TOP (@MaxEncounters)
+        e.Dataset,
+        e.Activity_Date,
+        e.SK_EncounterID,
+        e.Issue,
+        e.Source_SK_ProviderID,
+        e.Target_SK_ProviderID,
+        e.Source_Cost,
+        e.Target_Cost
+    FROM #EncounterDiff e
+    ORDER BY e.Dataset, e.Activity_Date, e.Issue, e.SK_EncounterID;
+
+    DROP TABLE #Buckets;
+    DROP TABLE #DayDiff;
+    DROP TABLE #EncounterDiff;
+END
+GO
+
+PRINT '[OK] Created procedure: [Analytics].[sp_Reconcile_Fact_Fingerprint]';
+GO
@@ -0,0 +1,148 @@
+/**
+-- Script Name: 04_Create_Validation_Run.sql
+-- Description: Run history for scripts/validate_fact_data_parallel.py.
+--              The script runs sp_Validate_Fact_Data per domain and section group on
+--              separate connections, merges the result sets and writes one run row,
+--              one row per unit (with its duration) and the merged test results here.
+-- Author:      Sridhar Peddi
+-- Created:     2026-03-28
+
+-- Change Log:
+-- 2026-03-28   | Sridhar Peddi    | Initial creation - run, unit and result tables
+**/
+
+USE [Data_Lab_SWL_Live];
+GO
+
+SET ANSI_NULLS ON;
+GO
+SET QUOTED_IDENTIFIER ON;
+GO
+
+PRINT '========================================';
+PRINT 'Creating Validation Run History';
+PRINT 'Started: ' + CONVERT(VARCHAR, GETDATE(), 121);
+PRINT '========================================';
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Validation_Result]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Validation_Result] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Validation_Result];
+END
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Validation_Run_Unit]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Validation_Run_Unit] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Validation_Run_Unit];
+END
+GO
+
+IF OBJECT_ID('[Analytics].[tbl_Validation_Run]', 'U') IS NOT NULL
+BEGIN
+    PRINT 'Table [Analytics].[tbl_Validation_Run] already exists. Dropping...';
+    DROP TABLE [Analytics].[tbl_Validation_Run];
+END
+GO
+
+/**
+-- Table Name:  tbl_Validation_Run
+-- Description: One row per parallel validation run. Duration_Seconds is wall-clock;
+--              Unit_Seconds is the sum over units (what a serial run would have taken).
+**/
+CREATE TABLE [Analytics].[tbl_Validation_Run] (
+    [Run_ID] INT IDENTITY(1,1) NOT NULL,
+
+    -- PARAMETERS
+    [From_Date] DATE NOT NULL,
+    [To_Date] DATE NOT NULL,
+    [Variance_Threshold_Pct] DECIMAL(5,2) NOT NULL,
+    [Unknown_Threshold_Pct] DECIMAL(5,2) NOT NULL,
+    [Materiality_Threshold] INT NOT NULL,
+    [Workers] INT NOT NULL,
+
+    -- TIMINGS
+    [Start_DateTime] DATETIME2 NOT NULL,
+    [End_DateTime] DATETIME2 NOT NULL,
+    [Duration_Seconds] DECIMAL(10,2) NOT NULL,
+    [Unit_Seconds] DECIMAL(10,2) NOT NULL,
+
+    -- OUTCOME
+    [Total_Tests] INT NOT NULL,
+    [Passed] INT NOT NULL,
+    [Failed] INT NOT NULL,
+    [Units_Failed] INT NOT NULL,
+    [Overall_Status] VARCHAR(10) NOT NULL,            -- 'PASS', 'FAIL', 'ERROR'
+
+    [Host_Name] NVARCHAR(128) NOT NULL DEFAULT HOST_NAME(),
+
+    CONSTRAINT [PK_Validation_Run] PRIMARY KEY CLUSTERED ([Run_ID])
+) ON [PRIMARY];
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Validation_Run]';
+GO
+
+/**
+-- Table Name:  tbl_Validation_Run_Unit
+-- Description: One row per sp_Validate_Fact_Data call in a run (@Domain + @Sections).
+**/
+CREATE TABLE [Analytics].[tbl_Validation_Run_Unit] (
+    [Run_ID] INT NOT NULL,
+    [Unit_Name] VARCHAR(30) NOT NULL,                  -- 'IP:1,2,3,5,6,7', 'OP:4'
+    [Domain] VARCHAR(10) NOT NULL,
+    [Sections] VARCHAR(50) NOT NULL,
+
+    [Start_DateTime] DATETIME2 NOT NULL,
+    [End_DateTime] DATETIME2 NOT NULL,
+    [Duration_Seconds] DECIMAL(10,2) NOT NULL,
+
+    [Test_Count] INT NOT NULL,
+    [Failed_Count] INT NOT NULL,
+    [Status] VARCHAR(10) NOT NULL,                     -- 'PASS', 'FAIL', 'ERROR'
+    [Error_Message] NVARCHAR(2000) NULL,
+
+    CONSTRAINT [PK_Validation_Run_Unit] PRIMARY KEY CLUSTERED ([Run_ID], [Unit_Name]),
+    CONSTRAINT [FK_Validation_Run_Unit_Run] FOREIGN KEY ([Run_ID])
+        REFERENCES [Analytics].[tbl_Validation_Run] ([Run_ID])
+) ON [PRIMARY];
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Validation_Run_Unit]';
+GO
+
+/**
+-- Table Name:  tbl_Validation_Result
+-- Description: Merged test results of a run (sp_Validate_Fact_Data first result set),
+--              renumbered across units in the procedure's order (failures first).
+**/
+CREATE TABLE [Analytics].[tbl_Validation_Result] (
+    [Run_ID] INT NOT NULL,
+    [Test_ID] INT NOT NULL,
+    [Unit_Name] VARCHAR(30) NOT NULL,
+
+    [Domain] VARCHAR(10) NOT NULL,
+    [Test_Category] VARCHAR(50) NOT NULL,
+    [Test_Name] VARCHAR(100) NOT NULL,
+    [Source_Value] BIGINT NULL,
+    [Target_Value] BIGINT NULL,
+    [Variance_Pct] DECIMAL(10,4) NULL,
+    [Threshold_Pct] DECIMAL(5,2) NULL,
+    [Status] VARCHAR(10) NOT NULL,
+    [Details] VARCHAR(500) NULL,
+
+    CONSTRAINT [PK_Validation_Result] PRIMARY KEY CLUSTERED ([Run_ID], [Test_ID]),
+    CONSTRAINT [FK_Validation_Result_Run] FOREIGN KEY ([Run_ID])
+        REFERENCES [Analytics].[tbl_Validation_Run] ([Run_ID])
+) ON [PRIMARY];
+GO
+
+PRINT '[OK] Created table: [Analytics].[tbl_Validation_Result]';
+GO
+
+PRINT '';
+PRINT '========================================';
+PRINT 'Validation Run History Complete';
+PRINT '========================================';
+GO